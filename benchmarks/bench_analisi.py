@@ -0,0 +1,71 @@
+"""
+Benchmark: analisi vettoriali di AnalisiRicette contro gli stessi calcoli con cicli Python.
+
+Su un catalogo di ricette sintetiche misura la costruzione delle colonne (la prima
+analisi dopo una modifica), poi percentili dei minutaggi, durata media per ingrediente
+e coppie di ingredienti più frequenti sulle colonne già in cache, e li confronta con
+le versioni in puro Python (sort, dizionari di liste, conteggio delle coppie).
+
+Uso:
+    python benchmarks/bench_analisi.py --ricette 1000000
+"""
+
+import argparse
+import os
+import sys
+from collections import Counter, defaultdict
+from itertools import combinations
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))   # Rende importabile il pacchetto ricette dalla radice del progetto.
+
+from bench_indice_ingredienti import cronometra, genera_ricette                      # noqa: E402
+from ricette import AnalisiRicette, CatalogoRicette                                  # noqa: E402
+
+
+# Percentili con un ordinamento Python (metodo "più vicino" semplificato: basta per confrontare i tempi).
+def percentili_python(ricette, percentili=(50, 90, 99)):
+    minutaggi = sorted(ricetta['minutaggio'] for ricetta in ricette)
+    return {p: minutaggi[min(len(minutaggi) - 1, p * len(minutaggi) // 100)] for p in percentili}
+
+
+def durata_per_ingrediente_python(ricette):
+    gruppi = defaultdict(list)
+    for ricetta in ricette:
+        for ingrediente in ricetta['ingredienti']:
+            gruppi[ingrediente].append(ricetta['minutaggio'])
+    return {ingrediente: sum(valori) / len(valori) for ingrediente, valori in gruppi.items()}
+
+
+def coppie_python(ricette, numero=10):
+    coppie = Counter()
+    for ricetta in ricette:
+        coppie.update(combinations(sorted(ricetta['ingredienti']), 2))
+    return coppie.most_common(numero)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--ricette", type=int, default=1_000_000, help="numero di ricette sintetiche")
+    parser.add_argument("--ripetizioni", type=int, default=3, help="ripetizioni delle analisi sulle colonne in cache")
+    argomenti = parser.parse_args()
+
+    ricette, _ = genera_ricette(argomenti.ricette)
+    catalogo = CatalogoRicette(ricette, alias={})
+    analisi = AnalisiRicette(catalogo)
+    secondi_colonne, _ = cronometra(analisi.colonne, 1)
+
+    print(f"{argomenti.ricette:,} ricette; costruzione delle colonne: {secondi_colonne * 1000:.0f} ms (solo dopo una modifica)")
+    print(f"{'analisi':<26} {'python (ms)':>12} {'vettoriale (ms)':>16} {'rapporto':>10}")
+    confronti = (
+        ("percentili minutaggio", lambda: percentili_python(catalogo), analisi.percentili_durata),
+        ("durata per ingrediente", lambda: durata_per_ingrediente_python(catalogo), analisi.durata_per_ingrediente),
+        ("coppie più frequenti", lambda: coppie_python(catalogo), analisi.coppie_frequenti),
+    )
+    for etichetta, python, vettoriale in confronti:
+        secondi_python, _ = cronometra(python, 1)
+        secondi_vettoriale, _ = cronometra(vettoriale, argomenti.ripetizioni)
+        print(f"{etichetta:<26} {secondi_python * 1000:>12.1f} {secondi_vettoriale * 1000:>16.1f} {secondi_python / secondi_vettoriale:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Benchmark: "cosa posso cucinare" con i bitset di IndiceDispensa contro la scansione della lista.
+
+Su un catalogo di ricette sintetiche misura la costruzione dei bitset (al primo uso)
+e il tempo medio di trova_cucinabili() per dispense casuali, con 0..K ingredienti
+mancanti ammessi, confrontandolo con la scansione lineare della stessa lista. Il
+tempo per interrogazione va letto come latenza "ad ogni tasto premuto".
+
+Uso:
+    python benchmarks/bench_dispensa.py --ricette 1000000 --interrogazioni 50
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))   # Rende importabile il pacchetto ricette dalla radice del progetto.
+
+from bench_indice_ingredienti import genera_ricette                                  # noqa: E402
+from ricette import CatalogoRicette, trova_cucinabili                                # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--ricette", type=int, default=1_000_000, help="numero di ricette sintetiche")
+    parser.add_argument("--interrogazioni", type=int, default=50, help="dispense casuali per ogni misura")
+    parser.add_argument("--dispensa", type=int, default=15, help="ingredienti in ogni dispensa")
+    parser.add_argument("--mancanti", type=int, default=3, help="numero massimo di mancanti da provare")
+    parser.add_argument("--limite", type=int, default=20, help="risultati per interrogazione")
+    parser.add_argument("--scansione", type=int, default=3, help="interrogazioni per misurare la scansione lineare (lenta)")
+    argomenti = parser.parse_args()
+
+    ricette, vocabolario = genera_ricette(argomenti.ricette)
+    catalogo = CatalogoRicette(ricette, alias={})
+    inizio = time.perf_counter()
+    catalogo.indice_dispensa
+    print(f"{argomenti.ricette:,} ricette; costruzione dei bitset: {time.perf_counter() - inizio:.2f} s")
+
+    casuale = random.Random(7)
+    dispense = [casuale.sample(vocabolario[:200], argomenti.dispensa) for _ in range(argomenti.interrogazioni)]
+    print(f"{'mancanti':>8} {'bitset (ms)':>12} {'scansione (ms)':>15} {'risultati medi':>15}")
+    for mancanti in range(argomenti.mancanti + 1):
+        inizio = time.perf_counter()
+        trovate = sum(len(trova_cucinabili(catalogo, dispensa, mancanti, argomenti.limite)) for dispensa in dispense)
+        indice = (time.perf_counter() - inizio) / len(dispense)
+        inizio = time.perf_counter()
+        for dispensa in dispense[:argomenti.scansione]:
+            attese = trova_cucinabili(ricette, dispensa, mancanti, argomenti.limite)
+            ottenute = trova_cucinabili(catalogo, dispensa, mancanti, argomenti.limite)
+            assert [r['nome'] for r, _ in attese] == [r['nome'] for r, _ in ottenute], "risultati diversi dalla scansione"
+        scansione = (time.perf_counter() - inizio) / min(len(dispense), argomenti.scansione) - indice
+        print(f"{mancanti:>8} {indice * 1000:>12.2f} {scansione * 1000:>15.1f} {trovate / len(dispense):>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
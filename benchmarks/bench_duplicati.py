@@ -0,0 +1,83 @@
+"""
+Benchmark: ricette quasi uguali con MinHash/LSH contro il confronto di tutte le coppie.
+
+Genera ricette sintetiche con una quota di varianti quasi uguali (stessi ingredienti,
+con uno aggiunto o tolto), poi misura il rapporto completo dei duplicati con
+MinHash/LSH (firme comprese) e la ricerca delle ricette simili ad una ricetta
+(tramite l'indice degli ingredienti e con la scansione della lista), e li confronta
+con il confronto di tutte le coppie (quadratico: solo sulle prime ricette).
+Riporta anche quante delle coppie vere sopra la soglia vengono trovate (richiamo).
+
+Uso:
+    python benchmarks/bench_duplicati.py --ricette 200000 --coppie-esatte 3000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from itertools import combinations
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))   # Rende importabile il pacchetto ricette dalla radice del progetto.
+
+from bench_indice_ingredienti import genera_ricette                                  # noqa: E402
+from ricette import SOGLIA_SIMILI, CatalogoRicette, jaccard, trova_duplicati, trova_simili  # noqa: E402
+
+
+# Aggiunge varianti quasi uguali di ricette scelte a caso: un ingrediente in più o in meno.
+def aggiungi_varianti(ricette, vocabolario, quota, seme=3):
+    casuale = random.Random(seme)
+    for numero in range(int(len(ricette) * quota)):
+        ingredienti = list(casuale.choice(ricette)['ingredienti'])
+        if casuale.random() < 0.5 and len(ingredienti) > 5:
+            ingredienti.pop(casuale.randrange(len(ingredienti)))
+        else:
+            ingredienti.append(casuale.choice(vocabolario))
+        ricette.append({'nome': f"Variante {numero}", 'ingredienti': ingredienti, 'minutaggio': casuale.randint(5, 180)})
+    return ricette
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--ricette", type=int, default=200_000, help="numero di ricette sintetiche")
+    parser.add_argument("--quota", type=float, default=0.05, help="quota di varianti quasi uguali aggiunte")
+    parser.add_argument("--soglia", type=float, default=SOGLIA_SIMILI, help="somiglianza di Jaccard minima")
+    parser.add_argument("--coppie-esatte", type=int, default=3000, help="ricette su cui confrontare tutte le coppie")
+    argomenti = parser.parse_args()
+
+    ricette, vocabolario = genera_ricette(argomenti.ricette)
+    ricette = aggiungi_varianti(ricette, vocabolario, argomenti.quota)
+    catalogo = CatalogoRicette(ricette, alias={})
+
+    inizio = time.perf_counter()
+    coppie = trova_duplicati(catalogo, argomenti.soglia)
+    rapporto = time.perf_counter() - inizio
+    campione = ricette[-100:]
+    inizio = time.perf_counter()
+    for ricetta in campione:
+        trova_simili(catalogo, ricetta, argomenti.soglia)
+    simili = (time.perf_counter() - inizio) / len(campione)
+    inizio = time.perf_counter()
+    for ricetta in campione[:3]:
+        trova_simili(ricette, ricetta, argomenti.soglia)
+    scansione = (time.perf_counter() - inizio) / 3
+    print(f"{len(ricette):,} ricette: {len(coppie):,} coppie in {rapporto:.2f} s; ricette simili a una ricetta "
+          f"in {simili * 1000:.2f} ms (scansione della lista {scansione * 1000:.1f} ms)")
+
+    piccolo = aggiungi_varianti(ricette[:argomenti.coppie_esatte], vocabolario, argomenti.quota, seme=4)
+    insiemi = [set(ricetta['ingredienti']) for ricetta in piccolo]
+    inizio = time.perf_counter()
+    esatte = {(piccolo[i]['nome'], piccolo[j]['nome']) for i, j in combinations(range(len(piccolo)), 2)
+              if jaccard(insiemi[i], insiemi[j]) >= argomenti.soglia}
+    tutte_le_coppie = time.perf_counter() - inizio
+    inizio = time.perf_counter()
+    trovate = {(prima['nome'], seconda['nome']) for prima, seconda, _ in trova_duplicati(CatalogoRicette(piccolo, alias={}), argomenti.soglia)}
+    lsh = time.perf_counter() - inizio
+    richiamo = len(esatte & trovate) / len(esatte) if esatte else 1.0
+    print(f"{len(piccolo):,} ricette: tutte le coppie {tutte_le_coppie:.2f} s, MinHash/LSH (catalogo compreso) {lsh:.2f} s, "
+          f"richiamo {richiamo:.1%} ({len(esatte & trovate)}/{len(esatte)}), falsi positivi {len(trovate - esatte)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark: tempo di importazione del pacchetto ricette.
+
+Lancia più volte `python -X importtime -c "import ricette"` in un processo nuovo,
+legge dal report il tempo cumulativo del modulo `ricette` e ne prende la mediana.
+Per confronto misura anche `import pandas`, la dipendenza che la vecchia versione
+di codice.py caricava ad ogni importazione (se pandas è installato).
+
+Prima di misurare compila il bytecode del pacchetto, così il tempo non include la
+compilazione dei sorgenti (che avviene solo alla prima importazione dopo una modifica).
+
+Termina con codice di uscita 1 se la mediana supera il budget indicato.
+
+Uso:
+    python benchmarks/bench_import.py --ripetizioni 15 --budget-ms 25
+"""
+
+import argparse
+import compileall
+import os
+import statistics
+import subprocess
+import sys
+
+RADICE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))                # Cartella che contiene il pacchetto ricette.
+
+
+# Importa `modulo` in un interprete nuovo e restituisce il suo tempo cumulativo in microsecondi, letto da -X importtime.
+def tempo_importazione(modulo):
+    processo = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+        cwd=RADICE, capture_output=True, text=True, check=True,
+    )
+    for riga in processo.stderr.splitlines():                                       # Righe nel formato "import time: self | cumulativo | nome".
+        parti = riga.split("|")
+        if len(parti) == 3 and parti[2].strip() == modulo:
+            return int(parti[1])
+    raise RuntimeError(f"modulo {modulo} non trovato nel report di -X importtime")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--ripetizioni", type=int, default=15, help="numero di processi da lanciare per modulo")
+    parser.add_argument("--budget-ms", type=float, default=25.0, help="budget massimo per `import ricette`, in millisecondi")
+    argomenti = parser.parse_args()
+
+    compileall.compile_dir(os.path.join(RADICE, "ricette"), quiet=1)                # Misura con il bytecode già compilato, come nei worker in produzione.
+    mediana = statistics.median(tempo_importazione("ricette") for _ in range(argomenti.ripetizioni)) / 1000
+    print(f"import ricette: {mediana:.1f} ms (mediana su {argomenti.ripetizioni} processi, budget {argomenti.budget_ms:.0f} ms)")
+
+    try:
+        mediana_pandas = statistics.median(tempo_importazione("pandas") for _ in range(min(argomenti.ripetizioni, 5))) / 1000
+        print(f"import pandas:  {mediana_pandas:.1f} ms (costo che la vecchia codice.py pagava ad ogni importazione)")
+    except subprocess.CalledProcessError:
+        print("import pandas:  non installato")
+
+    if mediana > argomenti.budget_ms:
+        print("Budget superato.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark: importazione ed esportazione in streaming di file JSONL e CSV.
+
+Scrive un file con ricette sintetiche (con qualche riga non valida e qualche
+duplicato), lo importa in un CatalogoRicette e in un RepositorySQLite e lo
+riesporta, riportando le righe al secondo di ogni passaggio.
+
+Uso:
+    python benchmarks/bench_importazione.py --ricette 200000 --formato jsonl
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # Rende importabile il pacchetto ricette dalla radice del progetto.
+
+from ricette import CatalogoRicette, RepositorySQLite, esporta_file, importa_file, lista_ricette  # noqa: E402
+
+
+# Scrive il file di prova: ogni 100 righe una non valida, ogni 50 un duplicato della precedente.
+def scrivi_file(percorso, numero, formato, seme=42):
+    casuale = random.Random(seme)
+    vocabolario = sorted({i for ricetta in lista_ricette for i in ricetta['ingredienti']})
+    with open(percorso, 'w', encoding='utf-8', newline='') as file:
+        if formato == 'csv':
+            file.write("nome,ingredienti,minutaggio\n")
+        for n in range(numero):
+            nome = f"Ricetta {n - 1 if n % 50 == 0 and n else n}"
+            ingredienti = casuale.sample(vocabolario, casuale.randint(3, 8))
+            minutaggio = -5 if n % 100 == 99 else casuale.randint(5, 180)
+            if formato == 'csv':
+                file.write(f"{nome},\"{', '.join(ingredienti)}\",{minutaggio}\n")
+            else:
+                file.write(json.dumps({'nome': nome, 'ingredienti': ingredienti, 'minutaggio': minutaggio}) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--ricette", type=int, default=200_000, help="righe del file di prova")
+    parser.add_argument("--formato", choices=("jsonl", "csv"), default="jsonl")
+    parser.add_argument("--blocco", type=int, default=10_000, help="ricette inserite per volta")
+    argomenti = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cartella:
+        sorgente = os.path.join(cartella, f"ricette.{argomenti.formato}")
+        scrivi_file(sorgente, argomenti.ricette, argomenti.formato)
+
+        catalogo = CatalogoRicette()
+        print("importazione in CatalogoRicette:  ", importa_file(catalogo, sorgente, dimensione_blocco=argomenti.blocco))
+        with RepositorySQLite(os.path.join(cartella, "ricette.db")) as repository:
+            print("importazione in RepositorySQLite: ", importa_file(repository, sorgente, dimensione_blocco=argomenti.blocco))
+            print("esportazione da RepositorySQLite: ", esporta_file(repository, os.path.join(cartella, f"copia_db.{argomenti.formato}")))
+        print("esportazione da CatalogoRicette:  ", esporta_file(catalogo, os.path.join(cartella, f"copia.{argomenti.formato}")))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark: ricerca per ingredienti con indice invertito contro scansione lineare.
+
+Confronta il tempo medio di un'interrogazione AND su due o più ingredienti
+eseguita scorrendo tutta la lista (come faceva filtraggio_avanzato2) con quello
+della stessa interrogazione risolta da CatalogoRicette intersecando le posting list.
+
+Uso:
+    python benchmarks/bench_indice_ingredienti.py --ricette 100000 --ripetizioni 20
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # Rende importabile il pacchetto ricette dalla radice del progetto.
+
+from ricette import CatalogoRicette, lista_ricette                                   # noqa: E402
+
+
+# Genera ricette sintetiche pescando gli ingredienti con frequenze sbilanciate, come nei ricettari reali.
+def genera_ricette(numero, seme=42):
+    casuale = random.Random(seme)
+    vocabolario = sorted({i for ricetta in lista_ricette for i in ricetta['ingredienti']})
+    vocabolario += [f"Ingrediente {n}" for n in range(2000)]                            # Allunga il vocabolario con ingredienti rari.
+    pesi = [1 / (posizione + 1) for posizione in range(len(vocabolario))]              # Pochi ingredienti molto comuni, tanti rari.
+    ricette = []
+    for n in range(numero):
+        ingredienti = list(dict.fromkeys(casuale.choices(vocabolario, pesi, k=casuale.randint(3, 9))))
+        ricette.append({'nome': f"Ricetta {n}", 'ingredienti': ingredienti, 'minutaggio': casuale.randint(5, 180)})
+    return ricette, vocabolario
+
+
+# Scansione lineare equivalente a quella delle funzioni originali, generalizzata a N ingredienti.
+def scansione_lineare(ricette, ingredienti):
+    cercati = [i.lower() for i in ingredienti]
+    risultati = []
+    for ricetta in ricette:
+        ingredienti_lower = [i.lower() for i in ricetta['ingredienti']]
+        if all(i in ingredienti_lower for i in cercati):
+            risultati.append(ricetta)
+    return risultati
+
+
+def cronometra(funzione, ripetizioni):
+    inizio = time.perf_counter()
+    for _ in range(ripetizioni):
+        risultato = funzione()
+    return (time.perf_counter() - inizio) / ripetizioni, risultato
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--ricette", type=int, default=100_000, help="numero di ricette sintetiche")
+    parser.add_argument("--ripetizioni", type=int, default=20, help="ripetizioni per ogni interrogazione")
+    argomenti = parser.parse_args()
+
+    ricette, vocabolario = genera_ricette(argomenti.ricette)
+    inizio = time.perf_counter()
+    catalogo = CatalogoRicette(ricette, alias={})                                      # Senza sinonimi, per confrontare i risultati con la scansione lineare.
+    print(f"Costruzione dell'indice su {len(ricette)} ricette: {time.perf_counter() - inizio:.3f} s")
+
+    interrogazioni = [
+        vocabolario[:2],                                                                # Due ingredienti comunissimi.
+        [vocabolario[0], vocabolario[40]],                                              # Uno comune e uno medio.
+        [vocabolario[1], vocabolario[2], vocabolario[3]],                               # Tre ingredienti comuni.
+        [vocabolario[0], vocabolario[500]],                                             # Uno comune e uno raro.
+    ]
+    print(f"{'interrogazione':<60} {'lineare (ms)':>14} {'indice (ms)':>12} {'speedup':>9}")
+    for ingredienti in interrogazioni:
+        t_lineare, attesi = cronometra(lambda: scansione_lineare(ricette, ingredienti), argomenti.ripetizioni)
+        t_indice, ottenuti = cronometra(lambda: catalogo.filtra_ingredienti(tutti=ingredienti), argomenti.ripetizioni)
+        assert attesi == ottenuti, "l'indice restituisce risultati diversi dalla scansione lineare"
+        etichetta = " & ".join(ingredienti)[:58] + f" ({len(attesi)})"
+        print(f"{etichetta:<60} {t_lineare * 1000:>14.2f} {t_indice * 1000:>12.3f} {t_lineare / t_indice:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark: interrogazioni paginate con il pianificatore contro filtra-ordina-taglia.
+
+Per ogni interrogazione confronta il tempo del generatore di Interrogazione (che parte
+dall'indice più conveniente e si ferma appena la pagina è piena) con quello dell'approccio
+diretto: calcolare tutti i risultati con CatalogoRicette.filtra(), ordinarli e poi
+tenere solo la pagina richiesta.
+
+Uso:
+    python benchmarks/bench_interrogazioni.py --ricette 100000 --ripetizioni 20
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # Rende importabile il pacchetto ricette dalla radice del progetto.
+
+from bench_indice_ingredienti import cronometra, genera_ricette                      # noqa: E402
+from ricette import CatalogoRicette, Interrogazione                                  # noqa: E402
+
+
+# Approccio diretto: tutti i risultati, ordinati, poi la pagina.
+def filtra_ordina_taglia(catalogo, tutti, minimo, massimo, chiave, limite):
+    risultati = catalogo.filtra(tutti=tutti, minimo=minimo, massimo=massimo)
+    if chiave != 'inserimento':
+        risultati = sorted(risultati, key=lambda ricetta: ricetta[chiave])
+    return [dict(ricetta) for ricetta in risultati[:limite]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--ricette", type=int, default=100_000, help="numero di ricette sintetiche")
+    parser.add_argument("--ripetizioni", type=int, default=20, help="ripetizioni per ogni interrogazione")
+    argomenti = parser.parse_args()
+
+    ricette, vocabolario = genera_ricette(argomenti.ricette)
+    catalogo = CatalogoRicette(ricette, alias={})
+
+    interrogazioni = [                                                                  # (ingredienti, minimo, massimo, ordinamento, limite)
+        ([vocabolario[0]], None, None, 'inserimento', 10),                              # Ingrediente comunissimo, prima pagina.
+        ([vocabolario[0]], 30, 60, 'minutaggio', 10),                                   # Ordine dato dall'indice dei minutaggi.
+        ([vocabolario[0], vocabolario[1]], 5, 170, 'minutaggio', 20),                   # Intervallo ampio e due ingredienti comuni.
+        ([vocabolario[300]], 10, 20, 'inserimento', 10),                                # Ingrediente raro: guida la posting list.
+    ]
+    print(f"{'interrogazione':<52} {'diretto (ms)':>13} {'piano (ms)':>11} {'speedup':>9}")
+    for tutti, minimo, massimo, chiave, limite in interrogazioni:
+        interrogazione = (Interrogazione(catalogo).con_ingredienti(*tutti).minutaggio(minimo, massimo)
+                          .ordina_per(chiave).limita(limite))
+        t_diretto, attesi = cronometra(
+            lambda: filtra_ordina_taglia(catalogo, tutti, minimo, massimo, chiave, limite), argomenti.ripetizioni)
+        t_piano, ottenuti = cronometra(lambda: [dict(ricetta) for ricetta in interrogazione], argomenti.ripetizioni)
+        assert attesi == ottenuti, "il pianificatore restituisce risultati diversi dall'approccio diretto"
+        etichetta = f"{' & '.join(tutti)} [{minimo}-{massimo}] per {chiave}, {limite}"[:52]
+        print(f"{etichetta:<52} {t_diretto * 1000:>13.2f} {t_piano * 1000:>11.3f} {t_diretto / t_piano:>8.0f}x")
+        for riga in interrogazione.piano():
+            print(f"    {riga}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Benchmark: avvio a freddo da istantanea binaria mappata contro il caricamento di un JSONL.
+
+Costruisce un catalogo di ricette sintetiche (con qualche eliminazione), lo salva come
+istantanea e come JSONL e verifica che l'istantanea riletta dia le stesse ricette,
+statistiche e risposte agli indici del catalogo di partenza (round-trip). Poi misura,
+in processi nuovi, il tempo per aprire l'archivio e rispondere a una ricerca per nome,
+e in questo processo il tempo di apertura e delle prime interrogazioni. Il file è già
+nella cache del sistema operativo: si misura il lavoro di Python, non il disco.
+
+Uso:
+    python benchmarks/bench_istantanea.py --ricette 1000000 --processi 5
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+RADICE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RADICE)                                                           # Rende importabile il pacchetto ricette dalla radice del progetto.
+
+from bench_indice_ingredienti import genera_ricette                                  # noqa: E402
+from ricette import CatalogoRicette, carica_istantanea, esporta_file, salva_istantanea  # noqa: E402
+
+# Programma eseguito dai processi nuovi: apre l'archivio con la riga di comando e cerca una ricetta per nome.
+AVVIO = """
+import sys, time
+inizio = time.perf_counter()
+from ricette.comandi import apri_archivio
+archivio = apri_archivio(sys.argv[1])
+if archivio.trova_per_nome(sys.argv[2]) is None:
+    sys.exit("ricetta non trovata: " + sys.argv[2])
+print(time.perf_counter() - inizio)
+"""
+
+
+# Solleva ValueError se il valore dell'istantanea riletta è diverso da quello del catalogo: vale anche con python -O, che toglie gli assert.
+def controlla(caricato, atteso, cosa):
+    if caricato != atteso:
+        raise ValueError(f"round-trip dell'istantanea: {cosa} diverso dal catalogo di partenza ({caricato!r:.200} invece di {atteso!r:.200})")
+
+
+# Restituisce i nomi di un elenco di ricette, per confrontare i risultati delle interrogazioni.
+def nomi(ricette):
+    return [ricetta['nome'] for ricetta in ricette]
+
+
+# Verifica che l'istantanea riletta sia uguale al catalogo di partenza.
+def verifica(catalogo, caricato, vocabolario):
+    controlla(len(caricato), len(catalogo), "numero di ricette")
+    controlla([dict(ricetta) for ricetta in caricato], [dict(ricetta) for ricetta in catalogo], "ricette")
+    for nome in ('piu_comuni', 'meno_comuni', 'durata'):
+        controlla(getattr(caricato.statistiche, nome)(), getattr(catalogo.statistiche, nome)(), nome)
+    for nome in ('id_con_piu_minutaggio', 'id_con_piu_ingredienti'):
+        controlla(caricato.ricetta(getattr(caricato.statistiche, nome)())['nome'], catalogo.ricetta(getattr(catalogo.statistiche, nome)())['nome'], nome)
+    for posizione in range(0, 200, 7):
+        primo, secondo = vocabolario[posizione], vocabolario[posizione + 1]
+        controlla(caricato.statistiche.frequenza(primo), catalogo.statistiche.frequenza(primo), f"frequenza di {primo}")
+        controlla(nomi(caricato.filtra([primo], [], [secondo], 20, 90)), nomi(catalogo.filtra([primo], [], [secondo], 20, 90)), f"filtra {primo}")
+        controlla(nomi(caricato.filtra_ingredienti([], [primo, secondo])), nomi(catalogo.filtra_ingredienti([], [primo, secondo])),
+                  f"filtra_ingredienti {primo}, {secondo}")
+        testo = f"ta {posizione}"
+        controlla(len(caricato.id_con_nome_simile(testo)), len(catalogo.id_con_nome_simile(testo)), f"nomi simili a {testo!r}")
+    controlla(nomi(caricato.ricette_piu_veloci(50)), nomi(catalogo.ricette_piu_veloci(50)), "ricette più veloci")
+    controlla(nomi(caricato.filtra_minutaggio(30, 31)), nomi(catalogo.filtra_minutaggio(30, 31)), "filtra_minutaggio")
+
+
+# Avvia `processi` processi nuovi sull'archivio e restituisce la mediana dei secondi (importazione compresa) e del processo intero.
+def avvio_a_freddo(percorso, nome, processi):
+    interni, totali = [], []
+    for _ in range(processi):
+        inizio = time.perf_counter()
+        uscita = subprocess.run([sys.executable, "-c", AVVIO, percorso, nome], capture_output=True, text=True, check=True,
+                                env=dict(os.environ, PYTHONPATH=RADICE))
+        totali.append(time.perf_counter() - inizio)
+        interni.append(float(uscita.stdout))
+    return statistics.median(interni), statistics.median(totali)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--ricette", type=int, default=200_000, help="numero di ricette sintetiche")
+    parser.add_argument("--processi", type=int, default=5, help="processi nuovi per ogni misura di avvio a freddo")
+    argomenti = parser.parse_args()
+
+    ricette, vocabolario = genera_ricette(argomenti.ricette)
+    inizio = time.perf_counter()
+    catalogo = CatalogoRicette(ricette)
+    costruzione = time.perf_counter() - inizio
+    for ricetta in list(catalogo)[::50]:                                                # Qualche lapide, che l'istantanea non scrive.
+        catalogo.remove(ricetta)
+    nome = list(catalogo)[len(catalogo) // 2]['nome']
+
+    with tempfile.TemporaryDirectory() as cartella:
+        istantanea = os.path.join(cartella, "ricette.istantanea")
+        jsonl = os.path.join(cartella, "ricette.jsonl")
+        inizio = time.perf_counter()
+        byte = salva_istantanea(catalogo, istantanea)
+        salvataggio = time.perf_counter() - inizio
+        esporta_file(catalogo, jsonl)
+        print(f"{len(catalogo):,} ricette: catalogo costruito in {costruzione:.2f} s; istantanea di {byte / 2**20:.1f} MiB "
+              f"scritta in {salvataggio:.2f} s (JSONL: {os.path.getsize(jsonl) / 2**20:.1f} MiB)")
+
+        inizio = time.perf_counter()
+        caricato = carica_istantanea(istantanea)
+        apertura = time.perf_counter() - inizio
+        inizio = time.perf_counter()
+        caricato.trova_per_nome(nome)
+        caricato.filtra([vocabolario[0]], [], [], 10, 20)
+        caricato.statistiche.piu_comuni(5)
+        prime = time.perf_counter() - inizio
+        print(f"apertura dell'istantanea in questo processo: {apertura * 1000:.2f} ms, "
+              f"prime interrogazioni (nome, filtro, statistiche) {prime * 1000:.2f} ms")
+        verifica(catalogo, caricato, vocabolario)
+        print("round-trip: ricette, statistiche e indici uguali al catalogo di partenza")
+
+        for etichetta, percorso in (("istantanea", istantanea), ("JSONL", jsonl)):
+            interno, totale = avvio_a_freddo(percorso, nome, argomenti.processi)
+            print(f"avvio a freddo da {etichetta:<10}: {interno * 1000:>9.1f} ms per aprire e cercare "
+                  f"({totale * 1000:.1f} ms con l'avvio dell'interprete)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark: operazioni a lotti su un archivio caricato una volta contro un processo per operazione.
+
+Misura le operazioni al secondo di esegui_lotto() (aggiunte, ricerche, filtri ed
+eliminazioni lette come JSON) sul catalogo in memoria e su un database SQLite, e le
+confronta con il costo di lanciare `python -m ricette` per ogni singola operazione.
+
+Uso:
+    python benchmarks/bench_lotto.py --operazioni 20000 --processi 10
+"""
+
+import argparse
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+RADICE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RADICE)                                                           # Rende importabile il pacchetto ricette dalla radice del progetto.
+
+from ricette import CatalogoRicette, RepositorySQLite, esegui_lotto                  # noqa: E402
+
+
+# Genera un lotto di operazioni miste: per ogni ricetta aggiunta, una ricerca, un filtro e poi l'eliminazione.
+def genera_operazioni(numero, seme=42):
+    casuale = random.Random(seme)
+    righe = []
+    for i in range(numero):
+        tipo = i % 4
+        if tipo == 0:
+            operazione = {'op': 'add', 'nome': f"Ricetta {i}", 'minutaggio': casuale.randint(1, 180),
+                          'ingredienti': [f"Ingrediente {casuale.randint(0, 500)}" for _ in range(6)]}
+        elif tipo == 1:
+            operazione = {'op': 'search', 'nome': f"Ricetta {i - 1}"}
+        elif tipo == 2:
+            operazione = {'op': 'filter', 'tutti': [f"Ingrediente {casuale.randint(0, 500)}"], 'massimo': 60, 'limite': 10}
+        else:
+            operazione = {'op': 'delete', 'nome': f"Ricetta {i - 3}"}
+        righe.append(json.dumps(operazione))
+    return righe
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--operazioni", type=int, default=20_000, help="operazioni nel lotto")
+    parser.add_argument("--processi", type=int, default=10, help="processi lanciati per misurare il costo per invocazione")
+    argomenti = parser.parse_args()
+
+    righe = genera_operazioni(argomenti.operazioni)
+    print(f"{'modalità':<36} {'operazioni/s':>14}")
+    for etichetta, archivio in (("lotto, CatalogoRicette", CatalogoRicette()),
+                                ("lotto, RepositorySQLite su file", None)):
+        with tempfile.TemporaryDirectory() as cartella:
+            if archivio is None:
+                archivio = RepositorySQLite(os.path.join(cartella, "ricette.db"))
+            riepilogo = esegui_lotto(archivio, righe, io.StringIO())
+            if hasattr(archivio, 'chiudi'):
+                archivio.chiudi()
+        assert riepilogo['errori'] == 0, "il lotto di prova non dovrebbe contenere errori"
+        print(f"{etichetta:<36} {riepilogo['operazioni_al_secondo']:>14,}")
+
+    ambiente = dict(os.environ, PYTHONPATH=RADICE)
+    inizio = time.perf_counter()
+    for riga in righe[:argomenti.processi]:
+        operazione = json.loads(riga)
+        comando = [sys.executable, "-m", "ricette", "search", "--nome", operazione.get('nome', "Ricetta")]
+        subprocess.run(comando, check=True, stdout=subprocess.DEVNULL, env=ambiente)
+    secondi = time.perf_counter() - inizio
+    print(f"{'un processo per operazione':<36} {argomenti.processi / secondi:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
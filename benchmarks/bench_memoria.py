@@ -0,0 +1,83 @@
+"""
+Benchmark: memoria occupata dalla lista di dizionari contro l'archivio colonnare.
+
+Costruisce lo stesso insieme di ricette sintetiche in tre forme e misura con
+tracemalloc la memoria allocata da ciascuna:
+    - lista di dizionari (la rappresentazione originale di lista_ricette);
+    - ArchivioColonnare da solo;
+    - CatalogoRicette completo (archivio più indici di nomi, ingredienti e minutaggi).
+
+Gli ingredienti della lista di dizionari sono stringhe allocate di nuovo per ogni
+ricetta, come succede quando i dati vengono letti da un file o dall'input.
+
+Uso:
+    python benchmarks/bench_memoria.py --ricette 200000
+"""
+
+import argparse
+import gc
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # Rende importabile il pacchetto ricette dalla radice del progetto.
+
+from ricette import ArchivioColonnare, CatalogoRicette, lista_ricette                # noqa: E402
+
+
+# Genera le righe come le produrrebbe un parser: ogni ricetta ha le proprie copie delle stringhe.
+def genera_righe(numero, seme=42):
+    casuale = random.Random(seme)
+    vocabolario = sorted({i for ricetta in lista_ricette for i in ricetta['ingredienti']})
+    pesi = [1 / (posizione + 1) for posizione in range(len(vocabolario))]
+    for n in range(numero):
+        ingredienti = dict.fromkeys(casuale.choices(vocabolario, pesi, k=casuale.randint(3, 9)))
+        yield f"Ricetta {n}", [(i + " ")[:-1] for i in ingredienti], casuale.randint(5, 180)  # (i + " ")[:-1] crea una nuova stringa uguale a i.
+
+
+# Misura la memoria ancora allocata dopo aver costruito la struttura restituita da `costruisci`.
+def misura(costruisci):
+    gc.collect()
+    tracemalloc.start()
+    struttura = costruisci()
+    corrente, picco = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del struttura
+    return corrente, picco
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--ricette", type=int, default=200_000, help="numero di ricette sintetiche")
+    argomenti = parser.parse_args()
+    numero = argomenti.ricette
+
+    def lista_di_dizionari():
+        return [{'nome': nome, 'ingredienti': ingredienti, 'minutaggio': minutaggio}
+                for nome, ingredienti, minutaggio in genera_righe(numero)]
+
+    def archivio():
+        archivio = ArchivioColonnare()
+        for nome, ingredienti, minutaggio in genera_righe(numero):
+            archivio.aggiungi(nome, ingredienti, minutaggio)
+        return archivio
+
+    def catalogo():
+        return CatalogoRicette({'nome': nome, 'ingredienti': ingredienti, 'minutaggio': minutaggio}
+                               for nome, ingredienti, minutaggio in genera_righe(numero))
+
+    risultati = [(nome, *misura(funzione)) for nome, funzione in (
+        ("lista di dizionari", lista_di_dizionari),
+        ("ArchivioColonnare", archivio),
+        ("CatalogoRicette (con indici)", catalogo),
+    )]
+    riferimento = risultati[0][1]
+    print(f"{numero} ricette")
+    print(f"{'rappresentazione':<30} {'memoria (MiB)':>14} {'picco (MiB)':>12} {'byte/ricetta':>13} {'rapporto':>9}")
+    for nome, corrente, picco in risultati:
+        print(f"{nome:<30} {corrente / 2**20:>14.1f} {picco / 2**20:>12.1f} {corrente / numero:>13.0f} {corrente / riferimento:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
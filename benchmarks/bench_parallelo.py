@@ -0,0 +1,61 @@
+"""
+Benchmark: statistiche su più processi, da 1 a N lavoratori.
+
+Misura statistiche_parallele() su una lista di ricette sintetiche e sullo stesso
+ricettario esportato in JSONL, con un numero crescente di processi, e le confronta
+con il conteggio seriale di statistiche_ingredienti() (un Counter in un solo
+processo). Controlla anche che tutte le varianti diano gli stessi risultati.
+Il guadagno dipende dai processori disponibili: con un solo processore la versione
+parallela paga solo il costo di avviare i processi.
+
+Uso:
+    python benchmarks/bench_parallelo.py --ricette 1000000 --lavoratori 8
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+from collections import Counter
+
+RADICE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RADICE)                                                           # Rende importabile il pacchetto ricette dalla radice del progetto.
+
+from bench_indice_ingredienti import cronometra, genera_ricette                      # noqa: E402
+from ricette import esporta_file, statistiche_parallele                              # noqa: E402
+
+
+# Il calcolo seriale di riferimento, come in statistiche_ingredienti() e statistiche_durata() su una lista.
+def seriale(ricette):
+    conteggi = Counter()
+    for ricetta in ricette:
+        conteggi.update(ricetta['ingredienti'])
+    minutaggi = [ricetta['minutaggio'] for ricetta in ricette]
+    return conteggi.most_common(5), (min(minutaggi), sum(minutaggi) / len(minutaggi), max(minutaggi))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--ricette", type=int, default=1_000_000, help="numero di ricette sintetiche")
+    parser.add_argument("--lavoratori", type=int, default=os.cpu_count() or 1, help="numero massimo di processi")
+    parser.add_argument("--ripetizioni", type=int, default=3, help="ripetizioni di ogni misura (si riporta la media)")
+    argomenti = parser.parse_args()
+
+    ricette, _ = genera_ricette(argomenti.ricette)
+    tempo_seriale, atteso = cronometra(lambda: seriale(ricette), argomenti.ripetizioni)
+    print(f"{argomenti.ricette:,} ricette, {os.cpu_count()} processori")
+    print(f"{'sorgente':<10} {'lavoratori':>10} {'secondi':>10} {'rispetto al seriale':>20}")
+    print(f"{'lista':<10} {'seriale':>10} {tempo_seriale:>10.3f} {1:>19.2f}x")
+
+    with tempfile.TemporaryDirectory() as cartella:
+        percorso = os.path.join(cartella, "ricette.jsonl")
+        esporta_file(ricette, percorso)
+        for etichetta, sorgente in (("lista", ricette), ("jsonl", percorso)):
+            for lavoratori in range(1, argomenti.lavoratori + 1):
+                secondi, risultato = cronometra(lambda: statistiche_parallele(sorgente, lavoratori), argomenti.ripetizioni)
+                assert (risultato.piu_comuni(5), risultato.durata()) == atteso, f"risultati diversi con {etichetta}, {lavoratori} processi"
+                print(f"{etichetta:<10} {lavoratori:>10} {secondi:>10.3f} {tempo_seriale / secondi:>19.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Benchmark: prova di carico del servizio HTTP/JSON su localhost.
+
+Avvia `python -m ricette serve` in un processo separato su un archivio di ricette
+sintetiche, poi apre molte connessioni keep-alive che inviano per un certo tempo un
+misto di ricerche per nome, filtri, statistiche e (in piccola parte) aggiunte ed
+eliminazioni. Riporta le richieste al secondo e le latenze p50/p99, in totale e per
+operazione. Il client gira in un solo processo Python: con molte connessioni può
+essere lui il collo di bottiglia.
+
+Uso:
+    python benchmarks/bench_servizio.py --ricette 100000 --connessioni 32 --secondi 10
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from urllib.parse import quote
+
+RADICE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RADICE)                                                           # Rende importabile il pacchetto ricette dalla radice del progetto.
+
+from bench_indice_ingredienti import genera_ricette                                  # noqa: E402
+from ricette import esporta_file                                                     # noqa: E402
+
+
+# Trova una porta libera su localhost.
+def porta_libera():
+    with socket.socket() as prova:
+        prova.bind(("127.0.0.1", 0))
+        return prova.getsockname()[1]
+
+
+# Invia una richiesta e legge la risposta (con Content-Length o a blocchi); restituisce lo stato.
+async def richiesta(lettore, scrittore, metodo, percorso, corpo=None):
+    dati = b"" if corpo is None else json.dumps(corpo).encode("utf-8")
+    scrittore.write(f"{metodo} {percorso} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(dati)}\r\n\r\n".encode() + dati)
+    intestazione = (await lettore.readuntil(b"\r\n\r\n")).decode("latin-1").lower()
+    stato = int(intestazione.split(" ", 2)[1])
+    if "transfer-encoding: chunked" in intestazione:
+        while True:
+            lunghezza = int((await lettore.readuntil(b"\r\n"))[:-2], 16)
+            await lettore.readexactly(lunghezza + 2)
+            if not lunghezza:
+                break
+    else:
+        lunghezza = int(intestazione.split("content-length:", 1)[1].split("\r\n", 1)[0])
+        await lettore.readexactly(lunghezza)
+    return stato
+
+
+# Sceglie la prossima richiesta secondo il misto di operazioni.
+def prossima_richiesta(casuale, vocabolario, numero_ricette, quota_scritture, aggiunte):
+    tiro = casuale.random()
+    if tiro < quota_scritture / 2:
+        nome = f"Nuova {casuale.random()}"
+        aggiunte.append(nome)
+        return "add", "POST", "/add", {'nome': nome, 'ingredienti': casuale.sample(vocabolario[:200], 4), 'minutaggio': 30}
+    if tiro < quota_scritture:
+        nome = aggiunte.pop() if aggiunte else "Nessuna"
+        return "delete", "POST", "/delete", {'nome': nome}
+    tiro = casuale.random()
+    if tiro < 0.45:
+        return "search", "GET", f"/search?nome={quote(f'Ricetta {casuale.randrange(numero_ricette)}')}", None
+    if tiro < 0.9:
+        ingrediente = quote(casuale.choice(vocabolario[:300]))
+        return "filter", "GET", f"/filter?tutti={ingrediente}&massimo=60&ordina_per=minutaggio&limite=10", None
+    return "stats", "GET", "/stats", None
+
+
+# Una connessione keep-alive che invia richieste fino alla scadenza, registrando le latenze.
+async def client(porta, scadenza, seme, vocabolario, numero_ricette, quota_scritture, latenze, errori):
+    casuale = random.Random(seme)
+    aggiunte = []
+    lettore, scrittore = await asyncio.open_connection("127.0.0.1", porta)
+    while time.perf_counter() < scadenza:
+        operazione, metodo, percorso, corpo = prossima_richiesta(casuale, vocabolario, numero_ricette, quota_scritture, aggiunte)
+        inizio = time.perf_counter()
+        stato = await richiesta(lettore, scrittore, metodo, percorso, corpo)
+        latenze.setdefault(operazione, []).append(time.perf_counter() - inizio)
+        if stato != 200 and operazione != "delete":
+            errori.append((operazione, stato))
+    scrittore.close()
+
+
+def percentile(valori, quota):
+    valori = sorted(valori)
+    return valori[min(len(valori) - 1, int(quota * len(valori)))]
+
+
+async def carico(argomenti, porta, vocabolario):
+    latenze, errori = {}, []
+    scadenza = time.perf_counter() + argomenti.secondi
+    inizio = time.perf_counter()
+    await asyncio.gather(*(client(porta, scadenza, seme, vocabolario, argomenti.ricette, argomenti.scritture, latenze, errori)
+                           for seme in range(argomenti.connessioni)))
+    return latenze, errori, time.perf_counter() - inizio
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--ricette", type=int, default=100_000, help="numero di ricette sintetiche")
+    parser.add_argument("--connessioni", type=int, default=32, help="connessioni keep-alive concorrenti")
+    parser.add_argument("--secondi", type=float, default=10, help="durata della prova")
+    parser.add_argument("--scritture", type=float, default=0.02, help="quota di richieste che sono aggiunte o eliminazioni")
+    argomenti = parser.parse_args()
+
+    ricette, vocabolario = genera_ricette(argomenti.ricette)
+    with tempfile.TemporaryDirectory() as cartella:
+        archivio = os.path.join(cartella, "ricette.jsonl")
+        esporta_file(ricette, archivio)
+        porta = porta_libera()
+        server = subprocess.Popen([sys.executable, "-m", "ricette", "-a", archivio, "serve", "--porta", str(porta)],
+                                  env=dict(os.environ, PYTHONPATH=RADICE), stderr=subprocess.PIPE, text=True)
+        try:
+            server.stderr.readline()                                                    # "In ascolto su ...": il catalogo è caricato.
+            latenze, errori, secondi = asyncio.run(carico(argomenti, porta, vocabolario))
+        finally:
+            server.terminate()
+            server.wait()
+
+    tutte = [latenza for valori in latenze.values() for latenza in valori]
+    print(f"{len(tutte)} richieste da {argomenti.connessioni} connessioni in {secondi:.1f} s: "
+          f"{len(tutte) / secondi:,.0f} richieste/s, {len(errori)} errori")
+    print(f"{'operazione':<12} {'richieste':>10} {'p50 (ms)':>10} {'p99 (ms)':>10}")
+    for operazione, valori in sorted(latenze.items()) + [("totale", tutte)]:
+        print(f"{operazione:<12} {len(valori):>10} {percentile(valori, 0.5) * 1000:>10.2f} {percentile(valori, 0.99) * 1000:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
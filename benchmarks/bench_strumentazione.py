@@ -0,0 +1,63 @@
+"""
+Benchmark: costo della strumentazione sulle operazioni, a metriche spente, accese e con profilo.
+
+Misura alcune operazioni strumentate (ricerca per nome e per minutaggio, filtro con
+un'Interrogazione, statistiche sulla durata) su un catalogo sintetico chiamando la
+funzione originale (__wrapped__), la funzione decorata con le metriche spente, con le
+metriche accese e con profilo cProfile e picco di memoria tracemalloc. Alla fine
+stampa le metriche raccolte nel formato di Prometheus.
+
+Uso:
+    python benchmarks/bench_strumentazione.py --ricette 100000 --ripetizioni 2000
+"""
+
+import argparse
+import io
+import os
+import sys
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # Rende importabile il pacchetto ricette dalla radice del progetto.
+
+from bench_indice_ingredienti import cronometra, genera_ricette                      # noqa: E402
+from ricette import CatalogoRicette, interroga, metriche, statistiche_durata, trova_ricette  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--ricette", type=int, default=100_000, help="numero di ricette sintetiche")
+    parser.add_argument("--ripetizioni", type=int, default=2000, help="chiamate per ogni misura")
+    argomenti = parser.parse_args()
+
+    ricette, vocabolario = genera_ricette(argomenti.ricette)
+    catalogo = CatalogoRicette(ricette)
+    operazioni = {
+        "cerca per nome": (trova_ricette, lambda funzione: funzione(catalogo, nome="ta 12")),
+        "cerca per minutaggio": (trova_ricette, lambda funzione: funzione(catalogo, minutaggio=45)),
+        "filtra (10 ricette)": (interroga, lambda funzione: list(funzione(catalogo, tutti=[vocabolario[0]], massimo=30, limite=10))),
+        "statistiche_durata": (statistiche_durata, lambda funzione: funzione(catalogo)),
+    }
+    modalita = (("spente", None), ("accese", {}), ("profilo", {'profilo': True, 'memoria': True}))
+
+    print(f"{'operazione':<24} {'originale':>12} " + " ".join(f"{nome:>18}" for nome, _ in modalita))
+    with redirect_stdout(io.StringIO()):                                                # statistiche_durata() stampa: si misura senza terminale.
+        righe = []
+        for nome, (funzione, chiamata) in operazioni.items():
+            originale = cronometra(lambda: chiamata(funzione.__wrapped__), argomenti.ripetizioni)[0]
+            colonne = []
+            for _, opzioni in modalita:
+                if opzioni is None:
+                    metriche.disabilita()
+                else:
+                    metriche.abilita(**opzioni)
+                secondi = cronometra(lambda: chiamata(funzione), argomenti.ripetizioni)[0]
+                colonne.append(f"{secondi * 1e6:>9.2f} us ({secondi / originale:4.2f}x)")
+            righe.append(f"{nome:<24} {originale * 1e6:>9.2f} us " + " ".join(colonne))
+        metriche.disabilita()
+    print("\n".join(righe))
+    print()
+    print(metriche.esporta_prometheus())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""
+Benchmark: suite completa su ricettari sintetici di dimensione crescente, con baseline.
+
+Per ogni dimensione genera un ricettario sintetico (vedi sintetiche.py: ingredienti con
+frequenze di Zipf, sempre lo stesso a parità di seme) e misura, sia su una lista semplice
+sia su un CatalogoRicette, le funzioni che usa l'utente: aggiungi_ricetta() ed
+elimina_ricetta(), cerca_ricette() per nome, ingrediente e minutaggio, i due
+filtraggio_avanzato() e tutte le funzioni di statistiche. Le funzioni interattive
+ricevono le risposte da un input() simulato e stampano su os.devnull, così si misura
+anche il costo della stampa. Ogni operazione viene ripetuta finché non esaurisce il
+tempo a disposizione (almeno una volta); poi una chiamata in più sotto tracemalloc
+misura il picco di memoria allocata.
+
+I risultati si possono salvare come baseline in un file JSON e confrontare con una
+baseline precedente: le operazioni più lente (o con un picco di memoria più alto) della
+tolleranza indicata vengono segnalate e il programma esce con codice 1.
+
+Uso:
+    python benchmarks/bench_suite.py --ricette 1000 10000 100000 --salva baseline.json
+    python benchmarks/bench_suite.py --ricette 1000 10000 100000 --confronta baseline.json --tolleranza 0.25
+    python benchmarks/bench_suite.py --ricette 10000000 --sorgenti catalogo --operazioni cerca_ricette[nome]
+"""
+
+import argparse
+import builtins
+import json
+import os
+import platform
+import resource
+import statistics
+import sys
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager, redirect_stdout
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))   # Rende importabile il pacchetto ricette dalla radice del progetto.
+
+from ricette import (CatalogoRicette, aggiungi_ricetta, cerca_ricette, durata_in_flusso, elimina_ricetta,  # noqa: E402
+                     filtraggio_avanzato, filtraggio_avanzato2, ingrediente_frequenza, ricetta_con_piu_ingredienti,
+                     ricetta_con_piu_minutaggio, statistiche_durata, statistiche_ingredienti)
+from sintetiche import PIATTI, genera_ricette, vocabolario                           # noqa: E402
+
+SORGENTI = ("lista", "catalogo")
+SOGLIA_MEMORIA = 64 * 1024                                                          # Sotto questi byte le differenze di picco sono rumore.
+
+
+# Sostituisce input() con una coda di risposte e manda la stampa su os.devnull.
+@contextmanager
+def senza_terminale():
+    risposte = deque()
+    originale = builtins.input
+    builtins.input = lambda messaggio="": risposte.popleft()
+    try:
+        with open(os.devnull, "w") as uscita, redirect_stdout(uscita):
+            yield risposte
+    finally:
+        builtins.input = originale
+
+
+# Prepara le operazioni da misurare: per ciascuna, una funzione che esegue una chiamata.
+def operazioni(ricettario, numero, risposte):
+    parole = vocabolario(numero)
+    rari = len(parole) // 2                                                          # Un ingrediente a metà della coda della Zipf.
+    ingredienti = [parole[0], parole[3], parole[20], parole[rari]]
+    nomi = [f"{PIATTI[0]} di {parole[0]}", f"{PIATTI[5]} di {parole[3]}", f"{PIATTI[9]} di {parole[20]}"]
+    aggiunte = deque()                                                               # Nomi aggiunti da aggiungi_ricetta(), che elimina_ricetta() poi cancella.
+    contatore = iter(range(10**9))
+
+    # Ogni chiamata sceglie il criterio successivo, così si mescolano ingredienti comuni e rari.
+    def a_turno(valori):
+        turno = iter(range(10**9))
+        return lambda: valori[next(turno) % len(valori)]
+
+    def aggiungi():
+        nome = f"Ricetta nuova {next(contatore)}"
+        aggiunte.append(nome)
+        risposte.extend([nome, f"{parole[1]}, {parole[7]}, {parole[rari + 1]}", "25"])
+        aggiungi_ricetta(ricettario)
+
+    def elimina():
+        risposte.append(aggiunte.popleft())
+        elimina_ricetta(ricettario)
+
+    nome, ingrediente, minutaggio = a_turno(nomi), a_turno(ingredienti), a_turno([30, 45, 90])
+    massimo, coppia = a_turno([20, 45]), a_turno([(parole[0], parole[1]), (parole[2], parole[20]), (parole[3], parole[rari])])
+
+    def filtra():
+        risposte.extend([str(massimo()), ingrediente()])
+        filtraggio_avanzato(ricettario)
+
+    def filtra2():
+        risposte.extend(coppia())
+        filtraggio_avanzato2(ricettario)
+
+    def frequenza():
+        risposte.append(ingrediente())
+        ingrediente_frequenza(ricettario)
+
+    return {
+        "aggiungi_ricetta": aggiungi,
+        "elimina_ricetta": elimina,
+        "cerca_ricette[nome]": lambda: cerca_ricette(ricettario, nome=nome()),
+        "cerca_ricette[ingrediente]": lambda: cerca_ricette(ricettario, ingrediente=ingrediente()),
+        "cerca_ricette[minutaggio]": lambda: cerca_ricette(ricettario, minutaggio=minutaggio()),
+        "filtraggio_avanzato": filtra,
+        "filtraggio_avanzato2": filtra2,
+        "ingrediente_frequenza": frequenza,
+        "ricetta_con_piu_ingredienti": lambda: ricetta_con_piu_ingredienti(ricettario),
+        "ricetta_con_piu_minutaggio": lambda: ricetta_con_piu_minutaggio(ricettario),
+        "statistiche_ingredienti": lambda: statistiche_ingredienti(ricettario),
+        "statistiche_durata": lambda: statistiche_durata(ricettario),
+        "durata_in_flusso": lambda: durata_in_flusso(ricettario),
+    }, aggiunte
+
+
+# Ripete la chiamata finché non passano `secondi` (almeno una volta, al più `massimo` volte) e restituisce i tempi.
+def cronometra(chiamata, secondi, massimo):
+    tempi = []
+    inizio = time.perf_counter()
+    while not tempi or (len(tempi) < massimo and time.perf_counter() - inizio < secondi):
+        partenza = time.perf_counter()
+        chiamata()
+        tempi.append(time.perf_counter() - partenza)
+    return tempi
+
+
+# Esegue la chiamata una volta sotto tracemalloc e restituisce i byte allocati in più al picco.
+def picco_memoria(chiamata):
+    tracemalloc.start()
+    try:
+        iniziale = tracemalloc.get_traced_memory()[0]
+        chiamata()
+        return tracemalloc.get_traced_memory()[1] - iniziale
+    finally:
+        tracemalloc.stop()
+
+
+# Riassume i tempi di un'operazione nel formato della baseline.
+def misura(tempi, numero, picco):
+    mediana = statistics.median(tempi)
+    return {'secondi': mediana, 'chiamate': len(tempi), 'al_secondo': 1 / mediana if mediana else float('inf'),
+            'ricette_al_secondo': numero / mediana if mediana else float('inf'), 'picco_byte': picco}
+
+
+# Misura tutte le operazioni scelte su un ricettario di `numero` ricette.
+def esegui(numero, argomenti, scelte):
+    risultati = {}
+    inizio = time.perf_counter()
+    if "lista" in argomenti.sorgenti:
+        ricette = list(genera_ricette(numero, argomenti.seme))
+        generazione = time.perf_counter() - inizio
+        costruisci = lambda: CatalogoRicette(ricette)                                    # noqa: E731
+    else:
+        ricette, generazione = None, None                                                # Solo catalogo: le ricette arrivano in flusso dal generatore.
+        costruisci = lambda: CatalogoRicette(genera_ricette(numero, argomenti.seme))     # noqa: E731
+
+    sorgenti = {}
+    if "catalogo" in argomenti.sorgenti:
+        partenza = time.perf_counter()
+        sorgenti["catalogo"] = costruisci()
+        secondi = time.perf_counter() - partenza
+        picco = picco_memoria(costruisci) if argomenti.memoria else None
+        risultati[f"{numero}/catalogo/costruzione"] = misura([secondi], numero, picco)
+    if ricette is not None:
+        sorgenti["lista"] = ricette
+        risultati[f"{numero}/lista/generazione"] = misura([generazione], numero, None)
+
+    with senza_terminale() as risposte:
+        for sorgente, ricettario in sorgenti.items():
+            chiamate, aggiunte = operazioni(ricettario, numero, risposte)
+            for nome in scelte:
+                massimo = argomenti.massimo
+                if nome == "elimina_ricetta":                                            # Cancella solo ciò che ha aggiunto aggiungi_ricetta(), tenendone uno per tracemalloc.
+                    massimo = len(aggiunte) - bool(argomenti.memoria)
+                    if massimo < 1:
+                        continue
+                tempi = cronometra(chiamate[nome], argomenti.secondi, massimo)
+                picco = picco_memoria(chiamate[nome]) if argomenti.memoria else None
+                risultati[f"{numero}/{sorgente}/{nome}"] = misura(tempi, numero, picco)
+                risposte.clear()
+            while aggiunte:                                                              # Riporta il ricettario com'era, fuori dalle misure.
+                chiamate["elimina_ricetta"]()
+    return risultati
+
+
+# Confronta i risultati con una baseline e restituisce le righe delle regressioni.
+def confronta(risultati, baseline, tolleranza):
+    regressioni = []
+    for chiave, attuale in risultati.items():
+        precedente = baseline.get(chiave)
+        if precedente is None:
+            continue
+        rapporto = attuale['secondi'] / precedente['secondi'] if precedente['secondi'] else 1.0
+        if rapporto > 1 + tolleranza:
+            regressioni.append(f"{chiave}: {precedente['secondi'] * 1000:.3f} -> {attuale['secondi'] * 1000:.3f} ms ({rapporto:.2f}x)")
+        prima, dopo = precedente.get('picco_byte'), attuale.get('picco_byte')
+        if prima is not None and dopo is not None and dopo > max(prima * (1 + tolleranza), prima + SOGLIA_MEMORIA):
+            regressioni.append(f"{chiave}: picco di memoria {prima / 1024:.0f} -> {dopo / 1024:.0f} KiB")
+    return regressioni
+
+
+# Stampa una riga per operazione: tempo mediano, chiamate al secondo, ricette al secondo e picco di memoria.
+def stampa(risultati):
+    print(f"{'operazione':<46} {'ms/chiamata':>12} {'chiamate/s':>12} {'ricette/s':>14} {'picco KiB':>10}")
+    for chiave, risultato in risultati.items():
+        picco = "-" if risultato['picco_byte'] is None else f"{risultato['picco_byte'] / 1024:.0f}"
+        print(f"{chiave:<46} {risultato['secondi'] * 1000:>12.3f} {risultato['al_secondo']:>12,.1f} "
+              f"{risultato['ricette_al_secondo']:>14,.0f} {picco:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--ricette", type=int, nargs="+", default=[1_000, 10_000, 100_000], help="dimensioni dei ricettari (fino a 10^7)")
+    parser.add_argument("--sorgenti", nargs="+", choices=SORGENTI, default=list(SORGENTI), help="lista semplice, CatalogoRicette o entrambi")
+    parser.add_argument("--operazioni", nargs="+", help="misura solo queste operazioni (default: tutte)")
+    parser.add_argument("--seme", type=int, default=42, help="seme del generatore")
+    parser.add_argument("--secondi", type=float, default=0.5, help="tempo a disposizione di ogni operazione")
+    parser.add_argument("--massimo", type=int, default=1000, help="numero massimo di chiamate per operazione")
+    parser.add_argument("--senza-memoria", dest="memoria", action="store_false", help="non misura il picco di memoria con tracemalloc")
+    parser.add_argument("--salva", help="file JSON dove salvare i risultati come baseline")
+    parser.add_argument("--confronta", help="baseline JSON con cui confrontare i risultati")
+    parser.add_argument("--tolleranza", type=float, default=0.25, help="rallentamento relativo oltre il quale c'è una regressione")
+    argomenti = parser.parse_args()
+
+    tutte = list(operazioni([], 0, deque())[0])
+    scelte = argomenti.operazioni or tutte
+    sconosciute = set(scelte) - set(tutte)
+    if sconosciute:
+        parser.error(f"operazioni sconosciute: {', '.join(sorted(sconosciute))} (disponibili: {', '.join(tutte)})")
+    if "elimina_ricetta" in scelte and "aggiungi_ricetta" in scelte:
+        scelte = [nome for nome in tutte if nome in scelte]                              # elimina_ricetta() deve seguire aggiungi_ricetta().
+
+    risultati = {}
+    for numero in argomenti.ricette:
+        risultati.update(esegui(numero, argomenti, scelte))
+    stampa(risultati)
+    print(f"picco di memoria del processo: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MiB")
+
+    if argomenti.salva:
+        with open(argomenti.salva, "w", encoding="utf-8") as file:
+            json.dump({'python': platform.python_version(), 'piattaforma': platform.platform(), 'seme': argomenti.seme,
+                       'risultati': risultati}, file, indent=2)
+        print(f"baseline salvata in {argomenti.salva}")
+    if argomenti.confronta:
+        with open(argomenti.confronta, encoding="utf-8") as file:
+            baseline = json.load(file)
+        regressioni = confronta(risultati, baseline['risultati'], argomenti.tolleranza)
+        for riga in regressioni:
+            print(f"REGRESSIONE {riga}")
+        print(f"{len(regressioni)} regressioni rispetto a {argomenti.confronta} (tolleranza {argomenti.tolleranza:.0%})")
+        if regressioni:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
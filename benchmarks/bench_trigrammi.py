@@ -0,0 +1,61 @@
+"""
+Benchmark: ricerca per sottostringa con l'indice dei trigrammi contro scansione lineare.
+
+Confronta il tempo medio di una ricerca per parte del nome o dell'ingrediente eseguita
+scorrendo tutta la lista (come fa cerca_ricette su una lista semplice) con quello della
+stessa ricerca risolta da CatalogoRicette con l'indice dei trigrammi.
+
+Uso:
+    python benchmarks/bench_trigrammi.py --ricette 100000 --ripetizioni 20
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # Rende importabile il pacchetto ricette dalla radice del progetto.
+
+from bench_indice_ingredienti import cronometra, genera_ricette                      # noqa: E402
+from ricette import CatalogoRicette                                                  # noqa: E402
+
+
+# Scansioni lineari equivalenti ai controlli di cerca_ricette().
+def nomi_lineare(ricette, testo):
+    testo = testo.lower()
+    return {n for n, ricetta in enumerate(ricette) if testo in ricetta['nome'].lower()}
+
+
+def ingredienti_lineare(ricette, testo):
+    testo = testo.lower()
+    return {n for n, ricetta in enumerate(ricette) if any(testo in i.lower() for i in ricetta['ingredienti'])}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--ricette", type=int, default=100_000, help="numero di ricette sintetiche")
+    parser.add_argument("--ripetizioni", type=int, default=20, help="ripetizioni per ogni ricerca")
+    argomenti = parser.parse_args()
+
+    ricette, _ = genera_ricette(argomenti.ricette)
+    inizio = time.perf_counter()
+    catalogo = CatalogoRicette(ricette, alias={})                                      # Senza sinonimi, per confrontare i risultati con la scansione lineare.
+    print(f"Costruzione del catalogo su {len(ricette)} ricette: {time.perf_counter() - inizio:.3f} s")
+
+    ricerche = [
+        ('nome', "ricetta 4242", nomi_lineare, catalogo.id_con_nome_simile),            # Pochi nomi la contengono.
+        ('nome', "ta 9", nomi_lineare, catalogo.id_con_nome_simile),                    # Molti nomi la contengono.
+        ('ingrediente', "pomod", ingredienti_lineare, catalogo.ricette_con_ingrediente_simile),
+        ('ingrediente', "iente 17", ingredienti_lineare, catalogo.ricette_con_ingrediente_simile),
+    ]
+    print(f"{'ricerca':<40} {'lineare (ms)':>14} {'trigrammi (ms)':>15} {'speedup':>9}")
+    for campo, testo, lineare, indicizzata in ricerche:
+        t_lineare, attesi = cronometra(lambda: lineare(ricette, testo), argomenti.ripetizioni)
+        t_indice, ottenuti = cronometra(lambda: indicizzata(testo), argomenti.ripetizioni)
+        assert attesi == ottenuti, "l'indice restituisce risultati diversi dalla scansione lineare"
+        etichetta = f"{campo} ~ '{testo}' ({len(attesi)})"
+        print(f"{etichetta:<40} {t_lineare * 1000:>14.2f} {t_indice * 1000:>15.3f} {t_lineare / t_indice:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
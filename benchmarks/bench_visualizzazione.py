@@ -0,0 +1,70 @@
+"""
+Benchmark: stampa di molte ricette con print() riga per riga contro scrittura bufferizzata.
+
+Confronta il tempo per mostrare tutte le ricette con quattro print() per ricetta (come
+faceva visualizza_ricette) con quello di scrivi_ricette(), che scrive un blocco di
+ricette con una sola write(), nel formato esteso e in quello compatto. L'output va su
+os.devnull con buffer di riga, come su un terminale (ogni a capo svuota il buffer), o
+con il buffer predefinito, come su un file o una pipe.
+
+Uso:
+    python benchmarks/bench_visualizzazione.py --ricette 100000 --ripetizioni 3
+"""
+
+import argparse
+import io
+import os
+import sys
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # Rende importabile il pacchetto ricette dalla radice del progetto.
+
+from bench_indice_ingredienti import cronometra, genera_ricette                      # noqa: E402
+from ricette import CatalogoRicette, rendi_ricette, scrivi_ricette                   # noqa: E402
+
+
+# Versione originale di visualizza_ricette(): quattro print() per ricetta.
+def stampa_riga_per_riga(ricette):
+    for ricetta in ricette:
+        print(f"Nome: {ricetta['nome']}")
+        print(f"Ingredienti: {', '.join(ricetta['ingredienti'])}")
+        print(f"Minutaggio: {ricetta['minutaggio']} minuti")
+        print("-" * 40)
+
+
+# Esegue una funzione con sys.stdout rediretto su os.devnull, con il buffer indicato.
+def su_devnull(funzione, buffering):
+    with open(os.devnull, "w", buffering=buffering) as uscita, redirect_stdout(uscita):
+        funzione()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--ricette", type=int, default=100_000, help="numero di ricette sintetiche")
+    parser.add_argument("--ripetizioni", type=int, default=3, help="ripetizioni per ogni misura")
+    argomenti = parser.parse_args()
+
+    ricette, _ = genera_ricette(argomenti.ricette)
+    catalogo = CatalogoRicette(ricette, alias={})
+
+    atteso = io.StringIO()                                                              # L'output bufferizzato deve essere identico a quello delle print().
+    with redirect_stdout(atteso):
+        stampa_riga_per_riga(catalogo)
+    assert rendi_ricette(catalogo) == atteso.getvalue(), "il formato esteso è diverso da quello di visualizza_ricette"
+
+    metodi = [
+        ("print() riga per riga", lambda: stampa_riga_per_riga(catalogo)),
+        ("scrivi_ricette, esteso", lambda: scrivi_ricette(catalogo)),
+        ("scrivi_ricette, compatto", lambda: scrivi_ricette(catalogo, formato='compatto')),
+        ("scrivi_ricette, pagina 3 da 50", lambda: scrivi_ricette(catalogo, pagina=3, per_pagina=50)),
+    ]
+    print(f"Output di {len(catalogo)} ricette ({len(atteso.getvalue()) / 1e6:.1f} MB nel formato esteso)")
+    print(f"{'metodo':<32} {'terminale (ms)':>15} {'file/pipe (ms)':>15}")
+    for etichetta, funzione in metodi:
+        t_terminale, _ = cronometra(lambda: su_devnull(funzione, 1), argomenti.ripetizioni)
+        t_file, _ = cronometra(lambda: su_devnull(funzione, -1), argomenti.ripetizioni)
+        print(f"{etichetta:<32} {t_terminale * 1000:>15.1f} {t_file * 1000:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
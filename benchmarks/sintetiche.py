@@ -0,0 +1,76 @@
+"""
+Generatore di ricettari sintetici riproducibili, da 10^3 a 10^7 ricette.
+
+Le frequenze degli ingredienti seguono una legge di Zipf (l'ingrediente di rango r
+compare con probabilità proporzionale a 1 / r ** esponente), come negli archivi reali:
+pochi ingredienti comunissimi (sale, olio, aglio...) e una lunga coda di ingredienti
+rari. Il vocabolario cresce con la radice del numero di ricette (legge di Heaps) e parte
+dagli ingredienti delle ricette di esempio, i più comuni. I minutaggi hanno una
+distribuzione log-normale (mediana intorno ai 30 minuti) e i nomi sono unici.
+
+Le ricette vengono generate una alla volta, quindi la memoria usata dal generatore non
+dipende dal numero di ricette: CatalogoRicette(genera_ricette(10**7)) non tiene mai
+in memoria la lista dei dizionari.
+
+Uso:
+    from sintetiche import genera_ricette, vocabolario
+    python benchmarks/sintetiche.py --ricette 1000000 --uscita ricette.jsonl
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+from bisect import bisect_left
+from collections import Counter
+from itertools import accumulate
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))   # Rende importabile il pacchetto ricette dalla radice del progetto.
+
+from ricette import esporta_file, lista_ricette                                      # noqa: E402
+
+PIATTI = ("Torta", "Zuppa", "Risotto", "Insalata", "Pasta", "Crema", "Sformato", "Frittata", "Vellutata",
+          "Spiedini", "Polpette", "Crostata", "Involtini", "Stufato", "Tortino", "Focaccia", "Gratin", "Lasagne")
+ESPONENTE = 1.0                                                                     # Esponente della legge di Zipf.
+
+
+# Restituisce il vocabolario per un ricettario di `numero` ricette, dal più comune al più raro.
+def vocabolario(numero):
+    frequenze = Counter(ingrediente for ricetta in lista_ricette for ingrediente in ricetta['ingredienti'])
+    comuni = [ingrediente for ingrediente, _ in frequenze.most_common()]             # In testa quelli più usati negli esempi.
+    dimensione = max(len(comuni), int(30 * math.sqrt(numero)))                       # Legge di Heaps: circa 950 ingredienti per 10^3 ricette, 95.000 per 10^7.
+    return comuni + [f"Ingrediente {n}" for n in range(dimensione - len(comuni))]
+
+
+# Genera `numero` ricette sintetiche, sempre le stesse a parità di seme.
+def genera_ricette(numero, seme=42, esponente=ESPONENTE):
+    casuale = random.Random(seme)
+    ingredienti = vocabolario(numero)
+    cumulati = list(accumulate(1 / rango ** esponente for rango in range(1, len(ingredienti) + 1)))
+    totale = cumulati[-1]
+    for n in range(numero):
+        quanti = min(3 + int(casuale.expovariate(1 / 4)), 15)                           # Da 3 a 15 ingredienti, in media circa 7.
+        scelti = {}
+        for _ in range(quanti * 4):                                                     # Con la testa della Zipf i doppioni sono frequenti: riprova, con un limite.
+            scelti[ingredienti[bisect_left(cumulati, casuale.random() * totale)]] = None
+            if len(scelti) == quanti:
+                break
+        scelti = list(scelti)
+        minutaggio = max(1, min(600, round(casuale.lognormvariate(math.log(30), 0.7))))
+        yield {'nome': f"{casuale.choice(PIATTI)} di {scelti[0]} {n}", 'ingredienti': scelti, 'minutaggio': minutaggio}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--ricette", type=int, default=100_000, help="numero di ricette sintetiche")
+    parser.add_argument("--seme", type=int, default=42, help="seme del generatore")
+    parser.add_argument("--esponente", type=float, default=ESPONENTE, help="esponente della legge di Zipf")
+    parser.add_argument("--uscita", required=True, help="file JSONL o CSV da scrivere")
+    argomenti = parser.parse_args()
+    rapporto = esporta_file(genera_ricette(argomenti.ricette, argomenti.seme, argomenti.esponente), argomenti.uscita)
+    print(f"{rapporto.scritte:,} ricette scritte in {argomenti.uscita} in {rapporto.secondi:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
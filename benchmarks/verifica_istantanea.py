@@ -0,0 +1,77 @@
+"""
+Verifica del round-trip dell'istantanea binaria, anche dopo una modifica.
+
+Salva un catalogo di ricette sintetiche (con qualche eliminazione) come istantanea, la
+rilegge e la confronta con il catalogo di partenza; poi applica le stesse aggiunte ed
+eliminazioni ai due cataloghi (l'istantanea si scongela alla prima modifica), li
+confronta di nuovo, salva il catalogo modificato, lo rilegge e lo confronta ancora.
+Ogni differenza solleva ValueError (niente assert: il controllo vale anche con python -O).
+
+Uso:
+    python benchmarks/verifica_istantanea.py --ricette 5000 --seme 1
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+
+RADICE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RADICE)                                                           # Rende importabile il pacchetto ricette dalla radice del progetto.
+
+from bench_indice_ingredienti import genera_ricette                                  # noqa: E402
+from bench_istantanea import controlla, nomi, verifica                                # noqa: E402
+from ricette import CatalogoRicette, carica_istantanea, salva_istantanea             # noqa: E402
+
+
+# Applica a un catalogo le aggiunte e le eliminazioni indicate, nell'ordine.
+def modifica(catalogo, aggiunte, eliminate):
+    for ricetta in aggiunte:
+        catalogo.append(dict(ricetta))
+    for nome in eliminate:
+        catalogo.elimina_id(catalogo.id_per_nome(nome))
+
+
+# Confronta anche quello che verifica() non guarda: ordine di prima comparsa degli ingredienti e ricerca per nome esatto.
+def verifica_completa(catalogo, caricato, vocabolario, cosa):
+    verifica(catalogo, caricato, vocabolario)
+    controlla(caricato.statistiche.piu_comuni(len(vocabolario)), catalogo.statistiche.piu_comuni(len(vocabolario)), f"{cosa}: classifica completa")
+    controlla(nomi(caricato.trova_per_nome(ricetta['nome']) for ricetta in catalogo), nomi(catalogo), f"{cosa}: ricerca per nome")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--ricette", type=int, default=5000, help="numero di ricette sintetiche")
+    parser.add_argument("--seme", type=int, default=1, help="seme di ricette, eliminazioni e modifiche")
+    argomenti = parser.parse_args()
+
+    casuale = random.Random(argomenti.seme)
+    ricette, vocabolario = genera_ricette(argomenti.ricette, argomenti.seme)
+    catalogo = CatalogoRicette(ricette)
+    for ricetta in casuale.sample(ricette, len(ricette) // 10):                         # Lapidi, che l'istantanea non scrive.
+        catalogo.remove(catalogo.trova_per_nome(ricetta['nome']))
+
+    with tempfile.TemporaryDirectory() as cartella:
+        percorso = os.path.join(cartella, "ricette.istantanea")
+        salva_istantanea(catalogo, percorso)
+        caricato = carica_istantanea(percorso)
+        verifica_completa(catalogo, caricato, vocabolario, "istantanea riletta")
+
+        aggiunte = [{'nome': f"Nuova {n}", 'ingredienti': [casuale.choice(vocabolario), f"Ingrediente nuovo {n}"], 'minutaggio': n + 1}
+                    for n in range(50)]
+        eliminate = casuale.sample(nomi(catalogo), len(catalogo) // 20) + ["Nuova 7"]  # Anche una ricetta aggiunta dopo il caricamento.
+        modifica(catalogo, aggiunte, eliminate)
+        modifica(caricato, aggiunte, eliminate)
+        controlla(caricato._istantanea, None, "istantanea dopo la modifica (dovrebbe essere scongelata)")
+        verifica_completa(catalogo, caricato, vocabolario, "istantanea modificata")
+
+        seconda = os.path.join(cartella, "modificata.istantanea")
+        salva_istantanea(caricato, seconda)
+        verifica_completa(catalogo, carica_istantanea(seconda), vocabolario, "istantanea modificata e riletta")
+
+    print(f"round-trip dell'istantanea: {len(catalogo):,} ricette uguali dopo salvataggio, modifica e nuovo salvataggio")
+
+
+if __name__ == "__main__":
+    main()
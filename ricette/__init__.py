@@ -0,0 +1,182 @@
+"""
+
+Progetto: Gestione Ricette
+
+Obiettivo: Il progetto si propone di realizzare un sistema per gestire un insieme di ricette, consentendo agli utenti di eseguire operazioni di aggiunta, eliminazione, ricerca,
+visualizzazione e analisi delle ricette. Attraverso questo programma, gli utenti potranno gestire facilmente una lista di ricette, ognuna con vari ingredienti e tempi di 
+preparazione. Inoltre, il sistema offrirà la possibilità di effettuare ricerche avanzate e generare statistiche utili, come per esempio visionare la frequenza di un 
+determinato ingrediente o la ricetta più complessa (maggior minutaggio).
+
+Funzionalità principali:
+
+**Aggiunta di una nuova ricetta**: Gli utenti possono inserire nuove ricette specificando il nome, gli ingredienti e il minutaggio, utilizzando la funzione aggiungi_ricetta().
+
+**Eliminazione di una ricetta**: È possibile rimuovere ricette esistenti dalla lista, cercandole per nome tramite la funzione elimina_ricetta().
+
+**Visualizzazione di tutte le ricette**: Consente di migliorare la visualizzazione di tutte le ricette presenti nella lista, con dettagli su nome, ingredienti e tempo di 
+preparazione, attraverso la funzione visualizza_ricette(), anche a pagine o in formato compatto (una riga per ricetta).
+
+**Ricerca avanzata di ricette**: Gli utenti possono cercare ricette in base al nome, a ingredienti specifici o al tempo di preparazione, utilizzando la funzione cerca_ricette(), 
+che permette di filtrare i risultati in base ai criteri scelti dall'utente tramite ricerca_ricetta().
+
+Statistiche sugli ingredienti:
+
+    **ingrediente_frequenza()**       : mostra la frequenza con la quale si ripete un determinato ingrediente.
+    **ricetta_con_piu_ingredienti()** : identifica e visualizza la ricetta con il maggior numero di ingredienti.
+    **ricetta_con_piu_minutaggio(**)  : mostra la ricetta che richiede il maggior tempo di preparazione.
+    **statistiche_ingredienti()**     : fornisce un'analisi degli ingredienti più e meno comuni.
+    **statistiche_durata()**          : analizza la durata delle ricette, mostrando la durata minima, media e massima.
+    
+Filtraggio avanzato delle ricette:
+
+    **filtraggio_avanzato()**  : permette di cercare ricette che richiedono un tempo di preparazione inferiore a un certo minutaggio e che contengono un determinato ingrediente.
+    **filtraggio_avanzato2()** : consente di filtrare ricette che contengono due ingredienti specifici.
+    **trova_cucinabili()**     : "cosa posso cucinare con questi ingredienti?": ricette preparabili con la dispensa, o a cui mancano al più
+                                 k ingredienti, ordinate dalla più completa (sul catalogo con i bitset di IndiceDispensa).
+    **trova_duplicati()**      : coppie di ricette con ingredienti quasi uguali (somiglianza di Jaccard), senza confrontare tutte le
+                                 coppie grazie a MinHash/LSH (IndiceSomiglianze); trova_simili() cerca quelle simili a una ricetta
+                                 (sul catalogo tramite l'indice degli ingredienti, o i secchi LSH se gli ingredienti sono comuni) e aggiungi_ricetta() avvisa quando la nuova ricetta ne ha già una quasi uguale.
+    
+Strutture di supporto:
+
+    **CatalogoRicette**    : contenitore delle ricette usabile al posto della lista, che assegna ad ogni ricetta un id stabile e mantiene aggiornati
+                             l'indice dei nomi, l'indice invertito degli ingredienti e l'indice ordinato dei minutaggi.
+    **DizionarioIngredienti** : porta gli ingredienti in forma canonica all'inserimento (maiuscole, accenti, spazi e sinonimi come
+                                'Olioo' -> "Olio d'Oliva", vedi ALIAS_INGREDIENTI) e li identifica con un id intero.
+    **IndiceIngredienti**  : associa ad ogni ingrediente le ricette che lo contengono e risolve interrogazioni AND/OR/NOT su più ingredienti.
+    **ArchivioColonnare**  : conserva le ricette per colonne (array di minutaggi, id canonici degli ingredienti, nomi internati),
+                             restituendole come viste compatibili con i dizionari (RicettaVista).
+    **StatisticheIncrementali** : statistiche su ingredienti e minutaggi aggiornate ad ogni aggiunta ed eliminazione.
+    **statistiche_parallele()** : statistiche map-reduce su più processi per liste o file JSONL/CSV molto grandi (StatisticheAggregate);
+                                  le funzioni di statistica accettano anche `lavoratori=N` per usarle su una lista.
+    **AnalisiRicette**     : analisi vettoriali con NumPy/pandas (percentili e istogrammi dei minutaggi, durata per ingrediente,
+                             matrice sparsa delle co-occorrenze degli ingredienti) su colonne tenute in cache fino alla prossima modifica.
+    **RepositorySQLite**   : alternativa persistente al catalogo, su database SQLite, con la stessa interfaccia.
+    **importa_file() / esporta_file()** : importazione ed esportazione in streaming di file JSONL e CSV, con validazione e deduplica.
+    **salva_istantanea() / carica_istantanea()** : istantanea binaria versionata del catalogo con colonne e indici già costruiti,
+                                                   aperta in pochi millisecondi tramite mmap e memoryview, senza copiarla.
+    **IndiceTrigrammi**    : indice dei trigrammi di nomi e ingredienti, per le ricerche per sottostringa senza scorrere tutto.
+    **Interrogazione**     : interrogazione componibile su nome, ingredienti e minutaggio, con ordinamento e paginazione; restituisce
+                             un generatore e, sul catalogo, parte dall'indice più selettivo fermandosi appena la pagina è piena.
+    **scrivi_ricette()**   : scrive le ricette formattate su schermo, file o pipe con una sola write() per blocco di ricette,
+                             con paginazione e formato compatto (vedi anche rendi_ricette(), formatta_ricetta(), formatta_compatta()).
+    **IndiceMinutaggio**   : tiene le ricette ordinate per minutaggio per ricerche per intervallo e "le N ricette più veloci".
+    **metriche**           : strumentazione di ricerche, filtri, statistiche, aggiunte ed eliminazioni (chiamate, istogrammi delle
+                             latenze e delle ricette restituite), disattivata di base; metriche.abilita() la accende, anche con
+                             profilo cProfile e picco di memoria tracemalloc per operazione, ed esporta in JSON o per Prometheus.
+
+Uso:
+
+    **python -m ricette** (o python codice.py) : avvia il programma interattivo sulle ricette di esempio.
+    **python -m ricette COMANDO ...**          : esegue un sottocomando (add, delete, search, filter, pantry, duplicates, stats,
+                                                 import, export) su un archivio SQLite, JSONL, CSV o istantanea binaria e ne
+                                                 scrive il risultato in JSON; `batch` esegue un'operazione JSON per riga letta
+                                                 da un file o da stdin (vedi riga_di_comando()).
+    **python -m ricette serve --porta 8080**   : servizio HTTP/JSON (ServizioRicette) con ricerca, filtri, statistiche, aggiunte ed
+                                                 eliminazioni; le letture non usano lock e le scritture vengono applicate a lotti.
+    **import ricette**                         : importa le funzioni e le classi senza effetti collaterali, senza chiedere input e senza
+                                                 caricare dipendenze pesanti (le statistiche usano un percorso in puro Python).
+
+Questo progetto è concepito per facilitare la gestione delle ricette da parte di appassionati di cucina o di chiunque desideri organizzare e analizzare facilmente una 
+collezione di ricette.
+
+"""
+
+from importlib import import_module
+
+from .archivio import ArchivioColonnare, RicettaVista, TabellaStringhe
+from .catalogo import CatalogoRicette
+from .dati import lista_ricette
+from .importazione import (RapportoTrasferimento, esporta, esporta_file, importa, importa_file, leggi_csv, leggi_jsonl,
+                          valida_ricetta)
+from .indici import (SOGLIA_BANDE, SOGLIA_SIMILI, IndiceDispensa, IndiceIngredienti, IndiceMinutaggio, IndiceSomiglianze, IndiceTrigrammi,
+                     jaccard, normalizza_chiave)
+from .ingredienti import ALIAS_INGREDIENTI, DizionarioIngredienti, forma_base
+from .interattivo import main
+from .interrogazioni import Interrogazione, interroga
+from .operazioni import (aggiungi_ricetta, cerca_ricette, elimina_ricetta, filtraggio_avanzato, filtraggio_avanzato2,
+                         ricerca_ricetta, trova_cucinabili, trova_duplicati, trova_ricette, trova_simili, visualizza_ricette)
+from .statistiche import (StatisticheIncrementali, durata_in_flusso, ingrediente_frequenza, ricetta_con_piu_ingredienti,
+                          ricetta_con_piu_minutaggio, statistiche_durata, statistiche_ingredienti)
+from .strumentazione import Metriche, metriche, strumentata
+from .visualizzazione import formatta_compatta, formatta_ricetta, rendi_ricette, scrivi_ricette
+
+# Nomi esportati dai moduli che usano dipendenze più pesanti: vengono importati solo al primo utilizzo.
+_ESPORTAZIONI_PIGRE = {
+    'AnalisiRicette': 'analisi',
+    'RepositorySQLite': 'repository_sqlite',
+    'ServizioRicette': 'servizio',
+    'StatisticheAggregate': 'parallelo',
+    'StatisticheSQLite': 'repository_sqlite',
+    'carica_istantanea': 'istantanea',
+    'esegui_lotto': 'comandi',
+    'riga_di_comando': 'comandi',
+    'salva_istantanea': 'istantanea',
+    'statistiche_parallele': 'parallelo',
+}
+
+__all__ = [                                                                         # Senza i nomi pigri: `from ricette import *` non deve caricare i moduli pesanti.
+    'ALIAS_INGREDIENTI',
+    'ArchivioColonnare',
+    'CatalogoRicette',
+    'DizionarioIngredienti',
+    'IndiceDispensa',
+    'IndiceIngredienti',
+    'IndiceMinutaggio',
+    'IndiceSomiglianze',
+    'IndiceTrigrammi',
+    'Interrogazione',
+    'Metriche',
+    'RapportoTrasferimento',
+    'RicettaVista',
+    'SOGLIA_BANDE',
+    'SOGLIA_SIMILI',
+    'StatisticheIncrementali',
+    'TabellaStringhe',
+    'aggiungi_ricetta',
+    'cerca_ricette',
+    'durata_in_flusso',
+    'elimina_ricetta',
+    'esporta',
+    'esporta_file',
+    'filtraggio_avanzato',
+    'filtraggio_avanzato2',
+    'forma_base',
+    'formatta_compatta',
+    'formatta_ricetta',
+    'importa',
+    'importa_file',
+    'ingrediente_frequenza',
+    'interroga',
+    'jaccard',
+    'leggi_csv',
+    'leggi_jsonl',
+    'lista_ricette',
+    'main',
+    'metriche',
+    'normalizza_chiave',
+    'rendi_ricette',
+    'ricerca_ricetta',
+    'ricetta_con_piu_ingredienti',
+    'ricetta_con_piu_minutaggio',
+    'scrivi_ricette',
+    'statistiche_durata',
+    'statistiche_ingredienti',
+    'strumentata',
+    'trova_cucinabili',
+    'trova_duplicati',
+    'trova_ricette',
+    'trova_simili',
+    'valida_ricetta',
+    'visualizza_ricette',
+]
+
+
+# Importa al primo accesso i nomi dei moduli pesanti, così `import ricette` resta veloce (PEP 562).
+def __getattr__(nome):
+    modulo = _ESPORTAZIONI_PIGRE.get(nome)
+    if modulo is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+    valore = getattr(import_module(f".{modulo}", __name__), nome)
+    globals()[nome] = valore                                                        # Dal secondo accesso in poi il nome è un normale attributo del modulo.
+    return valore
@@ -0,0 +1,14 @@
+"""
+Punto di ingresso del pacchetto: `python -m ricette` avvia il programma interattivo;
+con degli argomenti (per esempio `python -m ricette search --nome pasta`) esegue un
+sottocomando non interattivo con risultato in JSON.
+"""
+
+import sys
+
+from .interattivo import main
+
+if len(sys.argv) > 1:
+    from .comandi import riga_di_comando
+    sys.exit(riga_di_comando())
+main()
@@ -0,0 +1,217 @@
+"""
+Analisi vettoriali delle ricette con NumPy, pandas e (per le co-occorrenze) SciPy.
+
+Le ricette vengono portate una volta in forma colonnare (array dei minutaggi, del
+numero di ingredienti e dei codici degli ingredienti, tutti di seguito) e da lì ogni
+analisi è fatta con operazioni vettoriali, senza cicli Python sulle ricette. La forma
+colonnare resta in memoria e viene rifatta solo dopo un'aggiunta o un'eliminazione.
+
+Il modulo non viene importato da `import ricette`: NumPy e pandas si caricano solo
+al primo uso di AnalisiRicette.
+"""
+
+from itertools import chain                                                         # Importa chain, per appiattire gli ingredienti di una lista di ricette.
+
+import numpy as np                                                                  # Importa NumPy, per le colonne e le operazioni vettoriali.
+import pandas as pd                                                                 # Importa pandas, per i raggruppamenti per ingrediente e le tabelle dei risultati.
+
+PERCENTILI = (50, 90, 99)                                                           # Percentili predefiniti dei minutaggi.
+
+
+# Definisce le analisi vettoriali su un catalogo o su una lista di ricette, con una rappresentazione colonnare tenuta in cache.
+class AnalisiRicette:
+
+    """
+    Analisi vettoriali su minutaggi e ingredienti delle ricette.
+
+    Su un CatalogoRicette le colonne vengono copiate direttamente dall'archivio
+    colonnare (ingredienti in forma canonica) e rifatte solo quando cambia
+    `catalogo.versione`, cioè dopo un'aggiunta o un'eliminazione. Su una lista
+    semplice (o su un RepositorySQLite) le modifiche non si possono vedere, quindi le
+    colonne vengono rifatte ad ogni analisi, con gli ingredienti così come sono scritti;
+    invalida() le fa ricalcolare anche sul catalogo.
+
+    Args:
+        lista (CatalogoRicette or list): Ricette da analizzare.
+    """
+
+    def __init__(self, lista):
+        self._lista = lista
+        self._versione = None                                                           # Versione del catalogo a cui si riferisce la cache.
+        self._colonne = None                                                            # Cache: dizionario con le colonne (vedi _costruisci()).
+
+    def invalida(self):
+
+        """
+        Scarta la rappresentazione colonnare: la prossima analisi la ricostruisce.
+        """
+
+        self._versione = None
+        self._colonne = None
+
+    def colonne(self):
+
+        """
+        Restituisce la rappresentazione colonnare delle ricette, ricostruendola se il catalogo è cambiato.
+
+        Returns:
+            dict: Colonne delle ricette, nell'ordine della lista:
+                  - 'minutaggi'   : array int64 con il minutaggio di ogni ricetta;
+                  - 'lunghezze'   : array int64 con il numero di ingredienti di ogni ricetta;
+                  - 'ricetta'     : array int64 con la ricetta (posizione) di ogni ingrediente;
+                  - 'codici'      : array int64 con il codice di ogni ingrediente, tutti di seguito;
+                  - 'ingredienti' : array di stringhe: codice -> nome dell'ingrediente.
+        """
+
+        versione = getattr(self._lista, 'versione', None)
+        if self._colonne is None or versione is None or versione != self._versione:
+            self._colonne = self._costruisci()
+            self._versione = versione
+        return self._colonne
+
+    def _costruisci(self):
+
+        """
+        Costruisce le colonne, copiandole dall'archivio del catalogo o leggendo le ricette una volta.
+        """
+
+        archivio = getattr(self._lista, '_archivio', None)
+        if archivio is not None:                                                        # Catalogo: copia le colonne dell'archivio scartando le lapidi.
+            vive = np.frombuffer(archivio.vive, dtype=np.uint8).astype(bool)            # astype copia: l'archivio resta libero di crescere.
+            offset = np.frombuffer(archivio.offset, dtype=np.uint64).astype(np.int64)
+            lunghezze_tutte = np.diff(offset)
+            minutaggi = np.frombuffer(archivio.durate, dtype=np.uint32).astype(np.int64)[vive]
+            codici = np.frombuffer(archivio.valori, dtype=np.uint32).astype(np.int64)[np.repeat(vive, lunghezze_tutte)]
+            lunghezze = lunghezze_tutte[vive]
+            dizionario = archivio.dizionario
+            ingredienti = np.array([dizionario[i] for i in range(len(dizionario))], dtype=object)  # Il vocabolario è piccolo rispetto alle ricette.
+        else:                                                                           # Lista o database: una sola lettura delle ricette.
+            ricette = list(self._lista)
+            minutaggi = np.fromiter((ricetta['minutaggio'] for ricetta in ricette), dtype=np.int64, count=len(ricette))
+            elenchi = [ricetta['ingredienti'] for ricetta in ricette]
+            lunghezze = np.fromiter(map(len, elenchi), dtype=np.int64, count=len(elenchi))
+            codici, ingredienti = pd.factorize(pd.Series(list(chain.from_iterable(elenchi)), dtype=object))
+            codici = codici.astype(np.int64)
+            ingredienti = np.asarray(ingredienti, dtype=object)
+        return {
+            'minutaggi': minutaggi,
+            'lunghezze': lunghezze,
+            'ricetta': np.repeat(np.arange(len(lunghezze)), lunghezze),
+            'codici': codici,
+            'ingredienti': ingredienti,
+        }
+
+    def __len__(self):
+        return len(self.colonne()['minutaggi'])
+
+    def percentili_durata(self, percentili=PERCENTILI):
+
+        """
+        Calcola i percentili dei minutaggi.
+
+        Args:
+            percentili (sequence, optional): Percentili da calcolare, tra 0 e 100.
+
+        Returns:
+            dict or None: Percentile -> minutaggio (interpolato linearmente), o None se non ci sono ricette.
+        """
+
+        minutaggi = self.colonne()['minutaggi']
+        if not len(minutaggi):
+            return None
+        valori = np.percentile(minutaggi, percentili)
+        return dict(zip(percentili, valori.tolist()))
+
+    def istogramma_durata(self, intervalli=10, estremi=None):
+
+        """
+        Conta le ricette per fasce di minutaggio.
+
+        Args:
+            intervalli (int or sequence, optional): Numero di fasce di uguale ampiezza, oppure i bordi delle fasce.
+            estremi (tuple, optional): (minimo, massimo) delle fasce; se manca vanno dal minutaggio minimo al massimo.
+
+        Returns:
+            tuple: (conteggi, bordi) come numpy.histogram(): la fascia i va da bordi[i] a bordi[i + 1]
+                   (l'ultima comprende anche il bordo destro).
+        """
+
+        return np.histogram(self.colonne()['minutaggi'], bins=intervalli, range=estremi)
+
+    def durata_per_ingrediente(self, minimo_ricette=1):
+
+        """
+        Raggruppa i minutaggi per ingrediente.
+
+        Args:
+            minimo_ricette (int, optional): Ingredienti presenti in meno ricette vengono scartati.
+
+        Returns:
+            pandas.DataFrame: Indicizzato per ingrediente, con le colonne 'ricette', 'media',
+                              'mediana', 'minimo' e 'massimo', dall'ingrediente presente in più
+                              ricette (a parità, nell'ordine di prima comparsa).
+        """
+
+        colonne = self.colonne()
+        coppie = pd.DataFrame({
+            'ingrediente': colonne['codici'],
+            'minutaggio': colonne['minutaggi'][colonne['ricetta']],                     # Ogni ingrediente prende il minutaggio della sua ricetta.
+        })
+        gruppi = coppie.groupby('ingrediente', sort=True)['minutaggio'].agg(['size', 'mean', 'median', 'min', 'max'])
+        gruppi.columns = ['ricette', 'media', 'mediana', 'minimo', 'massimo']
+        gruppi = gruppi[gruppi['ricette'] >= minimo_ricette].sort_values('ricette', ascending=False, kind='stable')
+        gruppi.index = pd.Index(colonne['ingredienti'][gruppi.index.to_numpy()], name='ingrediente')
+        return gruppi
+
+    def co_occorrenze(self, diagonale=True):
+
+        """
+        Costruisce la matrice sparsa delle co-occorrenze degli ingredienti.
+
+        La matrice è I.T @ I, dove I è la matrice sparsa ricette x ingredienti con 1 se
+        la ricetta contiene l'ingrediente: l'elemento (a, b) è il numero di ricette che
+        contengono sia a sia b.
+
+        Args:
+            diagonale (bool, optional): Se False azzera la diagonale (ricette che contengono l'ingrediente).
+
+        Returns:
+            tuple: (scipy.sparse.csr_matrix simmetrica di interi, array dei nomi degli ingredienti per riga/colonna).
+        """
+
+        from scipy import sparse                                                        # SciPy serve solo qui: lo importa al primo uso.
+
+        colonne = self.colonne()
+        ingredienti = colonne['ingredienti']
+        incidenza = sparse.csr_matrix(
+            (np.ones(len(colonne['codici']), dtype=np.int32), (colonne['ricetta'], colonne['codici'])),
+            shape=(len(colonne['lunghezze']), len(ingredienti)),
+        )
+        incidenza.sum_duplicates()
+        incidenza.data[:] = 1                                                           # Un ingrediente ripetuto nella stessa ricetta conta una volta.
+        matrice = (incidenza.T @ incidenza).tocsr()
+        if not diagonale:
+            matrice.setdiag(0)
+            matrice.eliminate_zeros()
+        return matrice, ingredienti
+
+    def coppie_frequenti(self, numero=10):
+
+        """
+        Restituisce le coppie di ingredienti che compaiono insieme nel maggior numero di ricette.
+
+        Args:
+            numero (int, optional): Quante coppie restituire.
+
+        Returns:
+            list: Tuple (ingrediente, ingrediente, ricette), dalla coppia più frequente.
+        """
+
+        from scipy import sparse
+
+        matrice, ingredienti = self.co_occorrenze()
+        superiore = sparse.triu(matrice, k=1).tocoo()                                  # Ogni coppia una volta sola, senza la diagonale.
+        if not superiore.nnz:
+            return []
+        migliori = np.argsort(-superiore.data, kind='stable')[:numero]
+        return [(ingredienti[superiore.row[i]], ingredienti[superiore.col[i]], int(superiore.data[i])) for i in migliori]
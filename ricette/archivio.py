@@ -0,0 +1,207 @@
+"""
+Archivio colonnare delle ricette: tabella delle stringhe, colonne compatte e viste compatibili con i dizionari.
+"""
+
+from array import array                                                             # Importa array, usato per memorizzare le colonne dell'archivio in modo compatto.
+from collections.abc import Mapping                                                 # Importa Mapping, la classe base delle viste che si comportano come dizionari.
+
+from .ingredienti import DizionarioIngredienti
+
+
+# Definisce la tabella delle stringhe, che conserva una sola copia di ogni nome e lo identifica con un intero.
+class TabellaStringhe:
+
+    """
+    Tabella che assegna un id intero ad ogni stringa distinta (interning).
+
+    Ogni stringa viene memorizzata una volta sola, e le ricette la richiamano
+    tramite il suo id.
+    """
+
+    __slots__ = ('_stringhe', '_id')
+
+    def __init__(self):
+        self._stringhe = []                                                             # Lista: id -> stringa.
+        self._id = {}                                                                   # Dizionario: stringa -> id.
+
+    def __len__(self):
+        return len(self._stringhe)
+
+    def __getitem__(self, id_stringa):
+        return self._stringhe[id_stringa]
+
+    def interna(self, testo):
+
+        """
+        Restituisce l'id della stringa, aggiungendola alla tabella se non c'è ancora.
+
+        Args:
+            testo (str): Stringa da internare.
+
+        Returns:
+            int: Id della stringa.
+        """
+
+        id_stringa = self._id.get(testo)
+        if id_stringa is None:
+            id_stringa = len(self._stringhe)
+            self._stringhe.append(testo)
+            self._id[testo] = id_stringa
+        return id_stringa
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce l'archivio a colonne delle ricette, molto più compatto di una lista di dizionari.
+class ArchivioColonnare:
+
+    """
+    Archivio delle ricette organizzato per colonne invece che come lista di dizionari.
+
+    Ogni ricetta occupa una riga, il cui numero è il suo id:
+        - `nomi`    : array('I') con l'id del nome nella tabella delle stringhe;
+        - `durate`  : array('I') con il minutaggio;
+        - `offset`  : array('Q') con n+1 posizioni; gli ingredienti della riga i sono
+                      `valori[offset[i]:offset[i + 1]]`;
+        - `valori`  : array('I') con gli id canonici degli ingredienti (vedi
+                      DizionarioIngredienti), tutti di seguito;
+        - `vive`    : bytearray con 1 per le righe valide e 0 per quelle eliminate.
+
+    Gli ingredienti vengono normalizzati una volta sola, all'inserimento: le varianti
+    di uno stesso ingrediente diventano lo stesso id e i doppioni nella ricetta spariscono.
+    Le eliminazioni azzerano solo il flag in `vive`, così gli id restano stabili.
+
+    Args:
+        dizionario (DizionarioIngredienti, optional): Dizionario degli ingredienti da usare;
+                                                      se manca ne viene creato uno con i sinonimi predefiniti.
+    """
+
+    __slots__ = ('stringhe', 'dizionario', 'nomi', 'durate', 'offset', 'valori', 'vive')
+
+    def __init__(self, dizionario=None):
+        self.stringhe = TabellaStringhe()                                               # Nomi delle ricette.
+        self.dizionario = DizionarioIngredienti() if dizionario is None else dizionario  # Ingredienti canonici.
+        self.nomi = array('I')
+        self.durate = array('I')
+        self.offset = array('Q', [0])
+        self.valori = array('I')
+        self.vive = bytearray()
+
+    def __len__(self):
+        return len(self.durate)                                                         # Numero di righe, comprese quelle eliminate.
+
+    def aggiungi(self, nome, ingredienti, minutaggio):
+
+        """
+        Aggiunge una riga all'archivio.
+
+        Args:
+            nome (str): Nome della ricetta.
+            ingredienti (list): Ingredienti della ricetta.
+            minutaggio (int): Minutaggio della ricetta.
+
+        Returns:
+            int: Id (numero di riga) assegnato alla ricetta.
+
+        Raises:
+            OverflowError: Se il minutaggio è negativo o non sta in 32 bit.
+            TypeError: Se il minutaggio non è un intero.
+        """
+
+        id_ricetta = len(self.durate)
+        interna = self.dizionario.interna
+        valori = array('I', dict.fromkeys(interna(ingrediente) for ingrediente in ingredienti))  # dict.fromkeys toglie i doppioni mantenendo l'ordine.
+        id_nome = self.stringhe.interna(nome)
+        self.durate.append(minutaggio)                                                  # Per prima: se il minutaggio non è valido nessuna colonna è cambiata.
+        self.valori.extend(valori)
+        self.offset.append(len(self.valori))
+        self.nomi.append(id_nome)
+        self.vive.append(1)
+        return id_ricetta
+
+    def elimina(self, id_ricetta):
+
+        """
+        Segna una riga come eliminata.
+
+        Args:
+            id_ricetta (int): Id della ricetta da eliminare.
+        """
+
+        self.vive[id_ricetta] = 0
+
+    def viva(self, id_ricetta):
+
+        """
+        Returns:
+            bool: True se l'id corrisponde a una riga esistente e non eliminata.
+        """
+
+        return 0 <= id_ricetta < len(self.vive) and self.vive[id_ricetta] == 1
+
+    def nome(self, id_ricetta):
+        return self.stringhe[self.nomi[id_ricetta]]
+
+    def minutaggio(self, id_ricetta):
+        return self.durate[id_ricetta]
+
+    def id_ingredienti(self, id_ricetta):
+
+        """
+        Returns:
+            array: Gli id degli ingredienti della riga, senza copiare le stringhe.
+        """
+
+        return self.valori[self.offset[id_ricetta]:self.offset[id_ricetta + 1]]
+
+    def ingredienti(self, id_ricetta):
+
+        """
+        Returns:
+            list: I nomi canonici degli ingredienti della riga, condivisi con il dizionario.
+        """
+
+        nomi = self.dizionario
+        return [nomi[i] for i in self.id_ingredienti(id_ricetta)]
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce la vista di una riga dell'archivio, che si comporta come il dizionario di una ricetta.
+class RicettaVista(Mapping):
+
+    """
+    Vista in sola lettura di una ricetta dell'archivio colonnare, usabile come il
+    dizionario {'nome': ..., 'ingredienti': [...], 'minutaggio': ...}.
+
+    Le funzioni che leggono ricetta['nome'], ricetta['ingredienti'] e
+    ricetta['minutaggio'] continuano a funzionare senza modifiche.
+
+    Args:
+        archivio (ArchivioColonnare): Archivio che contiene la ricetta.
+        id_ricetta (int): Id della ricetta nell'archivio.
+    """
+
+    __slots__ = ('_archivio', 'id')
+
+    _CHIAVI = ('nome', 'ingredienti', 'minutaggio')
+
+    def __init__(self, archivio, id_ricetta):
+        self._archivio = archivio
+        self.id = id_ricetta
+
+    def __getitem__(self, chiave):
+        if chiave == 'nome':
+            return self._archivio.nome(self.id)
+        if chiave == 'ingredienti':
+            return self._archivio.ingredienti(self.id)
+        if chiave == 'minutaggio':
+            return self._archivio.minutaggio(self.id)
+        raise KeyError(chiave)
+
+    def __iter__(self):
+        return iter(self._CHIAVI)
+
+    def __len__(self):
+        return len(self._CHIAVI)
+
+    def __repr__(self):
+        return repr(dict(self))
@@ -0,0 +1,628 @@
+"""
+Catalogo delle ricette: contenitore compatibile con una lista che mantiene archivio, indici e statistiche.
+"""
+
+import math                                                                          # Importa math, per il numero di ingredienti in comune richiesto dalla soglia.
+
+from .archivio import ArchivioColonnare, RicettaVista
+from .indici import (SOGLIA_BANDE, SOGLIA_SIMILI, IndiceDispensa, IndiceIngredienti, IndiceMinutaggio, IndiceSomiglianze, IndiceTrigrammi,
+                     jaccard, normalizza_chiave)
+from .ingredienti import DizionarioIngredienti, forma_base
+from .statistiche import StatisticheIncrementali
+
+
+# Definisce un contenitore di ricette che si comporta come una lista ma mantiene aggiornati archivio, indici e statistiche.
+class CatalogoRicette:
+
+    """
+    Contenitore delle ricette compatibile con l'uso che le funzioni fanno di una lista
+    (iterazione, len, append, remove), che mantiene aggiornati gli indici dei nomi
+    (esatto e per trigrammi), l'indice invertito degli ingredienti, l'indice ordinato
+    dei minutaggi e le statistiche ad ogni aggiunta ed eliminazione.
+
+    Le ricette sono conservate in un ArchivioColonnare e vengono restituite come
+    RicettaVista, che si comporta come il dizionario della ricetta. Gli ingredienti
+    passano una sola volta, all'inserimento, per il DizionarioIngredienti: da lì in poi
+    archivio, indice e statistiche lavorano sugli id canonici, e 'olio', 'Olioo' e
+    "Olio d'Oliva" contano come lo stesso ingrediente.
+
+    Ogni ricetta riceve un id intero stabile, che non cambia per tutta la vita del
+    catalogo: gli indici fanno riferimento alle ricette solo tramite id. Le eliminazioni
+    lasciano una "lapide" nell'archivio al posto della ricetta, così aggiunta,
+    eliminazione e ricerca per nome esatto costano O(1) ammortizzato.
+
+    L'attributo `versione` cresce ad ogni aggiunta ed eliminazione: chi tiene dati
+    calcolati sul catalogo (per esempio AnalisiRicette) lo usa per sapere quando rifarli.
+
+    Un catalogo aperto con carica_istantanea() legge colonne e indici direttamente dal
+    file mappato in memoria; la prima modifica li ricostruisce in memoria (vedi _scongela()).
+
+    Args:
+        ricette (iterable, optional): Ricette iniziali, come dizionari con chiavi
+                                      'nome', 'ingredienti' e 'minutaggio'.
+        alias (dict, optional): Sinonimi degli ingredienti (variante -> nome canonico);
+                                None usa ALIAS_INGREDIENTI, {} li disattiva.
+    """
+
+    MASSIMO_CANDIDATI = 5000                                                            # Candidati oltre i quali ricette_simili() passa alle bande LSH.
+
+    def __init__(self, ricette=(), alias=None):
+        self.dizionario = DizionarioIngredienti(alias)                                  # Ingredienti canonici, condivisi da archivio, indice e statistiche.
+        self.versione = 0                                                               # Numero di modifiche: invalida i dati calcolati fuori dal catalogo.
+        self._istantanea = None                                                         # Mappa dell'istantanea da cui vengono le strutture, finché sono in sola lettura.
+        self._crea_strutture()
+        for ricetta in ricette:
+            self.append(ricetta)
+
+    def _crea_strutture(self):
+
+        """
+        Crea archivio, indici e statistiche vuoti, condividendo il dizionario degli ingredienti.
+        """
+
+        self._archivio = ArchivioColonnare(self.dizionario)                             # Colonne con i dati delle ricette, indicizzate per id.
+        self._per_nome = {}                                                             # Dizionario: nome normalizzato -> id, nell'ordine di inserimento.
+        self.indice_nomi = IndiceTrigrammi()                                            # Trigrammi dei nomi, per la ricerca per sottostringa.
+        self.indice_ingredienti = IndiceIngredienti(self.dizionario)
+        self.indice_minutaggio = IndiceMinutaggio()
+        self.statistiche = StatisticheIncrementali(self.dizionario)
+        self._indice_dispensa = None                                                    # Bitset per la ricerca "con quello che ho", creati alla prima richiesta.
+        self._indice_somiglianze = None                                                 # Firme MinHash e secchi LSH delle ricette, creati alla prima richiesta.
+
+    def _scongela(self):
+
+        """
+        Sostituisce le strutture in sola lettura di un'istantanea (vedi ricette.istantanea)
+        con quelle modificabili, ricaricando le ricette: lo fa la prima modifica. Gli id
+        non cambiano, perché nell'istantanea sono già consecutivi e nell'ordine di inserimento,
+        e l'ordine di prima comparsa degli ingredienti (gli ex aequo delle statistiche) è
+        quello salvato, non quello delle sole ricette sopravvissute.
+        """
+
+        archivio = self._archivio
+        nomi = self.dizionario
+        righe = [(archivio.nome(i), [nomi[j] for j in archivio.id_ingredienti(i)], archivio.minutaggio(i)) for i in self._per_nome.values()]
+        comparsa = self.statistiche.ordine_di_comparsa()
+        versione = self.versione
+        self._istantanea = None                                                         # Le viste già restituite tengono viva la mappa finché servono.
+        self._crea_strutture()
+        for nome, ingredienti, minutaggio in righe:
+            self.append({'nome': nome, 'ingredienti': ingredienti, 'minutaggio': minutaggio})
+        if comparsa is not None:
+            self.statistiche.imposta_ordine_di_comparsa(comparsa)
+        self.versione = versione                                                        # Il contenuto non è cambiato.
+
+    def __iter__(self):
+        archivio = self._archivio
+        return (RicettaVista(archivio, id_ricetta) for id_ricetta in self._per_nome.values())  # Scorre solo le ricette vive, nell'ordine di inserimento.
+
+    def __len__(self):
+        return len(self._per_nome)
+
+    def __contains__(self, ricetta):
+        return self.id_di(ricetta) is not None
+
+    def append(self, ricetta):
+
+        """
+        Aggiunge una ricetta al catalogo e la registra negli indici.
+
+        La ricetta viene copiata nell'archivio colonnare con gli ingredienti in forma
+        canonica (senza doppioni): modifiche successive al dizionario passato non si
+        riflettono sul catalogo.
+
+        Args:
+            ricetta (dict): Ricetta da aggiungere.
+
+        Returns:
+            int: Id assegnato alla ricetta.
+
+        Raises:
+            ValueError: Se nel catalogo c'è già una ricetta con lo stesso nome.
+        """
+
+        chiave = normalizza_chiave(ricetta['nome'])
+        if chiave in self._per_nome:
+            raise ValueError(f"La ricetta '{ricetta['nome']}' è già presente nel catalogo.")
+        if self._istantanea is not None:
+            self._scongela()
+        id_ricetta = self._archivio.aggiungi(ricetta['nome'], ricetta['ingredienti'], ricetta['minutaggio'])  # Il nuovo id è la prossima riga: gli id non vengono mai riutilizzati.
+        self._per_nome[chiave] = id_ricetta
+        id_ingredienti = self._archivio.id_ingredienti(id_ricetta)                     # Ingredienti già normalizzati dall'archivio: indice e statistiche usano gli id.
+        self.indice_nomi.aggiungi(id_ricetta, ricetta['nome'])
+        self.indice_ingredienti.aggiungi(id_ricetta, id_ingredienti)
+        self.indice_minutaggio.aggiungi(id_ricetta, ricetta['minutaggio'])
+        self.statistiche.aggiungi(id_ricetta, id_ingredienti, ricetta['minutaggio'])
+        if self._indice_dispensa is not None:
+            self._indice_dispensa.aggiungi(id_ricetta, id_ingredienti)
+        if self._indice_somiglianze is not None:
+            self._indice_somiglianze.aggiungi(id_ricetta, id_ingredienti)
+        self.versione += 1
+        return id_ricetta
+
+    def aggiungi_molte(self, ricette):
+
+        """
+        Aggiunge molte ricette, saltando quelle con un nome già presente.
+
+        Args:
+            ricette (iterable): Ricette da aggiungere (anche un generatore).
+
+        Returns:
+            int: Numero di ricette effettivamente aggiunte.
+        """
+
+        aggiunte = 0
+        for ricetta in ricette:
+            if normalizza_chiave(ricetta['nome']) not in self._per_nome:
+                self.append(ricetta)
+                aggiunte += 1
+        return aggiunte
+
+    def remove(self, ricetta):
+
+        """
+        Rimuove una ricetta dal catalogo e dagli indici.
+
+        Args:
+            ricetta (dict): Ricetta da rimuovere.
+
+        Raises:
+            ValueError: Se la ricetta non è presente nel catalogo.
+        """
+
+        id_ricetta = self.id_di(ricetta)
+        if id_ricetta is None:
+            raise ValueError(f"La ricetta '{ricetta['nome']}' non è presente nel catalogo.")  # Stessa eccezione di list.remove.
+        self.elimina_id(id_ricetta)
+
+    def elimina_id(self, id_ricetta):
+
+        """
+        Elimina la ricetta con l'id indicato, lasciando una lapide al suo posto.
+
+        Args:
+            id_ricetta (int): Id della ricetta da eliminare.
+
+        Returns:
+            RicettaVista: La ricetta eliminata (i suoi dati restano leggibili).
+
+        Raises:
+            KeyError: Se l'id non corrisponde a una ricetta presente.
+        """
+
+        ricetta = self.ricetta(id_ricetta)
+        if ricetta is None:
+            raise KeyError(id_ricetta)
+        if self._istantanea is not None:
+            self._scongela()
+        self._archivio.elimina(id_ricetta)                                              # Lapide: la riga resta occupata così gli altri id non cambiano.
+        del self._per_nome[normalizza_chiave(ricetta['nome'])]
+        id_ingredienti = self._archivio.id_ingredienti(id_ricetta)
+        self.indice_nomi.rimuovi(id_ricetta)
+        self.indice_ingredienti.rimuovi(id_ricetta, id_ingredienti)
+        self.indice_minutaggio.rimuovi(id_ricetta, ricetta['minutaggio'])
+        self.statistiche.rimuovi(id_ricetta, id_ingredienti, ricetta['minutaggio'])
+        if self._indice_dispensa is not None:
+            self._indice_dispensa.rimuovi(id_ricetta)
+        if self._indice_somiglianze is not None:
+            self._indice_somiglianze.rimuovi(id_ricetta)
+        self.versione += 1
+        return ricetta
+
+    def id_ricette(self):
+
+        """
+        Returns:
+            iterator: Gli id delle ricette presenti, nell'ordine di inserimento.
+        """
+
+        return iter(self._per_nome.values())
+
+    def minutaggio_di(self, id_ricetta):
+
+        """
+        Returns:
+            int: Il minutaggio della ricetta con l'id indicato, letto direttamente dalla colonna.
+        """
+
+        return self._archivio.durate[id_ricetta]
+
+    def ricetta(self, id_ricetta):
+
+        """
+        Restituisce la ricetta con l'id indicato.
+
+        Args:
+            id_ricetta (int): Id della ricetta.
+
+        Returns:
+            RicettaVista or None: La ricetta, o None se l'id non esiste o la ricetta è stata eliminata.
+        """
+
+        if self._archivio.viva(id_ricetta):
+            return RicettaVista(self._archivio, id_ricetta)
+        return None
+
+    def id_per_nome(self, nome):
+
+        """
+        Restituisce l'id della ricetta con il nome indicato (senza distinguere maiuscole e minuscole).
+
+        Args:
+            nome (str): Nome della ricetta.
+
+        Returns:
+            int or None: L'id della ricetta, o None se non esiste.
+        """
+
+        return self._per_nome.get(normalizza_chiave(nome))
+
+    def trova_per_nome(self, nome):
+
+        """
+        Restituisce la ricetta con il nome indicato in O(1).
+
+        Args:
+            nome (str): Nome della ricetta.
+
+        Returns:
+            RicettaVista or None: La ricetta, o None se non esiste.
+        """
+
+        id_ricetta = self.id_per_nome(nome)
+        return None if id_ricetta is None else RicettaVista(self._archivio, id_ricetta)
+
+    def id_di(self, ricetta):
+
+        """
+        Restituisce l'id di una ricetta del catalogo, cercandola per nome.
+
+        La ricetta è la stessa se nome e minutaggio coincidono e se i suoi ingredienti,
+        portati in forma canonica, sono quelli conservati nel catalogo.
+
+        Args:
+            ricetta (dict): Ricetta da cercare.
+
+        Returns:
+            int or None: L'id, o None se nel catalogo non c'è una ricetta uguale.
+        """
+
+        if isinstance(ricetta, RicettaVista) and ricetta._archivio is self._archivio:   # Una vista di questo catalogo conosce già il proprio id.
+            return ricetta.id if self._archivio.viva(ricetta.id) else None
+        id_ricetta = self.id_per_nome(ricetta['nome'])
+        if id_ricetta is None:
+            return None
+        archivio = self._archivio
+        cerca = archivio.dizionario.cerca
+        if (archivio.nome(id_ricetta) != ricetta['nome'] or archivio.minutaggio(id_ricetta) != ricetta['minutaggio']
+                or list(archivio.id_ingredienti(id_ricetta)) != list(dict.fromkeys(cerca(i) for i in ricetta['ingredienti']))):
+            return None                                                                 # Stesso nome ma contenuto diverso: non è la stessa ricetta.
+        return id_ricetta
+
+    def ricette_da_id(self, id_ricette):
+
+        """
+        Converte un insieme di id nelle ricette corrispondenti, nell'ordine di inserimento.
+
+        Args:
+            id_ricette (iterable): Id delle ricette.
+
+        Returns:
+            list: Le ricette corrispondenti.
+        """
+
+        archivio = self._archivio
+        return [RicettaVista(archivio, i) for i in sorted(id_ricette)]                  # Gli id crescono con l'inserimento, quindi ordinarli ripristina l'ordine della lista.
+
+    def filtra_ingredienti(self, tutti=(), almeno_uno=(), esclusi=()):
+
+        """
+        Restituisce le ricette che soddisfano un'interrogazione AND/OR/NOT sugli ingredienti.
+
+        Args:
+            tutti (iterable): Ingredienti che devono essere tutti presenti.
+            almeno_uno (iterable): Ingredienti di cui almeno uno deve essere presente.
+            esclusi (iterable): Ingredienti che non devono essere presenti.
+
+        Returns:
+            list: Le ricette che soddisfano i criteri, nell'ordine di inserimento.
+        """
+
+        id_ricette = self.indice_ingredienti.interroga(tutti, almeno_uno, esclusi, universo=self._per_nome.values())
+        return self.ricette_da_id(id_ricette)
+
+    def filtra(self, tutti=(), almeno_uno=(), esclusi=(), minimo=None, massimo=None):
+
+        """
+        Restituisce le ricette che soddisfano insieme un'interrogazione sugli ingredienti
+        e un intervallo di minutaggio.
+
+        Il criterio più selettivo guida la ricerca: se l'intervallo contiene meno ricette
+        della posting list più corta si scorre l'intervallo verificando gli ingredienti,
+        altrimenti si risolve l'interrogazione sugli ingredienti verificando il minutaggio.
+
+        Args:
+            tutti (iterable): Ingredienti che devono essere tutti presenti.
+            almeno_uno (iterable): Ingredienti di cui almeno uno deve essere presente.
+            esclusi (iterable): Ingredienti che non devono essere presenti.
+            minimo (int, optional): Minutaggio minimo (incluso).
+            massimo (int, optional): Minutaggio massimo (incluso).
+
+        Returns:
+            list: Le ricette che soddisfano i criteri, nell'ordine di inserimento.
+        """
+
+        if minimo is None and massimo is None:
+            return self.filtra_ingredienti(tutti, almeno_uno, esclusi)
+
+        indice = self.indice_ingredienti
+        liste_and = [indice.posting(i) for i in tutti]
+        liste_or = [indice.posting(i) for i in almeno_uno]
+        liste_not = [indice.posting(i) for i in esclusi]
+        if liste_and:
+            stima_ingredienti = min(len(posting) for posting in liste_and)               # Stima dei risultati: la posting list più corta.
+        elif liste_or:
+            stima_ingredienti = sum(len(posting) for posting in liste_or)
+        else:
+            stima_ingredienti = len(self)
+
+        if self.indice_minutaggio.conta(minimo, massimo) <= stima_ingredienti:           # L'intervallo è più selettivo: lo scorre e verifica gli ingredienti.
+            id_ricette = [
+                i for i in self.indice_minutaggio.intervallo(minimo, massimo)
+                if all(i in posting for posting in liste_and)
+                and (not liste_or or any(i in posting for posting in liste_or))
+                and not any(i in posting for posting in liste_not)
+            ]
+        else:                                                                           # Gli ingredienti sono più selettivi: verifica il minutaggio dei candidati.
+            minimo = float('-inf') if minimo is None else minimo
+            massimo = float('inf') if massimo is None else massimo
+            durate = self._archivio.durate                                              # Legge i minutaggi direttamente dalla colonna.
+            id_ricette = [
+                i for i in indice.interroga(tutti, almeno_uno, esclusi, universo=self._per_nome.values())
+                if minimo <= durate[i] <= massimo
+            ]
+        return self.ricette_da_id(id_ricette)
+
+    def id_con_minutaggio(self, minimo=None, massimo=None):
+
+        """
+        Restituisce gli id delle ricette con minutaggio compreso tra minimo e massimo (inclusi).
+
+        Args:
+            minimo (int, optional): Minutaggio minimo; None per nessun limite inferiore.
+            massimo (int, optional): Minutaggio massimo; None per nessun limite superiore.
+
+        Returns:
+            generator: Gli id, in ordine di minutaggio.
+        """
+
+        return self.indice_minutaggio.intervallo(minimo, massimo)
+
+    def filtra_minutaggio(self, minimo=None, massimo=None, decrescente=False):
+
+        """
+        Restituisce le ricette con minutaggio compreso tra minimo e massimo, in ordine di minutaggio.
+
+        Args:
+            minimo (int, optional): Minutaggio minimo (incluso).
+            massimo (int, optional): Minutaggio massimo (incluso).
+            decrescente (bool, optional): Se True parte dal minutaggio più alto.
+
+        Returns:
+            generator: Le ricette, generate una alla volta.
+        """
+
+        archivio = self._archivio
+        return (RicettaVista(archivio, i) for i in self.indice_minutaggio.intervallo(minimo, massimo, decrescente))
+
+    def ricette_piu_veloci(self, numero):
+
+        """
+        Restituisce le `numero` ricette con il minutaggio più basso.
+
+        Args:
+            numero (int): Quante ricette restituire.
+
+        Returns:
+            list: Le ricette, dalla più veloce.
+        """
+
+        return [RicettaVista(self._archivio, i) for i in self.indice_minutaggio.primi(numero)]
+
+    def ricette_con_ingrediente_simile(self, testo):
+
+        """
+        Restituisce gli id delle ricette con almeno un ingrediente che contiene il testo indicato.
+
+        Trova gli ingredienti del vocabolario che contengono il testo tramite l'indice
+        dei trigrammi e unisce le loro posting list; se il testo è un sinonimo (per
+        esempio 'Olioo') conta anche il suo ingrediente canonico.
+
+        Args:
+            testo (str): Porzione di testo da cercare negli ingredienti.
+
+        Returns:
+            set: Id delle ricette trovate.
+        """
+
+        indice = self.indice_ingredienti
+        id_ingredienti = indice.vocabolario_simile(testo)
+        if self.dizionario.chiave(testo) != forma_base(testo):                          # Il testo è un sinonimo: conta anche il suo ingrediente canonico.
+            id_canonico = self.dizionario.cerca(testo)
+            if id_canonico is not None:
+                id_ingredienti.add(id_canonico)
+        id_ricette = set()
+        for id_ingrediente in id_ingredienti:
+            id_ricette |= indice.posting(id_ingrediente)
+        return id_ricette
+
+    def id_con_nome_simile(self, testo):
+
+        """
+        Restituisce gli id delle ricette il cui nome contiene il testo indicato
+        (senza distinguere maiuscole e minuscole), tramite l'indice dei trigrammi dei nomi.
+
+        Args:
+            testo (str): Porzione di testo da cercare nei nomi.
+
+        Returns:
+            set: Id delle ricette trovate.
+        """
+
+        return self.indice_nomi.cerca(testo)
+
+    @property
+    def indice_dispensa(self):
+
+        """
+        Returns:
+            IndiceDispensa: I bitset degli ingredienti delle ricette, costruiti al primo
+                            accesso e da lì aggiornati ad ogni aggiunta ed eliminazione.
+        """
+
+        if self._indice_dispensa is None:
+            indice = IndiceDispensa()
+            archivio = self._archivio
+            for id_ricetta in self._per_nome.values():
+                indice.aggiungi(id_ricetta, archivio.id_ingredienti(id_ricetta))
+            self._indice_dispensa = indice
+        return self._indice_dispensa
+
+    @property
+    def indice_somiglianze(self):
+
+        """
+        Returns:
+            IndiceSomiglianze: Le firme MinHash e i secchi LSH delle ricette, calcolati al primo
+                               accesso e da lì aggiornati ad ogni aggiunta ed eliminazione.
+        """
+
+        if self._indice_somiglianze is None:
+            indice = IndiceSomiglianze()
+            archivio = self._archivio
+            for id_ricetta in self._per_nome.values():                                  # Per id crescente, come vuole IndiceSomiglianze.aggiungi().
+                indice.aggiungi(id_ricetta, archivio.id_ingredienti(id_ricetta))
+            self._indice_somiglianze = indice
+        return self._indice_somiglianze
+
+    def cucinabili(self, ingredienti, mancanti=0, limite=None):
+
+        """
+        Restituisce le ricette che si possono preparare con gli ingredienti indicati,
+        comprandone al più `mancanti`, tramite i bitset dell'IndiceDispensa.
+
+        Args:
+            ingredienti (iterable): Ingredienti disponibili (maiuscole, accenti, spazi e sinonimi sono ignorati).
+            mancanti (int, optional): Numero massimo di ingredienti mancanti.
+            limite (int, optional): Numero massimo di risultati.
+
+        Returns:
+            list: Coppie (ricetta, lista degli ingredienti mancanti), prima quelle a cui manca
+                  meno, poi quelle che usano più ingredienti della dispensa.
+        """
+
+        cerca = self.dizionario.cerca
+        id_ingredienti = [i for i in map(cerca, ingredienti) if i is not None]          # Un ingrediente mai visto non è in nessuna ricetta.
+        archivio = self._archivio
+        nomi = self.dizionario
+        return [
+            (RicettaVista(archivio, id_ricetta), [nomi[i] for i in archivio.id_ingredienti(id_ricetta) if mancano >> i & 1])
+            for id_ricetta, mancano in self.indice_dispensa.cerca(id_ingredienti, mancanti, limite)
+        ]
+
+    def ricette_simili(self, ricetta, soglia=SOGLIA_SIMILI):
+
+        """
+        Restituisce le ricette con ingredienti quasi uguali a quelli della ricetta indicata.
+
+        Per avere somiglianza almeno `soglia` una ricetta deve contenere almeno
+        ceil(soglia * n) degli n ingredienti di riferimento, quindi almeno uno dei
+        n - ceil(soglia * n) + 1 più rari: basta unire le loro posting list per avere
+        tutti i candidati, senza errori e senza indici in più.
+
+        Se però anche quegli ingredienti sono comuni (sale, olio) le posting list coprono
+        buona parte del catalogo: oltre MASSIMO_CANDIDATI candidati, e se la soglia non è
+        sotto quella delle bande, i candidati sono le ricette che coincidono in almeno una
+        banda dell'indice_somiglianze, verificate con la somiglianza esatta. Come in
+        coppie_simili(), allora una ricetta sopra la soglia può sfuggire con una probabilità
+        piccola. Sotto la soglia delle bande resta la ricerca esatta, anche se lenta.
+
+        Args:
+            ricetta (dict): Ricetta di riferimento, del catalogo (viene esclusa dai risultati) o no.
+            soglia (float, optional): Somiglianza di Jaccard minima, sugli ingredienti canonici.
+
+        Returns:
+            list: Coppie (ricetta, somiglianza), dalla più simile (a parità, nell'ordine di inserimento).
+        """
+
+        archivio = self._archivio
+        id_ricetta = self.id_di(ricetta)
+        if id_ricetta is not None:
+            ingredienti = set(archivio.id_ingredienti(id_ricetta))
+        else:                                                                           # Ricetta esterna: gli ingredienti mai visti diventano id negativi, diversi da ogni altro.
+            cerca = self.dizionario.cerca
+            ingredienti = {cerca(nome) for nome in ricetta['ingredienti']} - {None}
+            nuovi = {self.dizionario.chiave(nome) for nome in ricetta['ingredienti'] if cerca(nome) is None}
+            ingredienti |= set(range(-len(nuovi), 0))
+        if soglia <= 0:                                                                 # Anche le ricette senza ingredienti in comune superano la soglia.
+            candidati = self._per_nome.values()
+        else:
+            posting = self.indice_ingredienti.posting
+            rari = sorted(ingredienti, key=lambda i: len(posting(i)))                  # Gli id negativi non hanno posting list: sono i più rari.
+            necessari = math.ceil(soglia * len(ingredienti) - 1e-9)                     # Tolleranza: 0.8 * 5 in virgola mobile non deve diventare 5.
+            rari = rari[:len(ingredienti) - necessari + 1]
+            if soglia < SOGLIA_BANDE or sum(len(posting(i)) for i in rari) <= self.MASSIMO_CANDIDATI:
+                candidati = set().union(*map(posting, rari))
+            else:
+                candidati = self.indice_somiglianze.candidati(ingredienti)
+        risultati = []
+        for candidato in candidati:
+            if candidato != id_ricetta:
+                somiglianza = jaccard(ingredienti, set(archivio.id_ingredienti(candidato)))
+                if somiglianza >= soglia:
+                    risultati.append((-somiglianza, candidato))
+        return [(RicettaVista(archivio, candidato), -somiglianza) for somiglianza, candidato in sorted(risultati)]
+
+    def coppie_simili(self, soglia=SOGLIA_SIMILI, indice=None):
+
+        """
+        Trova in tutto il catalogo le coppie di ricette con ingredienti quasi uguali,
+        confrontando solo le ricette che le bande MinHash/LSH mettono nello stesso secchio.
+
+        Senza `indice` usa l'indice_somiglianze del catalogo, con le firme e i secchi già
+        pronti; un `indice` diverso calcola le sue firme ad ogni chiamata, senza tenerle in
+        memoria. Le coppie sopra la soglia possono sfuggire con una probabilità piccola, che
+        cresce avvicinandosi alla soglia delle bande (vedi IndiceSomiglianze).
+
+        Args:
+            soglia (float, optional): Somiglianza di Jaccard minima, sugli ingredienti canonici.
+            indice (IndiceSomiglianze, optional): Firme e bande da usare al posto di quelle del catalogo.
+
+        Returns:
+            list: Tuple (ricetta, ricetta, somiglianza), dalla coppia più simile; in ogni coppia
+                  la prima ricetta è quella inserita prima.
+        """
+
+        archivio = self._archivio
+        if indice is None:
+            coppie = self.indice_somiglianze.coppie_indicizzate()
+        else:
+            firme = {}
+            for id_ricetta in self._per_nome.values():                                  # Per id crescente: la prima ricetta di ogni coppia è la più vecchia.
+                firma = indice.firma(archivio.id_ingredienti(id_ricetta))
+                if firma is not None:
+                    firme[id_ricetta] = firma
+            coppie = indice.coppie(firme)
+        insiemi = {}                                                                    # Cache: id ricetta -> insieme degli ingredienti, per i controlli esatti.
+        risultati = []
+        for primo, secondo in coppie:
+            for id_ricetta in (primo, secondo):
+                if id_ricetta not in insiemi:
+                    insiemi[id_ricetta] = set(archivio.id_ingredienti(id_ricetta))
+            somiglianza = jaccard(insiemi[primo], insiemi[secondo])
+            if somiglianza >= soglia:
+                risultati.append((-somiglianza, primo, secondo))
+        risultati.sort()
+        return [(RicettaVista(archivio, primo), RicettaVista(archivio, secondo), -somiglianza)
+                for somiglianza, primo, secondo in risultati]
@@ -0,0 +1,713 @@
+"""
+Riga di comando non interattiva: sottocomandi con risultato in JSON e modalità a lotti.
+
+    python -m ricette [--archivio FILE] add NOME --ingredienti "Pasta, Uova" --minutaggio 30
+    python -m ricette [--archivio FILE] delete NOME
+    python -m ricette [--archivio FILE] search [--nome TESTO] [--ingrediente TESTO] [--minutaggio N]
+    python -m ricette [--archivio FILE] filter [--tutti ...] [--esclusi ...] [--massimo N] [--limite N] ...
+    python -m ricette [--archivio FILE] pantry --ingredienti "Pasta, Uova, Sale" [--mancanti K] [--limite N]
+    python -m ricette [--archivio FILE] duplicates [--soglia 0.8] [--limite N]
+    python -m ricette [--archivio FILE] stats [--ingrediente NOME]
+    python -m ricette [--archivio FILE] import FILE | export FILE
+    python -m ricette [--archivio FILE] batch [FILE]
+    python -m ricette [--archivio FILE] serve [--host HOST] [--porta PORTA]
+
+L'archivio può essere un database SQLite (.db, .sqlite, .sqlite3), aggiornato ad ogni
+operazione, o un file JSONL/CSV, caricato in un CatalogoRicette e riscritto alla fine
+se è cambiato. Un'istantanea binaria (.istantanea, vedi ricette.istantanea) si apre in
+pochi millisecondi ed è la scelta migliore per le sole letture; dopo una modifica viene
+riscritta come i file JSONL/CSV (per crearne una: `--archivio ricette.istantanea import
+ricette.jsonl`). Senza --archivio si lavora sulle ricette di esempio, senza salvare.
+
+La modalità a lotti legge un'operazione JSON per riga, per esempio
+{"op": "add", "nome": "Carbonara", "ingredienti": ["Pasta", "Uova"], "minutaggio": 30},
+e scrive un risultato JSON per riga: l'archivio viene caricato una volta sola.
+
+`serve` espone le stesse operazioni via HTTP (vedi ricette.servizio); le scritture
+ricevute vengono salvate nell'archivio JSONL/CSV quando il servizio viene fermato.
+
+Con --metriche FILE vengono misurate le operazioni eseguite (chiamate, latenze, ricette
+restituite, vedi ricette.strumentazione) e alla fine le metriche vengono scritte in FILE,
+nel formato di Prometheus se l'estensione è .prom, altrimenti in JSON ('-': su stderr).
+--profila e --profila-memoria aggiungono il profilo cProfile e il picco di memoria delle
+operazioni indicate (nomi separati da virgole, per esempio "cerca,filtra", o "tutte").
+"""
+
+import argparse                                                                     # Importa argparse, per i sottocomandi e le opzioni della riga di comando.
+import json                                                                         # Importa json, per leggere le operazioni a lotti e scrivere i risultati.
+import os                                                                           # Importa os, usato per riconoscere il tipo di archivio e sostituire il file salvato.
+import sys                                                                          # Importa sys, per leggere da stdin e scrivere su stdout e stderr.
+import time                                                                         # Importa time, usato per misurare le operazioni al secondo dei lotti.
+
+from .catalogo import CatalogoRicette
+from .dati import lista_ricette
+from .importazione import esporta_file, importa_file, valida_ricetta
+from .interrogazioni import ORDINAMENTI, interroga
+from .indici import SOGLIA_BANDE, SOGLIA_SIMILI
+from .operazioni import trova_cucinabili, trova_duplicati, trova_ricette
+from .strumentazione import metriche, strumentata
+
+ESTENSIONI_SQLITE = ('.db', '.sqlite', '.sqlite3')                                 # Estensioni riconosciute come database SQLite.
+ESTENSIONE_ISTANTANEA = '.istantanea'                                               # Estensione delle istantanee binarie.
+ESTENSIONE_PROMETHEUS = '.prom'                                                     # Estensione dei file di metriche scritti nel formato di Prometheus.
+DIMENSIONE_BLOCCO_USCITA = 1000                                                     # Risultati dei lotti scritti con una sola write().
+INTERO_MASSIMO = 2 ** 63 - 1                                                        # Il più grande intero che SQLite sa confrontare.
+
+
+# Definisce una funzione di supporto che copia una ricetta (anche una vista o una riga SQLite) in un dizionario serializzabile.
+def _come_dizionario(ricetta):
+    if ricetta is None:
+        return None
+    return {'nome': ricetta['nome'], 'ingredienti': list(ricetta['ingredienti']), 'minutaggio': ricetta['minutaggio']}
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione di supporto che accetta gli ingredienti come lista o come testo separato da virgole.
+def _lista(valore):
+    if valore is None:
+        return ()
+    if isinstance(valore, str):
+        return [parte.strip() for parte in valore.split(',') if parte.strip()]
+    return valore
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione che apre l'archivio indicato e lo restituisce pronto per le operazioni.
+def apri_archivio(percorso=None):
+
+    """
+    Apre l'archivio delle ricette.
+
+    Args:
+        percorso (str, optional): Database SQLite, file JSONL/CSV o istantanea; se manca, le ricette di esempio.
+
+    Returns:
+        CatalogoRicette or RepositorySQLite: L'archivio aperto.
+
+    Raises:
+        ValueError: Se il formato del file non è supportato.
+    """
+
+    if percorso is None:
+        return CatalogoRicette(lista_ricette)
+    if percorso.lower().endswith(ESTENSIONI_SQLITE):
+        from .repository_sqlite import RepositorySQLite                                 # Importato solo quando serve, come in `ricette.__getattr__`.
+        return RepositorySQLite(percorso)
+    if percorso.lower().endswith(ESTENSIONE_ISTANTANEA):
+        if not os.path.exists(percorso):
+            return CatalogoRicette()
+        from .istantanea import carica_istantanea
+        return carica_istantanea(percorso)
+    if not percorso.lower().endswith(('.jsonl', '.csv')):
+        raise ValueError(f"Archivio '{percorso}' non supportato: usa un database SQLite, un file JSONL o CSV o un'istantanea.")
+    catalogo = CatalogoRicette()
+    if os.path.exists(percorso):
+        importa_file(catalogo, percorso)
+    return catalogo
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione che salva un archivio JSONL/CSV modificato e chiude un database.
+def chiudi_archivio(archivio, percorso=None, modificato=False):
+
+    """
+    Salva l'archivio se è un file JSONL/CSV o un'istantanea modificati, oppure chiude il database.
+
+    Il file viene scritto accanto all'originale e poi lo sostituisce, così un errore
+    a metà scrittura non lascia un archivio troncato.
+
+    Args:
+        archivio (CatalogoRicette or RepositorySQLite): Archivio aperto con apri_archivio().
+        percorso (str, optional): Percorso passato ad apri_archivio().
+        modificato (bool, optional): Se durante la sessione ci sono state aggiunte, eliminazioni o importazioni.
+    """
+
+    if hasattr(archivio, 'chiudi'):
+        archivio.chiudi()                                                               # SQLite ha già salvato ogni operazione.
+    elif percorso is not None and modificato:
+        temporaneo = percorso + '.tmp'
+        if percorso.lower().endswith(ESTENSIONE_ISTANTANEA):
+            from .istantanea import salva_istantanea
+            salva_istantanea(archivio, temporaneo)
+        else:
+            esporta_file(archivio, temporaneo, os.path.splitext(percorso)[1].lstrip('.').lower())
+        os.replace(temporaneo, percorso)                                                # Anche se il vecchio file è mappato: la mappa resta sul file precedente.
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce l'operazione che aggiunge una ricetta. Ogni operazione riceve l'archivio e i parametri e restituisce un risultato serializzabile in JSON.
+@strumentata('aggiungi')
+def aggiungi(archivio, nome=None, ingredienti=None, minutaggio=None):
+
+    """
+    Aggiunge una ricetta, validandola come le righe importate. Sul catalogo segnala anche
+    le ricette che hanno già quasi gli stessi ingredienti (vedi trova_simili()).
+
+    Returns:
+        dict: {'aggiunta': ricetta}, più {'simili': [{'nome': ..., 'somiglianza': ...}, ...]} sul catalogo.
+
+    Raises:
+        ValueError: Se la ricetta non è valida o il nome è già presente.
+    """
+
+    ricetta, motivo = valida_ricetta({'nome': nome, 'ingredienti': ingredienti, 'minutaggio': minutaggio})
+    if ricetta is None:
+        raise ValueError(motivo)
+    id_ricetta = archivio.append(ricetta)                                               # Solleva ValueError se il nome è già presente.
+    aggiunta = archivio.ricetta(id_ricetta)
+    risultato = {'aggiunta': _come_dizionario(aggiunta)}                                # Come è stata salvata, con gli ingredienti in forma canonica.
+    if hasattr(archivio, 'ricette_simili'):                                             # Su SQLite servirebbe una scansione completa ad ogni aggiunta: lì si usa `duplicates`.
+        risultato['simili'] = [{'nome': simile['nome'], 'somiglianza': round(somiglianza, 3)}
+                               for simile, somiglianza in archivio.ricette_simili(aggiunta)]
+    return risultato
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce l'operazione che elimina una ricetta per nome.
+@strumentata('elimina')
+def elimina(archivio, nome=None):
+
+    """
+    Elimina la ricetta con il nome indicato (senza distinguere maiuscole e minuscole).
+
+    Returns:
+        dict: {'eliminata': ricetta}.
+
+    Raises:
+        ValueError: Se la ricetta non esiste.
+    """
+
+    id_ricetta = archivio.id_per_nome(nome or '')
+    if id_ricetta is None:
+        raise ValueError(f"Ricetta '{nome}' non trovata.")
+    ricetta = _come_dizionario(archivio.ricetta(id_ricetta))
+    archivio.elimina_id(id_ricetta)
+    return {'eliminata': ricetta}
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce l'operazione di ricerca, con gli stessi criteri di cerca_ricette().
+def cerca(archivio, nome=None, ingrediente=None, minutaggio=None):
+
+    """
+    Cerca le ricette come cerca_ricette(): nome e ingrediente per sottostringa, minutaggio esatto.
+
+    Returns:
+        dict: {'numero': quante, 'ricette': [...]}.
+    """
+
+    ricette = [_come_dizionario(ricetta) for ricetta in trova_ricette(archivio, nome, ingrediente, minutaggio)]
+    return {'numero': len(ricette), 'ricette': ricette}
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce l'operazione di filtraggio, che usa un'Interrogazione.
+def filtra(archivio, nome=None, tutti=None, almeno_uno=None, esclusi=None, minimo=None, massimo=None,
+           ordina_per='inserimento', decrescente=False, limite=None, salta=0):
+
+    """
+    Filtra le ricette con un'Interrogazione (ingredienti, minutaggio, ordinamento e paginazione).
+
+    Returns:
+        dict: {'numero': quante, 'ricette': [...]}.
+
+    Raises:
+        ValueError: Se l'ordinamento non è supportato.
+    """
+
+    ricette = [_come_dizionario(ricetta) for ricetta in interroga(
+        archivio, nome=nome, tutti=_lista(tutti), almeno_uno=_lista(almeno_uno), esclusi=_lista(esclusi),
+        minimo=minimo, massimo=massimo, ordina_per=ordina_per, decrescente=decrescente, limite=limite, salta=salta)]
+    return {'numero': len(ricette), 'ricette': ricette}
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce l'operazione "cosa posso cucinare", con gli stessi criteri di trova_cucinabili().
+def dispensa(archivio, ingredienti=None, mancanti=0, limite=None):
+
+    """
+    Trova le ricette preparabili con gli ingredienti indicati, comprandone al più `mancanti`.
+
+    Returns:
+        dict: {'numero': quante, 'ricette': [{'ricetta': {...}, 'mancanti': [...]}, ...]}, dalla più completa.
+    """
+
+    risultati = [{'ricetta': _come_dizionario(ricetta), 'mancanti': list(mancano)}
+                 for ricetta, mancano in trova_cucinabili(archivio, _lista(ingredienti), mancanti, limite)]
+    return {'numero': len(risultati), 'ricette': risultati}
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce l'operazione che elenca le coppie di ricette quasi uguali.
+def duplicati(archivio, soglia=SOGLIA_SIMILI, limite=None):
+
+    """
+    Elenca le coppie di ricette con ingredienti quasi uguali, come trova_duplicati().
+
+    Le coppie candidate vengono dalle bande MinHash/LSH, che sotto SOGLIA_BANDE (circa
+    0.71) ne perdono la maggior parte: una soglia più bassa viene rifiutata invece di
+    restituire un elenco incompleto.
+
+    Returns:
+        dict: {'numero': quante coppie, 'coppie': [{'ricette': [nome, nome], 'somiglianza': ...}, ...]}, dalla più simile.
+
+    Raises:
+        ValueError: Se la soglia non è compresa tra SOGLIA_BANDE e 1.
+    """
+
+    soglia = float(soglia)
+    if not SOGLIA_BANDE <= soglia <= 1:
+        raise ValueError(f"la soglia deve essere compresa tra {SOGLIA_BANDE:.2f} e 1: sotto, le bande MinHash/LSH perdono la maggior parte delle coppie")
+    coppie = trova_duplicati(archivio, soglia)
+    risultati = [{'ricette': [prima['nome'], seconda['nome']], 'somiglianza': round(somiglianza, 3)}
+                 for prima, seconda, somiglianza in coppie[:limite]]
+    return {'numero': len(coppie), 'coppie': risultati}
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce l'operazione che raccoglie le statistiche.
+@strumentata('statistiche')
+def statistiche(archivio, ingrediente=None, numero=5):
+
+    """
+    Raccoglie le statistiche dell'archivio, già aggiornate dal catalogo o calcolate da SQLite.
+
+    Returns:
+        dict: Numero di ricette, durata minima/media/massima, ingredienti più e meno comuni,
+              ricette con più ingredienti e più minutaggio e, se indicato, la frequenza di un ingrediente.
+    """
+
+    dati = archivio.statistiche
+    durata = dati.durata()
+    meno_comuni, frequenza_minima = dati.meno_comuni()
+    risultato = {
+        'ricette': len(archivio),
+        'durata': None if durata is None else dict(zip(('minimo', 'media', 'massimo'), durata)),
+        'piu_comuni': [{'ingrediente': nome, 'frequenza': volte} for nome, volte in dati.piu_comuni(numero)],
+        'meno_comuni': {'ingredienti': meno_comuni, 'frequenza': frequenza_minima},
+        'piu_ingredienti': None,
+        'piu_minutaggio': None,
+    }
+    if len(archivio):
+        risultato['piu_ingredienti'] = _come_dizionario(archivio.ricetta(dati.id_con_piu_ingredienti()))
+        risultato['piu_minutaggio'] = _come_dizionario(archivio.ricetta(dati.id_con_piu_minutaggio()))
+    if ingrediente:
+        risultato['frequenza'] = {'ingrediente': ingrediente, 'volte': dati.frequenza(ingrediente)}
+    return risultato
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione di supporto che converte un RapportoTrasferimento in un dizionario.
+def _rapporto(rapporto):
+    return {'lette': rapporto.lette, 'scritte': rapporto.scritte, 'scartate': rapporto.scartate,
+            'duplicate': rapporto.duplicate, 'errori': [list(errore) for errore in rapporto.errori],
+            'secondi': round(rapporto.secondi, 6)}
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce l'operazione che importa un file nell'archivio.
+def importa(archivio, percorso=None, formato=None):
+
+    """
+    Importa un file JSONL o CSV nell'archivio.
+
+    Returns:
+        dict: Il rapporto dell'importazione.
+
+    Raises:
+        ValueError: Se il formato non è supportato.
+        OSError: Se il file non può essere letto.
+    """
+
+    return _rapporto(importa_file(archivio, percorso, formato))
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce l'operazione che esporta l'archivio in un file.
+def esporta(archivio, percorso=None, formato=None):
+
+    """
+    Esporta l'archivio in un file JSONL o CSV.
+
+    Returns:
+        dict: Il rapporto dell'esportazione.
+
+    Raises:
+        ValueError: Se il formato non è supportato.
+        OSError: Se il file non può essere scritto.
+    """
+
+    return _rapporto(esporta_file(archivio, percorso, formato))
+
+
+
+OPERAZIONI = {                                                                      # Nome dell'operazione (sottocomando o campo "op" dei lotti) -> funzione.
+    'add': aggiungi, 'aggiungi': aggiungi,
+    'delete': elimina, 'elimina': elimina,
+    'search': cerca, 'cerca': cerca,
+    'filter': filtra, 'filtra': filtra,
+    'pantry': dispensa, 'dispensa': dispensa,
+    'duplicates': duplicati, 'duplicati': duplicati,
+    'stats': statistiche, 'statistiche': statistiche,
+    'import': importa, 'importa': importa,
+    'export': esporta, 'esporta': esporta,
+}
+OPERAZIONI_DI_SCRITTURA = {'add', 'aggiungi', 'delete', 'elimina', 'import', 'importa'}  # Dopo queste un archivio JSONL/CSV va salvato.
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce il controllo dei parametri di testo. Ogni controllo restituisce il motivo per cui il valore non va bene, o None.
+def _testo(valore):
+    if valore is not None and not isinstance(valore, str):
+        return "deve essere un testo"
+    return None
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce il controllo degli elenchi di ingredienti, accettati come lista o come testo separato da virgole (vedi _lista()).
+def _elenco(valore):
+    if valore is not None and not isinstance(valore, str) and not (
+            isinstance(valore, list) and all(isinstance(elemento, str) for elemento in valore)):
+        return "deve essere un testo o una lista di testi"
+    return None
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce il controllo dei parametri interi, come i minutaggi cercati.
+def _intero(valore):
+    if valore is not None and (isinstance(valore, bool) or not isinstance(valore, int) or abs(valore) > INTERO_MASSIMO):
+        return "deve essere un numero intero"
+    return None
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce il controllo dei conteggi, che non possono essere negativi.
+def _naturale(valore):
+    if isinstance(valore, bool) or not isinstance(valore, int) or not 0 <= valore <= INTERO_MASSIMO:
+        return "deve essere un numero intero maggiore o uguale a 0"
+    return None
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce il controllo dei limiti, dove None vuol dire nessun limite.
+def _limite(valore):
+    return None if valore is None else _naturale(valore)
+
+
+
+CONTROLLI_PARAMETRI = {                                                             # Funzione dell'operazione -> {parametro: controllo}.
+    aggiungi: {'nome': _testo, 'ingredienti': _elenco},                                 # Il minutaggio lo controlla valida_ricetta(), come per le righe importate.
+    elimina: {'nome': _testo},
+    cerca: {'nome': _testo, 'ingrediente': _testo, 'minutaggio': _intero},
+    filtra: {'nome': _testo, 'tutti': _elenco, 'almeno_uno': _elenco, 'esclusi': _elenco, 'minimo': _intero,
+             'massimo': _intero, 'ordina_per': _testo, 'limite': _limite, 'salta': _naturale},
+    dispensa: {'ingredienti': _elenco, 'mancanti': _naturale, 'limite': _limite},
+    duplicati: {'limite': _limite},
+    statistiche: {'ingrediente': _testo, 'numero': _naturale},
+    importa: {'percorso': _testo, 'formato': _testo},
+    esporta: {'percorso': _testo, 'formato': _testo},
+}
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione che controlla i parametri di un'operazione prima di eseguirla.
+def controlla_parametri(nome_operazione, parametri):
+
+    """
+    Controlla che l'operazione esista e che i suoi parametri abbiano il tipo giusto,
+    così un valore sbagliato diventa un errore dell'operazione e non un'eccezione a metà.
+
+    Args:
+        nome_operazione (str): Nome dell'operazione, per esempio 'add' o 'cerca'.
+        parametri (dict): Parametri dell'operazione.
+
+    Returns:
+        function: La funzione che esegue l'operazione.
+
+    Raises:
+        ValueError: Se l'operazione non esiste o un parametro non è valido.
+    """
+
+    operazione = OPERAZIONI.get(nome_operazione) if isinstance(nome_operazione, str) else None
+    if operazione is None:
+        raise ValueError(f"operazione '{nome_operazione}' non supportata")
+    controlli = CONTROLLI_PARAMETRI[operazione]
+    for nome, valore in parametri.items():
+        controllo = controlli.get(nome)
+        motivo = None if controllo is None else controllo(valore)                       # I parametri sconosciuti li segnala la chiamata.
+        if motivo is not None:
+            raise ValueError(f"parametro '{nome}' non valido: {motivo}")
+    return operazione
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione che esegue un'operazione indicata per nome, con i parametri in un dizionario.
+def esegui_operazione(archivio, nome_operazione, parametri):
+
+    """
+    Esegue l'operazione `nome_operazione` (un sottocomando) con i parametri indicati.
+
+    Args:
+        archivio (CatalogoRicette or RepositorySQLite): Archivio su cui lavorare.
+        nome_operazione (str): Nome dell'operazione, per esempio 'add' o 'cerca'.
+        parametri (dict): Parametri dell'operazione.
+
+    Returns:
+        dict: Il risultato dell'operazione, serializzabile in JSON.
+
+    Raises:
+        ValueError: Se l'operazione non esiste, i parametri non sono validi o l'operazione fallisce.
+    """
+
+    operazione = controlla_parametri(nome_operazione, parametri)
+    try:
+        return operazione(archivio, **parametri)
+    except TypeError as errore:                                                         # Parametri sconosciuti o di tipo sbagliato.
+        raise ValueError(f"parametri non validi: {errore}") from None
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce la funzione che esegue un lotto di operazioni JSON sullo stesso archivio.
+def esegui_lotto(archivio, righe, uscita):
+
+    """
+    Esegue un'operazione per riga e scrive un risultato JSON per riga.
+
+    Ogni riga è un oggetto con il campo "op" (il nome del sottocomando) e i parametri
+    dell'operazione; le righe vuote e quelle che iniziano con # vengono ignorate. Un
+    errore non interrompe il lotto: la riga del risultato contiene il campo "errore".
+
+    Args:
+        archivio (CatalogoRicette or RepositorySQLite): Archivio su cui lavorare.
+        righe (iterable): Righe di testo, per esempio un file aperto o sys.stdin.
+        uscita (file): Dove scrivere i risultati.
+
+    Returns:
+        dict: {'eseguite', 'errori', 'modificato', 'secondi', 'operazioni_al_secondo'}.
+    """
+
+    inizio = time.perf_counter()
+    eseguite = errori = 0
+    modificato = False
+    blocco = []
+    for numero_riga, riga in enumerate(righe, start=1):
+        riga = riga.strip()
+        if not riga or riga.startswith('#'):
+            continue
+        risultato = {'riga': numero_riga}
+        try:
+            parametri = json.loads(riga)
+            if not isinstance(parametri, dict):
+                raise ValueError("la riga non è un oggetto")
+            nome_operazione = parametri.pop('op', None)
+            risultato['op'] = nome_operazione
+            risultato['risultato'] = esegui_operazione(archivio, nome_operazione, parametri)
+            modificato = modificato or nome_operazione in OPERAZIONI_DI_SCRITTURA
+        except Exception as errore:                                                     # Anche un errore inatteso riguarda solo la sua riga: il lotto prosegue.
+            risultato['errore'] = str(errore)
+            errori += 1
+        eseguite += 1
+        blocco.append(json.dumps(risultato, ensure_ascii=False))
+        if len(blocco) >= DIMENSIONE_BLOCCO_USCITA:
+            uscita.write('\n'.join(blocco) + '\n')
+            blocco = []
+    if blocco:
+        uscita.write('\n'.join(blocco) + '\n')
+    secondi = time.perf_counter() - inizio
+    return {'eseguite': eseguite, 'errori': errori, 'modificato': modificato, 'secondi': round(secondi, 6),
+            'operazioni_al_secondo': round(eseguite / secondi) if secondi else 0}
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione di supporto che serve l'archivio via HTTP finché il processo non viene interrotto.
+def _servi(archivio, host, porta):
+
+    """
+    Avvia il servizio HTTP sulle ricette dell'archivio e, alla fine, riporta nell'archivio
+    le scritture ricevute.
+
+    Returns:
+        tuple: (catalogo con le scritture applicate, True se ci sono state scritture).
+
+    Raises:
+        ValueError: Se l'archivio è un database SQLite: il servizio lavora in memoria.
+    """
+
+    if hasattr(archivio, 'chiudi'):
+        raise ValueError("il servizio lavora in memoria: usa un archivio JSONL o CSV")
+    import asyncio
+    from .servizio import ServizioRicette                                               # Importato qui: servizio importa a sua volta questo modulo.
+
+    def pronto(host, porta):
+        print(f"In ascolto su http://{host}:{porta}", file=sys.stderr, flush=True)
+
+    servizio = ServizioRicette(archivio)
+    try:
+        asyncio.run(servizio.servi(host, porta, pronto))
+    except KeyboardInterrupt:
+        pass
+    return servizio.istantanea(), servizio.modificato
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione di supporto che aggiunge a un parser le opzioni comuni a tutti i sottocomandi.
+def _opzioni_comuni(parser, predefinito):
+    parser.add_argument('--archivio', '-a', default=predefinito,
+                        help="database SQLite (.db) o file JSONL/CSV; se manca, le ricette di esempio")
+    parser.add_argument('--indenta', type=int, default=predefinito, help="indentazione del JSON (di base su una riga)")
+    parser.add_argument('--metriche', default=predefinito, metavar='FILE',
+                        help="misura le operazioni e scrive le metriche in FILE (.prom: Prometheus, altrimenti JSON; '-': stderr)")
+    parser.add_argument('--profila', default=predefinito, metavar='OPERAZIONI',
+                        help="profila con cProfile le operazioni indicate, separate da virgole ('tutte' per tutte)")
+    parser.add_argument('--profila-memoria', default=predefinito, metavar='OPERAZIONI',
+                        help="misura con tracemalloc il picco di memoria delle operazioni indicate, separate da virgole")
+    return parser
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione di supporto che attiva le metriche chieste dalla riga di comando e restituisce dove scriverle.
+def _attiva_metriche(percorso, profila, profila_memoria):
+    if percorso is None and not profila and not profila_memoria:
+        return None
+    profilo, memoria = (True if valore == 'tutte' else _lista(valore) for valore in (profila, profila_memoria))
+    metriche.abilita(profilo, memoria)
+    return percorso or '-'
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione di supporto che scrive le metriche raccolte in un file JSON o Prometheus, o su stderr.
+def _scrivi_metriche(percorso):
+    if percorso.endswith(ESTENSIONE_PROMETHEUS):
+        testo = metriche.esporta_prometheus()
+    else:
+        testo = json.dumps(metriche.esporta(), ensure_ascii=False, indent=2) + '\n'
+    if percorso == '-':
+        sys.stderr.write(testo)
+        return
+    with open(percorso, 'w', encoding='utf-8') as file:
+        file.write(testo)
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione che costruisce il parser della riga di comando.
+def crea_parser():
+
+    """
+    Returns:
+        argparse.ArgumentParser: Il parser con tutti i sottocomandi.
+    """
+
+    parser = _opzioni_comuni(argparse.ArgumentParser(
+        prog='python -m ricette', description="Gestione delle ricette dalla riga di comando, con risultati in JSON."), None)
+    comuni = _opzioni_comuni(argparse.ArgumentParser(add_help=False), argparse.SUPPRESS)  # Accettate anche dopo il sottocomando, senza sovrascrivere quelle date prima.
+    sottocomandi = parser.add_subparsers(dest='comando', required=True, metavar='comando')
+
+    comando = sottocomandi.add_parser('add', aliases=['aggiungi'], parents=[comuni], help="aggiunge una ricetta")
+    comando.add_argument('nome')
+    comando.add_argument('--ingredienti', '-i', required=True, help="ingredienti separati da virgole")
+    comando.add_argument('--minutaggio', '-m', required=True, type=int)
+
+    comando = sottocomandi.add_parser('delete', aliases=['elimina'], parents=[comuni], help="elimina una ricetta per nome")
+    comando.add_argument('nome')
+
+    comando = sottocomandi.add_parser('search', aliases=['cerca'], parents=[comuni], help="cerca per nome, ingrediente o minutaggio")
+    comando.add_argument('--nome', '-n', help="testo contenuto nel nome")
+    comando.add_argument('--ingrediente', '-i', help="testo contenuto in un ingrediente")
+    comando.add_argument('--minutaggio', '-m', type=int, help="minutaggio esatto")
+
+    comando = sottocomandi.add_parser('filter', aliases=['filtra'], parents=[comuni], help="filtra, ordina e pagina le ricette")
+    comando.add_argument('--nome', '-n', help="testo contenuto nel nome")
+    comando.add_argument('--tutti', nargs='+', metavar='INGREDIENTE', help="ingredienti tutti presenti")
+    comando.add_argument('--almeno-uno', nargs='+', metavar='INGREDIENTE', help="ingredienti di cui almeno uno presente")
+    comando.add_argument('--esclusi', nargs='+', metavar='INGREDIENTE', help="ingredienti assenti")
+    comando.add_argument('--minimo', type=int, help="minutaggio minimo (incluso)")
+    comando.add_argument('--massimo', type=int, help="minutaggio massimo (incluso)")
+    comando.add_argument('--ordina-per', choices=ORDINAMENTI, default='inserimento')
+    comando.add_argument('--decrescente', action='store_true')
+    comando.add_argument('--limite', type=int)
+    comando.add_argument('--salta', type=int, default=0)
+
+    comando = sottocomandi.add_parser('pantry', aliases=['dispensa'], parents=[comuni],
+                                      help="ricette preparabili con gli ingredienti che hai, ammettendo qualche mancante")
+    comando.add_argument('--ingredienti', '-i', required=True, help="ingredienti disponibili separati da virgole")
+    comando.add_argument('--mancanti', '-k', type=int, default=0, help="ingredienti mancanti ammessi")
+    comando.add_argument('--limite', type=int)
+
+    comando = sottocomandi.add_parser('duplicates', aliases=['duplicati'], parents=[comuni],
+                                      help="coppie di ricette con ingredienti quasi uguali (MinHash/LSH)")
+    comando.add_argument('--soglia', type=float, default=SOGLIA_SIMILI, help=f"somiglianza di Jaccard minima, tra {SOGLIA_BANDE:.2f} e 1")
+    comando.add_argument('--limite', type=int, help="coppie da mostrare")
+
+    comando = sottocomandi.add_parser('stats', aliases=['statistiche'], parents=[comuni], help="statistiche su ingredienti e durata")
+    comando.add_argument('--ingrediente', '-i', help="mostra anche la frequenza di questo ingrediente")
+    comando.add_argument('--numero', type=int, default=5, help="quanti ingredienti più comuni mostrare")
+
+    for nome, alias, aiuto in (('import', 'importa', "importa un file JSONL o CSV"),
+                               ('export', 'esporta', "esporta in un file JSONL o CSV")):
+        comando = sottocomandi.add_parser(nome, aliases=[alias], parents=[comuni], help=aiuto)
+        comando.add_argument('percorso')
+        comando.add_argument('--formato', choices=('jsonl', 'csv'), help="di base dedotto dall'estensione")
+
+    comando = sottocomandi.add_parser('serve', aliases=['servi'], parents=[comuni],
+                                      help="avvia il servizio HTTP/JSON sul catalogo in memoria (vedi ricette.servizio)")
+    comando.add_argument('--host', default='127.0.0.1')
+    comando.add_argument('--porta', type=int, default=8080)
+
+    comando = sottocomandi.add_parser('batch', aliases=['lotto'], parents=[comuni], help="esegue le operazioni JSON lette da un file o da stdin")
+    comando.add_argument('percorso', nargs='?', default='-', help="file delle operazioni, una per riga ('-' per stdin)")
+    return parser
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce la funzione principale della riga di comando.
+def riga_di_comando(argomenti=None):
+
+    """
+    Esegue un sottocomando e ne scrive il risultato in JSON su stdout.
+
+    Args:
+        argomenti (list, optional): Argomenti della riga di comando; se mancano, sys.argv[1:].
+
+    Returns:
+        int: Codice di uscita: 0 se tutto è andato a buon fine, 1 in caso di errore.
+    """
+
+    parametri = vars(crea_parser().parse_args(argomenti))
+    percorso = parametri.pop('archivio')
+    indenta = parametri.pop('indenta')
+    nome_comando = parametri.pop('comando')
+    file_metriche = _attiva_metriche(parametri.pop('metriche'), parametri.pop('profila'), parametri.pop('profila_memoria'))
+    try:
+        archivio = apri_archivio(percorso)
+    except (ValueError, OSError) as errore:
+        print(json.dumps({'errore': str(errore)}, ensure_ascii=False), file=sys.stderr)
+        return 1
+
+    modificato = False
+    codice = 0
+    try:
+        if nome_comando in ('batch', 'lotto'):
+            if parametri['percorso'] == '-':
+                riepilogo = esegui_lotto(archivio, sys.stdin, sys.stdout)
+            else:
+                with open(parametri['percorso'], encoding='utf-8') as file:
+                    riepilogo = esegui_lotto(archivio, file, sys.stdout)
+            modificato = riepilogo['modificato']
+            codice = 1 if riepilogo['errori'] else 0
+            print(json.dumps(riepilogo), file=sys.stderr)                              # Il riepilogo va su stderr, così stdout contiene solo i risultati.
+        else:
+            try:
+                if nome_comando in ('serve', 'servi'):
+                    archivio, modificato = _servi(archivio, **parametri)
+                    return 0
+                risultato = esegui_operazione(archivio, nome_comando, parametri)
+                modificato = nome_comando in OPERAZIONI_DI_SCRITTURA
+            except (ValueError, OSError) as errore:
+                risultato = {'errore': str(errore)}
+                codice = 1
+            print(json.dumps(risultato, ensure_ascii=False, indent=indenta))
+    finally:
+        chiudi_archivio(archivio, percorso, modificato)
+        if file_metriche is not None:
+            _scrivi_metriche(file_metriche)
+    return codice
@@ -0,0 +1,47 @@
+"""
+Ricette di esempio con cui viene inizializzato il catalogo.
+"""
+
+
+# Lista con all'interno tutte le ricette.
+lista_ricette= [
+    
+     # Ogni ricetta è un dizionario con il nome della ricetta, una lista di ingredienti e il minutaggio richiesto.
+    {'nome': 'Carbonara','ingredienti': ['Pasta','Uova','Pecorino','Parmigiano','Pepe Nero','Guanciale'],'minutaggio': 30} ,
+    {'nome': 'Matriciana','ingredienti': ['Pasta','Sugo di Pomodoro','Pecorino','Pepe Nero','Guanciale'],'minutaggio': 45},
+    {'nome': 'Pesto','ingredienti': ['Aglio','Basilico','Pinoli','Olio','Sale'],'minutaggio': 10},
+    {'nome': 'Polpetta','ingredienti': ['Carne Macinata','Uova','Pane','Pepe Nero','Sale','Parmigiano'],'minutaggio': 20},
+    {'nome': 'Margherita','ingredienti': ['Sugo di Pomodoro','Mozzarella','Basilico','Olioo'],'minutaggio': 15},
+    {'nome': 'Lasagna', 'ingredienti': ['Pasta', 'Carne Macinata', 'Sugo di Pomodoro', 'Besciamella', 'Mozzarella', 'Parmigiano'], 'minutaggio': 90},
+    {'nome': 'Risotto ai Funghi', 'ingredienti': ['Riso', 'Funghi', 'Brodo Vegetale', 'Vino Bianco', 'Cipolla', 'Parmigiano'], 'minutaggio': 40},
+    {'nome': 'Tiramisu', 'ingredienti': ['Mascarpone', 'Uova', 'Caffè', 'Savoiardi', 'Zucchero', 'Cacao in Polvere'], 'minutaggio': 30},
+    {'nome': 'Cacciatora', 'ingredienti': ['Pollo', 'Pomodoro', 'Cipolla', 'Olive', 'Vino Rosso', 'Rosmarino'], 'minutaggio': 60},
+    {'nome': 'Frittata di Patate', 'ingredienti': ['Uova', 'Patate', 'Cipolla', 'Parmigiano', 'Sale', 'Pepe'], 'minutaggio': 30},
+    {'nome': 'Caprese', 'ingredienti': ['Mozzarella', 'Pomodoro', 'Basilico', 'Olio d\'Oliva', 'Sale'], 'minutaggio': 10},
+    {'nome': 'Zuppa di Legumi', 'ingredienti': ['Legumi Misti', 'Brodo Vegetale', 'Carota', 'Cipolla', 'Sedano', 'Pomodoro'], 'minutaggio': 50},
+    {'nome': 'Pollo al Limone', 'ingredienti': ['Pollo', 'Limone', 'Olio d\'Oliva', 'Aglio', 'Rosmarino', 'Sale', 'Pepe'], 'minutaggio': 40},
+    {'nome': 'Pancakes', 'ingredienti': ['Farina', 'Latte', 'Uova', 'Zucchero', 'Lievito in Polvere', 'Burro'], 'minutaggio': 20},
+    {'nome': 'Couscous alle Verdure', 'ingredienti': ['Couscous', 'Zucchine', 'Peperoni', 'Pomodorini', 'Cipolla', 'Olio d\'Oliva'], 'minutaggio': 30},
+    {'nome': 'Spaghetti Aglio e Olio', 'ingredienti': ['Spaghetti', 'Aglio', 'Peperoncino', 'Olio d\'Oliva', 'Prezzemolo'], 'minutaggio': 20},
+    {'nome': 'Sgombro al Forno', 'ingredienti': ['Sgombro', 'Limone', 'Rosmarino', 'Olio d\'Oliva', 'Sale', 'Pepe'], 'minutaggio': 25},
+    {'nome': 'Involtini di Melanzane', 'ingredienti': ['Melanzane', 'Ricotta', 'Pomodoro', 'Mozzarella', 'Basilico'], 'minutaggio': 45},
+    {'nome': 'Torta di Mele', 'ingredienti': ['Mele', 'Farina', 'Zucchero', 'Uova', 'Burro', 'Lievito in Polvere'], 'minutaggio': 60},
+    {'nome': 'Gnocchi al Pesto', 'ingredienti': ['Gnocchi di Patate', 'Pesto', 'Parmigiano'], 'minutaggio': 20},
+    {'nome': 'Boeuf Bourguignon', 'ingredienti': ['Manzo', 'Vino Rosso', 'Carota', 'Cipolla', 'Funghi', 'Bacon', 'Brodo di Carne'], 'minutaggio': 120},
+    {'nome': 'Falafel', 'ingredienti': ['Ceci', 'Aglio', 'Cipolla', 'Prezzemolo', 'Coriandolo', 'Cumino', 'Farina'], 'minutaggio': 45},
+    {'nome': 'Moussaka', 'ingredienti': ['Melanzane', 'Carne Macinata', 'Pomodoro', 'Cipolla', 'Besciamella', 'Parmigiano'], 'minutaggio': 90},
+    {'nome': 'Chili con Carne', 'ingredienti': ['Carne Macinata', 'Fagioli', 'Pomodoro', 'Peperoni', 'Cipolla', 'Spezie'], 'minutaggio': 60},
+    {'nome': 'Zuppa di Cipolle', 'ingredienti': ['Cipolla', 'Brodo di Carne', 'Pane', 'Formaggio Gruyère', 'Burro'], 'minutaggio': 50},
+    {'nome': 'Insalata di Tonno', 'ingredienti': ['Tonno in scatola', 'Pomodori', 'Cetrioli', 'Olive', 'Cipolla', 'Olio d\'Oliva'], 'minutaggio': 15},
+    {'nome': 'Tacos', 'ingredienti': ['Tortillas', 'Carne Macinata', 'Lattuga', 'Pomodoro', 'Formaggio', 'Salsa'], 'minutaggio': 30},
+    {'nome': 'Pasta al Pesto di Rucola', 'ingredienti': ['Pasta', 'Rucola', 'Noci', 'Parmigiano', 'Olio d\'Oliva', 'Aglio'], 'minutaggio': 20},
+    {'nome': 'Ratatouille', 'ingredienti': ['Melanzane', 'Zucchine', 'Peperoni', 'Pomodoro', 'Cipolla', 'Aglio', 'Olio d\'Oliva'], 'minutaggio': 60},
+    {'nome': 'Polpette di Ricotta', 'ingredienti': ['Ricotta', 'Farina', 'Uova', 'Parmigiano', 'Prezzemolo', 'Sale'], 'minutaggio': 30},
+    {'nome': 'Pancetta alla Griglia', 'ingredienti': ['Pancetta', 'Sale', 'Pepe', 'Rosmarino', 'Olio d\'Oliva'], 'minutaggio': 20},
+    {'nome': 'Frittelle di Zucchine', 'ingredienti': ['Zucchine', 'Farina', 'Uova', 'Parmigiano', 'Aglio', 'Prezzemolo'], 'minutaggio': 25},
+    {'nome': 'Crostini al Pomodoro', 'ingredienti': ['Pane', 'Pomodori', 'Aglio', 'Basilico', 'Olio d\'Oliva', 'Sale'], 'minutaggio': 15},
+    {'nome': 'Quiche Lorraine', 'ingredienti': ['Pasta Brisè', 'Panna', 'Uova', 'Bacon', 'Formaggio Gruyère', 'Cipolla'], 'minutaggio': 50},
+    {'nome': 'Sgombro alla Griglia', 'ingredienti': ['Sgombro', 'Limone', 'Rosmarino', 'Olio d\'Oliva', 'Sale', 'Pepe'], 'minutaggio': 25},
+    {'nome': 'Torta Salata con Spinaci e Ricotta', 'ingredienti': ['Pasta Brisè', 'Spinaci', 'Ricotta', 'Parmigiano', 'Uova', 'Noce Moscata'], 'minutaggio': 45}
+    
+    ]
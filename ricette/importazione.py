@@ -0,0 +1,347 @@
+"""
+Importazione ed esportazione in streaming delle ricette, in formato JSONL e CSV.
+
+Le righe vengono lette, validate, deduplicate per nome e inserite a blocchi: in memoria
+c'è al massimo un blocco alla volta, qualunque sia la dimensione del file.
+"""
+
+import csv                                                                          # Importa csv, per leggere e scrivere file CSV.
+import json                                                                         # Importa json, per leggere e scrivere file JSONL (un oggetto JSON per riga).
+import os                                                                           # Importa os, usato per riconoscere il formato dall'estensione del file.
+import time                                                                         # Importa time, usato per misurare le righe al secondo.
+from itertools import islice                                                        # Importa islice, usato per dividere il flusso in blocchi.
+
+from .indici import normalizza_chiave
+
+CAMPI = ('nome', 'ingredienti', 'minutaggio')                                       # Colonne dei file CSV, nell'ordine in cui vengono scritte.
+MASSIMO_ERRORI_CONSERVATI = 100                                                     # Oltre questo numero gli errori vengono solo contati, per non occupare memoria.
+MINUTAGGIO_MASSIMO = 2 ** 32 - 1                                                    # Il catalogo conserva i minutaggi in un array('I'), quindi in 32 bit senza segno.
+
+
+# Definisce il rapporto di un'importazione o esportazione, con i conteggi e la velocità in righe al secondo.
+class RapportoTrasferimento:
+
+    """
+    Conteggi e tempi di un'importazione o di un'esportazione.
+
+    Attributes:
+        lette (int): Righe lette dal file (o ricette lette dal catalogo).
+        scartate (int): Righe non valide.
+        duplicate (int): Righe saltate perché il nome era già presente.
+        scritte (int): Ricette inserite nel catalogo (o scritte nel file).
+        errori (list): Primi errori incontrati, come tuple (numero di riga, motivo).
+    """
+
+    def __init__(self):
+        self.lette = 0
+        self.scartate = 0
+        self.duplicate = 0
+        self.scritte = 0
+        self.errori = []
+        self._inizio = time.perf_counter()
+        self._fine = None
+
+    def errore(self, numero_riga, motivo):
+
+        """
+        Registra una riga scartata.
+
+        Args:
+            numero_riga (int): Numero della riga nel file (da 1).
+            motivo (str): Perché la riga è stata scartata.
+        """
+
+        self.scartate += 1
+        if len(self.errori) < MASSIMO_ERRORI_CONSERVATI:
+            self.errori.append((numero_riga, motivo))
+
+    def termina(self):
+
+        """
+        Ferma il cronometro del trasferimento.
+        """
+
+        self._fine = time.perf_counter()
+
+    @property
+    def secondi(self):
+        return (self._fine or time.perf_counter()) - self._inizio
+
+    @property
+    def righe_al_secondo(self):
+        return self.lette / self.secondi if self.secondi else 0.0
+
+    def __str__(self):
+        return (f"{self.lette} righe lette, {self.scritte} scritte, {self.scartate} scartate, "
+                f"{self.duplicate} duplicate in {self.secondi:.2f} s ({self.righe_al_secondo:,.0f} righe/s)")
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione che legge un file JSONL una riga alla volta.
+def leggi_jsonl(file):
+
+    """
+    Legge le ricette da un file JSONL (un oggetto JSON per riga), una alla volta.
+
+    Args:
+        file (file): File di testo aperto in lettura.
+
+    Returns:
+        generator: Tuple (numero di riga, oggetto letto oppure stringa con l'errore di lettura).
+    """
+
+    for numero_riga, riga in enumerate(file, start=1):
+        if not riga.strip():
+            continue                                                                    # Ignora le righe vuote.
+        try:
+            yield numero_riga, json.loads(riga)
+        except json.JSONDecodeError as errore:
+            yield numero_riga, f"JSON non valido: {errore.msg}"
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione che legge un file CSV una riga alla volta.
+def leggi_csv(file, separatore_ingredienti=','):
+
+    """
+    Legge le ricette da un file CSV con intestazione nome, ingredienti, minutaggio.
+
+    Gli ingredienti stanno tutti in una cella, separati da `separatore_ingredienti`
+    (la cella va racchiusa tra virgolette se il separatore è la virgola).
+
+    Args:
+        file (file): File di testo aperto in lettura (con newline='').
+        separatore_ingredienti (str, optional): Separatore degli ingredienti nella cella.
+
+    Returns:
+        generator: Tuple (numero di riga, dizionario letto).
+    """
+
+    lettore = csv.DictReader(file)
+    for riga in lettore:
+        ingredienti = riga.get('ingredienti')
+        if ingredienti is not None:
+            riga['ingredienti'] = ingredienti.split(separatore_ingredienti)
+        yield lettore.line_num, riga
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione che controlla e pulisce una riga letta, restituendo la ricetta o il motivo per cui non è valida.
+def valida_ricetta(dati):
+
+    """
+    Controlla una riga letta e la trasforma in una ricetta pulita.
+
+    Args:
+        dati (dict): Riga letta dal file.
+
+    Returns:
+        tuple: (ricetta, None) se la riga è valida, altrimenti (None, motivo).
+    """
+
+    if not isinstance(dati, dict):
+        return None, dati if isinstance(dati, str) else "la riga non è un oggetto"
+    nome = dati.get('nome')
+    if not isinstance(nome, str) or not nome.strip():
+        return None, "nome mancante"
+    ingredienti = dati.get('ingredienti')
+    if isinstance(ingredienti, str):
+        ingredienti = ingredienti.split(',')
+    if not isinstance(ingredienti, list) or not all(isinstance(i, str) for i in ingredienti):
+        return None, "ingredienti non validi"
+    ingredienti = [ingrediente.strip() for ingrediente in ingredienti if ingrediente.strip()]  # Toglie gli spazi inutili e le voci vuote, come aggiungi_ricetta().
+    if not ingredienti:
+        return None, "nessun ingrediente"
+    minutaggio = dati.get('minutaggio')
+    if isinstance(minutaggio, bool) or (isinstance(minutaggio, float) and not minutaggio.is_integer()):
+        return None, "minutaggio non valido"                                           # int() troncherebbe 3.5 a 3 senza dire nulla.
+    try:
+        minutaggio = int(minutaggio)
+    except (TypeError, ValueError, OverflowError):
+        return None, "minutaggio non valido"
+    if minutaggio <= 0:
+        return None, "il minutaggio deve essere maggiore di 0"
+    if minutaggio > MINUTAGGIO_MASSIMO:
+        return None, f"il minutaggio non può superare {MINUTAGGIO_MASSIMO}"
+    return {'nome': nome.strip(), 'ingredienti': ingredienti, 'minutaggio': minutaggio}, None
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione che divide un flusso in blocchi di dimensione fissa.
+def a_blocchi(elementi, dimensione):
+
+    """
+    Divide un iterabile in liste di al massimo `dimensione` elementi.
+
+    Args:
+        elementi (iterable): Elementi da dividere.
+        dimensione (int): Dimensione massima di ogni blocco.
+
+    Returns:
+        generator: I blocchi, come liste.
+    """
+
+    iteratore = iter(elementi)
+    while True:
+        blocco = list(islice(iteratore, dimensione))
+        if not blocco:
+            return
+        yield blocco
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce la funzione che importa un flusso di righe in un catalogo, validando e deduplicando a blocchi.
+def importa(destinazione, righe, dimensione_blocco=10_000, avanzamento=None):
+
+    """
+    Importa un flusso di righe in un CatalogoRicette o in un RepositorySQLite.
+
+    Ogni riga viene validata (nome presente, ingredienti puliti, minutaggio positivo)
+    e scartata se il suo nome è già nella destinazione o è già comparso nello stesso
+    blocco. Le ricette valide vengono inserite un blocco alla volta, quindi la memoria
+    usata dipende dalla dimensione del blocco e non da quella del file.
+
+    Args:
+        destinazione (CatalogoRicette or RepositorySQLite): Dove inserire le ricette.
+        righe (iterable): Tuple (numero di riga, dati), come prodotte da leggi_jsonl() o leggi_csv().
+        dimensione_blocco (int, optional): Ricette inserite per volta.
+        avanzamento (callable, optional): Chiamata con il rapporto dopo ogni blocco.
+
+    Returns:
+        RapportoTrasferimento: Conteggi e velocità dell'importazione.
+    """
+
+    rapporto = RapportoTrasferimento()
+
+    def ricette_valide():
+        for numero_riga, dati in righe:
+            rapporto.lette += 1
+            ricetta, motivo = valida_ricetta(dati)
+            if ricetta is None:
+                rapporto.errore(numero_riga, motivo)
+            else:
+                yield ricetta
+
+    for blocco in a_blocchi(ricette_valide(), dimensione_blocco):
+        nomi_nel_blocco = set()
+        nuove = []
+        for ricetta in blocco:
+            chiave = normalizza_chiave(ricetta['nome'])
+            if chiave in nomi_nel_blocco or destinazione.id_per_nome(ricetta['nome']) is not None:  # Deduplica con l'indice dei nomi della destinazione.
+                rapporto.duplicate += 1
+                continue
+            nomi_nel_blocco.add(chiave)
+            nuove.append(ricetta)
+        rapporto.scritte += destinazione.aggiungi_molte(nuove)
+        if avanzamento is not None:
+            avanzamento(rapporto)
+
+    rapporto.termina()
+    return rapporto
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione che sceglie il formato di un file in base alla sua estensione.
+def _formato_da_percorso(percorso, formato):
+    formato = formato or os.path.splitext(percorso)[1].lstrip('.').lower()
+    if formato not in ('jsonl', 'csv'):
+        raise ValueError(f"Formato '{formato}' non supportato: usa 'jsonl' o 'csv'.")
+    return formato
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione che importa un file JSONL o CSV in un catalogo.
+def importa_file(destinazione, percorso, formato=None, dimensione_blocco=10_000, avanzamento=None):
+
+    """
+    Importa un file JSONL o CSV in un catalogo.
+
+    Args:
+        destinazione (CatalogoRicette or RepositorySQLite): Dove inserire le ricette.
+        percorso (str): File da importare.
+        formato (str, optional): 'jsonl' o 'csv'; se manca viene dedotto dall'estensione.
+        dimensione_blocco (int, optional): Ricette inserite per volta.
+        avanzamento (callable, optional): Chiamata con il rapporto dopo ogni blocco.
+
+    Returns:
+        RapportoTrasferimento: Conteggi e velocità dell'importazione.
+
+    Raises:
+        ValueError: Se il formato non è supportato.
+    """
+
+    formato = _formato_da_percorso(percorso, formato)
+    with open(percorso, encoding='utf-8', newline='') as file:
+        righe = leggi_jsonl(file) if formato == 'jsonl' else leggi_csv(file)
+        return importa(destinazione, righe, dimensione_blocco, avanzamento)
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce la funzione che scrive le ricette in un file JSONL o CSV, una alla volta.
+def esporta(ricette, file, formato='jsonl', separatore_ingredienti=','):
+
+    """
+    Scrive le ricette in un file, una alla volta, senza costruire il contenuto in memoria.
+
+    Args:
+        ricette (iterable): Ricette da esportare (un catalogo, un repository o una lista).
+        file (file): File di testo aperto in scrittura (con newline='' per il CSV).
+        formato (str, optional): 'jsonl' o 'csv'.
+        separatore_ingredienti (str, optional): Separatore degli ingredienti nella cella CSV.
+
+    Returns:
+        RapportoTrasferimento: Conteggi e velocità dell'esportazione.
+
+    Raises:
+        ValueError: Se nel CSV un ingrediente contiene il separatore: rileggendolo diventerebbe due ingredienti.
+    """
+
+    rapporto = RapportoTrasferimento()
+    if formato == 'csv':
+        scrittore = csv.writer(file)
+        scrittore.writerow(CAMPI)
+        for ricetta in ricette:
+            ingredienti = ricetta['ingredienti']
+            cella = separatore_ingredienti.join(ingredienti)
+            if cella.count(separatore_ingredienti) != max(len(ingredienti) - 1, 0):      # Un solo conteggio in C invece di un controllo per ingrediente.
+                contiene = next(i for i in ingredienti if separatore_ingredienti in i)
+                raise ValueError(f"L'ingrediente '{contiene}' della ricetta '{ricetta['nome']}' contiene il separatore "
+                                 f"'{separatore_ingredienti}': nel CSV diventerebbe più ingredienti, usa il formato JSONL.")
+            scrittore.writerow((ricetta['nome'], cella, ricetta['minutaggio']))
+            rapporto.lette += 1
+    else:
+        for ricetta in ricette:
+            file.write(json.dumps({campo: ricetta[campo] for campo in CAMPI}, ensure_ascii=False))
+            file.write('\n')
+            rapporto.lette += 1
+    rapporto.scritte = rapporto.lette
+    rapporto.termina()
+    return rapporto
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione che esporta le ricette in un file JSONL o CSV.
+def esporta_file(ricette, percorso, formato=None):
+
+    """
+    Esporta le ricette in un file JSONL o CSV.
+
+    Args:
+        ricette (iterable): Ricette da esportare.
+        percorso (str): File da scrivere.
+        formato (str, optional): 'jsonl' o 'csv'; se manca viene dedotto dall'estensione.
+
+    Returns:
+        RapportoTrasferimento: Conteggi e velocità dell'esportazione.
+
+    Raises:
+        ValueError: Se il formato non è supportato o una ricetta non si può scrivere nel CSV.
+    """
+
+    formato = _formato_da_percorso(percorso, formato)
+    try:
+        with open(percorso, 'w', encoding='utf-8', newline='') as file:
+            return esporta(ricette, file, formato)
+    except ValueError:
+        os.remove(percorso)                                                             # Non lascia un file scritto a metà.
+        raise
@@ -0,0 +1,837 @@
+"""
+Indici sulle ricette: trigrammi per la ricerca per sottostringa, indice invertito degli ingredienti, indice ordinato dei minutaggi
+bitset degli ingredienti per le ricerche "con quello che ho in dispensa" e MinHash/LSH per le ricette quasi uguali.
+"""
+
+from bisect import bisect_left, insort                                              # Importa le funzioni di bisect, usate per mantenere ordinato l'indice dei minutaggi.
+from heapq import nsmallest                                                         # Importa nsmallest, per i migliori risultati della dispensa senza ordinarli tutti.
+
+from .ingredienti import DizionarioIngredienti, forma_base, piega
+
+SOGLIA_SIMILI = 0.8                                                                 # Somiglianza di Jaccard oltre la quale due ricette sono quasi uguali.
+SOGLIA_BANDE = (1 / 16) ** (1 / 8)                                                  # Soglia (circa 0.71) delle bande predefinite di IndiceSomiglianze: 16 bande da 8 righe.
+
+
+# Definisce una funzione di supporto che porta un testo (nome o ingrediente) nella forma usata come chiave negli indici.
+def normalizza_chiave(testo):
+
+    """
+    Restituisce la chiave di confronto di un testo: senza spazi iniziali/finali e in casefold.
+
+    Args:
+        testo (str): Nome di una ricetta o di un ingrediente.
+
+    Returns:
+        str: Testo normalizzato, usato come chiave negli indici.
+    """
+
+    return testo.strip().casefold()                                                     # casefold() è una versione più aggressiva di lower(), adatta ai confronti.
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce l'indice dei trigrammi, che trova i testi che contengono una sottostringa senza scorrerli tutti.
+class IndiceTrigrammi:
+
+    """
+    Indice dei trigrammi (sequenze di 3 caratteri) di testi normalizzati.
+
+    Per cercare i testi che contengono una sottostringa si intersecano, dalla più corta,
+    le posting list dei suoi trigrammi: restano solo i candidati che contengono tutti i
+    trigrammi, che vengono poi verificati con un confronto diretto.
+
+    Gli elementi indicizzati sono identificati da una chiave qualsiasi (l'id di una
+    ricetta, o l'ingrediente stesso).
+    """
+
+    LUNGHEZZA = 3                                                                       # Lunghezza dei frammenti indicizzati.
+
+    def __init__(self):
+        self._posting = {}                                                              # Dizionario: trigramma -> set di chiavi.
+        self._testi = {}                                                                # Dizionario: chiave -> testo normalizzato, per la verifica finale.
+
+    def __len__(self):
+        return len(self._testi)
+
+    @classmethod
+    def trigrammi(cls, testo):
+
+        """
+        Restituisce l'insieme dei trigrammi di un testo già normalizzato.
+
+        Args:
+            testo (str): Testo normalizzato.
+
+        Returns:
+            set: I trigrammi del testo (vuoto se il testo è più corto di 3 caratteri).
+        """
+
+        return {testo[i:i + cls.LUNGHEZZA] for i in range(len(testo) - cls.LUNGHEZZA + 1)}
+
+    def aggiungi(self, chiave, testo):
+
+        """
+        Indicizza un testo.
+
+        Args:
+            chiave (hashable): Chiave dell'elemento (per esempio l'id della ricetta).
+            testo (str): Testo da indicizzare; viene convertito in casefold.
+        """
+
+        testo = testo.casefold()
+        self._testi[chiave] = testo
+        for trigramma in self.trigrammi(testo):
+            self._posting.setdefault(trigramma, set()).add(chiave)
+
+    def rimuovi(self, chiave):
+
+        """
+        Toglie un elemento dall'indice.
+
+        Args:
+            chiave (hashable): Chiave dell'elemento.
+        """
+
+        testo = self._testi.pop(chiave, None)
+        if testo is None:
+            return
+        for trigramma in self.trigrammi(testo):
+            posting = self._posting[trigramma]
+            posting.discard(chiave)
+            if not posting:
+                del self._posting[trigramma]                                            # Elimina le posting list rimaste vuote.
+
+    def cerca(self, sottostringa):
+
+        """
+        Restituisce le chiavi dei testi che contengono la sottostringa (senza distinguere maiuscole e minuscole).
+
+        Args:
+            sottostringa (str): Testo da cercare.
+
+        Returns:
+            set: Chiavi degli elementi il cui testo contiene la sottostringa.
+        """
+
+        sottostringa = sottostringa.casefold()                                          # Niente strip(): anche gli spazi fanno parte della sottostringa cercata.
+        trigrammi = self.trigrammi(sottostringa)
+        if not trigrammi:                                                               # Meno di 3 caratteri: non si può restringere, si verificano tutti i testi.
+            return {chiave for chiave, testo in self._testi.items() if sottostringa in testo}
+        liste = sorted((self._posting.get(trigramma, frozenset()) for trigramma in trigrammi), key=len)
+        candidati = set(liste[0])
+        for posting in liste[1:]:
+            if not candidati:
+                break
+            candidati &= posting
+        testi = self._testi
+        return {chiave for chiave in candidati if sottostringa in testi[chiave]}        # Avere tutti i trigrammi non basta: verifica che siano contigui.
+
+    def stima(self, sottostringa):
+
+        """
+        Stima per eccesso, senza verificare i testi, quanti elementi contengono la sottostringa.
+
+        Args:
+            sottostringa (str): Testo da cercare.
+
+        Returns:
+            int: Lunghezza della posting list più corta tra quelle dei trigrammi (tutti i testi
+                 se la sottostringa è più corta di 3 caratteri).
+        """
+
+        trigrammi = self.trigrammi(sottostringa.casefold())
+        if not trigrammi:
+            return len(self._testi)
+        return min(len(self._posting.get(trigramma, ())) for trigramma in trigrammi)
+
+    def testo(self, chiave):
+
+        """
+        Returns:
+            str: Il testo indicizzato (in casefold) dell'elemento con la chiave indicata.
+        """
+
+        return self._testi[chiave]
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce l'indice invertito ingrediente -> ricette, che evita di scorrere tutta la lista ad ogni ricerca per ingrediente.
+class IndiceIngredienti:
+
+    """
+    Indice invertito che associa ad ogni ingrediente canonico (il suo id nel
+    DizionarioIngredienti) l'insieme degli id delle ricette che lo contengono (posting list).
+
+    Le interrogazioni AND/OR/NOT su un numero qualsiasi di ingredienti si risolvono
+    intersecando le posting list a partire dalla più piccola, senza toccare le ricette
+    che non possono far parte del risultato.
+
+    Args:
+        dizionario (DizionarioIngredienti, optional): Dizionario che traduce gli ingredienti in id.
+    """
+
+    def __init__(self, dizionario=None):
+        self._dizionario = DizionarioIngredienti() if dizionario is None else dizionario
+        self._posting = {}                                                              # Dizionario: id ingrediente -> set di id ricetta.
+        self._trigrammi = IndiceTrigrammi()                                             # Trigrammi del vocabolario, per la ricerca di ingredienti per sottostringa.
+
+    def aggiungi(self, id_ricetta, id_ingredienti):
+
+        """
+        Registra gli ingredienti di una ricetta nell'indice.
+
+        Args:
+            id_ricetta (int): Identificativo della ricetta.
+            id_ingredienti (iterable): Id canonici degli ingredienti della ricetta.
+        """
+
+        for id_ingrediente in id_ingredienti:
+            posting = self._posting.get(id_ingrediente)
+            if posting is None:                                                         # Ingrediente nuovo: crea la posting list e lo aggiunge al vocabolario dei trigrammi.
+                posting = self._posting[id_ingrediente] = set()
+                self._trigrammi.aggiungi(id_ingrediente, forma_base(self._dizionario[id_ingrediente]))
+            posting.add(id_ricetta)
+
+    def rimuovi(self, id_ricetta, id_ingredienti):
+
+        """
+        Rimuove dall'indice gli ingredienti di una ricetta.
+
+        Args:
+            id_ricetta (int): Identificativo della ricetta.
+            id_ingredienti (iterable): Id canonici degli ingredienti della ricetta.
+        """
+
+        for id_ingrediente in id_ingredienti:
+            posting = self._posting.get(id_ingrediente)
+            if posting is None:
+                continue
+            posting.discard(id_ricetta)                                                 # Toglie la ricetta dalla posting list dell'ingrediente.
+            if not posting:
+                del self._posting[id_ingrediente]                                       # Elimina le posting list rimaste vuote per non sporcare il vocabolario.
+                self._trigrammi.rimuovi(id_ingrediente)
+
+    def posting(self, ingrediente):
+
+        """
+        Restituisce gli id delle ricette che contengono esattamente l'ingrediente indicato.
+
+        Args:
+            ingrediente (str or int): Ingrediente da cercare (maiuscole, accenti, spazi e
+                                      sinonimi sono ignorati), oppure il suo id canonico.
+
+        Returns:
+            set: Insieme (da non modificare) degli id delle ricette.
+        """
+
+        if isinstance(ingrediente, str):
+            ingrediente = self._dizionario.cerca(ingrediente)                           # Un ingrediente mai visto non ha id e quindi nessuna ricetta.
+        return self._posting.get(ingrediente, frozenset())
+
+    def vocabolario(self):
+
+        """
+        Restituisce tutti gli ingredienti presenti nell'indice.
+
+        Returns:
+            KeysView: Gli id canonici degli ingredienti.
+        """
+
+        return self._posting.keys()
+
+    def vocabolario_simile(self, testo):
+
+        """
+        Restituisce gli ingredienti del vocabolario che contengono il testo indicato,
+        usando l'indice dei trigrammi invece di scorrere tutto il vocabolario.
+
+        Args:
+            testo (str): Porzione di testo da cercare (maiuscole e accenti sono ignorati).
+
+        Returns:
+            set: Id canonici degli ingredienti trovati.
+        """
+
+        return self._trigrammi.cerca(piega(testo))
+
+    def interroga(self, tutti=(), almeno_uno=(), esclusi=(), universo=()):
+
+        """
+        Risolve un'interrogazione booleana sugli ingredienti.
+
+        Il risultato contiene le ricette che hanno TUTTI gli ingredienti di `tutti`,
+        ALMENO UNO di quelli di `almeno_uno` (se indicati) e NESSUNO di quelli di `esclusi`.
+
+        Args:
+            tutti (iterable): Ingredienti richiesti in AND.
+            almeno_uno (iterable): Ingredienti richiesti in OR.
+            esclusi (iterable): Ingredienti vietati (NOT).
+            universo (iterable): Id di tutte le ricette, usato solo quando non ci sono
+                                 condizioni positive (interrogazione di sola esclusione).
+
+        Returns:
+            set: Id delle ricette che soddisfano l'interrogazione.
+        """
+
+        liste_and = sorted((self.posting(i) for i in tutti), key=len)                  # Ordina le posting list dalla più corta: l'intersezione parte dalla più selettiva.
+        liste_or = [self.posting(i) for i in almeno_uno]
+
+        if liste_and:
+            candidati = set(liste_and[0])                                               # Copia la posting list più corta come insieme di partenza.
+            for posting in liste_and[1:]:
+                if not candidati:
+                    break                                                               # Intersezione già vuota: inutile proseguire.
+                candidati &= posting
+        elif liste_or:
+            candidati = set().union(*liste_or)                                          # Solo condizioni OR: il risultato è l'unione delle posting list.
+            liste_or = []
+        else:
+            candidati = set(universo)                                                   # Nessuna condizione positiva: si parte da tutte le ricette.
+
+        if liste_or and candidati:
+            if len(candidati) <= sum(len(posting) for posting in liste_or):             # Conviene verificare i pochi candidati piuttosto che costruire l'unione.
+                candidati = {i for i in candidati if any(i in posting for posting in liste_or)}
+            else:
+                candidati &= set().union(*liste_or)
+
+        for ingrediente in esclusi:
+            if not candidati:
+                break
+            candidati -= self.posting(ingrediente)                                      # Toglie le ricette che contengono un ingrediente escluso.
+
+        return candidati
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce l'indice ordinato dei minutaggi, che permette ricerche per intervallo senza scorrere tutta la lista.
+class IndiceMinutaggio:
+
+    """
+    Indice ordinato delle coppie (minutaggio, id ricetta), mantenuto con bisect.
+
+    Le ricerche per intervallo, le "N ricette più veloci" e l'iterazione in ordine
+    di minutaggio costano O(log n + k), dove k è il numero di risultati.
+    """
+
+    def __init__(self):
+        self._chiavi = []                                                               # Lista ordinata di tuple (minutaggio, id ricetta).
+
+    def __len__(self):
+        return len(self._chiavi)
+
+    def aggiungi(self, id_ricetta, minutaggio):
+
+        """
+        Inserisce una ricetta nell'indice mantenendo l'ordinamento.
+
+        Args:
+            id_ricetta (int): Identificativo della ricetta.
+            minutaggio (int): Minutaggio della ricetta.
+        """
+
+        insort(self._chiavi, (minutaggio, id_ricetta))
+
+    def rimuovi(self, id_ricetta, minutaggio):
+
+        """
+        Rimuove una ricetta dall'indice.
+
+        Args:
+            id_ricetta (int): Identificativo della ricetta.
+            minutaggio (int): Minutaggio della ricetta.
+        """
+
+        posizione = bisect_left(self._chiavi, (minutaggio, id_ricetta))                 # Trova la coppia in O(log n).
+        if posizione < len(self._chiavi) and self._chiavi[posizione] == (minutaggio, id_ricetta):
+            del self._chiavi[posizione]
+
+    def _estremi(self, minimo, massimo):
+
+        """
+        Calcola le posizioni, nella lista ordinata, che delimitano l'intervallo [minimo, massimo].
+        """
+
+        inizio = 0 if minimo is None else bisect_left(self._chiavi, (minimo,))         # (minimo,) precede ogni coppia con lo stesso minutaggio.
+        fine = len(self._chiavi) if massimo is None else bisect_left(self._chiavi, (massimo + 1,))
+        return inizio, max(inizio, fine)
+
+    def conta(self, minimo=None, massimo=None):
+
+        """
+        Conta in O(log n) le ricette con minutaggio compreso tra minimo e massimo (inclusi).
+
+        Args:
+            minimo (int, optional): Minutaggio minimo; None per nessun limite inferiore.
+            massimo (int, optional): Minutaggio massimo; None per nessun limite superiore.
+
+        Returns:
+            int: Numero di ricette nell'intervallo.
+        """
+
+        inizio, fine = self._estremi(minimo, massimo)
+        return fine - inizio
+
+    def intervallo(self, minimo=None, massimo=None, decrescente=False):
+
+        """
+        Restituisce gli id delle ricette con minutaggio compreso tra minimo e massimo (inclusi),
+        in ordine di minutaggio.
+
+        Args:
+            minimo (int, optional): Minutaggio minimo; None per nessun limite inferiore.
+            massimo (int, optional): Minutaggio massimo; None per nessun limite superiore.
+            decrescente (bool, optional): Se True parte dal minutaggio più alto.
+
+        Returns:
+            generator: Gli id delle ricette, generati uno alla volta.
+        """
+
+        inizio, fine = self._estremi(minimo, massimo)
+        chiavi = self._chiavi
+        posizioni = range(fine - 1, inizio - 1, -1) if decrescente else range(inizio, fine)
+        return (chiavi[posizione][1] for posizione in posizioni)
+
+    def primi(self, numero):
+
+        """
+        Restituisce gli id delle `numero` ricette più veloci.
+
+        Args:
+            numero (int): Quante ricette restituire.
+
+        Returns:
+            list: Id delle ricette, dalla più veloce.
+        """
+
+        return [id_ricetta for _, id_ricetta in self._chiavi[:numero]]
+
+    def minimo(self):
+
+        """
+        Returns:
+            tuple or None: La coppia (minutaggio, id) con il minutaggio più basso, o None se l'indice è vuoto.
+        """
+
+        return self._chiavi[0] if self._chiavi else None
+
+    def massimo(self):
+
+        """
+        Returns:
+            tuple or None: La coppia (minutaggio, id) con il minutaggio più alto, o None se l'indice è vuoto.
+        """
+
+        return self._chiavi[-1] if self._chiavi else None
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce l'indice a bitset degli ingredienti, che risponde a "cosa posso cucinare con quello che ho in dispensa".
+class IndiceDispensa:
+
+    """
+    Indice delle ricette per la ricerca "con questi ingredienti": ogni ricetta è un
+    intero usato come bitset, con il bit i acceso se contiene l'ingrediente di id i.
+
+    Con la dispensa anch'essa come bitset, gli ingredienti che mancano a una ricetta
+    sono `maschera & ~dispensa` e il loro numero è un popcount (int.bit_count()).
+
+    Per non provare tutte le ricette, ognuna è registrata anche sotto i suoi
+    MASSIMO_MANCANTI + 1 ingredienti di id più alto ("sentinelle": gli id crescono con la
+    prima comparsa, quindi sono di solito i suoi ingredienti più rari). A una ricetta
+    che manca di al più k ingredienti resta in dispensa almeno una delle sue prime
+    k + 1 sentinelle: i candidati sono solo le ricette registrate sotto le sentinelle
+    presenti in dispensa. Oltre MASSIMO_MANCANTI si scorrono tutti i bitset.
+    """
+
+    MASSIMO_MANCANTI = 3                                                                # Mancanti massimi serviti dalle sentinelle.
+
+    def __init__(self):
+        self._maschere = {}                                                             # Dizionario: id ricetta -> bitset degli ingredienti.
+        self._sentinelle = [{} for _ in range(self.MASSIMO_MANCANTI + 1)]              # Per rango: id ingrediente -> set degli id ricetta.
+
+    def __len__(self):
+        return len(self._maschere)
+
+    @staticmethod
+    def maschera(id_ingredienti):
+
+        """
+        Restituisce il bitset di un insieme di ingredienti.
+
+        Args:
+            id_ingredienti (iterable): Id canonici degli ingredienti.
+
+        Returns:
+            int: Bitset con un bit acceso per ogni ingrediente.
+        """
+
+        maschera = 0
+        for id_ingrediente in id_ingredienti:
+            maschera |= 1 << id_ingrediente
+        return maschera
+
+    @classmethod
+    def _sentinelle_di(cls, maschera):
+
+        """
+        Restituisce gli id delle sentinelle di un bitset, dalla più alta.
+        """
+
+        sentinelle = []
+        while maschera and len(sentinelle) <= cls.MASSIMO_MANCANTI:
+            id_ingrediente = maschera.bit_length() - 1                                  # Il bit più alto acceso.
+            sentinelle.append(id_ingrediente)
+            maschera ^= 1 << id_ingrediente
+        return sentinelle
+
+    def aggiungi(self, id_ricetta, id_ingredienti):
+
+        """
+        Registra una ricetta nell'indice.
+
+        Args:
+            id_ricetta (int): Identificativo della ricetta.
+            id_ingredienti (iterable): Id canonici degli ingredienti della ricetta.
+        """
+
+        maschera = self.maschera(id_ingredienti)
+        self._maschere[id_ricetta] = maschera
+        for rango, id_ingrediente in enumerate(self._sentinelle_di(maschera)):
+            self._sentinelle[rango].setdefault(id_ingrediente, set()).add(id_ricetta)
+
+    def rimuovi(self, id_ricetta):
+
+        """
+        Rimuove una ricetta dall'indice.
+
+        Args:
+            id_ricetta (int): Identificativo della ricetta.
+        """
+
+        maschera = self._maschere.pop(id_ricetta, 0)
+        for rango, id_ingrediente in enumerate(self._sentinelle_di(maschera)):          # Le sentinelle si ricavano dal bitset: non serve conservarle.
+            ricette = self._sentinelle[rango][id_ingrediente]
+            ricette.discard(id_ricetta)
+            if not ricette:
+                del self._sentinelle[rango][id_ingrediente]
+
+    def cerca(self, id_ingredienti, mancanti=0, limite=None):
+
+        """
+        Trova le ricette che si possono cucinare con gli ingredienti indicati,
+        ammettendo al più `mancanti` ingredienti da comprare.
+
+        Vengono considerate solo le ricette che usano almeno un ingrediente della dispensa.
+
+        Args:
+            id_ingredienti (iterable): Id canonici degli ingredienti in dispensa.
+            mancanti (int, optional): Numero massimo di ingredienti mancanti.
+            limite (int, optional): Numero massimo di risultati.
+
+        Returns:
+            list: Coppie (id ricetta, bitset degli ingredienti mancanti), ordinate per numero
+                  di mancanti, poi per numero di ingredienti della dispensa usati (dal più
+                  alto), poi per id.
+        """
+
+        presenti = set(id_ingredienti)
+        dispensa = self.maschera(presenti)
+        if not dispensa:
+            return []
+        assente = ~dispensa
+        risultati = []
+        if mancanti <= self.MASSIMO_MANCANTI:
+            maschere = self._maschere
+            visti = set()
+            for rango in range(mancanti + 1):                                           # Basta guardare le prime `mancanti` + 1 sentinelle di ogni ricetta.
+                sentinelle = self._sentinelle[rango]
+                candidati = set()
+                for id_ingrediente in presenti:
+                    ricette = sentinelle.get(id_ingrediente)
+                    if ricette:
+                        candidati |= ricette
+                candidati -= visti
+                visti |= candidati
+                self._valuta(((id_ricetta, maschere[id_ricetta]) for id_ricetta in candidati), dispensa, assente, mancanti, risultati)
+                if limite is not None and sum(1 for voce in risultati if voce[0] <= rango) >= limite:
+                    break                                                               # Dopo il rango r sono note tutte le ricette con al più r mancanti: i primi `limite` non cambiano più.
+        else:
+            self._valuta(self._maschere.items(), dispensa, assente, mancanti, risultati)  # Troppi mancanti per le sentinelle: prova tutti i bitset.
+        risultati = sorted(risultati) if limite is None else nsmallest(limite, risultati)  # Con un limite basta un heap dei migliori.
+        return [(id_ricetta, mancano) for _, _, id_ricetta, mancano in risultati]
+
+    @staticmethod
+    def _valuta(coppie, dispensa, assente, mancanti, risultati):
+
+        """
+        Aggiunge ai risultati le ricette (id, bitset) a cui mancano al più `mancanti` ingredienti.
+        """
+
+        for id_ricetta, maschera in coppie:
+            mancano = maschera & assente
+            numero_mancanti = mancano.bit_count()
+            if numero_mancanti <= mancanti and mancano != maschera:                     # mancano == maschera: la ricetta non usa nulla della dispensa.
+                risultati.append((numero_mancanti, -(maschera & dispensa).bit_count(), id_ricetta, mancano))
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce le firme MinHash con le bande LSH, che trovano le coppie di ricette quasi uguali senza confrontarle tutte.
+class IndiceSomiglianze:
+
+    """
+    Firme MinHash e bande LSH per trovare le coppie di ricette con ingredienti quasi
+    uguali (somiglianza di Jaccard alta).
+
+    La firma di un insieme di ingredienti ha `permutazioni` valori: per ogni funzione di
+    hash, il minimo tra gli hash dei suoi ingredienti. La probabilità che due firme
+    coincidano in una posizione è la somiglianza di Jaccard dei due insiemi. La firma è
+    divisa in `bande` bande di righe consecutive: due ricette diventano candidate se
+    coincidono in almeno una banda, cosa molto probabile sopra circa
+    (1 / bande) ** (1 / righe) di somiglianza (0.71 con i valori predefiniti) e rara sotto.
+    I candidati vanno poi verificati con la somiglianza esatta.
+
+    L'indice può anche tenere le firme e i secchi delle bande di un insieme di ricette,
+    aggiornati ad ogni aggiungi() e rimuovi(): allora candidati() trova le ricette simili
+    a una sola ricetta con `bande` accessi a dizionario e coppie_indicizzate() elenca le
+    coppie candidate senza ricalcolare nessuna firma. In ogni banda una ricetta da sola
+    nel suo secchio è registrata come id, senza lista, per contenere la memoria.
+
+    Ogni valore della firma è un hash di 15 bit e la firma intera è un solo int di Python,
+    con un valore ogni 16 bit: il minimo posizione per posizione tra due firme si fa con
+    poche operazioni sull'intero (il sedicesimo bit di ogni posizione fa da guardia nella
+    sottrazione), invece che con un ciclo sulle permutazioni.
+
+    Args:
+        permutazioni (int, optional): Numero di funzioni di hash della firma.
+        bande (int, optional): Numero di bande; deve dividere `permutazioni`.
+        seme (int, optional): Seme delle funzioni di hash.
+
+    Raises:
+        ValueError: Se `bande` non divide `permutazioni`.
+    """
+
+    PRIMO = (1 << 61) - 1                                                               # Primo di Mersenne per le funzioni di hash (a * x + b) mod p.
+    BIT = 16                                                                            # Bit per valore della firma: 15 di hash e uno di guardia.
+
+    def __init__(self, permutazioni=128, bande=16, seme=1):
+        if permutazioni % bande:
+            raise ValueError("il numero di bande deve dividere il numero di permutazioni")
+        from random import Random                                                       # Importato qui: serve solo quando le firme vengono calcolate, non a `import ricette`.
+        casuale = Random(seme)
+        self._coefficienti = [(casuale.randrange(1, self.PRIMO), casuale.randrange(self.PRIMO)) for _ in range(permutazioni)]
+        self._bande = bande
+        self._bit_banda = self.BIT * (permutazioni // bande)
+        self._guardie = sum(1 << (self.BIT * posizione + self.BIT - 1) for posizione in range(permutazioni))
+        self._vettori = {}                                                              # Cache: id ingrediente -> hash per ogni permutazione, in un solo int.
+        self._firme = {}                                                                # Dizionario: id ricetta -> firma, per le ricette indicizzate.
+        self._singoli = [{} for _ in range(bande)]                                      # Per banda: chiave -> id dell'unica ricetta del secchio.
+        self._multipli = [{} for _ in range(bande)]                                     # Per banda: chiave -> lista crescente degli id, se sono almeno due.
+
+    def __len__(self):
+        return len(self._firme)
+
+    @property
+    def soglia(self):
+
+        """
+        Returns:
+            float: Somiglianza (1 / bande) ** (1 / righe) intorno alla quale le bande iniziano
+                   a trovare le coppie; sotto, la maggior parte delle coppie sfugge.
+        """
+
+        righe = self._bit_banda // self.BIT
+        return (1 / self._bande) ** (1 / righe)
+
+    def _vettore(self, id_ingrediente):
+
+        """
+        Restituisce gli hash di un ingrediente per tutte le permutazioni, impaccati in un int (calcolati una volta sola).
+        """
+
+        vettore = self._vettori.get(id_ingrediente)
+        if vettore is None:
+            primo, bit = self.PRIMO, self.BIT
+            vettore = 0
+            for posizione, (a, b) in enumerate(self._coefficienti):
+                vettore |= ((a * id_ingrediente + b) % primo >> 46) << (bit * posizione)  # I 15 bit alti dell'hash a 61 bit.
+            self._vettori[id_ingrediente] = vettore
+        return vettore
+
+    def firma(self, id_ingredienti):
+
+        """
+        Calcola la firma MinHash di un insieme di ingredienti.
+
+        Args:
+            id_ingredienti (iterable): Id degli ingredienti (interi non negativi).
+
+        Returns:
+            int or None: Firma impaccata (vedi la classe), None se non ci sono ingredienti.
+        """
+
+        guardie, valori = self._guardie, (1 << self.BIT - 1) - 1
+        firma = None
+        for vettore in map(self._vettore, set(id_ingredienti)):
+            if firma is None:
+                firma = vettore
+                continue
+            maggiori = ((firma | guardie) - vettore) & guardie                         # Guardia accesa dove firma >= vettore: nessun prestito tra posizioni.
+            firma ^= (firma ^ vettore) & ((maggiori >> self.BIT - 1) * valori)          # Dove la guardia è accesa prende il valore del vettore.
+        return firma
+
+    def chiavi(self, firma):
+
+        """
+        Restituisce le chiavi delle bande di una firma.
+
+        Args:
+            firma (int): Firma calcolata da firma().
+
+        Returns:
+            list: Un int per banda.
+        """
+
+        bit, maschera = self._bit_banda, (1 << self._bit_banda) - 1
+        return [firma >> (bit * banda) & maschera for banda in range(self._bande)]
+
+    def coppie(self, firme):
+
+        """
+        Restituisce le coppie candidate: le ricette che coincidono in almeno una banda.
+
+        Le bande vengono esaminate una alla volta, quindi in memoria c'è un solo dizionario
+        di secchi. Una coppia viene restituita solo nella prima banda in cui coincide, così
+        non serve ricordare le coppie già viste.
+
+        Args:
+            firme (dict): Id ricetta -> firma, senza le ricette senza ingredienti.
+
+        Returns:
+            generator: Coppie (id, id) da verificare con la somiglianza esatta; in ogni coppia
+                       il primo id è quello che viene prima in `firme`.
+        """
+
+        bit, maschera = self._bit_banda, (1 << self._bit_banda) - 1
+        for banda in range(self._bande):
+            spostamento = bit * banda
+            primi = {}                                                                  # Chiave della banda -> prima ricetta del secchio.
+            secchi = {}                                                                 # Chiave della banda -> ricette del secchio, se sono almeno due.
+            for id_ricetta, firma in firme.items():
+                chiave = firma >> spostamento & maschera
+                primo = primi.setdefault(chiave, id_ricetta)
+                if primo != id_ricetta:
+                    secchi.setdefault(chiave, [primo]).append(id_ricetta)
+            yield from self._coppie_dei_secchi(firme, banda, secchi.values())
+
+    def _coppie_dei_secchi(self, firme, banda, secchi):
+
+        """
+        Restituisce le coppie dei secchi di una banda che non coincidono in nessuna banda precedente.
+        """
+
+        bit, maschera = self._bit_banda, (1 << self._bit_banda) - 1
+        for ricette in secchi:
+            for posizione, primo in enumerate(ricette):
+                firma = firme[primo]
+                for secondo in ricette[posizione + 1:]:
+                    diverse = firma ^ firme[secondo]
+                    if all(diverse >> (bit * precedente) & maschera for precedente in range(banda)):
+                        yield primo, secondo
+
+    def aggiungi(self, id_ricetta, id_ingredienti):
+
+        """
+        Calcola la firma di una ricetta e la registra nei secchi delle bande.
+
+        Args:
+            id_ricetta (int): Id della ricetta, maggiore di quelli già indicizzati.
+            id_ingredienti (iterable): Id canonici degli ingredienti.
+        """
+
+        firma = self.firma(id_ingredienti)
+        if firma is None:                                                               # Senza ingredienti non è simile a nessuna ricetta.
+            return
+        self._firme[id_ricetta] = firma
+        for singoli, multipli, chiave in zip(self._singoli, self._multipli, self.chiavi(firma)):
+            altro = singoli.pop(chiave, None)
+            if altro is not None:
+                multipli[chiave] = [altro, id_ricetta]
+            elif chiave in multipli:
+                multipli[chiave].append(id_ricetta)                                     # Gli id crescono: la lista resta ordinata.
+            else:
+                singoli[chiave] = id_ricetta
+
+    def rimuovi(self, id_ricetta):
+
+        """
+        Toglie una ricetta dai secchi delle bande.
+
+        Args:
+            id_ricetta (int): Id della ricetta.
+        """
+
+        firma = self._firme.pop(id_ricetta, None)
+        if firma is None:
+            return
+        for singoli, multipli, chiave in zip(self._singoli, self._multipli, self.chiavi(firma)):
+            ricette = multipli.get(chiave)
+            if ricette is None:
+                del singoli[chiave]
+                continue
+            ricette.remove(id_ricetta)
+            if len(ricette) == 1:
+                singoli[chiave] = ricette[0]
+                del multipli[chiave]
+
+    def candidati(self, id_ingredienti):
+
+        """
+        Restituisce le ricette indicizzate che coincidono con un insieme di ingredienti in almeno una banda.
+
+        Args:
+            id_ingredienti (iterable): Id degli ingredienti (interi).
+
+        Returns:
+            set: Id delle ricette candidate, da verificare con la somiglianza esatta.
+        """
+
+        firma = self.firma(id_ingredienti)
+        trovati = set()
+        if firma is None:
+            return trovati
+        for singoli, multipli, chiave in zip(self._singoli, self._multipli, self.chiavi(firma)):
+            ricette = multipli.get(chiave)
+            if ricette is not None:
+                trovati.update(ricette)
+            elif chiave in singoli:
+                trovati.add(singoli[chiave])
+        return trovati
+
+    def coppie_indicizzate(self):
+
+        """
+        Restituisce le coppie candidate tra le ricette indicizzate, come coppie(), usando i
+        secchi già pronti: nessuna firma viene ricalcolata.
+
+        Returns:
+            generator: Coppie (id, id) da verificare con la somiglianza esatta, con il primo id minore.
+        """
+
+        for banda, multipli in enumerate(self._multipli):
+            yield from self._coppie_dei_secchi(self._firme, banda, multipli.values())
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione di supporto che calcola la somiglianza di Jaccard tra due insiemi.
+def jaccard(primo, secondo):
+
+    """
+    Args:
+        primo (set): Primo insieme.
+        secondo (set): Secondo insieme.
+
+    Returns:
+        float: |intersezione| / |unione|, 0.0 se entrambi sono vuoti.
+    """
+
+    unione = len(primo | secondo)
+    return len(primo & secondo) / unione if unione else 0.0
@@ -0,0 +1,173 @@
+"""
+Dizionario canonico degli ingredienti: normalizzazione, sinonimi e interning in id interi.
+
+Le varianti di uno stesso ingrediente ('olio', 'Olio  ', 'Olioo') vengono ricondotte
+una volta sola, all'inserimento, allo stesso id; da lì in poi indici e statistiche
+confrontano interi invece di ricalcolare .lower() su ogni stringa ad ogni interrogazione.
+"""
+
+import unicodedata                                                                  # Importa unicodedata, usato per togliere gli accenti.
+
+# Sinonimi e refusi predefiniti: variante -> nome canonico. Le chiavi vengono normalizzate, quindi maiuscole e accenti non contano.
+ALIAS_INGREDIENTI = {
+    'Olio': "Olio d'Oliva",
+    'Olioo': "Olio d'Oliva",
+    'Pomodori': 'Pomodoro',
+    'Pepe': 'Pepe Nero',
+}
+
+
+# Definisce una funzione che confronta i testi senza maiuscole e senza accenti.
+def piega(testo):
+
+    """
+    Restituisce il testo in casefold e senza accenti ('Brisè' -> 'brise'), lasciando gli spazi come sono.
+
+    Args:
+        testo (str): Testo da piegare.
+
+    Returns:
+        str: Testo piegato, usato per le ricerche per sottostringa.
+    """
+
+    scomposto = unicodedata.normalize('NFKD', testo.replace('’', "'"))                 # NFKD separa le lettere dai loro accenti; l'apostrofo tipografico diventa quello semplice.
+    return ''.join(carattere for carattere in scomposto if not unicodedata.combining(carattere)).casefold()
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione che calcola la forma base di un ingrediente.
+def forma_base(testo):
+
+    """
+    Restituisce la forma base di un testo: piegato (vedi piega()) e con gli spazi
+    ridotti a uno solo tra le parole.
+
+    Args:
+        testo (str): Ingrediente come scritto.
+
+    Returns:
+        str: Forma base, usata come chiave degli ingredienti.
+    """
+
+    return ' '.join(piega(testo).split())
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce il dizionario degli ingredienti, che assegna un id intero ad ogni ingrediente canonico.
+class DizionarioIngredienti:
+
+    """
+    Dizionario canonico degli ingredienti.
+
+    Ogni ingrediente viene ricondotto alla sua forma base e poi, se compare nella
+    tabella dei sinonimi, a quella del nome canonico; ad ogni forma distinta corrisponde
+    un id intero stabile. Il nome mostrato di un id è il nome canonico del sinonimo,
+    oppure l'ingrediente così come è stato scritto la prima volta (senza spazi inutili).
+
+    I sinonimi non sono transitivi: ogni variante punta direttamente al suo nome canonico.
+
+    Args:
+        alias (dict, optional): Tabella variante -> nome canonico; None usa ALIAS_INGREDIENTI,
+                                un dizionario vuoto disattiva i sinonimi.
+    """
+
+    __slots__ = ('_alias', '_etichette', '_nomi', '_id', '_per_testo')
+
+    def __init__(self, alias=None):
+        alias = ALIAS_INGREDIENTI if alias is None else alias
+        self._alias = {forma_base(variante): forma_base(canonico) for variante, canonico in alias.items()}  # Dizionario: forma base della variante -> forma base canonica.
+        self._etichette = {forma_base(canonico): canonico for canonico in alias.values()}                   # Dizionario: forma base canonica -> nome mostrato.
+        self._nomi = []                                                                 # Lista: id -> nome mostrato.
+        self._id = {}                                                                   # Dizionario: forma base canonica -> id.
+        self._per_testo = {}                                                            # Cache: ingrediente come scritto -> id, per non normalizzare due volte lo stesso testo.
+
+    def __len__(self):
+        return len(self._nomi)
+
+    def __getitem__(self, id_ingrediente):
+        return self._nomi[id_ingrediente]
+
+    def chiave(self, ingrediente):
+
+        """
+        Restituisce la chiave canonica di un ingrediente, con i sinonimi già risolti.
+
+        Args:
+            ingrediente (str): Ingrediente come scritto.
+
+        Returns:
+            str: Forma base del nome canonico.
+        """
+
+        base = forma_base(ingrediente)
+        return self._alias.get(base, base)
+
+    def canonico(self, ingrediente):
+
+        """
+        Restituisce il nome con cui un ingrediente viene conservato e mostrato.
+
+        Args:
+            ingrediente (str): Ingrediente come scritto.
+
+        Returns:
+            str: Nome canonico dell'ingrediente.
+        """
+
+        chiave = self.chiave(ingrediente)
+        id_ingrediente = self._id.get(chiave)
+        if id_ingrediente is not None:
+            return self._nomi[id_ingrediente]
+        return self._etichette.get(chiave) or ' '.join(ingrediente.split())
+
+    def sinonimi(self):
+
+        """
+        Restituisce la tabella dei sinonimi, da ripassare al costruttore per avere lo stesso dizionario.
+
+        Returns:
+            dict: Variante (in forma base) -> nome canonico.
+        """
+
+        return {variante: self._etichette[canonico] for variante, canonico in self._alias.items()}
+
+    def cerca(self, ingrediente):
+
+        """
+        Restituisce l'id di un ingrediente senza aggiungerlo al dizionario.
+
+        Args:
+            ingrediente (str): Ingrediente come scritto.
+
+        Returns:
+            int or None: L'id, o None se l'ingrediente non è mai stato inserito.
+        """
+
+        id_ingrediente = self._per_testo.get(ingrediente)
+        if id_ingrediente is None:
+            id_ingrediente = self._id.get(self.chiave(ingrediente))
+        return id_ingrediente
+
+    def interna(self, ingrediente):
+
+        """
+        Restituisce l'id di un ingrediente, aggiungendolo al dizionario se non c'è ancora.
+
+        Args:
+            ingrediente (str): Ingrediente come scritto.
+
+        Returns:
+            int: Id dell'ingrediente canonico.
+        """
+
+        id_ingrediente = self._per_testo.get(ingrediente)
+        if id_ingrediente is not None:
+            return id_ingrediente
+        chiave = self.chiave(ingrediente)
+        id_ingrediente = self._id.get(chiave)
+        if id_ingrediente is None:
+            id_ingrediente = len(self._nomi)
+            self._nomi.append(self.canonico(ingrediente))
+            self._id[chiave] = id_ingrediente
+        self._per_testo[ingrediente] = id_ingrediente
+        return id_ingrediente
@@ -0,0 +1,75 @@
+"""
+Programma interattivo: esegue in sequenza tutte le operazioni sul catalogo delle ricette di esempio.
+"""
+
+from .catalogo import CatalogoRicette
+from .dati import lista_ricette
+from .operazioni import (aggiungi_ricetta, elimina_ricetta, filtraggio_avanzato, filtraggio_avanzato2, ricerca_ricetta,
+                         visualizza_ricette)
+from .statistiche import (ingrediente_frequenza, ricetta_con_piu_ingredienti, ricetta_con_piu_minutaggio, statistiche_durata,
+                          statistiche_ingredienti)
+
+
+# Definisce la funzione principale del programma, che guida l'utente attraverso tutte le operazioni.
+def main():
+
+    """
+    Avvia il programma interattivo sulle ricette di esempio.
+
+    Returns:
+        None: Interagisce con l'utente tramite input() e print().
+    """
+
+
+    #Crea il catalogo a partire dalla lista, così che ricerche, filtri e statistiche usino gli indici.
+    catalogo_ricette = CatalogoRicette(lista_ricette)
+
+    #Funzione Richiamata per Aggiungere una Nuova Ricetta a quelle gia presenti.
+    aggiungi_ricetta(catalogo_ricette)
+
+    print("-" * 40)
+
+    #Funzione Richiamata per Eliminare una Ricetta già presente nella lista.
+    elimina_ricetta(catalogo_ricette)
+
+    print("-" * 40)
+
+    #Funzione Richiamata per migliorare la visualizzazione di tutte le ricette.
+    visualizza_ricette(catalogo_ricette)
+
+    #Funzione Richiamata per ricercare una determinata ricetta in base a determinati criteri.
+    ricerca_ricetta(catalogo_ricette)
+
+    #Funzione Richiamata per visualizzare la frequenza con la quale si prensenta un determinato ingrediente
+    ingrediente_frequenza(catalogo_ricette)
+    print("-" * 40)
+
+    #Funzione Richiamata per mostrare la ricetta che contiene più ingredienti.
+    ricetta_max_ingredienti = ricetta_con_piu_ingredienti(catalogo_ricette)
+
+    if ricetta_max_ingredienti:
+        print(f"La ricetta con il maggior numero di ingredienti è '{ricetta_max_ingredienti['nome']}' con {len(ricetta_max_ingredienti['ingredienti'])} ingredienti.")
+
+    print("-" * 40)
+
+    #Funzione Richiamata per mostrare la ricetta che richiede maggior Minutaggio.
+    ricetta_max_minutaggio = ricetta_con_piu_minutaggio(catalogo_ricette)
+
+    if ricetta_max_minutaggio:
+        print(f"La ricetta con il maggior minutaggio è '{ricetta_max_minutaggio['nome']}' con {ricetta_max_minutaggio['minutaggio']} minuti.")
+
+    print("-" * 40)
+
+    #Funzione Richiamata per mostrare le ricette con piu'/meno minutaggio.
+    statistiche_ingredienti(catalogo_ricette)
+    print("-" * 40)
+
+    #Funzione Richiamata per mostrare le ricette con il minutaggio minore, maggiore e la media sul totale
+    statistiche_durata(catalogo_ricette)
+    print("-" * 40)
+
+    #Funzione Richiamata per mostrare le ricette con al suo interno un Doppio Filtro, ovvero il primo in base al minutaggio (Es: <=45 minuti)e il secondo per Ingrediente (Es: Aglio).
+    filtraggio_avanzato(catalogo_ricette)
+
+    #Funzione Richiamata per mostrare le ricette con al suo interno un Doppio Filtro, ovvero due Ingredienti (Es: Pasta & Spinaci).
+    filtraggio_avanzato2(catalogo_ricette)
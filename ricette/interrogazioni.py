@@ -0,0 +1,430 @@
+"""
+Interrogazioni componibili sulle ricette: criteri su nome, ingredienti e minutaggio,
+con ordinamento e paginazione, restituite come generatori.
+
+    ricette = (Interrogazione(catalogo)
+               .con_ingredienti('Uova')
+               .minutaggio(massimo=30)
+               .ordina_per('minutaggio')
+               .limita(10))
+    for ricetta in ricette:
+        ...
+
+Su un CatalogoRicette un piccolo pianificatore stima quante ricette soddisfano ogni
+criterio (dagli indici, senza scorrere le ricette), sceglie da quale indice partire,
+verifica gli altri criteri dal più selettivo e si ferma appena ha riempito la pagina.
+"""
+
+from heapq import nlargest, nsmallest                                               # Importa nsmallest/nlargest, usati per ordinare solo la pagina richiesta.
+from itertools import islice                                                        # Importa islice, usato per applicare offset e limite a un generatore.
+from math import log2, prod                                                         # Importa log2 e prod, usati per stimare i costi dei piani.
+
+from .ingredienti import DizionarioIngredienti
+from .strumentazione import strumentata
+
+ORDINAMENTI = ('inserimento', 'minutaggio', 'nome', 'numero_ingredienti')          # Chiavi di ordinamento accettate come stringa.
+
+
+# Definisce un criterio del piano: quante ricette lo soddisfano, come generarle da un indice e come verificarlo su un id.
+class _Criterio:
+
+    __slots__ = ('descrizione', 'stima', 'genera', 'verifica', 'ordine', 'pigro')
+
+    def __init__(self, descrizione, stima, genera=None, verifica=None, ordine='inserimento', pigro=False):
+        self.descrizione = descrizione                                                  # Testo mostrato da Interrogazione.piano().
+        self.stima = stima                                                              # Ricette che soddisfano il criterio (esatta o per eccesso).
+        self.genera = genera                                                            # Callable(decrescente) -> id nell'ordine `ordine`; None se il criterio sa solo verificare.
+        self.verifica = verifica                                                        # Callable(id) -> bool; None per la scansione completa.
+        self.ordine = ordine                                                            # Ordine in cui `genera` produce gli id.
+        self.pigro = pigro                                                              # True se `genera` produce gli id senza prima ordinarli tutti.
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce l'interrogazione componibile: ogni metodo restituisce una nuova interrogazione con un criterio in più.
+class Interrogazione:
+
+    """
+    Interrogazione componibile su un CatalogoRicette, un RepositorySQLite o una lista di ricette.
+
+    I metodi non modificano l'interrogazione ma ne restituiscono una nuova, quindi una
+    interrogazione di base può essere riusata e specializzata. L'esecuzione avviene solo
+    quando si scorrono i risultati, che vengono generati uno alla volta.
+
+    A parità di chiave di ordinamento le ricette restano nell'ordine di inserimento
+    (rovesciato se l'ordinamento è decrescente).
+
+    Args:
+        sorgente (CatalogoRicette or RepositorySQLite or iterable): Ricette da interrogare.
+    """
+
+    __slots__ = ('_sorgente', '_nomi', '_tutti', '_almeno_uno', '_esclusi', '_minimo', '_massimo',
+                 '_ordine', '_decrescente', '_limite', '_salta')
+
+    def __init__(self, sorgente):
+        self._sorgente = sorgente
+        self._nomi = ()                                                                 # Porzioni di testo che il nome deve contenere.
+        self._tutti = ()                                                                # Ingredienti richiesti in AND.
+        self._almeno_uno = ()                                                           # Ingredienti richiesti in OR.
+        self._esclusi = ()                                                              # Ingredienti vietati.
+        self._minimo = None
+        self._massimo = None
+        self._ordine = 'inserimento'
+        self._decrescente = False
+        self._limite = None
+        self._salta = 0
+
+    def _con(self, **modifiche):
+
+        """
+        Restituisce una copia dell'interrogazione con gli attributi indicati cambiati.
+        """
+
+        copia = Interrogazione.__new__(Interrogazione)
+        for attributo in self.__slots__:
+            setattr(copia, attributo, modifiche.get(attributo, getattr(self, attributo)))
+        return copia
+
+    def nome_contiene(self, testo):
+
+        """
+        Richiede che il nome contenga il testo indicato (senza distinguere maiuscole e minuscole).
+        """
+
+        return self._con(_nomi=self._nomi + (testo,))
+
+    def con_ingredienti(self, *ingredienti):
+
+        """
+        Richiede che la ricetta contenga tutti gli ingredienti indicati.
+        """
+
+        return self._con(_tutti=self._tutti + ingredienti)
+
+    def con_almeno_uno(self, *ingredienti):
+
+        """
+        Richiede che la ricetta contenga almeno uno degli ingredienti indicati.
+        """
+
+        return self._con(_almeno_uno=self._almeno_uno + ingredienti)
+
+    def senza_ingredienti(self, *ingredienti):
+
+        """
+        Esclude le ricette che contengono uno degli ingredienti indicati.
+        """
+
+        return self._con(_esclusi=self._esclusi + ingredienti)
+
+    def minutaggio(self, minimo=None, massimo=None):
+
+        """
+        Richiede un minutaggio compreso tra minimo e massimo (inclusi); più chiamate restringono l'intervallo.
+        """
+
+        if minimo is not None and self._minimo is not None:
+            minimo = max(minimo, self._minimo)
+        if massimo is not None and self._massimo is not None:
+            massimo = min(massimo, self._massimo)
+        return self._con(_minimo=self._minimo if minimo is None else minimo,
+                         _massimo=self._massimo if massimo is None else massimo)
+
+    def ordina_per(self, chiave='inserimento', decrescente=False):
+
+        """
+        Sceglie l'ordine dei risultati.
+
+        Args:
+            chiave (str or callable): Una tra 'inserimento', 'minutaggio', 'nome' e
+                                      'numero_ingredienti', oppure una funzione ricetta -> valore.
+            decrescente (bool, optional): Se True ordina dal valore più alto.
+
+        Raises:
+            ValueError: Se la chiave non è tra quelle previste.
+        """
+
+        if not callable(chiave) and chiave not in ORDINAMENTI:
+            raise ValueError(f"Ordinamento '{chiave}' non supportato: usa uno tra {', '.join(ORDINAMENTI)} o una funzione.")
+        return self._con(_ordine=chiave, _decrescente=decrescente)
+
+    def limita(self, numero):
+
+        """
+        Restituisce al massimo `numero` ricette.
+        """
+
+        return self._con(_limite=numero)
+
+    def salta(self, numero):
+
+        """
+        Salta le prime `numero` ricette (per la paginazione, insieme a limita()).
+        """
+
+        return self._con(_salta=numero)
+
+    def pagina(self, numero, dimensione):
+
+        """
+        Restituisce la pagina `numero` (da 1) di `dimensione` ricette.
+        """
+
+        return self._con(_salta=(numero - 1) * dimensione, _limite=dimensione)
+
+    def criteri(self):
+
+        """
+        Returns:
+            dict: I criteri dell'interrogazione, come argomenti di RepositorySQLite.interroga().
+        """
+
+        return {
+            'nomi': self._nomi, 'tutti': self._tutti, 'almeno_uno': self._almeno_uno, 'esclusi': self._esclusi,
+            'minimo': self._minimo, 'massimo': self._massimo, 'ordine': self._ordine,
+            'decrescente': self._decrescente, 'limite': self._limite, 'salta': self._salta,
+        }
+
+    def __iter__(self):
+        sorgente = self._sorgente
+        if hasattr(sorgente, 'indice_minutaggio'):                                      # Catalogo con indici: usa il pianificatore.
+            _, risultati = self._pianifica(sorgente)
+            return risultati
+        if hasattr(sorgente, 'interroga') and not callable(self._ordine):               # Repository: traduce l'interrogazione in SQL.
+            return sorgente.interroga(**self.criteri())
+        return self._scansione(sorgente)
+
+    def piano(self):
+
+        """
+        Descrive come verrebbe eseguita l'interrogazione, senza eseguirla.
+
+        Returns:
+            list: Righe di testo, dalla sorgente degli id ai filtri e all'ordinamento.
+        """
+
+        if hasattr(self._sorgente, 'indice_minutaggio'):
+            piano, _ = self._pianifica(self._sorgente)
+            return piano
+        if hasattr(self._sorgente, 'interroga') and not callable(self._ordine):
+            return ["interrogazione SQL (piano scelto da SQLite)"]
+        return ["scansione lineare della lista"]
+
+    def _pianifica(self, catalogo):
+
+        """
+        Costruisce il piano per un CatalogoRicette e il generatore dei risultati.
+
+        Per ogni criterio stima dagli indici quante ricette lo soddisfano. Ogni criterio
+        che sa generare i propri id è candidato a guidare la ricerca: il suo costo è il
+        numero di id da esaminare, ridotto quando genera gli id già nell'ordine richiesto
+        e c'è un limite (ci si ferma appena la pagina è piena). Gli altri criteri vengono
+        verificati sugli id della guida, dal più selettivo.
+        """
+
+        numero = len(catalogo)
+        criteri = self._criteri_catalogo(catalogo)
+        guide = [criterio for criterio in criteri if criterio.genera is not None]
+        guide.append(_Criterio("tutte le ricette", numero, lambda decrescente: _in_ordine(catalogo.id_ricette(), decrescente), pigro=True))
+        if self._ordine == 'minutaggio':
+            guide.append(_Criterio("tutte le ricette per minutaggio", numero,
+                                   lambda decrescente: catalogo.id_con_minutaggio(None, None) if not decrescente
+                                   else catalogo.indice_minutaggio.intervallo(decrescente=True), ordine='minutaggio', pigro=True))
+        da_leggere = None if self._limite is None else self._salta + self._limite
+
+        def costo(guida):
+            selettivita = prod(criterio.stima / max(numero, 1) for criterio in criteri if criterio is not guida)
+            risultati = guida.stima * selettivita
+            preparazione = 0 if guida.pigro else guida.stima                            # Una posting list va copiata e ordinata prima di generare il primo id.
+            if guida.ordine == self._ordine:
+                if da_leggere is not None:
+                    return preparazione + min(guida.stima, da_leggere / max(selettivita, 1 / max(numero, 1)))
+                return preparazione + guida.stima
+            return preparazione + guida.stima + risultati * log2(max(risultati, 2))    # I risultati vanno poi ordinati.
+
+        guida = min(guide, key=costo)
+        filtri = sorted((criterio for criterio in criteri if criterio is not guida), key=lambda criterio: criterio.stima)
+        in_flusso = guida.ordine == self._ordine
+
+        piano = [f"guida: {guida.descrizione} (~{guida.stima} ricette)"]
+        piano += [f"filtro: {criterio.descrizione} (~{criterio.stima} ricette)" for criterio in filtri]
+        if in_flusso:
+            fine = "" if da_leggere is None else f", si ferma dopo {da_leggere} risultati"
+            piano.append(f"ordine: {self._ordine} già dato dalla guida{fine}")
+        else:
+            piano.append(f"ordine: {'funzione' if callable(self._ordine) else self._ordine}, ordinando i risultati")
+        return piano, self._esegui(catalogo, guida, filtri, in_flusso)
+
+    def _esegui(self, catalogo, guida, filtri, in_flusso):
+
+        """
+        Genera le ricette del piano: id dalla guida, verifiche dei filtri, ordinamento e pagina.
+        """
+
+        id_ricette = guida.genera(self._decrescente if in_flusso else False)
+        for criterio in filtri:
+            id_ricette = filter(criterio.verifica, id_ricette)                          # Filtri in catena, dal più selettivo: restano pigri e un id scartato non arriva ai successivi.
+        if not in_flusso:
+            id_ricette = self._ordina(id_ricette, self._chiave_catalogo(catalogo))
+        fine = None if self._limite is None else self._salta + self._limite
+        for id_ricetta in islice(id_ricette, self._salta, fine):
+            yield catalogo.ricetta(id_ricetta)
+
+    def _criteri_catalogo(self, catalogo):
+
+        """
+        Traduce i criteri dell'interrogazione in criteri del piano, con le stime lette dagli indici.
+        """
+
+        indice = catalogo.indice_ingredienti
+        criteri = []
+        for ingrediente in dict.fromkeys(self._tutti):
+            posting = indice.posting(ingrediente)
+            criteri.append(_Criterio(f"ingrediente '{ingrediente}'", len(posting),
+                                     lambda decrescente, posting=posting: sorted(posting, reverse=decrescente),
+                                     posting.__contains__))
+        if self._almeno_uno:
+            liste = [indice.posting(ingrediente) for ingrediente in self._almeno_uno]
+            criteri.append(_Criterio(f"almeno uno tra {', '.join(self._almeno_uno)}", min(sum(map(len, liste)), len(catalogo)),
+                                     lambda decrescente, liste=liste: sorted(set().union(*liste), reverse=decrescente),
+                                     lambda i, liste=liste: any(i in posting for posting in liste)))
+        if self._esclusi:
+            liste = [indice.posting(ingrediente) for ingrediente in self._esclusi]
+            criteri.append(_Criterio(f"senza {', '.join(self._esclusi)}", max(len(catalogo) - sum(map(len, liste)), 0),
+                                     verifica=lambda i, liste=liste: not any(i in posting for posting in liste)))
+        if self._minimo is not None or self._massimo is not None:
+            minimo = float('-inf') if self._minimo is None else self._minimo
+            massimo = float('inf') if self._massimo is None else self._massimo
+            minutaggio_di = catalogo.minutaggio_di
+            criteri.append(_Criterio(f"minutaggio tra {self._minimo} e {self._massimo}",
+                                     catalogo.indice_minutaggio.conta(self._minimo, self._massimo),
+                                     lambda decrescente: catalogo.indice_minutaggio.intervallo(self._minimo, self._massimo, decrescente),
+                                     lambda i: minimo <= minutaggio_di(i) <= massimo, ordine='minutaggio', pigro=True))
+        indice_nomi = catalogo.indice_nomi
+        for testo in dict.fromkeys(self._nomi):
+            cercato = testo.casefold()
+            criteri.append(_Criterio(f"nome contiene '{testo}'", indice_nomi.stima(testo),
+                                     lambda decrescente, testo=testo: sorted(indice_nomi.cerca(testo), reverse=decrescente),
+                                     lambda i, cercato=cercato: cercato in indice_nomi.testo(i)))
+        return criteri
+
+    def _chiave_catalogo(self, catalogo):
+
+        """
+        Restituisce la funzione id -> valore per l'ordinamento richiesto.
+        """
+
+        if self._ordine == 'inserimento':
+            return None
+        if self._ordine == 'minutaggio':
+            return catalogo.minutaggio_di
+        if self._ordine == 'nome':
+            return catalogo.indice_nomi.testo
+        if self._ordine == 'numero_ingredienti':
+            return lambda i: len(catalogo.ricetta(i)['ingredienti'])
+        chiave = self._ordine
+        return lambda i: chiave(catalogo.ricetta(i))
+
+    def _ordina(self, id_ricette, chiave):
+
+        """
+        Ordina gli id per (chiave, id); con un limite tiene solo i primi salta + limite, con un heap.
+        """
+
+        chiave_completa = (lambda i: i) if chiave is None else (lambda i: (chiave(i), i))   # L'id come secondo criterio mantiene l'ordine di inserimento tra gli ex aequo.
+        if self._limite is None:
+            return iter(sorted(id_ricette, key=chiave_completa, reverse=self._decrescente))
+        primi = nlargest if self._decrescente else nsmallest
+        return iter(primi(self._salta + self._limite, id_ricette, key=chiave_completa))
+
+    def _scansione(self, ricette):
+
+        """
+        Esegue l'interrogazione scorrendo le ricette una alla volta (lista semplice, o
+        repository con un ordinamento personalizzato).
+        """
+
+        dizionario = getattr(ricette, 'dizionario', None) or DizionarioIngredienti()   # Stessa normalizzazione degli ingredienti del catalogo.
+        chiave = dizionario.chiave
+        tutti = {chiave(i) for i in self._tutti}
+        almeno_uno = {chiave(i) for i in self._almeno_uno}
+        esclusi = {chiave(i) for i in self._esclusi}
+        nomi = [testo.casefold() for testo in self._nomi]
+        minimo = float('-inf') if self._minimo is None else self._minimo
+        massimo = float('inf') if self._massimo is None else self._massimo
+
+        def soddisfa(ricetta):
+            if not minimo <= ricetta['minutaggio'] <= massimo:                          # Il minutaggio è il controllo più economico: viene fatto per primo.
+                return False
+            if nomi and not all(testo in ricetta['nome'].casefold() for testo in nomi):
+                return False
+            if tutti or almeno_uno or esclusi:
+                chiavi = {chiave(i) for i in ricetta['ingredienti']}
+                return tutti <= chiavi and (not almeno_uno or not almeno_uno.isdisjoint(chiavi)) and esclusi.isdisjoint(chiavi)
+            return True
+
+        trovate = ((posizione, ricetta) for posizione, ricetta in enumerate(ricette) if soddisfa(ricetta))
+        fine = None if self._limite is None else self._salta + self._limite
+        if self._ordine == 'inserimento' and not self._decrescente:
+            trovate = (ricetta for _, ricetta in trovate)                               # Già nell'ordine giusto: si ferma appena la pagina è piena.
+        else:
+            valore = _chiave_ricetta(self._ordine)
+            per_posizione = dict(trovate)
+            ordinate = self._ordina(per_posizione, None if valore is None else lambda posizione: valore(per_posizione[posizione]))
+            trovate = (per_posizione[posizione] for posizione in ordinate)
+        return islice(trovate, self._salta, fine)
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione di supporto che restituisce la funzione ricetta -> valore per un ordinamento.
+def _chiave_ricetta(ordine):
+    if ordine == 'inserimento':
+        return None
+    if ordine == 'minutaggio':
+        return lambda ricetta: ricetta['minutaggio']
+    if ordine == 'nome':
+        return lambda ricetta: ricetta['nome'].casefold()
+    if ordine == 'numero_ingredienti':
+        return lambda ricetta: len(ricetta['ingredienti'])
+    return ordine
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione di supporto che restituisce degli id crescenti, oppure rovesciati.
+def _in_ordine(id_ricette, decrescente):
+    return reversed(list(id_ricette)) if decrescente else id_ricette
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una scorciatoia che costruisce ed esegue un'interrogazione in una sola chiamata.
+@strumentata('filtra')
+def interroga(sorgente, nome=None, tutti=(), almeno_uno=(), esclusi=(), minimo=None, massimo=None,
+              ordina_per='inserimento', decrescente=False, limite=None, salta=0):
+
+    """
+    Esegue un'interrogazione con tutti i criteri passati come argomenti.
+
+    Args:
+        sorgente (CatalogoRicette or RepositorySQLite or iterable): Ricette da interrogare.
+        nome (str, optional): Testo che il nome deve contenere.
+        tutti (iterable): Ingredienti che devono essere tutti presenti.
+        almeno_uno (iterable): Ingredienti di cui almeno uno deve essere presente.
+        esclusi (iterable): Ingredienti che non devono essere presenti.
+        minimo (int, optional): Minutaggio minimo (incluso).
+        massimo (int, optional): Minutaggio massimo (incluso).
+        ordina_per (str or callable, optional): Chiave di ordinamento (vedi Interrogazione.ordina_per()).
+        decrescente (bool, optional): Se True ordina dal valore più alto.
+        limite (int, optional): Numero massimo di ricette.
+        salta (int, optional): Ricette da saltare all'inizio.
+
+    Returns:
+        generator: Le ricette trovate, generate una alla volta.
+    """
+
+    interrogazione = Interrogazione(sorgente)
+    if nome:
+        interrogazione = interrogazione.nome_contiene(nome)
+    interrogazione = (interrogazione.con_ingredienti(*tutti).con_almeno_uno(*almeno_uno).senza_ingredienti(*esclusi)
+                      .minutaggio(minimo, massimo).ordina_per(ordina_per, decrescente).salta(salta))
+    if limite is not None:
+        interrogazione = interrogazione.limita(limite)
+    return iter(interrogazione)
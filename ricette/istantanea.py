@@ -0,0 +1,512 @@
+"""
+Istantanea binaria del catalogo, per aprire in pochi millisecondi anche milioni di ricette.
+
+Il file contiene le colonne dell'archivio (tabella dei nomi, minutaggi, offset e id degli
+ingredienti) e gli indici già costruiti: nomi ordinati, posting list degli ingredienti,
+trigrammi di nomi e ingredienti, ricette in ordine di minutaggio e ingredienti in ordine
+di frequenza e di prima comparsa. carica_istantanea() mappa il file con mmap e legge tutto tramite
+memoryview, senza copiare né decodificare nulla in anticipo: le pagine arrivano dal
+disco solo quando servono, e più processi che aprono lo stesso file condividono le
+stesse pagine della cache del sistema operativo.
+
+Formato (versione 1):
+
+    MAGIA (8 byte) | versione e lunghezza dell'intestazione (2 x uint32 little endian)
+    intestazione JSON: sezioni {nome: [posizione, byte, tipo array, byte per elemento]},
+                       ordine dei byte, numero di ricette, sinonimi e aggregati
+    sezioni: array con gli interi nell'ordine dei byte della macchina che le ha scritte,
+             ognuna allineata a 8 byte dall'inizio dei dati
+
+Il catalogo caricato è un CatalogoRicette in sola lettura finché non arriva una
+modifica: allora viene ricostruito in memoria, come se fosse stato letto da un JSONL,
+ma con l'ordine di prima comparsa degli ingredienti salvato (che decide gli ex aequo).
+"""
+
+import json                                                                         # Importa json, per l'intestazione del file.
+import mmap                                                                         # Importa mmap, che mappa il file in memoria senza leggerlo.
+import struct                                                                       # Importa struct, per versione e lunghezza dell'intestazione.
+import sys                                                                          # Importa sys, per l'ordine dei byte della macchina.
+from array import array                                                             # Importa array, per scrivere le colonne e gli indici in forma compatta.
+from bisect import bisect_left                                                      # Importa bisect_left, per le ricerche nelle sezioni ordinate.
+from collections.abc import Mapping                                                 # Importa Mapping, la classe base della vista dei nomi.
+
+from .archivio import ArchivioColonnare
+from .catalogo import CatalogoRicette
+from .indici import IndiceIngredienti, IndiceTrigrammi, normalizza_chiave
+from .ingredienti import DizionarioIngredienti, forma_base
+
+MAGIA = b'RICETTE\x00'                                                              # Primi byte di ogni istantanea.
+VERSIONE = 1                                                                        # Versione del formato: cambia ad ogni modifica incompatibile.
+INTESTAZIONE = struct.Struct('<II')                                                 # Versione e lunghezza dell'intestazione JSON.
+ALLINEAMENTO = 8                                                                    # Ogni sezione inizia a un multiplo di 8 byte.
+
+
+# Definisce una funzione di supporto che arrotonda una posizione al multiplo di ALLINEAMENTO successivo.
+def _allinea(posizione):
+    return -(-posizione // ALLINEAMENTO) * ALLINEAMENTO
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione di supporto che scrive dei testi come un solo blocco UTF-8 con le posizioni di inizio e fine.
+def _tabella(testi):
+    testo, offset = bytearray(), array('Q', [0])
+    for elemento in testi:
+        testo += elemento.encode('utf-8')
+        offset.append(len(testo))
+    return testo, offset
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione di supporto che scrive delle liste di interi in forma compressa per righe (offset + valori).
+def _righe(liste):
+    offset, valori = array('Q', [0]), array('I')
+    for elementi in liste:
+        valori.extend(elementi)
+        offset.append(len(valori))
+    return offset, valori
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione di supporto che costruisce le sezioni di un indice dei trigrammi.
+def _sezioni_trigrammi(sezioni, prefisso, testi):
+
+    """
+    Aggiunge alle sezioni i trigrammi ordinati, le loro posting list e le chiavi indicizzate.
+
+    Args:
+        sezioni (dict): Sezioni dell'istantanea, da completare.
+        prefisso (str): Prefisso dei nomi delle sezioni.
+        testi (iterable): Coppie (chiave intera, testo), con le chiavi in ordine crescente.
+    """
+
+    chiavi, posting = array('I'), {}
+    for chiave, testo in testi:
+        chiavi.append(chiave)
+        for trigramma in IndiceTrigrammi.trigrammi(testo.casefold()):
+            posting.setdefault(trigramma, []).append(chiave)                           # Le chiavi arrivano in ordine: le posting list restano ordinate.
+    ordinati = sorted(posting)
+    sezioni[prefisso + '_testo'], sezioni[prefisso + '_offset'] = _tabella(ordinati)
+    sezioni[prefisso + '_posting_offset'], sezioni[prefisso + '_posting'] = _righe(posting[trigramma] for trigramma in ordinati)
+    sezioni[prefisso + '_chiavi'] = chiavi
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione che salva il catalogo in un'istantanea binaria.
+def salva_istantanea(ricette, percorso):
+
+    """
+    Scrive l'istantanea binaria di un catalogo o di una lista di ricette.
+
+    Le ricette eliminate non vengono scritte: nell'istantanea gli id vanno da 0 a n - 1
+    nell'ordine di inserimento.
+
+    Args:
+        ricette (CatalogoRicette or iterable): Ricette da salvare; una lista viene prima
+                                               caricata in un CatalogoRicette.
+        percorso (str): File da scrivere.
+
+    Returns:
+        int: Numero di byte scritti.
+    """
+
+    catalogo = ricette if isinstance(ricette, CatalogoRicette) else CatalogoRicette(ricette)
+    archivio = catalogo._archivio
+    dizionario = catalogo.dizionario
+    statistiche = catalogo.statistiche
+    vecchi_id = list(catalogo.id_ricette())                                             # Crescenti, perché l'ordine di inserimento è quello degli id.
+    numero = len(vecchi_id)
+
+    nomi = [archivio.nome(i) for i in vecchi_id]
+    durate = array('I', (archivio.durate[i] for i in vecchi_id))
+    ingredienti = [archivio.id_ingredienti(i) for i in vecchi_id]
+    posting = [[] for _ in range(len(dizionario))]
+    for id_ricetta, id_ingredienti in enumerate(ingredienti):
+        for id_ingrediente in id_ingredienti:
+            posting[id_ingrediente].append(id_ricetta)
+    chiavi = [normalizza_chiave(nome) for nome in nomi]
+    ordine = sorted(range(numero), key=durate.__getitem__)                              # sorted è stabile: a parità di minutaggio, per id.
+    cerca = dizionario.cerca
+
+    sezioni = {}
+    sezioni['nomi_testo'], sezioni['nomi_offset'] = _tabella(nomi)
+    sezioni['nomi_ordine'] = array('I', sorted(range(numero), key=chiavi.__getitem__))
+    sezioni['durate'] = durate
+    sezioni['offset'], sezioni['valori'] = _righe(ingredienti)
+    sezioni['vive'] = bytes([1]) * numero
+    sezioni['ingredienti_testo'], sezioni['ingredienti_offset'] = _tabella(dizionario[i] for i in range(len(dizionario)))
+    sezioni['posting_offset'], sezioni['posting'] = _righe(posting)
+    sezioni['minutaggi_ordine'] = array('I', ordine)
+    sezioni['minutaggi_ordinati'] = array('I', (durate[i] for i in ordine))
+    sezioni['frequenze_ordine'] = array('I', (cerca(nome) for nome, _ in statistiche.piu_comuni(len(dizionario))))
+    comparsa = statistiche.ordine_di_comparsa()                                         # Per gli ex aequo dopo la prima modifica (vedi CatalogoRicette._scongela).
+    if comparsa is not None:                                                            # None se si risalva un'istantanea che non lo conteneva.
+        sezioni['ingredienti_comparsa'] = array('I', comparsa)
+    _sezioni_trigrammi(sezioni, 'trigrammi_nomi', enumerate(nomi))
+    _sezioni_trigrammi(sezioni, 'trigrammi_ingredienti', ((i, forma_base(dizionario[i])) for i in range(len(dizionario)) if posting[i]))
+
+    def nuovo_id(vecchio):
+        return None if vecchio is None else bisect_left(vecchi_id, vecchio)
+
+    testata = {
+        'ordine_byte': sys.byteorder,
+        'ricette': numero,
+        'sinonimi': dizionario.sinonimi(),
+        'somma_minutaggi': sum(durate),
+        'id_piu_minutaggio': nuovo_id(statistiche.id_con_piu_minutaggio()),
+        'id_piu_ingredienti': nuovo_id(statistiche.id_con_piu_ingredienti()),
+        'sezioni': {},
+    }
+    posizione = 0
+    for nome, dati in sezioni.items():
+        vista = memoryview(dati)
+        testata['sezioni'][nome] = [posizione, vista.nbytes, getattr(dati, 'typecode', 'B'), vista.itemsize]
+        posizione = _allinea(posizione + vista.nbytes)
+    testo = json.dumps(testata, ensure_ascii=False).encode('utf-8')
+    inizio = _allinea(len(MAGIA) + INTESTAZIONE.size + len(testo))
+
+    with open(percorso, 'wb') as file:
+        file.write(MAGIA + INTESTAZIONE.pack(VERSIONE, len(testo)) + testo)
+        file.write(bytes(inizio - file.tell()))
+        for dati in sezioni.values():
+            byte = memoryview(dati).nbytes
+            file.write(dati)
+            file.write(bytes(_allinea(byte) - byte))
+        return file.tell()
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione che apre un'istantanea binaria senza copiarne il contenuto.
+def carica_istantanea(percorso):
+
+    """
+    Apre un'istantanea scritta da salva_istantanea().
+
+    Il file viene mappato in memoria: colonne e indici del catalogo restituito sono
+    memoryview sul file, e il tempo di apertura non dipende dal numero di ricette (solo
+    il dizionario degli ingredienti viene ricostruito). La prima aggiunta o eliminazione
+    ricostruisce il catalogo in memoria, mantenendo gli stessi id.
+
+    Args:
+        percorso (str): File dell'istantanea.
+
+    Returns:
+        CatalogoRicette: Il catalogo, in sola lettura fino alla prima modifica.
+
+    Raises:
+        ValueError: Se il file non è un'istantanea, è di un'altra versione del formato o
+                    è stato scritto su una macchina con un diverso ordine dei byte.
+    """
+
+    with open(percorso, 'rb') as file:
+        try:
+            mappa = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)              # La mappa resta valida anche dopo la chiusura del file.
+        except ValueError:                                                              # File vuoto: non si può mappare.
+            raise ValueError(f"'{percorso}' non è un'istantanea delle ricette.") from None
+    vista = memoryview(mappa)
+    testa = len(MAGIA) + INTESTAZIONE.size
+    if len(vista) < testa or vista[:len(MAGIA)] != MAGIA:
+        raise ValueError(f"'{percorso}' non è un'istantanea delle ricette.")
+    versione, lunghezza = INTESTAZIONE.unpack_from(vista, len(MAGIA))
+    if versione != VERSIONE:
+        raise ValueError(f"L'istantanea '{percorso}' è in formato {versione}, ma si può leggere solo il formato {VERSIONE}.")
+    testata = json.loads(bytes(vista[testa:testa + lunghezza]))
+    if testata['ordine_byte'] != sys.byteorder:
+        raise ValueError(f"L'istantanea '{percorso}' è stata scritta con un altro ordine dei byte ({testata['ordine_byte']}).")
+    inizio = _allinea(testa + lunghezza)
+    sezioni = {}
+    for nome, (posizione, byte, tipo, dimensione) in testata['sezioni'].items():
+        if array(tipo).itemsize != dimensione:
+            raise ValueError(f"L'istantanea '{percorso}' usa interi di {dimensione} byte per '{nome}', qui sono di {array(tipo).itemsize}.")
+        sezioni[nome] = vista[inizio + posizione:inizio + posizione + byte].cast(tipo)
+
+    dizionario = DizionarioIngredienti(testata['sinonimi'])
+    ingredienti = _TestiMappati(sezioni['ingredienti_testo'], sezioni['ingredienti_offset'])
+    for id_ingrediente in range(len(ingredienti)):                                      # Il vocabolario è piccolo: lo ricostruisce negli stessi id.
+        if dizionario.interna(ingredienti[id_ingrediente]) != id_ingrediente:
+            raise ValueError(f"L'istantanea '{percorso}' ha un vocabolario degli ingredienti non valido.")
+
+    numero = testata['ricette']
+    nomi = _TestiMappati(sezioni['nomi_testo'], sezioni['nomi_offset'])
+    archivio = ArchivioColonnare.__new__(ArchivioColonnare)                             # Stesse colonne di ArchivioColonnare, ma viste sul file.
+    archivio.stringhe = nomi
+    archivio.dizionario = dizionario
+    archivio.nomi = range(numero)                                                       # Nell'istantanea il nome della ricetta i è la stringa i.
+    archivio.durate = sezioni['durate']
+    archivio.offset = sezioni['offset']
+    archivio.valori = sezioni['valori']
+    archivio.vive = sezioni['vive']
+
+    catalogo = CatalogoRicette.__new__(CatalogoRicette)                                 # Stessi attributi di CatalogoRicette.__init__, in sola lettura.
+    catalogo.dizionario = dizionario
+    catalogo.versione = 0
+    catalogo._istantanea = mappa
+    catalogo._archivio = archivio
+    catalogo._per_nome = _NomiMappati(nomi, sezioni['nomi_ordine'])
+    catalogo.indice_nomi = _TrigrammiMappati(sezioni, 'trigrammi_nomi', lambda i: nomi[i].casefold())
+    catalogo.indice_ingredienti = _IngredientiMappati(dizionario, sezioni['posting_offset'], sezioni['posting'],
+                                                      _TrigrammiMappati(sezioni, 'trigrammi_ingredienti', lambda i: forma_base(dizionario[i])))
+    catalogo.indice_minutaggio = _MinutaggiMappati(sezioni['minutaggi_ordinati'], sezioni['minutaggi_ordine'])
+    catalogo.statistiche = _StatisticheMappate(dizionario, sezioni['posting_offset'], sezioni['frequenze_ordine'],
+                                               sezioni['minutaggi_ordinati'], testata, sezioni.get('ingredienti_comparsa'))
+    catalogo._indice_dispensa = None
+    catalogo._indice_somiglianze = None
+    return catalogo
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce la tabella delle stringhe letta dal file, che decodifica una stringa solo quando viene chiesta.
+class _TestiMappati:
+
+    """
+    Tabella delle stringhe in sola lettura: id -> testo, come TabellaStringhe.
+    """
+
+    __slots__ = ('_testo', '_offset')
+
+    def __init__(self, testo, offset):
+        self._testo = testo
+        self._offset = offset
+
+    def __len__(self):
+        return len(self._offset) - 1
+
+    def __getitem__(self, posizione):
+        return str(self._testo[self._offset[posizione]:self._offset[posizione + 1]], 'utf-8')
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce la vista nome normalizzato -> id letta dal file, con la ricerca binaria al posto del dizionario.
+class _NomiMappati(Mapping):
+
+    """
+    Sostituisce il dizionario nome normalizzato -> id del catalogo: la ricerca è binaria
+    sugli id ordinati per nome normalizzato, in O(log n) stringhe decodificate.
+    """
+
+    def __init__(self, nomi, ordine):
+        self._nomi = nomi
+        self._ordine = ordine
+
+    def __getitem__(self, chiave):
+        nomi, ordine = self._nomi, self._ordine
+        posizione = bisect_left(ordine, chiave, key=lambda i: normalizza_chiave(nomi[i]))
+        if posizione < len(ordine) and normalizza_chiave(nomi[ordine[posizione]]) == chiave:
+            return ordine[posizione]
+        raise KeyError(chiave)
+
+    def __iter__(self):
+        return (normalizza_chiave(self._nomi[i]) for i in range(len(self._ordine)))    # Nell'ordine di inserimento, come il dizionario.
+
+    def __len__(self):
+        return len(self._ordine)
+
+    def values(self):
+        return range(len(self._ordine))                                                 # Gli id sono consecutivi e nell'ordine di inserimento.
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione di supporto che interseca un insieme con una posting list ordinata letta dal file.
+def _interseca(candidati, posting):
+    if len(candidati) * 16 < len(posting):                                              # Pochi candidati: li cerca uno alla volta nella lista ordinata.
+        fine = len(posting)
+        return {i for i in candidati if (posizione := bisect_left(posting, i)) < fine and posting[posizione] == i}
+    candidati.intersection_update(posting)
+    return candidati
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce l'indice dei trigrammi letto dal file, con la stessa interfaccia di lettura di IndiceTrigrammi.
+class _TrigrammiMappati:
+
+    """
+    Indice dei trigrammi in sola lettura: trigrammi ordinati con le loro posting list.
+
+    Args:
+        sezioni (dict): Sezioni dell'istantanea.
+        prefisso (str): Prefisso dei nomi delle sezioni dell'indice.
+        testo_di (callable): Chiave -> testo indicizzato (in casefold), per la verifica finale.
+    """
+
+    def __init__(self, sezioni, prefisso, testo_di):
+        self._trigrammi = _TestiMappati(sezioni[prefisso + '_testo'], sezioni[prefisso + '_offset'])
+        self._offset = sezioni[prefisso + '_posting_offset']
+        self._posting = sezioni[prefisso + '_posting']
+        self._chiavi = sezioni[prefisso + '_chiavi']
+        self._testo_di = testo_di
+
+    def __len__(self):
+        return len(self._chiavi)
+
+    def _posting_di(self, trigramma):
+
+        """
+        Restituisce la posting list ordinata di un trigramma (vuota se il trigramma non compare).
+        """
+
+        trigrammi = self._trigrammi
+        posizione = bisect_left(range(len(trigrammi)), trigramma, key=trigrammi.__getitem__)
+        if posizione < len(trigrammi) and trigrammi[posizione] == trigramma:
+            return self._posting[self._offset[posizione]:self._offset[posizione + 1]]
+        return ()
+
+    def cerca(self, sottostringa):
+
+        """
+        Restituisce le chiavi dei testi che contengono la sottostringa, come IndiceTrigrammi.cerca().
+        """
+
+        sottostringa = sottostringa.casefold()
+        trigrammi = IndiceTrigrammi.trigrammi(sottostringa)
+        testo_di = self._testo_di
+        if not trigrammi:
+            return {chiave for chiave in self._chiavi if sottostringa in testo_di(chiave)}
+        liste = sorted(map(self._posting_di, trigrammi), key=len)
+        candidati = set(liste[0])
+        for posting in liste[1:]:
+            if not candidati:
+                break
+            candidati = _interseca(candidati, posting)
+        return {chiave for chiave in candidati if sottostringa in testo_di(chiave)}
+
+    def stima(self, sottostringa):
+
+        """
+        Stima per eccesso quanti testi contengono la sottostringa, come IndiceTrigrammi.stima().
+        """
+
+        trigrammi = IndiceTrigrammi.trigrammi(sottostringa.casefold())
+        if not trigrammi:
+            return len(self._chiavi)
+        return min(len(self._posting_di(trigramma)) for trigramma in trigrammi)
+
+    def testo(self, chiave):
+        return self._testo_di(chiave)
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce l'indice degli ingredienti letto dal file: le interrogazioni sono quelle di IndiceIngredienti.
+class _IngredientiMappati(IndiceIngredienti):
+
+    """
+    Indice invertito in sola lettura: le posting list sono righe ordinate del file e
+    diventano frozenset (in cache) la prima volta che vengono chieste.
+    """
+
+    def __init__(self, dizionario, offset, valori, trigrammi):
+        self._dizionario = dizionario
+        self._offset = offset
+        self._valori = valori
+        self._trigrammi = trigrammi
+        self._cache = {}                                                                # Dizionario: id ingrediente -> frozenset degli id ricetta.
+
+    def posting(self, ingrediente):
+        if isinstance(ingrediente, str):
+            ingrediente = self._dizionario.cerca(ingrediente)
+        posting = self._cache.get(ingrediente)
+        if posting is None:
+            if ingrediente is None or not 0 <= ingrediente < len(self._offset) - 1:  # Mai visto, o un id provvisorio (negativo) di ricette_simili().
+                return frozenset()
+            posting = self._cache[ingrediente] = frozenset(self._valori[self._offset[ingrediente]:self._offset[ingrediente + 1]])
+        return posting
+
+    def vocabolario(self):
+        offset = self._offset
+        return [i for i in range(len(offset) - 1) if offset[i + 1] > offset[i]]
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce l'indice dei minutaggi letto dal file, con la stessa interfaccia di lettura di IndiceMinutaggio.
+class _MinutaggiMappati:
+
+    """
+    Indice dei minutaggi in sola lettura: minutaggi ordinati e id corrispondenti, due colonne del file.
+    """
+
+    def __init__(self, minutaggi, ordine):
+        self._minutaggi = minutaggi
+        self._ordine = ordine
+
+    def __len__(self):
+        return len(self._ordine)
+
+    def _estremi(self, minimo, massimo):
+        inizio = 0 if minimo is None else bisect_left(self._minutaggi, minimo)
+        fine = len(self._ordine) if massimo is None else bisect_left(self._minutaggi, massimo + 1)
+        return inizio, max(inizio, fine)
+
+    def conta(self, minimo=None, massimo=None):
+        inizio, fine = self._estremi(minimo, massimo)
+        return fine - inizio
+
+    def intervallo(self, minimo=None, massimo=None, decrescente=False):
+        inizio, fine = self._estremi(minimo, massimo)
+        ordine = self._ordine
+        posizioni = range(fine - 1, inizio - 1, -1) if decrescente else range(inizio, fine)
+        return (ordine[posizione] for posizione in posizioni)
+
+    def primi(self, numero):
+        return self._ordine[:numero].tolist()
+
+    def minimo(self):
+        return (self._minutaggi[0], self._ordine[0]) if len(self._ordine) else None
+
+    def massimo(self):
+        return (self._minutaggi[-1], self._ordine[-1]) if len(self._ordine) else None
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce le statistiche lette dal file, con la stessa interfaccia di lettura di StatisticheIncrementali.
+class _StatisticheMappate:
+
+    """
+    Statistiche in sola lettura: le frequenze sono le lunghezze delle posting list,
+    l'ordine degli ingredienti per frequenza e gli aggregati dei minutaggi sono stati
+    calcolati al salvataggio.
+    """
+
+    def __init__(self, dizionario, offset, ordine, minutaggi, testata, comparsa=None):
+        self._dizionario = dizionario
+        self._offset = offset
+        self._ordine = ordine
+        self._minutaggi = minutaggi
+        self._testata = testata
+        self._comparsa = comparsa                                                       # Manca nelle istantanee scritte prima che venisse salvata.
+
+    def _conteggio(self, id_ingrediente):
+        return self._offset[id_ingrediente + 1] - self._offset[id_ingrediente]
+
+    def __len__(self):
+        return self._testata['ricette']
+
+    def frequenza(self, ingrediente):
+        id_ingrediente = self._dizionario.cerca(ingrediente)
+        return 0 if id_ingrediente is None else self._conteggio(id_ingrediente)
+
+    def piu_comuni(self, numero=5):
+        nomi = self._dizionario
+        return [(nomi[id_ingrediente], self._conteggio(id_ingrediente)) for id_ingrediente in self._ordine[:numero]]
+
+    def meno_comuni(self):
+        ordine = self._ordine
+        if not len(ordine):
+            return [], 0
+        frequenza_minima = self._conteggio(ordine[-1])
+        inizio = len(ordine) - 1
+        while inizio and self._conteggio(ordine[inizio - 1]) == frequenza_minima:       # L'ultimo gruppo ha la frequenza minima, già in ordine di comparsa.
+            inizio -= 1
+        return [self._dizionario[id_ingrediente] for id_ingrediente in ordine[inizio:]], frequenza_minima
+
+    def ordine_di_comparsa(self):
+        return None if self._comparsa is None else self._comparsa.tolist()
+
+    def durata(self):
+        numero = self._testata['ricette']
+        if not numero:
+            return None
+        return self._minutaggi[0], self._testata['somma_minutaggi'] / numero, self._minutaggi[-1]
+
+    def id_con_piu_minutaggio(self):
+        return self._testata['id_piu_minutaggio']
+
+    def id_con_piu_ingredienti(self):
+        return self._testata['id_piu_ingredienti']
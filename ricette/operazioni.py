@@ -0,0 +1,497 @@
+"""
+Operazioni interattive sulle ricette: aggiunta, eliminazione, visualizzazione, ricerca e filtraggio avanzato.
+"""
+
+from heapq import nsmallest                                                         # Importa nsmallest, per i migliori risultati senza ordinarli tutti.
+
+from .indici import SOGLIA_SIMILI, IndiceSomiglianze, jaccard
+from .ingredienti import DizionarioIngredienti
+from .strumentazione import strumentata
+from .visualizzazione import scrivi_ricette
+
+
+# Definisce una funzione di supporto che cerca una ricetta per nome, usando l'indice dei nomi se la lista ne ha uno.
+def _trova_per_nome(lista, nome):
+
+    """
+    Cerca una ricetta per nome senza distinguere maiuscole e minuscole.
+
+    Args:
+        lista (list): Lista che contiene tutte le ricette, oppure un CatalogoRicette.
+        nome (str): Nome della ricetta da cercare.
+
+    Returns:
+        dict or None: La ricetta trovata, o None se non esiste.
+    """
+
+    if hasattr(lista, 'trova_per_nome'):                                                # Con un indice dei nomi la ricerca costa O(1).
+        return lista.trova_per_nome(nome)
+    for ricetta in lista:                                                               # Altrimenti scorre la lista confrontando i nomi in minuscolo.
+        if ricetta['nome'].lower() == nome.lower():
+            return ricetta
+    return None
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione che permette di aggiungere una nuova ricetta nella lista. (Start2impact -> Registrazione di un nuovo elemento)
+def aggiungi_ricetta(lista):
+            
+    """
+    Aggiunge una nuova ricetta alla lista delle ricette se non è già presente.
+
+    Args:
+        lista (list): Lista che contiene tutte le ricette.
+
+    Returns: 
+        Lista aggiornata con la nuova ricetta se presente, 
+        altrimenti restituisce la lista originale.
+    """
+     
+    nome = input("Inserisci il nome della ricetta: ")                                   # Chiede all'utente di inserire il nome della ricetta.
+   
+    if _trova_per_nome(lista, nome) is not None:                                        # Controlla se la ricetta esiste già nella lista per evitare duplicati.
+        print(f"La ricetta '{nome}' è già presente nella lista.")                       # Se la ricetta è già presente, notifica l'utente e restituisce la lista originale.
+        return lista                                                                    # Restituisce la lista originale se la ricetta è duplicata
+    
+    ingredienti = input("Inserisci gli ingredienti separati da virgole: ").split(',')   # Chiede all'utente di inserire gli ingredienti.
+    while True:                                                                         # Ciclo Infinito
+        try:
+            minutaggio = int(input("Inserisci il minutaggio necessario (in minuti): ")) # Chiede all'utente di inserire il minutaggio della ricetta.
+            if minutaggio > 0:
+                break                                                                   # Esce dal ciclo solo se il minutaggio è valido (positivo).
+            else:
+                print("Il minutaggio deve essere un numero maggiore di 0. Riprova.")    # Messaggio di errore se il minutaggio è <= 0.
+        except ValueError:
+            print("Inserisci un numero valido per il minutaggio. Riprova.")
+    
+    nuova_ricetta = {                                                                   # Crea un nuovo dizionario con i dettagli della ricetta
+        'nome': nome,                                                                   # Assegna il nome alla ricetta.
+        'ingredienti': [ingrediente.strip() for ingrediente in ingredienti],            # Assegna gli ingredienti alla ricetta e rimuove eventuali spazi inutili dagli ingredienti.
+        'minutaggio': minutaggio                                                        # Assegna il minutaggio alla ricetta.
+    } 
+    
+    simili = _inserisci_ricetta(lista, nuova_ricetta)                                   # Aggiunge il nuovo dizionario alla lista delle ricette e cerca quelle quasi uguali.
+    print(f"La ricetta '{nome}' è stata aggiunta con successo.")                        # Notifica l'utente che la ricetta è stata aggiunta con successo.
+    for simile, somiglianza in simili[:3]:                                              # Avvisa se esiste già una ricetta con (quasi) gli stessi ingredienti.
+        print(f"Attenzione: '{nome}' ha quasi gli stessi ingredienti di '{simile['nome']}' (somiglianza {somiglianza:.0%}).")
+    
+    return lista                                                                        # Restituisce la lista aggiornata
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione di supporto che aggiunge una ricetta già letta e restituisce quelle quasi uguali (l'operazione 'aggiungi' delle metriche).
+@strumentata('aggiungi', elenco=False)
+def _inserisci_ricetta(lista, ricetta):
+    lista.append(ricetta)
+    return trova_simili(lista, ricetta)
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione di supporto che rimuove la ricetta con il nome indicato, se c'è (l'operazione 'elimina' delle metriche).
+@strumentata('elimina')
+def _rimuovi_per_nome(lista, nome):
+    ricetta = _trova_per_nome(lista, nome)
+    if ricetta is not None:
+        lista.remove(ricetta)                                                           # Rimuove la ricetta dalla lista (in O(1) se la lista è un CatalogoRicette).
+    return ricetta
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione che consente di eliminare una ricetta dalla lista.
+def elimina_ricetta(lista):
+    
+    """
+    Elimina una ricetta dalla lista basata sul nome fornito dall'utente.
+
+    Args:
+        lista (list): Lista che contiene tutte le ricette.
+
+    Returns:
+        Lista aggiornata senza la ricetta eliminata se presente, 
+        altrimenti restituisce la lista originale.
+    """
+    
+    nome = input("Inserisci il nome della ricetta da eliminare: ").lower()              # Chiede all'utente di inserire il nome della ricetta da eliminare, convertendolo in minuscolo per uniformità.
+    if _rimuovi_per_nome(lista, nome) is not None:                                      # Cerca la ricetta con il nome corrispondente e la rimuove.
+        print(f"Ricetta '{nome}' eliminata.")                                           # Notifica l'utente che la ricetta è stata eliminata.
+        return lista                                                                    # Restituisce la lista aggiornata dopo l'eliminazione.
+
+    print(f"Ricetta '{nome}' non trovata.")                                             # Se la ricetta non viene trovata, notifica l'utente.
+    return lista                                                                        # Restituisce la lista originale se la ricetta non è trovata
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione che permetta di migliorare la visualizzazione delle ricette. (Start2impact -> Visualizzazione di tutti gli elementi)
+def visualizza_ricette(lista, formato='esteso', pagina=1, per_pagina=None):
+    
+    """
+    Mostra tutte le ricette presenti nella lista, formattando nome, ingredienti e minutaggio.
+
+    Le ricette vengono formattate a blocchi e scritte con una sola write() per blocco,
+    invece di quattro print() per ricetta.
+
+    Args:
+        lista (list): Lista che contiene tutte le ricette.
+        formato (str, optional): 'esteso' (quattro righe per ricetta) o 'compatto' (una riga per ricetta).
+        pagina (int, optional): Pagina da mostrare (da 1), se è indicato `per_pagina`.
+        per_pagina (int, optional): Ricette per pagina; None per mostrarle tutte.
+
+    Returns:
+        None: Stampa le ricette
+    """
+    
+    scrivi_ricette(lista, formato=formato, pagina=pagina, per_pagina=per_pagina)
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione che restituisce le ricette che soddisfano uno o piu' attributi, senza stamparle.
+@strumentata('cerca')
+def trova_ricette(lista, nome=None, ingrediente=None, minutaggio=None):
+
+    """
+    Restituisce le ricette della lista che soddisfano i criteri indicati.
+
+    Args:
+        lista (list): Lista che contiene tutte le ricette.
+        nome (str, optional): Testo che il nome della ricetta deve contenere.
+        ingrediente (str, optional): Testo che almeno un ingrediente deve contenere.
+        minutaggio (int, optional): Minutaggio esatto della ricetta.
+
+    Returns:
+        list: Le ricette trovate, nell'ordine della lista.
+    """
+    
+    candidati = lista                                                                                       # Di base si esaminano tutte le ricette della lista.
+    if hasattr(lista, 'id_con_nome_simile') and (nome or ingrediente or minutaggio):                        # Se la lista ha degli indici, li usa per ridurre i candidati.
+        insiemi = []                                                                                        # Id delle ricette che soddisfano ciascun criterio indicato.
+        if minutaggio:
+            insiemi.append(set(lista.id_con_minutaggio(minutaggio, minutaggio)))                            # Ricette con esattamente quel minutaggio.
+        if nome:
+            insiemi.append(lista.id_con_nome_simile(nome))                                                  # Ricette il cui nome contiene il testo (indice dei trigrammi).
+        if ingrediente:
+            insiemi.append(lista.ricette_con_ingrediente_simile(ingrediente))                               # Ricette con un ingrediente che contiene il testo.
+        insiemi.sort(key=len)                                                                               # Interseca partendo dall'insieme più piccolo.
+        candidati = lista.ricette_da_id(insiemi[0].intersection(*insiemi[1:]))
+        nome = ingrediente = minutaggio = None                                                              # I criteri sono già stati verificati dagli indici.
+
+    risultati = []                                                                                          # Crea una lista vuota per memorizzare le ricette che soddisfano i criteri di ricerca.
+    for ricetta in candidati:                                                                               # Itera attraverso ogni ricetta candidata.
+        if nome and nome.lower() not in ricetta['nome'].lower():                                            # Controlla se è specificato un nome e se il nome della ricetta non corrisponde, salta la ricetta.
+            continue
+        if ingrediente and all(ingrediente.lower() not in ingr.lower() for ingr in ricetta['ingredienti']): # Controlla se è specificato un ingrediente e se non è presente negli ingredienti della ricetta, salta la ricetta.
+            continue
+        if minutaggio and ricetta['minutaggio'] != minutaggio:                                              # Controlla se è specificato un minutaggio e se non corrisponde a quello della ricetta, salta la ricetta.
+            continue
+        risultati.append(ricetta)                                                                           # Se tutte le condizioni sono soddisfatte, aggiunge la ricetta alla lista dei risultati.
+    return risultati
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione che permetta di cercare ricette basate su uno o piu' attributi 
+def cerca_ricette(lista, nome=None, ingrediente=None, minutaggio=None):
+    
+    """
+    Cerca ricette nella lista in base a nome, ingrediente o minutaggio fornito.
+
+    Args:
+        lista (list): Lista che contiene tutte le ricette.
+        nome (str, optional): Nome della ricetta da cercare.
+        ingrediente (str, optional): Ingrediente da cercare nelle ricette.
+        minutaggio (int, optional): Minutaggio per filtrare le ricette.
+
+    Returns:
+        None: Stampa le ricette che soddisfano i criteri di ricerca oppure un messaggio se non ci sono risultati.
+    """
+    
+    risultati = trova_ricette(lista, nome, ingrediente, minutaggio)                                         # Raccoglie le ricette che corrispondono ai criteri di ricerca.
+    if risultati:                                                                                           # Se ci sono risultati, stampali.
+            visualizza_ricette(risultati)                                                                   # Visualizza le ricette che corrispondono ai criteri di ricerca.
+    else:                                                                                                   
+        print("Nessuna ricetta trovata che soddisfi i criteri.")                                            # Se non ci sono risultati, stampa un messaggio di avviso.
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione che permetta di interagire con l'utente per acquisire criteri di ricerca. (Start2impact -> Ricerca di elementi)
+def ricerca_ricetta(lista): 
+    
+    """
+    Consente all'utente di cercare una ricetta per nome, ingrediente o minutaggio.
+    Args:
+        lista (list): Lista che contiene tutte le ricette.
+    Returns:
+        None: Stampa i risultati della ricerca o un messaggio di errore se l'input non è valido.
+    """
+    print("Criteri di ricerca disponibili:")                                                             # Stampa le opzioni di ricerca disponibili per l'utente.
+    print("1. Nome")                                                                                        
+    print("2. Ingrediente")
+    print("3. Minutaggio")
+    scelta = input("Scegli il criterio di ricerca (1/2/3): ")                                            # Chiede all'utente di scegliere un criterio di ricerca tra le opzioni disponibili.
+    if scelta == '1':                                                                                    # Se l'utente ha scelto di cercare per nome, richiede il nome della ricetta e chiama la funzione cerca_ricette.
+        nome = input("Inserisci il nome della ricetta da cercare: ")                                     # Input per il nome della ricetta
+        cerca_ricette(lista, nome=nome)                                                                  # Chiamata alla funzione di ricerca con il nome specificato.
+    elif scelta == '2':                                                                                  # Se l'utente ha scelto di cercare per ingrediente, richiede l'ingrediente e chiama la funzione cerca_ricette.
+        ingrediente = input("Inserisci l'ingrediente da cercare: ")                                      # Input per l'ingrediente
+        cerca_ricette(lista, ingrediente=ingrediente)                                                    # Chiamata alla funzione di ricerca con l'ingrediente specificato
+    elif scelta == '3':  # Ricerca per minutaggio
+        while True:
+            try:
+                minutaggio = int(input("Inserisci il minutaggio della ricetta da cercare: "))           # Inserisce un numero da tastiera
+                if minutaggio < 0:
+                    print("Il minutaggio deve essere un numero positivo. Riprova.")
+                    continue                                                                            # Ripeti il ciclo se il numero è negativo
+                break                                                                                   # Esci dal ciclo se il numero è valido
+            except ValueError:                                                                          # Gestisce il caso in cui venga inserita una parola
+                print("Per favore inserisci un numero valido. Riprova.")                                     
+        cerca_ricette(lista, minutaggio=minutaggio)                                                     # Chiamata alla funzione di ricerca con il minutaggio specificato.
+    else:                                                                                                  
+        print("Scelta non valida. Per favore, scegli 1, 2 o 3.")                                         # Se l'input non è valido (non è 1, 2 o 3), stampa un messaggio di errore.
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione di supporto che scorre tutta la lista applicando il doppio filtro (usata quando non ci sono indici).
+def _filtra_minutaggio_ingrediente(lista, max_minutaggio, ingrediente):
+
+    """
+    Scansione lineare che restituisce le ricette con minutaggio non superiore al massimo
+    e che contengono l'ingrediente indicato.
+
+    Args:
+        lista (list): Lista che contiene tutte le ricette.
+        max_minutaggio (int): Minutaggio massimo (incluso).
+        ingrediente (str): Ingrediente da cercare, già in minuscolo.
+
+    Returns:
+        list: Le ricette che soddisfano entrambi i criteri.
+    """
+
+    ricette_filtrate = []                                                                                   # Inizializza una lista per memorizzare le ricette che soddisfano i criteri.
+    for ricetta in lista:                                                                                   # Scorre ogni ricetta nella lista fornita.
+        if ricetta['minutaggio'] <= max_minutaggio:                                                         # Verifica se il minutaggio della ricetta è inferiore o uguale al massimo specificato.
+            ingredienti_lower = [ingrediente_item.lower() for ingrediente_item in ricetta['ingredienti']]   # Crea una lista di ingredienti in minuscolo per la ricetta corrente convertiti in minuscolo.
+            if ingrediente in ingredienti_lower:                                                            # Verifica se l'ingrediente (in minuscolo) è presente nella lista di ingredienti (anch'essa in minuscolo).
+                ricette_filtrate.append(ricetta)                                                            # Aggiunge la ricetta alla lista dei risultati filtrati se soddisfa i criteri.
+    return ricette_filtrate
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione di supporto che applica il doppio filtro, con gli indici se la lista ne ha (l'operazione 'filtraggio_avanzato' delle metriche).
+@strumentata('filtraggio_avanzato')
+def _filtra_con_indici(lista, max_minutaggio, ingrediente):
+    if hasattr(lista, 'filtra'):                                                                            # Se la lista ha degli indici, il criterio più selettivo guida la ricerca.
+        return lista.filtra(tutti=[ingrediente], massimo=max_minutaggio)
+    return _filtra_minutaggio_ingrediente(lista, max_minutaggio, ingrediente)
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione che permetta di avere Doppio Filtro: 1) Per minutaggio. 2) Per Ingrediente (Start2impact -> Filtraggio Avanzato)
+def filtraggio_avanzato(lista):
+    
+    """
+    Filtra e visualizza le ricette in base a un doppio criterio: 
+    minutaggio massimo e presenza di un ingrediente specifico.
+
+    Args:
+        lista (list): Lista che contiene tutte le ricette, 
+                      dove ogni ricetta è rappresentata come un dizionario 
+                      con chiavi 'nome', 'ingredienti' e 'minutaggio'.
+
+    Returns:
+        None: Stampa i risultati della ricerca o un messaggio se la ricetta non è stata trovata.
+    """
+    
+    while True:                                                                                             # Ciclo infinito per ottenere un input valido per il minutaggio massimo.
+        try:
+            max_minutaggio = int(input("Inserisci il massimo minutaggio (in minuti): "))                    # Richiede all'utente di inserire il massimo minutaggio e converte l'input in un intero.
+            if max_minutaggio <= 0:                                                                         # Verifica se il minutaggio è un valore positivo(>0).
+                raise ValueError("Il minutaggio non può essere negativo o uguale a 0.")
+            break                                                                                           # Esce dal ciclo se l'input è valido
+        except ValueError as e:
+            print(f"Errore: {e}. Per favore, inserisci un numero intero valido.")                           # Stampa un messaggio di errore se l'input non è valido.
+     
+    ingrediente = input("Inserisci l'ingrediente da cercare: ").lower()                                     # Richiede all'utente di inserire un ingrediente da cercare, convertendolo in minuscolo per uniformità.                                   
+    ricette_filtrate = _filtra_con_indici(lista, max_minutaggio, ingrediente)
+
+    if ricette_filtrate:                                                                                    # Controlla se ci sono ricette filtrate da mostrare.                                                                         
+        visualizza_ricette(ricette_filtrate)                                                                # Stampa le ricette filtrate una sola volta, con un'unica scrittura.
+    else:
+        print(f"Nessuna ricetta trovata con meno di {max_minutaggio} minuti e contenente '{ingrediente}'.") # Stampa un messaggio se non ci sono ricette che soddisfano i criteri di filtraggio.
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione di supporto che scorre tutta la lista cercando le ricette con due ingredienti (usata quando non c'è un indice).
+def _filtra_due_ingredienti(lista, ingrediente1, ingrediente2):
+
+    """
+    Scansione lineare che restituisce le ricette che contengono entrambi gli ingredienti.
+
+    Args:
+        lista (list): Lista che contiene tutte le ricette.
+        ingrediente1 (str): Primo ingrediente, già in minuscolo.
+        ingrediente2 (str): Secondo ingrediente, già in minuscolo.
+
+    Returns:
+        list: Le ricette che contengono entrambi gli ingredienti.
+    """
+
+    ricette_filtrate = []                                                                                   # Inizializza una lista per memorizzare le ricette che soddisfano i criteri.
+    for ricetta in lista:                                                                                   # Scorre ogni ricetta nella lista fornita
+        ingredienti_lower = [ingrediente_item.lower() for ingrediente_item in ricetta['ingredienti']]       # Converte gli ingredienti della ricetta in minuscolo per il confronto 
+        if ingrediente1 in ingredienti_lower and ingrediente2 in ingredienti_lower:                         # Verifica se entrambe le condizioni siano soddisfatte
+            ricette_filtrate.append(ricetta)                                                                #Aggiunge la ricetta alla lista dei risultati filtrati se soddisfa i criteri.
+    return ricette_filtrate
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione di supporto che filtra per due ingredienti, con l'indice se la lista ne ha uno (l'operazione 'filtraggio_avanzato2' delle metriche).
+@strumentata('filtraggio_avanzato2')
+def _filtra_due_con_indici(lista, ingrediente1, ingrediente2):
+    if hasattr(lista, 'filtra_ingredienti'):                                                                # Se la lista ha un indice degli ingredienti, interseca le posting list invece di scorrere tutto.
+        return lista.filtra_ingredienti(tutti=[ingrediente1, ingrediente2])
+    return _filtra_due_ingredienti(lista, ingrediente1, ingrediente2)
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione che permetta di visualizzare la/e ricetta/e attraverso il filtro di due Ingredienti (Start2impact -> Filtraggio Avanzato)
+def filtraggio_avanzato2(lista):
+   
+    """
+    Filtra e visualizza le ricette che contengono due ingredienti specifici.
+
+    Args:
+        lista (list): Lista che contiene tutte le ricette, 
+                      dove ogni ricetta è rappresentata come un dizionario 
+                      con chiavi 'nome', 'ingredienti' e 'minutaggio'.
+
+    Returns:
+        None:Stampa i risultati della ricerca o un messaggio  se la ricetta non è stata trovata.
+    """
+    
+    ingrediente1 = input("Inserisci il primo ingrediente da cercare: ").strip().lower()                     # Richiede all'utente di inserire il primo ingrediente e lo converte in minuscolo.
+    ingrediente2 = input("Inserisci il secondo ingrediente da cercare: ").strip().lower()                   # Richiede all'utente di inserire il secondo ingrediente e lo converte in minuscolo.
+    ricette_filtrate = _filtra_due_con_indici(lista, ingrediente1, ingrediente2)
+
+    if ricette_filtrate:                                                                                    # Controlla se ci sono ricette filtrate da mostrare.
+        visualizza_ricette(ricette_filtrate)                                                                # Stampa le ricette filtrate una sola volta, con un'unica scrittura.
+    else:
+        print(f"Nessuna ricetta trovata contenente entrambi '{ingrediente1}' e '{ingrediente2}'.")          # Stampa un messaggio se non ci sono ricette che soddisfano i criteri di filtraggio.
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione di supporto che scorre tutta la lista cercando le ricette preparabili con la dispensa (usata quando non ci sono bitset).
+def _cucinabili_in_lista(lista, ingredienti, mancanti, limite):
+    chiave = (getattr(lista, 'dizionario', None) or DizionarioIngredienti()).chiave     # Stessa normalizzazione del catalogo: sinonimi, accenti e maiuscole.
+    dispensa = {chiave(ingrediente) for ingrediente in ingredienti}
+    risultati = []
+    for posizione, ricetta in enumerate(lista):
+        canonici = {}
+        for ingrediente in ricetta['ingredienti']:
+            canonici.setdefault(chiave(ingrediente), ingrediente)                       # Sinonimi nella stessa ricetta contano una volta, come nel catalogo.
+        mancano = [ingrediente for chiave_ingrediente, ingrediente in canonici.items() if chiave_ingrediente not in dispensa]
+        usati = len(canonici) - len(mancano)
+        if len(mancano) <= mancanti and usati:                                                              # Scarta le ricette che non usano nulla della dispensa.
+            risultati.append((len(mancano), -usati, posizione, ricetta, mancano))
+    risultati = sorted(risultati, key=lambda voce: voce[:3]) if limite is None else nsmallest(limite, risultati, key=lambda voce: voce[:3])
+    return [(ricetta, mancano) for _, _, _, ricetta, mancano in risultati]
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione che risponde a "cosa posso cucinare con questi ingredienti?", ammettendo qualche ingrediente da comprare.
+@strumentata('dispensa')
+def trova_cucinabili(lista, ingredienti, mancanti=0, limite=None):
+
+    """
+    Restituisce le ricette che si possono preparare con gli ingredienti disponibili,
+    comprandone al più `mancanti`. Contano solo le ricette che usano almeno uno degli
+    ingredienti disponibili.
+
+    Args:
+        lista (list): Lista che contiene tutte le ricette.
+        ingredienti (iterable): Ingredienti disponibili in dispensa.
+        mancanti (int, optional): Numero massimo di ingredienti mancanti.
+        limite (int, optional): Numero massimo di risultati.
+
+    Returns:
+        list: Coppie (ricetta, lista degli ingredienti mancanti), prima quelle a cui manca
+              meno, poi quelle che usano più ingredienti della dispensa, poi nell'ordine della lista.
+    """
+
+    if hasattr(lista, 'cucinabili'):                                                                        # Se la lista ha i bitset degli ingredienti, i confronti sono un AND e un popcount.
+        return lista.cucinabili(ingredienti, mancanti, limite)
+    return _cucinabili_in_lista(lista, ingredienti, mancanti, limite)
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione di supporto che porta gli ingredienti di una ricetta di una lista semplice in un insieme confrontabile.
+def _insieme_ingredienti(ricetta):
+    return {ingrediente.strip().lower() for ingrediente in ricetta['ingredienti']}
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione che trova le ricette con ingredienti quasi uguali a quelli di una ricetta.
+def trova_simili(lista, ricetta, soglia=SOGLIA_SIMILI):
+
+    """
+    Restituisce le ricette i cui ingredienti hanno con quelli della ricetta indicata una
+    somiglianza di Jaccard (ingredienti in comune / ingredienti in totale) di almeno `soglia`.
+
+    Args:
+        lista (list): Lista che contiene tutte le ricette.
+        ricetta (dict): Ricetta di riferimento; se fa parte della lista viene esclusa dai risultati.
+        soglia (float, optional): Somiglianza minima, tra 0 e 1.
+
+    Returns:
+        list: Coppie (ricetta, somiglianza), dalla più simile (a parità, nell'ordine della lista).
+    """
+
+    if hasattr(lista, 'ricette_simili'):                                                                    # Il catalogo confronta solo le ricette con gli ingredienti più rari in comune.
+        return lista.ricette_simili(ricetta, soglia)
+    cercati = _insieme_ingredienti(ricetta)
+    risultati = []
+    for posizione, altra in enumerate(lista):
+        if altra is not ricetta:
+            somiglianza = jaccard(cercati, _insieme_ingredienti(altra))
+            if somiglianza >= soglia:
+                risultati.append((-somiglianza, posizione, altra))
+    risultati.sort(key=lambda voce: voce[:2])
+    return [(altra, -somiglianza) for somiglianza, _, altra in risultati]
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione che trova in tutta la lista le coppie di ricette quasi uguali, senza confrontare tutte le coppie.
+@strumentata('duplicati')
+def trova_duplicati(lista, soglia=SOGLIA_SIMILI):
+
+    """
+    Trova le coppie di ricette con ingredienti quasi uguali (somiglianza di Jaccard di
+    almeno `soglia`), confrontando solo le coppie proposte da un indice MinHash/LSH.
+
+    Le bande trovano quasi tutte le coppie sopra SOGLIA_BANDE (circa 0.71) e poche sotto:
+    con una soglia più bassa il risultato è incompleto (il comando `duplicates` la rifiuta).
+
+    Args:
+        lista (list): Lista che contiene tutte le ricette.
+        soglia (float, optional): Somiglianza minima, tra SOGLIA_BANDE e 1.
+
+    Returns:
+        list: Tuple (ricetta, ricetta, somiglianza), dalla coppia più simile; in ogni coppia
+              la prima ricetta è quella che viene prima nella lista.
+    """
+
+    if hasattr(lista, 'coppie_simili'):                                                                     # Il catalogo usa gli ingredienti canonici dell'archivio.
+        return lista.coppie_simili(soglia)
+    ricette = list(lista)
+    insiemi = [_insieme_ingredienti(ricetta) for ricetta in ricette]
+    codici = {}                                                                                             # Ingrediente -> intero, per le firme MinHash.
+    indice = IndiceSomiglianze()
+    firme = {}
+    for posizione, insieme in enumerate(insiemi):
+        firma = indice.firma([codici.setdefault(ingrediente, len(codici)) for ingrediente in insieme])
+        if firma is not None:
+            firme[posizione] = firma
+    risultati = []
+    for primo, secondo in indice.coppie(firme):
+        somiglianza = jaccard(insiemi[primo], insiemi[secondo])
+        if somiglianza >= soglia:
+            risultati.append((-somiglianza, primo, secondo))
+    risultati.sort()
+    return [(ricette[primo], ricette[secondo], -somiglianza) for somiglianza, primo, secondo in risultati]
@@ -0,0 +1,359 @@
+"""
+Statistiche map-reduce su più processi, per ricettari molto grandi.
+
+Le ricette vengono divise in blocchi; ogni processo di un ProcessPoolExecutor conta gli
+ingredienti e aggrega i minutaggi del proprio blocco (map) e i risultati parziali
+vengono poi uniti (reduce). Il lavoro arriva ai processi in tre modi:
+
+    - lista di ricette: i processi la ricevono una volta sola all'avvio (con fork la
+      condividono senza copiarla) e ogni blocco è solo un intervallo di posizioni;
+    - file JSONL o CSV: ogni blocco è un intervallo di byte del file, che il processo
+      legge e valida da sé, così anche la lettura avviene in parallelo (nei CSV i
+      confini cadono tra un record e l'altro anche se una cella tra virgolette va a capo);
+    - qualsiasi altro iterabile: il processo principale raccoglie ingredienti e
+      minutaggi di ogni blocco e li invia ai processi (qui il principale fa da collo di
+      bottiglia: conviene passare una lista o un file).
+
+I conteggi sono quelli di statistiche_ingredienti() su una lista: ingredienti come sono
+scritti, senza forma canonica. I risultati parziali vengono uniti nell'ordine dei
+blocchi, quindi anche gli ex aequo escono nello stesso ordine del calcolo seriale.
+"""
+
+import os                                                                           # Importa os, per il numero di processori e la dimensione dei file.
+from collections import Counter                                                     # Importa Counter, usato per i conteggi parziali e la loro unione.
+from concurrent.futures import ProcessPoolExecutor                                  # Importa ProcessPoolExecutor, che distribuisce i blocchi tra i processi.
+from itertools import chain                                                         # Importa chain, per appiattire gli ingredienti di un blocco.
+
+from .importazione import _formato_da_percorso, a_blocchi, leggi_csv, leggi_jsonl, valida_ricetta
+
+DIMENSIONE_BLOCCO = 100_000                                                         # Ricette per blocco, per liste e iterabili.
+BLOCCHI_PER_PROCESSO = 4                                                            # Blocchi per processo nei file: i processi più veloci ne prendono di più.
+MINIMO_BYTE_PER_BLOCCO = 1 << 20                                                    # Sotto 1 MiB per blocco non conviene dividere un file.
+DIMENSIONE_LETTURA = 1 << 20                                                        # Byte letti alla volta cercando i confini dei record CSV.
+
+_ricette_condivise = None                                                           # Lista di ricette ricevuta da ogni processo all'avvio.
+
+
+# Definisce il risultato (parziale o totale) delle statistiche: conteggi degli ingredienti e aggregati dei minutaggi.
+class StatisticheAggregate:
+
+    """
+    Conteggi degli ingredienti e aggregati dei minutaggi di un insieme di ricette.
+
+    Gli aggregati di blocchi diversi si uniscono con unisci(): è il passo "reduce"
+    di statistiche_parallele(). L'interfaccia di lettura è quella di
+    StatisticheIncrementali (frequenza, piu_comuni, meno_comuni, durata).
+
+    Attributes:
+        conteggi (Counter): Ingrediente (come scritto) -> occorrenze.
+        numero (int): Numero di ricette.
+        somma_minutaggi (int): Somma dei minutaggi.
+        minimo (int or None): Minutaggio minimo.
+        massimo (int or None): Minutaggio massimo.
+        scartate (int): Righe non valide saltate (solo per i file).
+    """
+
+    __slots__ = ('conteggi', 'numero', 'somma_minutaggi', 'minimo', 'massimo', 'scartate', '_per_minuscolo')
+
+    def __init__(self):
+        self.conteggi = Counter()
+        self.numero = 0
+        self.somma_minutaggi = 0
+        self.minimo = None
+        self.massimo = None
+        self.scartate = 0
+        self._per_minuscolo = None                                                      # Conteggi per ingrediente in minuscolo, calcolati alla prima frequenza().
+
+    def __getstate__(self):
+        return self.conteggi, self.numero, self.somma_minutaggi, self.minimo, self.massimo, self.scartate
+
+    def __setstate__(self, stato):
+        self.conteggi, self.numero, self.somma_minutaggi, self.minimo, self.massimo, self.scartate = stato
+        self._per_minuscolo = None
+
+    def __len__(self):
+        return self.numero
+
+    def aggiungi_colonne(self, ingredienti, minutaggi):
+
+        """
+        Aggiunge un blocco di ricette dato per colonne.
+
+        Args:
+            ingredienti (iterable): Ingredienti di tutte le ricette del blocco, uno dopo l'altro.
+            minutaggi (list): Minutaggio di ogni ricetta del blocco.
+        """
+
+        self.conteggi.update(ingredienti)                                               # Un solo update per blocco: il conteggio avviene in C.
+        if minutaggi:
+            self.numero += len(minutaggi)
+            self.somma_minutaggi += sum(minutaggi)
+            minimo, massimo = min(minutaggi), max(minutaggi)
+            self.minimo = minimo if self.minimo is None else min(self.minimo, minimo)
+            self.massimo = massimo if self.massimo is None else max(self.massimo, massimo)
+        self._per_minuscolo = None
+
+    def aggiungi_ricette(self, ricette):
+
+        """
+        Aggiunge un blocco di ricette.
+
+        Args:
+            ricette (list): Ricette del blocco.
+        """
+
+        self.aggiungi_colonne(chain.from_iterable(ricetta['ingredienti'] for ricetta in ricette),
+                              [ricetta['minutaggio'] for ricetta in ricette])
+
+    def unisci(self, altra):
+
+        """
+        Unisce a queste statistiche quelle di un altro blocco, che viene dopo nell'ordine delle ricette.
+
+        Args:
+            altra (StatisticheAggregate): Statistiche da aggiungere.
+
+        Returns:
+            StatisticheAggregate: Queste statistiche, aggiornate.
+        """
+
+        self.conteggi.update(altra.conteggi)
+        self.numero += altra.numero
+        self.somma_minutaggi += altra.somma_minutaggi
+        for nome, scegli in (('minimo', min), ('massimo', max)):
+            valori = [valore for valore in (getattr(self, nome), getattr(altra, nome)) if valore is not None]
+            setattr(self, nome, scegli(valori) if valori else None)
+        self.scartate += altra.scartate
+        self._per_minuscolo = None
+        return self
+
+    def frequenza(self, ingrediente):
+
+        """
+        Restituisce quante volte un ingrediente compare, senza distinguere maiuscole e
+        minuscole (come ingrediente_frequenza() su una lista).
+
+        Args:
+            ingrediente (str): Ingrediente da cercare.
+
+        Returns:
+            int: Numero di occorrenze, 0 se l'ingrediente non compare.
+        """
+
+        if self._per_minuscolo is None:
+            self._per_minuscolo = Counter()
+            for nome, volte in self.conteggi.items():
+                self._per_minuscolo[nome.lower()] += volte
+        return self._per_minuscolo.get(ingrediente.strip().lower(), 0)
+
+    def piu_comuni(self, numero=5):
+
+        """
+        Returns:
+            list: Tuple (ingrediente, occorrenze) dalla più frequente, come Counter.most_common().
+        """
+
+        return self.conteggi.most_common(numero)
+
+    def meno_comuni(self):
+
+        """
+        Returns:
+            tuple: (lista degli ingredienti con la frequenza minima, frequenza minima), oppure ([], 0) se non ci sono ingredienti.
+        """
+
+        if not self.conteggi:
+            return [], 0
+        frequenza_minima = min(self.conteggi.values())
+        return [ingrediente for ingrediente, volte in self.conteggi.items() if volte == frequenza_minima], frequenza_minima
+
+    def durata(self):
+
+        """
+        Returns:
+            tuple or None: (minimo, media, massimo), o None se non ci sono ricette.
+        """
+
+        if not self.numero:
+            return None
+        return self.minimo, self.somma_minutaggi / self.numero, self.massimo
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce le funzioni eseguite nei processi: devono stare a livello di modulo per poter essere inviate ai processi.
+def _ricevi_ricette(ricette):
+    global _ricette_condivise
+    _ricette_condivise = ricette
+
+
+def _conta_intervallo(inizio, fine):
+    parziale = StatisticheAggregate()
+    parziale.aggiungi_ricette(_ricette_condivise[inizio:fine])
+    return parziale
+
+
+def _conta_colonne(ingredienti, minutaggi):
+    parziale = StatisticheAggregate()
+    parziale.aggiungi_colonne(ingredienti, minutaggi)
+    return parziale
+
+
+def _conta_file(percorso, formato, inizio, fine):
+    parziale = StatisticheAggregate()
+    with open(percorso, 'rb') as file:
+        intestazione = file.readline() if formato == 'csv' else b''
+        if inizio:
+            file.seek(inizio - 1)
+            file.readline()                                                             # Salta la riga iniziata nel blocco precedente (o solo il suo a capo).
+        posizione = max(file.tell(), len(intestazione))                                 # Nel primo blocco CSV l'intestazione non è una ricetta.
+        file.seek(posizione)
+
+        def righe():                                                                    # Righe che iniziano nel blocco, decodificate.
+            nonlocal posizione
+            for riga in file:
+                if posizione >= fine:
+                    return
+                posizione += len(riga)
+                yield riga.decode('utf-8')
+
+        if formato == 'csv':
+            lette = leggi_csv(chain([intestazione.decode('utf-8')], righe()))           # Ogni blocco rilegge l'intestazione per sapere l'ordine delle colonne.
+        else:
+            lette = leggi_jsonl(righe())
+        ricette = []
+        for _, dati in lette:
+            ricetta, _ = valida_ricetta(dati)
+            if ricetta is None:
+                parziale.scartate += 1
+            else:
+                ricette.append(ricetta)
+                if len(ricette) >= DIMENSIONE_BLOCCO:
+                    parziale.aggiungi_ricette(ricette)
+                    ricette = []
+        parziale.aggiungi_ricette(ricette)
+    return parziale
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione di supporto che divide un file in intervalli di byte, uno per blocco.
+def _intervalli_file(percorso, lavoratori, formato='jsonl'):
+    dimensione = os.path.getsize(percorso)
+    numero = max(1, min(lavoratori * BLOCCHI_PER_PROCESSO, dimensione // MINIMO_BYTE_PER_BLOCCO))
+    confini = [dimensione * i // numero for i in range(numero + 1)]
+    if formato == 'csv' and numero > 1:
+        confini = _confini_csv(percorso, confini)
+    return list(zip(confini, confini[1:]))
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione di supporto che sposta i confini dei blocchi di un CSV all'inizio del record successivo.
+def _confini_csv(percorso, confini):
+
+    """
+    Sposta ogni confine subito dopo il primo a capo che chiude davvero un record.
+
+    Un a capo dentro una cella tra virgolette non chiude il record: lo chiude solo un a
+    capo preceduto da un numero pari di virgolette (le virgolette dentro una cella sono
+    raddoppiate, quindi non cambiano la parità). Il file viene letto una volta sola
+    contando le virgolette, senza interpretare il CSV.
+
+    Args:
+        percorso (str): Percorso del file CSV.
+        confini (list): Confini in byte, dal primo (0) all'ultimo (la dimensione del file).
+
+    Returns:
+        list: Confini crescenti e senza doppioni, con il primo e l'ultimo invariati.
+    """
+
+    allineati = [confini[0]]
+    obiettivi = iter(confini[1:-1])
+    obiettivo = next(obiettivi, None)
+    base = 0                                                                            # Posizione nel file del pezzo letto.
+    dispari = 0                                                                         # Parità delle virgolette prima di base + cursore.
+    with open(percorso, 'rb') as file:
+        while obiettivo is not None:
+            pezzo = file.read(DIMENSIONE_LETTURA)
+            if not pezzo:
+                break
+            cursore = 0
+            while obiettivo is not None:
+                a_capo = pezzo.find(b'\n', max(obiettivo - base, cursore))
+                if a_capo < 0:
+                    break
+                dispari ^= pezzo.count(b'"', cursore, a_capo) & 1
+                cursore = a_capo + 1
+                if not dispari:                                                         # Fuori dalle virgolette: qui inizia un record.
+                    allineati.append(base + cursore)
+                    while obiettivo is not None and obiettivo < base + cursore:
+                        obiettivo = next(obiettivi, None)
+            dispari ^= pezzo.count(b'"', cursore) & 1
+            base += len(pezzo)
+    allineati.append(confini[-1])
+    return sorted(set(allineati))
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce la funzione che calcola le statistiche dividendo le ricette tra più processi.
+def statistiche_parallele(sorgente, lavoratori=None, dimensione_blocco=DIMENSIONE_BLOCCO, formato=None):
+
+    """
+    Conta gli ingredienti e aggrega i minutaggi dividendo il lavoro tra più processi.
+
+    Args:
+        sorgente (list or str or iterable): Lista di ricette, percorso di un file JSONL o CSV,
+                                            oppure un qualsiasi iterabile di ricette.
+        lavoratori (int, optional): Numero di processi; se manca, uno per processore.
+                                    Con 1 il calcolo avviene nel processo corrente.
+        dimensione_blocco (int, optional): Ricette per blocco, per liste e iterabili.
+        formato (str, optional): 'jsonl' o 'csv' per i file; se manca viene dedotto dall'estensione.
+
+    Returns:
+        StatisticheAggregate: Conteggi degli ingredienti e aggregati dei minutaggi.
+
+    Raises:
+        ValueError: Se il formato del file non è supportato.
+    """
+
+    lavoratori = lavoratori or os.cpu_count() or 1
+    totale = StatisticheAggregate()
+
+    if isinstance(sorgente, (str, os.PathLike)):
+        formato = _formato_da_percorso(os.fspath(sorgente), formato)
+        intervalli = _intervalli_file(sorgente, lavoratori, formato)
+        if lavoratori == 1:
+            parziali = (_conta_file(sorgente, formato, inizio, fine) for inizio, fine in intervalli)
+            return _unisci_in_ordine(totale, parziali)
+        with ProcessPoolExecutor(lavoratori) as esecutore:
+            parziali = esecutore.map(_conta_file, *zip(*((sorgente, formato, inizio, fine) for inizio, fine in intervalli)))
+            return _unisci_in_ordine(totale, parziali)
+
+    if isinstance(sorgente, (list, tuple)):
+        if lavoratori == 1:
+            totale.aggiungi_ricette(sorgente)
+            return totale
+        inizi = range(0, len(sorgente), dimensione_blocco)
+        with ProcessPoolExecutor(lavoratori, initializer=_ricevi_ricette, initargs=(sorgente,)) as esecutore:
+            parziali = esecutore.map(_conta_intervallo, inizi, [inizio + dimensione_blocco for inizio in inizi])
+            return _unisci_in_ordine(totale, parziali)
+
+    blocchi = a_blocchi(sorgente, dimensione_blocco)
+    if lavoratori == 1:
+        for blocco in blocchi:
+            totale.aggiungi_ricette(blocco)
+        return totale
+    with ProcessPoolExecutor(lavoratori) as esecutore:
+        in_corso = []                                                                   # Al massimo due blocchi per processo in volo, per non tenere tutto in memoria.
+        for blocco in blocchi:
+            ingredienti = list(chain.from_iterable(ricetta['ingredienti'] for ricetta in blocco))
+            in_corso.append(esecutore.submit(_conta_colonne, ingredienti, [ricetta['minutaggio'] for ricetta in blocco]))
+            if len(in_corso) >= 2 * lavoratori:
+                totale.unisci(in_corso.pop(0).result())
+        return _unisci_in_ordine(totale, (futuro.result() for futuro in in_corso))
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione di supporto che unisce i risultati parziali nell'ordine dei blocchi.
+def _unisci_in_ordine(totale, parziali):
+    for parziale in parziali:
+        totale.unisci(parziale)
+    return totale
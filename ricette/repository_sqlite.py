@@ -0,0 +1,649 @@
+"""
+Repository delle ricette su SQLite: le ricette sopravvivono alla chiusura del programma
+e le interrogazioni non richiedono di tenere tutto il catalogo in memoria.
+"""
+
+import sqlite3                                                                      # Importa sqlite3, il database incluso nella libreria standard.
+from itertools import groupby                                                       # Importa groupby, usato per raggruppare le righe delle join per ricetta.
+
+from .indici import normalizza_chiave
+from .ingredienti import DizionarioIngredienti, forma_base, piega
+
+
+# Schema normalizzato: ricette, ingredienti distinti e tabella di collegamento, con gli indici usati dalle interrogazioni.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ricette (
+    id                  INTEGER PRIMARY KEY,
+    nome                TEXT    NOT NULL,
+    chiave_nome         TEXT    NOT NULL UNIQUE,
+    minutaggio          INTEGER NOT NULL CHECK (minutaggio > 0),
+    numero_ingredienti  INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS ingredienti (
+    id      INTEGER PRIMARY KEY,
+    nome    TEXT NOT NULL UNIQUE,
+    chiave  TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS ricetta_ingredienti (
+    id_ricetta      INTEGER NOT NULL REFERENCES ricette (id) ON DELETE CASCADE,
+    posizione       INTEGER NOT NULL,
+    id_ingrediente  INTEGER NOT NULL REFERENCES ingredienti (id),
+    PRIMARY KEY (id_ricetta, posizione)
+);
+CREATE INDEX IF NOT EXISTS idx_ricette_minutaggio ON ricette (minutaggio, id);
+CREATE INDEX IF NOT EXISTS idx_ricette_numero_ingredienti ON ricette (numero_ingredienti, id);
+CREATE INDEX IF NOT EXISTS idx_ingredienti_chiave ON ingredienti (chiave);
+CREATE INDEX IF NOT EXISTS idx_ricetta_ingredienti_ingrediente ON ricetta_ingredienti (id_ingrediente, id_ricetta);
+"""
+
+# Interrogazioni a testo fisso: sqlite3 le prepara una volta e poi le riusa dalla sua cache.
+SQL_INSERISCI_RICETTA = "INSERT INTO ricette (nome, chiave_nome, minutaggio, numero_ingredienti) VALUES (?, ?, ?, ?)"
+SQL_INSERISCI_INGREDIENTE = "INSERT INTO ingredienti (nome, chiave) VALUES (?, ?)"
+SQL_ID_INGREDIENTE = "SELECT id FROM ingredienti WHERE chiave = ?"
+SQL_INSERISCI_COLLEGAMENTO = "INSERT INTO ricetta_ingredienti (id_ricetta, posizione, id_ingrediente) VALUES (?, ?, ?)"
+SQL_ELIMINA_RICETTA = "DELETE FROM ricette WHERE id = ?"
+SQL_ID_PER_NOME = "SELECT id FROM ricette WHERE chiave_nome = ?"
+SQL_CONTA = "SELECT count(*) FROM ricette"
+SQL_RICETTE_CON_INGREDIENTI = """
+    SELECT r.id, r.nome, r.minutaggio, i.nome
+    FROM ricette r
+    LEFT JOIN ricetta_ingredienti ri ON ri.id_ricetta = r.id
+    LEFT JOIN ingredienti i ON i.id = ri.id_ingrediente
+    {filtro}
+    ORDER BY r.id, ri.posizione
+"""
+SQL_INTERVALLO = "SELECT id FROM ricette WHERE minutaggio BETWEEN ? AND ? ORDER BY minutaggio, id"
+SQL_INTERVALLO_DECRESCENTE = "SELECT id FROM ricette WHERE minutaggio BETWEEN ? AND ? ORDER BY minutaggio DESC, id DESC"
+SQL_PIU_VELOCI = "SELECT id FROM ricette ORDER BY minutaggio, id LIMIT ?"
+SQL_INGREDIENTE_SIMILE = """
+    SELECT DISTINCT ri.id_ricetta
+    FROM ingredienti i JOIN ricetta_ingredienti ri ON ri.id_ingrediente = i.id
+    WHERE instr(i.chiave, ?) > 0 OR i.chiave = ?
+"""
+SQL_NOME_SIMILE = "SELECT id FROM ricette WHERE instr(chiave_nome, ?) > 0"                 # Scansione: SQLite non ha un indice per le sottostringhe.
+SQL_FREQUENZA = """
+    SELECT count(*) FROM ingredienti i JOIN ricetta_ingredienti ri ON ri.id_ingrediente = i.id
+    WHERE i.chiave = ?
+"""
+SQL_PIU_COMUNI = """
+    SELECT i.nome, count(*) AS frequenza
+    FROM ricetta_ingredienti ri JOIN ingredienti i ON i.id = ri.id_ingrediente
+    GROUP BY ri.id_ingrediente
+    ORDER BY frequenza DESC, min(ri.rowid)
+    LIMIT ?
+"""
+SQL_MENO_COMUNI = """
+    WITH conteggi AS (
+        SELECT id_ingrediente, count(*) AS frequenza, min(rowid) AS prima_comparsa
+        FROM ricetta_ingredienti GROUP BY id_ingrediente
+    )
+    SELECT i.nome, c.frequenza
+    FROM conteggi c JOIN ingredienti i ON i.id = c.id_ingrediente
+    WHERE c.frequenza = (SELECT min(frequenza) FROM conteggi)
+    ORDER BY c.prima_comparsa
+"""
+SQL_DURATA = "SELECT min(minutaggio), avg(minutaggio), max(minutaggio) FROM ricette"
+SQL_PIU_MINUTAGGIO = "SELECT id FROM ricette ORDER BY minutaggio DESC, id LIMIT 1"
+SQL_PIU_INGREDIENTI = "SELECT id FROM ricette ORDER BY numero_ingredienti DESC, id LIMIT 1"
+
+SQL_INTERROGA = "SELECT r.id FROM ricette r {filtro} ORDER BY {ordine} LIMIT ? OFFSET ?"
+ORDINAMENTI_SQL = {                                                                 # Colonne di ordinamento di RepositorySQLite.interroga(); l'id decide tra gli ex aequo.
+    'inserimento': ('r.id',),
+    'minutaggio': ('r.minutaggio', 'r.id'),
+    'nome': ('r.chiave_nome', 'r.id'),
+    'numero_ingredienti': ('r.numero_ingredienti', 'r.id'),
+}
+
+# Frammenti usati per comporre i filtri su ingredienti e minutaggio.
+SQL_FILTRO_TUTTI = """r.id IN (
+    SELECT ri.id_ricetta FROM ricetta_ingredienti ri JOIN ingredienti i ON i.id = ri.id_ingrediente
+    WHERE i.chiave IN ({segnaposto}) GROUP BY ri.id_ricetta HAVING count(DISTINCT i.chiave) = ?
+)"""
+SQL_FILTRO_ALMENO_UNO = """EXISTS (
+    SELECT 1 FROM ricetta_ingredienti ri JOIN ingredienti i ON i.id = ri.id_ingrediente
+    WHERE ri.id_ricetta = r.id AND i.chiave IN ({segnaposto})
+)"""
+SQL_FILTRO_ESCLUSI = """NOT EXISTS (
+    SELECT 1 FROM ricetta_ingredienti ri JOIN ingredienti i ON i.id = ri.id_ingrediente
+    WHERE ri.id_ricetta = r.id AND i.chiave IN ({segnaposto})
+)"""
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce le statistiche calcolate dal database, con la stessa interfaccia di StatisticheIncrementali.
+class StatisticheSQLite:
+
+    """
+    Statistiche sulle ricette calcolate con interrogazioni SQL sugli indici del database.
+
+    Offre gli stessi metodi di StatisticheIncrementali, così le funzioni di statistica
+    funzionano allo stesso modo con un CatalogoRicette o con un RepositorySQLite.
+
+    Args:
+        connessione (sqlite3.Connection): Connessione al database delle ricette.
+        dizionario (DizionarioIngredienti): Dizionario che calcola le chiavi degli ingredienti.
+    """
+
+    def __init__(self, connessione, dizionario):
+        self._connessione = connessione
+        self._dizionario = dizionario
+
+    def __len__(self):
+        return self._connessione.execute(SQL_CONTA).fetchone()[0]
+
+    def frequenza(self, ingrediente):
+
+        """
+        Returns:
+            int: Quante volte l'ingrediente compare nelle ricette (senza distinguere maiuscole, accenti e sinonimi).
+        """
+
+        return self._connessione.execute(SQL_FREQUENZA, (self._dizionario.chiave(ingrediente),)).fetchone()[0]
+
+    def piu_comuni(self, numero=5):
+
+        """
+        Returns:
+            list: Tuple (ingrediente, occorrenze) dei `numero` ingredienti più comuni.
+        """
+
+        return self._connessione.execute(SQL_PIU_COMUNI, (numero,)).fetchall()
+
+    def meno_comuni(self):
+
+        """
+        Returns:
+            tuple: (lista degli ingredienti con la frequenza minima, frequenza minima), oppure ([], 0).
+        """
+
+        righe = self._connessione.execute(SQL_MENO_COMUNI).fetchall()
+        if not righe:
+            return [], 0
+        return [nome for nome, _ in righe], righe[0][1]
+
+    def durata(self):
+
+        """
+        Returns:
+            tuple or None: (minimo, media, massimo) dei minutaggi, o None se non ci sono ricette.
+        """
+
+        minimo, media, massimo = self._connessione.execute(SQL_DURATA).fetchone()
+        return None if minimo is None else (minimo, media, massimo)
+
+    def id_con_piu_minutaggio(self):
+        riga = self._connessione.execute(SQL_PIU_MINUTAGGIO).fetchone()
+        return None if riga is None else riga[0]
+
+    def id_con_piu_ingredienti(self):
+        riga = self._connessione.execute(SQL_PIU_INGREDIENTI).fetchone()
+        return None if riga is None else riga[0]
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce la transazione del repository, che tiene la cache degli ingredienti allineata al database.
+class _Transazione:
+
+    """
+    Contesto di una transazione di RepositorySQLite.
+
+    Se la transazione va a buon fine le voci aggiunte alla cache degli ingredienti
+    diventano definitive; se viene annullata vengono tolte, perché gli ingredienti
+    inseriti nel frattempo non esistono più nel database.
+
+    Args:
+        repository (RepositorySQLite): Repository su cui aprire la transazione.
+    """
+
+    __slots__ = ('_repository',)
+
+    def __init__(self, repository):
+        self._repository = repository
+
+    def __enter__(self):
+        self._repository._connessione.__enter__()
+
+    def __exit__(self, tipo, valore, traccia):
+        repository = self._repository
+        try:
+            return repository._connessione.__exit__(tipo, valore, traccia)              # Esegue il commit, oppure il rollback se c'è stata un'eccezione.
+        except BaseException:
+            tipo = tipo or Exception                                                    # Il commit non è riuscito: la transazione è annullata.
+            raise
+        finally:
+            if tipo is not None:
+                cache = repository._id_ingredienti
+                for ingrediente in repository._id_provvisori:
+                    cache.pop(ingrediente, None)
+            repository._id_provvisori.clear()
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce il repository delle ricette su SQLite, utilizzabile dalle funzioni al posto di una lista o di un CatalogoRicette.
+class RepositorySQLite:
+
+    """
+    Repository persistente delle ricette su SQLite.
+
+    Espone la stessa interfaccia di CatalogoRicette (iterazione, len, append, remove,
+    ricerca per nome, filtri su ingredienti e minutaggio, statistiche), così tutte le
+    funzioni del progetto possono lavorare direttamente sul database. Le ricette sono
+    restituite come dizionari {'nome', 'ingredienti', 'minutaggio'}.
+
+    Il database usa tabelle normalizzate (ricette, ingredienti, collegamenti), indici
+    sul nome normalizzato, sugli ingredienti e sul minutaggio, e il journal WAL. Gli
+    ingredienti vengono portati in forma canonica all'inserimento con un
+    DizionarioIngredienti, come nel catalogo: la colonna `chiave` è la loro forma base.
+
+    Args:
+        percorso (str, optional): File del database; ':memory:' per un database temporaneo.
+        alias (dict, optional): Sinonimi degli ingredienti (variante -> nome canonico);
+                                None usa ALIAS_INGREDIENTI, {} li disattiva.
+    """
+
+    def __init__(self, percorso=':memory:', alias=None):
+        self._connessione = sqlite3.connect(percorso, cached_statements=256)          # Cache ampia: ogni interrogazione viene preparata una volta sola.
+        self._connessione.execute("PRAGMA foreign_keys = ON")                          # Necessario per ON DELETE CASCADE sui collegamenti.
+        self._connessione.execute("PRAGMA journal_mode = WAL")                          # Letture e scritture concorrenti; ignorato per i database in memoria.
+        self._connessione.execute("PRAGMA synchronous = NORMAL")                        # Con WAL resta sicuro e riduce le sincronizzazioni su disco.
+        self._connessione.executescript(SCHEMA)
+        self.dizionario = DizionarioIngredienti(alias)
+        self.statistiche = StatisticheSQLite(self._connessione, self.dizionario)
+        self._id_ingredienti = {}                                                       # Cache: ingrediente come scritto -> id, per non interrogare il database ad ogni inserimento.
+        self._id_provvisori = []                                                        # Voci della cache aggiunte nella transazione in corso: spariscono se viene annullata.
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *eccezione):
+        self.chiudi()
+
+    def chiudi(self):
+
+        """
+        Chiude la connessione al database.
+        """
+
+        self._connessione.close()
+
+    def __len__(self):
+        return self._connessione.execute(SQL_CONTA).fetchone()[0]
+
+    def __iter__(self):
+        return self._ricette_da_interrogazione("", ())                                 # Le ricette arrivano una alla volta, senza caricarle tutte in memoria.
+
+    def __contains__(self, ricetta):
+        return self.id_di(ricetta) is not None
+
+    def _ricette_da_interrogazione(self, filtro, parametri):
+
+        """
+        Esegue la join ricette-ingredienti con un filtro e ricompone le ricette come dizionari.
+        """
+
+        cursore = self._connessione.execute(SQL_RICETTE_CON_INGREDIENTI.format(filtro=filtro), parametri)
+        for (_, nome, minutaggio), righe in groupby(cursore, key=lambda riga: riga[:3]):
+            ingredienti = [riga[3] for riga in righe if riga[3] is not None]             # LEFT JOIN: una ricetta senza ingredienti produce una riga con NULL.
+            yield {'nome': nome, 'ingredienti': ingredienti, 'minutaggio': minutaggio}
+
+    def _id_ingrediente(self, ingrediente):
+
+        """
+        Restituisce l'id dell'ingrediente canonico, inserendolo se non è ancora presente.
+        """
+
+        id_ingrediente = self._id_ingredienti.get(ingrediente)
+        if id_ingrediente is None:
+            chiave = self.dizionario.chiave(ingrediente)
+            riga = self._connessione.execute(SQL_ID_INGREDIENTE, (chiave,)).fetchone()
+            if riga is None:
+                cursore = self._connessione.execute(SQL_INSERISCI_INGREDIENTE, (self.dizionario.canonico(ingrediente), chiave))
+                id_ingrediente = cursore.lastrowid
+            else:
+                id_ingrediente = riga[0]
+            self._id_ingredienti[ingrediente] = id_ingrediente                          # Gli ingredienti non vengono mai cancellati: la voce resta valida se la transazione va a buon fine.
+            self._id_provvisori.append(ingrediente)
+        return id_ingrediente
+
+    def _inserisci(self, ricetta):
+
+        """
+        Inserisce una ricetta e i suoi collegamenti agli ingredienti (senza fare commit).
+        """
+
+        id_ingredienti = list(dict.fromkeys(self._id_ingrediente(i) for i in ricetta['ingredienti']))  # Id canonici, senza doppioni.
+        try:
+            cursore = self._connessione.execute(SQL_INSERISCI_RICETTA, (
+                ricetta['nome'], normalizza_chiave(ricetta['nome']), ricetta['minutaggio'], len(id_ingredienti)))
+        except sqlite3.IntegrityError:
+            raise ValueError(f"La ricetta '{ricetta['nome']}' è già presente nel catalogo.") from None
+        id_ricetta = cursore.lastrowid
+        self._connessione.executemany(SQL_INSERISCI_COLLEGAMENTO, (
+            (id_ricetta, posizione, id_ingrediente) for posizione, id_ingrediente in enumerate(id_ingredienti)
+        ))
+        return id_ricetta
+
+    def append(self, ricetta):
+
+        """
+        Aggiunge una ricetta al database.
+
+        Args:
+            ricetta (dict): Ricetta da aggiungere.
+
+        Returns:
+            int: Id assegnato alla ricetta.
+
+        Raises:
+            ValueError: Se nel database c'è già una ricetta con lo stesso nome.
+        """
+
+        with self._transazione():                                                       # Transazione: in caso di errore non resta nulla a metà.
+            return self._inserisci(ricetta)
+
+    def _transazione(self):
+
+        """
+        Restituisce un contesto che esegue una transazione e, se viene annullata,
+        toglie dalla cache degli ingredienti gli id che non esistono più nel database.
+        """
+
+        return _Transazione(self)
+
+    def aggiungi_molte(self, ricette, dimensione_blocco=1000):
+
+        """
+        Aggiunge molte ricette, con una transazione ogni `dimensione_blocco` ricette.
+
+        Le ricette con un nome già presente vengono saltate.
+
+        Args:
+            ricette (iterable): Ricette da aggiungere (anche un generatore).
+            dimensione_blocco (int, optional): Ricette per transazione.
+
+        Returns:
+            int: Numero di ricette effettivamente aggiunte.
+        """
+
+        aggiunte = 0
+        blocco = []
+        for ricetta in ricette:
+            blocco.append(ricetta)
+            if len(blocco) >= dimensione_blocco:
+                aggiunte += self._inserisci_blocco(blocco)
+                blocco = []
+        if blocco:
+            aggiunte += self._inserisci_blocco(blocco)
+        return aggiunte
+
+    def _inserisci_blocco(self, blocco):
+
+        """
+        Inserisce un blocco di ricette in un'unica transazione, saltando i duplicati.
+        """
+
+        aggiunte = 0
+        with self._transazione():
+            for ricetta in blocco:
+                try:
+                    self._inserisci(ricetta)
+                except ValueError:
+                    continue
+                aggiunte += 1
+        return aggiunte
+
+    def remove(self, ricetta):
+
+        """
+        Rimuove una ricetta dal database.
+
+        Args:
+            ricetta (dict): Ricetta da rimuovere.
+
+        Raises:
+            ValueError: Se la ricetta non è presente.
+        """
+
+        id_ricetta = self.id_di(ricetta)
+        if id_ricetta is None:
+            raise ValueError(f"La ricetta '{ricetta['nome']}' non è presente nel catalogo.")
+        self.elimina_id(id_ricetta)
+
+    def elimina_id(self, id_ricetta):
+
+        """
+        Elimina la ricetta con l'id indicato; i collegamenti agli ingredienti vengono eliminati in cascata.
+
+        Args:
+            id_ricetta (int): Id della ricetta da eliminare.
+
+        Returns:
+            dict: La ricetta eliminata.
+
+        Raises:
+            KeyError: Se l'id non corrisponde a una ricetta presente.
+        """
+
+        ricetta = self.ricetta(id_ricetta)
+        if ricetta is None:
+            raise KeyError(id_ricetta)
+        with self._connessione:
+            self._connessione.execute(SQL_ELIMINA_RICETTA, (id_ricetta,))
+        return ricetta
+
+    def ricetta(self, id_ricetta):
+
+        """
+        Returns:
+            dict or None: La ricetta con l'id indicato, o None se non esiste.
+        """
+
+        if id_ricetta is None:
+            return None
+        return next(self._ricette_da_interrogazione("WHERE r.id = ?", (id_ricetta,)), None)
+
+    def id_per_nome(self, nome):
+
+        """
+        Returns:
+            int or None: L'id della ricetta con il nome indicato (senza distinguere maiuscole e minuscole).
+        """
+
+        riga = self._connessione.execute(SQL_ID_PER_NOME, (normalizza_chiave(nome),)).fetchone()
+        return None if riga is None else riga[0]
+
+    def trova_per_nome(self, nome):
+
+        """
+        Returns:
+            dict or None: La ricetta con il nome indicato, o None se non esiste.
+        """
+
+        return self.ricetta(self.id_per_nome(nome))
+
+    def id_di(self, ricetta):
+
+        """
+        Returns:
+            int or None: L'id di una ricetta uguale a quella indicata, o None se non c'è.
+        """
+
+        id_ricetta = self.id_per_nome(ricetta['nome'])
+        if id_ricetta is None:
+            return None
+        salvata = self.ricetta(id_ricetta)
+        chiave = self.dizionario.chiave
+        if (salvata['nome'] != ricetta['nome'] or salvata['minutaggio'] != ricetta['minutaggio']
+                or [chiave(i) for i in salvata['ingredienti']] != list(dict.fromkeys(chiave(i) for i in ricetta['ingredienti']))):
+            return None                                                                 # Confronta gli ingredienti in forma canonica, come sono stati salvati.
+        return id_ricetta
+
+    def ricette_da_id(self, id_ricette):
+
+        """
+        Converte degli id nelle ricette corrispondenti, in ordine di inserimento.
+
+        Args:
+            id_ricette (iterable): Id delle ricette.
+
+        Returns:
+            list: Le ricette corrispondenti.
+        """
+
+        id_ricette = sorted(id_ricette)
+        if not id_ricette:
+            return []
+        self._connessione.execute("CREATE TEMP TABLE IF NOT EXISTS id_richiesti (id INTEGER PRIMARY KEY)")
+        with self._connessione:                                                         # Passa gli id tramite una tabella temporanea: nessun limite sul numero di parametri.
+            self._connessione.execute("DELETE FROM id_richiesti")
+            self._connessione.executemany("INSERT INTO id_richiesti (id) VALUES (?)", ((i,) for i in id_ricette))
+        return list(self._ricette_da_interrogazione("WHERE r.id IN (SELECT id FROM id_richiesti)", ()))
+
+    def _filtro(self, tutti=(), almeno_uno=(), esclusi=(), minimo=None, massimo=None):
+
+        """
+        Compone la clausola WHERE e i parametri per un filtro su ingredienti e minutaggio.
+        """
+
+        condizioni, parametri = [], []
+        chiave = self.dizionario.chiave
+        tutti = list(dict.fromkeys(chiave(i) for i in tutti))                # Toglie i doppioni, altrimenti il conteggio DISTINCT non tornerebbe.
+        if tutti:
+            condizioni.append(SQL_FILTRO_TUTTI.format(segnaposto=", ".join("?" * len(tutti))))
+            parametri += tutti + [len(tutti)]
+        for frammento, ingredienti in ((SQL_FILTRO_ALMENO_UNO, almeno_uno), (SQL_FILTRO_ESCLUSI, esclusi)):
+            chiavi = [chiave(i) for i in ingredienti]
+            if chiavi:
+                condizioni.append(frammento.format(segnaposto=", ".join("?" * len(chiavi))))
+                parametri += chiavi
+        if minimo is not None:
+            condizioni.append("r.minutaggio >= ?")
+            parametri.append(minimo)
+        if massimo is not None:
+            condizioni.append("r.minutaggio <= ?")
+            parametri.append(massimo)
+        if not condizioni:
+            return "", ()
+        return "WHERE " + " AND ".join(condizioni), tuple(parametri)
+
+    def filtra_ingredienti(self, tutti=(), almeno_uno=(), esclusi=()):
+
+        """
+        Restituisce le ricette che soddisfano un'interrogazione AND/OR/NOT sugli ingredienti.
+
+        Args:
+            tutti (iterable): Ingredienti che devono essere tutti presenti.
+            almeno_uno (iterable): Ingredienti di cui almeno uno deve essere presente.
+            esclusi (iterable): Ingredienti che non devono essere presenti.
+
+        Returns:
+            list: Le ricette che soddisfano i criteri, nell'ordine di inserimento.
+        """
+
+        return self.filtra(tutti, almeno_uno, esclusi)
+
+    def filtra(self, tutti=(), almeno_uno=(), esclusi=(), minimo=None, massimo=None):
+
+        """
+        Restituisce le ricette che soddisfano un filtro su ingredienti e intervallo di minutaggio.
+        L'ordine di valutazione dei criteri è scelto dal pianificatore di SQLite in base agli indici.
+
+        Args:
+            tutti (iterable): Ingredienti che devono essere tutti presenti.
+            almeno_uno (iterable): Ingredienti di cui almeno uno deve essere presente.
+            esclusi (iterable): Ingredienti che non devono essere presenti.
+            minimo (int, optional): Minutaggio minimo (incluso).
+            massimo (int, optional): Minutaggio massimo (incluso).
+
+        Returns:
+            list: Le ricette che soddisfano i criteri, nell'ordine di inserimento.
+        """
+
+        filtro, parametri = self._filtro(tutti, almeno_uno, esclusi, minimo, massimo)
+        return list(self._ricette_da_interrogazione(filtro, parametri))
+
+    def id_con_minutaggio(self, minimo=None, massimo=None):
+
+        """
+        Returns:
+            generator: Gli id delle ricette con minutaggio tra minimo e massimo (inclusi), in ordine di minutaggio.
+        """
+
+        minimo = -2**63 if minimo is None else minimo
+        massimo = 2**63 - 1 if massimo is None else massimo
+        return (riga[0] for riga in self._connessione.execute(SQL_INTERVALLO, (minimo, massimo)))
+
+    def filtra_minutaggio(self, minimo=None, massimo=None, decrescente=False):
+
+        """
+        Returns:
+            generator: Le ricette con minutaggio tra minimo e massimo (inclusi), in ordine di minutaggio.
+        """
+
+        minimo = -2**63 if minimo is None else minimo
+        massimo = 2**63 - 1 if massimo is None else massimo
+        id_ricette = [riga[0] for riga in self._connessione.execute(
+            SQL_INTERVALLO_DECRESCENTE if decrescente else SQL_INTERVALLO, (minimo, massimo))]
+        return (self.ricetta(id_ricetta) for id_ricetta in id_ricette)
+
+    def ricette_piu_veloci(self, numero):
+
+        """
+        Returns:
+            list: Le `numero` ricette con il minutaggio più basso, dalla più veloce.
+        """
+
+        return [self.ricetta(riga[0]) for riga in self._connessione.execute(SQL_PIU_VELOCI, (numero,)).fetchall()]
+
+    def ricette_con_ingrediente_simile(self, testo):
+
+        """
+        Returns:
+            set: Id delle ricette con almeno un ingrediente che contiene il testo indicato
+                 (o con l'ingrediente canonico di cui il testo è un sinonimo).
+        """
+
+        chiave = self.dizionario.chiave(testo)
+        parametri = (piega(testo), chiave if chiave != forma_base(testo) else None)    # La chiave esatta serve solo se il testo è un sinonimo.
+        return {riga[0] for riga in self._connessione.execute(SQL_INGREDIENTE_SIMILE, parametri)}
+
+    def id_con_nome_simile(self, testo):
+
+        """
+        Returns:
+            set: Id delle ricette il cui nome contiene il testo indicato (senza distinguere maiuscole e minuscole).
+        """
+
+        return {riga[0] for riga in self._connessione.execute(SQL_NOME_SIMILE, (testo.casefold(),))}
+
+    def interroga(self, nomi=(), tutti=(), almeno_uno=(), esclusi=(), minimo=None, massimo=None,
+                  ordine='inserimento', decrescente=False, limite=None, salta=0):
+
+        """
+        Esegue un'interrogazione composta (vedi Interrogazione) con una sola SELECT:
+        filtri, ordinamento e paginazione vengono risolti da SQLite con i suoi indici.
+
+        Args:
+            nomi (iterable): Porzioni di testo che il nome deve contenere.
+            tutti, almeno_uno, esclusi (iterable): Criteri sugli ingredienti, come in filtra().
+            minimo, massimo (int, optional): Intervallo di minutaggio (inclusi).
+            ordine (str): Una delle chiavi di ORDINAMENTI_SQL.
+            decrescente (bool, optional): Se True ordina dal valore più alto.
+            limite (int, optional): Numero massimo di ricette.
+            salta (int, optional): Ricette da saltare all'inizio.
+
+        Returns:
+            generator: Le ricette della pagina, caricate una alla volta.
+        """
+
+        filtro, parametri = self._filtro(tutti, almeno_uno, esclusi, minimo, massimo)
+        condizioni_nome = ["instr(r.chiave_nome, ?) > 0"] * len(nomi)
+        if condizioni_nome:
+            filtro = ("WHERE " if not filtro else filtro + " AND ") + " AND ".join(condizioni_nome)
+            parametri += tuple(testo.casefold() for testo in nomi)
+        verso = " DESC" if decrescente else ""
+        ordinamento = ", ".join(colonna + verso for colonna in ORDINAMENTI_SQL[ordine])
+        id_ricette = [riga[0] for riga in self._connessione.execute(
+            SQL_INTERROGA.format(filtro=filtro, ordine=ordinamento),
+            parametri + (-1 if limite is None else limite, salta))]                    # LIMIT -1: nessun limite.
+        return (self.ricetta(id_ricetta) for id_ricetta in id_ricette)
@@ -0,0 +1,510 @@
+"""
+Servizio HTTP/JSON su asyncio: ricerca, filtri e statistiche per molti client su un catalogo in memoria.
+
+    GET  /search?nome=pasta&ingrediente=aglio&minutaggio=30
+    GET  /filter?tutti=Pasta&tutti=Aglio&massimo=30&ordina_per=minutaggio&limite=10
+    GET  /pantry?ingredienti=Pasta,Uova,Sale&mancanti=1&limite=20
+    GET  /duplicates?soglia=0.8&limite=50         (soglia tra 0.71 e 1: sotto, le bande LSH perdono le coppie)
+    GET  /stats?ingrediente=Aglio
+    POST /add     {"nome": "...", "ingredienti": ["..."], "minutaggio": 30}
+    POST /delete  {"nome": "..."}
+    GET  /metrics                       (metriche nel formato di testo di Prometheus; /metriche in JSON)
+
+Le letture accettano anche POST con i parametri in un oggetto JSON; valgono pure i nomi
+italiani (cerca, filtra, dispensa, duplicati, statistiche, aggiungi, elimina).
+
+Letture senza lock: il servizio tiene due copie del catalogo. Le letture usano sempre
+la copia pubblicata, che non viene mai modificata finché è pubblicata o letta. Le
+scritture vengono messe in coda e applicate a lotti alla copia di riserva; poi le due
+copie si scambiano e, quando l'ultima lettura della vecchia copia è finita, le scritture
+riuscite del lotto vengono riapplicate anche a quella, con le sole append() ed
+elimina_id() del catalogo. Ogni lotto costa quindi due applicazioni, ma mai una copia
+dell'intero catalogo; entrambe girano in un thread, perché la copia modificata non ha lettori.
+
+I risultati lunghi vengono inviati a blocchi (Transfer-Encoding: chunked), cedendo il
+controllo agli altri client tra un blocco e l'altro. Le letture che possono scorrere
+tutto il catalogo (filtri, dispensa, duplicati) girano in un thread dell'esecutore
+predefinito: una richiesta lenta non ferma le altre connessioni.
+
+Le metriche (vedi ricette.strumentazione) sono vuote finché la raccolta non viene
+attivata, per esempio con `python -m ricette serve --metriche FILE`.
+"""
+
+import asyncio                                                                      # Importa asyncio, per servire molte connessioni in un solo thread.
+import json                                                                         # Importa json, per leggere i parametri e scrivere le risposte.
+import signal                                                                       # Importa signal, per fermare il server con SIGINT o SIGTERM.
+from itertools import islice                                                        # Importa islice, usato per inviare i risultati a blocchi.
+from urllib.parse import parse_qs, unquote                                          # Importa parse_qs e unquote, per leggere percorso e parametri dell'URL.
+
+from .catalogo import CatalogoRicette
+from .comandi import controlla_parametri, dispensa, duplicati, esegui_operazione, statistiche
+from .importazione import CAMPI, valida_ricetta
+from .interrogazioni import interroga
+from .operazioni import trova_ricette
+from .strumentazione import metriche
+
+LETTURE_ELENCO = {                                                                  # Letture che restituiscono ricette, inviate una alla volta dal catalogo.
+    'search': trova_ricette, 'cerca': trova_ricette,
+    'filter': interroga, 'filtra': interroga,
+}
+LETTURE = {'stats': statistiche, 'statistiche': statistiche,                       # Letture con un risultato unico.
+           'pantry': dispensa, 'dispensa': dispensa,
+           'duplicates': duplicati, 'duplicati': duplicati}
+SCRITTURE = ('add', 'aggiungi', 'delete', 'elimina')                                # Scritture, applicate a lotti (vedi comandi.OPERAZIONI).
+LETTURE_PESANTI = ('filter', 'filtra', 'pantry', 'dispensa', 'duplicates', 'duplicati')  # Possono scorrere o ordinare tutto il catalogo: girano in un thread.
+METRICHE = ('metrics', 'metriche')                                                  # Metriche delle operazioni, in formato Prometheus o JSON.
+TIPO_JSON = 'application/json; charset=utf-8'
+TIPO_PROMETHEUS = 'text/plain; version=0.0.4; charset=utf-8'
+PARAMETRI_INTERI = ('minutaggio', 'minimo', 'massimo', 'limite', 'salta', 'numero', 'mancanti')
+PARAMETRI_DECIMALI = ('soglia',)
+PARAMETRI_ELENCO = ('tutti', 'almeno_uno', 'esclusi')
+MASSIMO_LOTTO = 256                                                                 # Scritture applicate al massimo per ogni scambio delle copie.
+MASSIMO_CORPO = 1 << 20                                                             # Dimensione massima del corpo di una richiesta (1 MiB).
+DIMENSIONE_BLOCCO = 500                                                             # Ricette per blocco nelle risposte lunghe.
+STATI = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+         413: 'Payload Too Large', 431: 'Request Header Fields Too Large', 500: 'Internal Server Error', 501: 'Not Implemented'}
+
+
+# Definisce la copia del catalogo letta dai client, con il numero di letture in corso.
+class _Copia:
+
+    """
+    Una delle due copie del catalogo, con il conteggio delle letture che la stanno usando.
+    """
+
+    __slots__ = ('catalogo', 'lettori', '_libera')
+
+    def __init__(self, catalogo):
+        self.catalogo = catalogo
+        self.lettori = 0
+        self._libera = None                                                             # Evento creato solo se qualcuno aspetta la fine delle letture.
+
+    def acquisisci(self):
+        self.lettori += 1
+        return self.catalogo
+
+    def rilascia(self):
+        self.lettori -= 1
+        if not self.lettori and self._libera is not None:
+            self._libera.set()
+
+    async def attendi_lettori(self):
+
+        """
+        Attende che tutte le letture in corso su questa copia siano finite.
+        """
+
+        while self.lettori:
+            self._libera = asyncio.Event()
+            await self._libera.wait()
+        self._libera = None
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione di supporto che converte i parametri letti dall'URL o dal JSON nei tipi attesi dalle operazioni.
+def _converti_parametri(parametri):
+    convertiti = {}
+    for nome, valore in parametri.items():
+        if nome in PARAMETRI_ELENCO:
+            valori = valore if isinstance(valore, list) else [valore]
+            valore = [parte.strip() for voce in valori for parte in str(voce).split(',') if parte.strip()]
+        elif nome in PARAMETRI_INTERI and valore is not None:
+            try:
+                valore = int(valore)
+            except (TypeError, ValueError, OverflowError):                              # OverflowError: 1e400 nel JSON diventa infinito.
+                raise ValueError(f"il parametro '{nome}' deve essere un intero") from None
+        elif nome in PARAMETRI_DECIMALI and valore is not None:
+            try:
+                valore = float(valore)
+            except (TypeError, ValueError, OverflowError):
+                raise ValueError(f"il parametro '{nome}' deve essere un numero") from None
+        elif nome == 'decrescente' and isinstance(valore, str):
+            valore = valore.lower() in ('1', 'true', 'si', 'sì')
+        convertiti[nome] = valore
+    return convertiti
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione di supporto che serializza una ricetta (anche una vista) in JSON.
+def _ricetta_json(ricetta):
+    return json.dumps({campo: ricetta[campo] for campo in CAMPI}, ensure_ascii=False)
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione di supporto che prende il prossimo blocco di ricette di un elenco, già in JSON.
+def _blocco_json(ricette):
+    return [_ricetta_json(ricetta) for ricetta in islice(ricette, DIMENSIONE_BLOCCO)]
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce la funzione che applica un lotto di scritture alla copia di riserva, raccogliendo risultati ed errori.
+def _applica_lotto(catalogo, lotto):
+
+    """
+    Applica le scritture di un lotto con esegui_operazione(), come le riceverebbe il comando.
+
+    Args:
+        catalogo (CatalogoRicette): Copia di riserva del catalogo.
+        lotto (list): Tuple (nome operazione, parametri, futuro).
+
+    Returns:
+        list: Una coppia (risultato, errore) per scrittura, con uno dei due None.
+    """
+
+    esiti = []
+    for nome_operazione, parametri, _ in lotto:
+        try:
+            esiti.append((esegui_operazione(catalogo, nome_operazione, parametri), None))
+        except Exception as errore:                                                     # Qualunque errore va al suo client: lo scrittore non deve fermarsi.
+            esiti.append((None, errore))
+    return esiti
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce la funzione che riporta sulla vecchia copia le scritture riuscite sulla prima.
+def _riapplica_lotto(catalogo, scritture):
+
+    """
+    Riapplica alla vecchia copia le scritture già riuscite sulla riserva, con le sole
+    append() ed elimina_id() del catalogo: il risultato è già stato restituito, quindi
+    niente ricerca delle ricette simili e niente metriche.
+
+    Args:
+        catalogo (CatalogoRicette): Vecchia copia del catalogo, senza più lettori.
+        scritture (list): Coppie (nome operazione, parametri) riuscite alla prima applicazione.
+    """
+
+    for nome_operazione, parametri in scritture:
+        if nome_operazione in ('add', 'aggiungi'):
+            ricetta, _ = valida_ricetta(parametri)                                      # Stessa ricetta validata della prima applicazione.
+            catalogo.append(ricetta)
+        else:
+            catalogo.elimina_id(catalogo.id_per_nome(parametri['nome']))
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce il servizio: le due copie del catalogo, la coda delle scritture e il gestore delle connessioni HTTP.
+class ServizioRicette:
+
+    """
+    Servizio HTTP/JSON sulle ricette, con letture senza lock e scritture a lotti.
+
+    Args:
+        ricette (iterable, optional): Ricette iniziali.
+        alias (dict, optional): Sinonimi degli ingredienti, come in CatalogoRicette.
+        massimo_lotto (int, optional): Scritture applicate al massimo per ogni scambio delle copie.
+
+    Attributes:
+        modificato (bool): True se è stata applicata almeno una scrittura.
+        versione (int): Numero di scambi delle copie, cioè di lotti di scritture applicati.
+    """
+
+    def __init__(self, ricette=(), alias=None, massimo_lotto=MASSIMO_LOTTO):
+        ricette = list(ricette)
+        self._pubblicata = _Copia(CatalogoRicette(ricette, alias))
+        self._riserva = _Copia(CatalogoRicette(ricette, alias))                        # Stesse ricette nello stesso ordine: le due copie hanno gli stessi id.
+        self._massimo_lotto = massimo_lotto
+        self._coda = None
+        self._scrittore = None
+        self._fermo = None
+        self.modificato = False
+        self.versione = 0
+
+    def istantanea(self):
+
+        """
+        Returns:
+            CatalogoRicette: La copia pubblicata, con tutte le scritture già confermate.
+                             Non va modificata: le scritture passano da scrivi().
+        """
+
+        return self._pubblicata.catalogo
+
+    def _avvia_scrittore(self):
+        if self._scrittore is None:
+            self._coda = asyncio.Queue()
+            self._scrittore = asyncio.get_running_loop().create_task(self._applica_scritture())
+
+    async def scrivi(self, nome_operazione, parametri):
+
+        """
+        Mette in coda una scrittura e ne attende il risultato.
+
+        Il risultato arriva dopo lo scambio delle copie: una lettura fatta subito dopo
+        vede già la modifica.
+
+        Args:
+            nome_operazione (str): 'add', 'delete' o i nomi italiani.
+            parametri (dict): Parametri dell'operazione.
+
+        Returns:
+            dict: Il risultato dell'operazione.
+
+        Raises:
+            ValueError: Se l'operazione o i parametri non sono validi o l'operazione fallisce.
+        """
+
+        if nome_operazione not in SCRITTURE:
+            raise ValueError(f"operazione di scrittura '{nome_operazione}' non supportata")
+        controlla_parametri(nome_operazione, parametri)                                 # Prima di metterla in coda: un parametro sbagliato non arriva allo scrittore.
+        self._avvia_scrittore()
+        futuro = asyncio.get_running_loop().create_future()
+        self._coda.put_nowait((nome_operazione, parametri, futuro))
+        return await futuro
+
+    async def _applica_scritture(self):
+
+        """
+        Ciclo dello scrittore: prende le scritture in coda a lotti e le applica alle due copie.
+        """
+
+        coda = self._coda
+        while True:
+            lotto = [await coda.get()]
+            while len(lotto) < self._massimo_lotto and not coda.empty():
+                lotto.append(coda.get_nowait())
+
+            riserva = self._riserva
+            ciclo = asyncio.get_running_loop()
+            esiti = await ciclo.run_in_executor(None, _applica_lotto, riserva.catalogo, lotto)  # La riserva è solo dello scrittore: nessun lettore la vede.
+            self._pubblicata, self._riserva = riserva, self._pubblicata                  # Scambio: da qui le nuove letture vedono il lotto.
+            self.versione += 1
+            self.modificato = self.modificato or any(errore is None for _, errore in esiti)
+            for (_, _, futuro), (risultato, errore) in zip(lotto, esiti):
+                if futuro.done():                                                       # Il client ha chiuso la connessione nel frattempo.
+                    continue
+                if errore is None:
+                    futuro.set_result(risultato)
+                else:
+                    futuro.set_exception(errore)
+
+            vecchia = self._riserva
+            await vecchia.attendi_lettori()                                             # Nessuno legge più la vecchia copia: ora si può modificare.
+            riuscite = [(nome_operazione, parametri) for (nome_operazione, parametri, _), (_, errore) in zip(lotto, esiti) if errore is None]
+            await ciclo.run_in_executor(None, _riapplica_lotto, vecchia.catalogo, riuscite)
+
+    async def leggi(self, nome_operazione, parametri):
+
+        """
+        Esegue una lettura con un risultato unico (statistiche, dispensa, duplicati) sulla
+        copia pubblicata. Le letture pesanti (vedi LETTURE_PESANTI) girano in un thread
+        dell'esecutore predefinito, così il ciclo continua a servire gli altri client: la
+        copia resta acquisita fino alla fine, quindi nessuno la modifica nel frattempo.
+
+        Args:
+            nome_operazione (str): Per esempio 'stats' o 'duplicati'.
+            parametri (dict): Parametri dell'operazione.
+
+        Returns:
+            dict: Il risultato dell'operazione.
+
+        Raises:
+            ValueError: Se i parametri non sono validi.
+        """
+
+        copia = self._pubblicata
+        catalogo = copia.acquisisci()
+        try:
+            if nome_operazione in LETTURE_PESANTI:
+                return await asyncio.get_running_loop().run_in_executor(None, esegui_operazione, catalogo, nome_operazione, parametri)
+            return esegui_operazione(catalogo, nome_operazione, parametri)
+        finally:
+            copia.rilascia()
+
+    @staticmethod
+    def _intestazione(stato, mantieni, lunghezza, tipo=TIPO_JSON):
+        chiusura = "" if mantieni else "Connection: close\r\n"
+        return (f"HTTP/1.1 {stato} {STATI[stato]}\r\nContent-Type: {tipo}\r\n"
+                f"{lunghezza}\r\n{chiusura}\r\n").encode('latin-1')
+
+    async def _invia(self, scrittore, stato, corpo, mantieni, tipo=TIPO_JSON):
+        scrittore.write(self._intestazione(stato, mantieni, f"Content-Length: {len(corpo)}", tipo) + corpo)
+        await scrittore.drain()
+
+    async def _invia_elenco(self, scrittore, nome_operazione, parametri, mantieni):
+
+        """
+        Invia le ricette trovate da una lettura, a blocchi, tenendo la copia pubblicata
+        finché l'invio non è finito. Per le letture pesanti ogni blocco viene preparato
+        in un thread, come in leggi().
+
+        Raises:
+            ValueError: Se i parametri non sono validi (prima di aver inviato qualcosa).
+            ConnectionAbortedError: Se l'elenco fallisce dopo l'intestazione: la connessione viene chiusa.
+        """
+
+        funzione = LETTURE_ELENCO[nome_operazione]
+        if nome_operazione in LETTURE_PESANTI:
+            ciclo = asyncio.get_running_loop()
+
+            async def prossimo_blocco():
+                return await ciclo.run_in_executor(None, _blocco_json, ricette)
+        else:
+            async def prossimo_blocco():
+                return _blocco_json(ricette)
+
+        copia = self._pubblicata
+        catalogo = copia.acquisisci()
+        try:
+            try:
+                ricette = iter(funzione(catalogo, **parametri))
+                blocco = await prossimo_blocco()                                        # Anche gli errori sollevati scorrendo arrivano prima dell'intestazione.
+            except TypeError as errore:
+                raise ValueError(f"parametri non validi: {errore}") from None
+            if len(blocco) < DIMENSIONE_BLOCCO:                                         # Risultato breve: una sola risposta con la sua lunghezza.
+                corpo = f'{{"ricette": [{", ".join(blocco)}], "numero": {len(blocco)}}}'.encode('utf-8')
+                await self._invia(scrittore, 200, corpo, mantieni)
+                return
+            scrittore.write(self._intestazione(200, mantieni, "Transfer-Encoding: chunked"))
+            numero, apertura = 0, '{"ricette": ['
+            while blocco:
+                numero += len(blocco)
+                dati = (apertura + ', '.join(blocco)).encode('utf-8')
+                scrittore.write(b"%x\r\n%s\r\n" % (len(dati), dati))
+                await scrittore.drain()                                                 # Cede il controllo: gli altri client non aspettano la fine dell'elenco.
+                try:
+                    blocco, apertura = await prossimo_blocco(), ', '
+                except Exception as errore:                                             # L'intestazione 200 è già partita: non si può più rispondere 500.
+                    raise ConnectionAbortedError(f"elenco interrotto: {errore}") from errore
+            dati = f'], "numero": {numero}}}'.encode('utf-8')
+            scrittore.write(b"%x\r\n%s\r\n0\r\n\r\n" % (len(dati), dati))
+            await scrittore.drain()
+        finally:
+            copia.rilascia()
+
+    async def _esegui_richiesta(self, scrittore, metodo, destinazione, corpo, mantieni):
+
+        """
+        Esegue una richiesta già letta e invia la risposta.
+        """
+
+        percorso, _, interrogazione = destinazione.partition('?')
+        nome_operazione = unquote(percorso).strip('/')
+        if nome_operazione in METRICHE:
+            if metodo != 'GET':
+                await self._invia(scrittore, 405, b'{"errore": "metodo non consentito"}', mantieni)
+            elif nome_operazione == 'metrics':
+                await self._invia(scrittore, 200, metriche.esporta_prometheus().encode('utf-8'), mantieni, TIPO_PROMETHEUS)
+            else:
+                await self._invia(scrittore, 200, json.dumps(metriche.esporta(), ensure_ascii=False).encode('utf-8'), mantieni)
+            return
+        if nome_operazione not in LETTURE_ELENCO and nome_operazione not in LETTURE and nome_operazione not in SCRITTURE:
+            await self._invia(scrittore, 404, b'{"errore": "percorso non trovato"}', mantieni)
+            return
+        if metodo != 'POST' and (metodo != 'GET' or nome_operazione in SCRITTURE):
+            await self._invia(scrittore, 405, b'{"errore": "metodo non consentito"}', mantieni)
+            return
+        try:
+            if metodo == 'POST':
+                parametri = json.loads(corpo or b'{}')
+                if not isinstance(parametri, dict):
+                    raise ValueError("il corpo deve essere un oggetto JSON")
+            else:
+                parametri = {nome: valori if nome in PARAMETRI_ELENCO else valori[-1]       # Un parametro ripetuto nell'URL vale una volta sola, tranne gli elenchi.
+                             for nome, valori in parse_qs(interrogazione).items()}
+            parametri = _converti_parametri(parametri)
+            controlla_parametri(nome_operazione, parametri)                             # Prima di acquisire la copia: un tipo sbagliato è un 400, non un 500.
+            if nome_operazione in LETTURE_ELENCO:
+                await self._invia_elenco(scrittore, nome_operazione, parametri, mantieni)
+                return
+            if nome_operazione in LETTURE:
+                risultato = await self.leggi(nome_operazione, parametri)
+            else:
+                risultato = await self.scrivi(nome_operazione, parametri)
+        except ValueError as errore:                                                    # json.JSONDecodeError è una sottoclasse di ValueError.
+            corpo = json.dumps({'errore': str(errore)}, ensure_ascii=False).encode('utf-8')
+            await self._invia(scrittore, 400, corpo, mantieni)
+            return
+        except ConnectionError:
+            raise                                                                       # La connessione va chiusa, senza altre risposte.
+        except Exception as errore:                                                     # Errore inatteso: la risposta arriva comunque e la connessione resta valida.
+            corpo = json.dumps({'errore': f"errore interno: {errore}"}, ensure_ascii=False).encode('utf-8')
+            await self._invia(scrittore, 500, corpo, mantieni)
+            return
+        await self._invia(scrittore, 200, json.dumps(risultato, ensure_ascii=False).encode('utf-8'), mantieni)
+
+    async def gestisci_connessione(self, lettore, scrittore):
+
+        """
+        Serve le richieste HTTP/1.1 di una connessione, una dopo l'altra (keep-alive).
+
+        Args:
+            lettore (asyncio.StreamReader): Flusso in lettura della connessione.
+            scrittore (asyncio.StreamWriter): Flusso in scrittura della connessione.
+        """
+
+        try:
+            while True:
+                try:
+                    intestazione = await lettore.readuntil(b'\r\n\r\n')
+                except asyncio.IncompleteReadError:
+                    break                                                               # Il client ha chiuso la connessione.
+                except asyncio.LimitOverrunError:
+                    await self._invia(scrittore, 431, b'{"errore": "intestazione troppo lunga"}', False)
+                    break
+                righe = intestazione.decode('latin-1').split('\r\n')
+                try:
+                    metodo, destinazione, versione = righe[0].split(' ')
+                    campi = dict((nome.strip().lower(), valore.strip())
+                                 for nome, _, valore in (riga.partition(':') for riga in righe[1:] if riga))
+                    lunghezza = int(campi.get('content-length') or 0)
+                except ValueError:
+                    await self._invia(scrittore, 400, b'{"errore": "richiesta non valida"}', False)
+                    break
+                if 'transfer-encoding' in campi:
+                    await self._invia(scrittore, 501, b'{"errore": "Transfer-Encoding non supportato"}', False)
+                    break
+                if lunghezza > MASSIMO_CORPO:
+                    await self._invia(scrittore, 413, b'{"errore": "corpo troppo grande"}', False)
+                    break
+                corpo = await lettore.readexactly(lunghezza) if lunghezza else b''
+                mantieni = versione == 'HTTP/1.1' and campi.get('connection', '').lower() != 'close'
+                await self._esegui_richiesta(scrittore, metodo, destinazione, corpo, mantieni)
+                if not mantieni:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass                                                                        # Connessione interrotta dal client.
+        finally:
+            scrittore.close()
+
+    async def servi(self, host='127.0.0.1', porta=8080, pronto=None):
+
+        """
+        Avvia il server e serve le richieste fino a ferma(), a SIGINT o a SIGTERM.
+
+        Args:
+            host (str, optional): Indirizzo su cui ascoltare.
+            porta (int, optional): Porta su cui ascoltare (0 per una porta libera qualsiasi).
+            pronto (callable, optional): Chiamata con (host, porta) quando il server è in ascolto.
+        """
+
+        ciclo = asyncio.get_running_loop()
+        self._fermo = asyncio.Event()
+        segnali = []
+        for segnale in (signal.SIGINT, signal.SIGTERM):
+            try:
+                ciclo.add_signal_handler(segnale, self._fermo.set)
+                segnali.append(segnale)
+            except (NotImplementedError, RuntimeError):                                 # Su Windows resta KeyboardInterrupt.
+                pass
+        self._avvia_scrittore()
+        server = await asyncio.start_server(self.gestisci_connessione, host, porta)
+        try:
+            async with server:
+                if pronto is not None:
+                    pronto(*server.sockets[0].getsockname()[:2])
+                await self._fermo.wait()
+        finally:
+            for segnale in segnali:
+                ciclo.remove_signal_handler(segnale)
+            self._scrittore.cancel()
+            self._scrittore = None
+
+    def ferma(self):
+
+        """
+        Chiede al server avviato con servi() di fermarsi.
+        """
+
+        if self._fermo is not None:
+            self._fermo.set()
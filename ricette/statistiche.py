@@ -0,0 +1,492 @@
+"""
+Statistiche sulle ricette: motore incrementale e funzioni che stampano le statistiche su ingredienti e durate.
+"""
+
+from bisect import bisect_left, insort                                              # Importa le funzioni di bisect, usate per mantenere ordinati i secchi delle frequenze.
+from collections import Counter                                                     # Importa Counter dal modulo collections, che e' utile per contare gli elementi in una sequenza.
+from heapq import heapify, heappop, heappush                                        # Importa le funzioni di heapq, usate per le statistiche su minimi e massimi.
+
+from .ingredienti import DizionarioIngredienti
+from .strumentazione import strumentata
+
+
+# Definisce il motore delle statistiche, aggiornato ad ogni aggiunta ed eliminazione invece di ricalcolare tutto ad ogni richiesta.
+class StatisticheIncrementali:
+
+    """
+    Statistiche sulle ricette mantenute in modo incrementale.
+
+    Ad ogni aggiunta ed eliminazione aggiorna:
+        - i conteggi degli ingredienti canonici, per id (vedi DizionarioIngredienti);
+        - i "secchi" ingredienti per frequenza, ciascuno già in ordine di prima comparsa,
+          per ingredienti più e meno comuni senza ordinare niente;
+        - numero e somma dei minutaggi, per la media;
+        - heap con eliminazione pigra per minutaggio minimo/massimo e per le
+          ricette con più ingredienti e più minutaggio.
+
+    Così ogni statistica costa O(1) o O(k) anche subito dopo delle eliminazioni.
+
+    Args:
+        dizionario (DizionarioIngredienti, optional): Dizionario che traduce id e nomi degli ingredienti.
+    """
+
+    def __init__(self, dizionario=None):
+        self._dizionario = DizionarioIngredienti() if dizionario is None else dizionario
+        self._conteggi = {}                                                             # Dizionario: id ingrediente -> occorrenze.
+        self._ordine = {}                                                               # Dizionario: id ingrediente -> numero progressivo della prima comparsa (per gli ex aequo).
+        self._per_ordine = {}                                                           # Dizionario inverso: numero progressivo -> id ingrediente.
+        self._prossimo_ordine = 0
+        self._per_frequenza = {}                                                        # Dizionario: frequenza -> lista ordinata dei numeri progressivi degli ingredienti con quella frequenza.
+        self._frequenze = []                                                            # Lista ordinata delle frequenze presenti in self._per_frequenza.
+        self._numero = 0                                                                # Numero di ricette.
+        self._somma_minutaggi = 0                                                       # Somma dei minutaggi, per la media.
+        self._vive = set()                                                              # Id delle ricette presenti, per scartare le voci vecchie degli heap.
+        self._heap_minutaggio_min = []                                                  # Heap di (minutaggio, id).
+        self._heap_minutaggio_max = []                                                  # Heap di (-minutaggio, id).
+        self._heap_ingredienti_max = []                                                 # Heap di (-numero ingredienti, id).
+
+    def aggiungi(self, id_ricetta, id_ingredienti, minutaggio):
+
+        """
+        Aggiorna le statistiche con una nuova ricetta.
+
+        Args:
+            id_ricetta (int): Identificativo della ricetta.
+            id_ingredienti (sequence): Id canonici degli ingredienti della ricetta.
+            minutaggio (int): Minutaggio della ricetta.
+        """
+
+        for id_ingrediente in id_ingredienti:
+            self._sposta(id_ingrediente, +1)
+        self._numero += 1
+        self._somma_minutaggi += minutaggio
+        self._vive.add(id_ricetta)
+        heappush(self._heap_minutaggio_min, (minutaggio, id_ricetta))
+        heappush(self._heap_minutaggio_max, (-minutaggio, id_ricetta))                 # A parità di minutaggio vince l'id più basso, cioè la ricetta inserita prima.
+        heappush(self._heap_ingredienti_max, (-len(id_ingredienti), id_ricetta))
+
+    def rimuovi(self, id_ricetta, id_ingredienti, minutaggio):
+
+        """
+        Aggiorna le statistiche togliendo una ricetta.
+
+        Le voci della ricetta negli heap restano dove sono e vengono scartate quando
+        arrivano in cima (eliminazione pigra).
+
+        Args:
+            id_ricetta (int): Identificativo della ricetta.
+            id_ingredienti (sequence): Id canonici degli ingredienti della ricetta.
+            minutaggio (int): Minutaggio della ricetta.
+        """
+
+        for id_ingrediente in id_ingredienti:
+            self._sposta(id_ingrediente, -1)
+        self._numero -= 1
+        self._somma_minutaggi -= minutaggio
+        self._vive.discard(id_ricetta)
+        if len(self._heap_minutaggio_min) > 2 * len(self._vive) + 64:                   # Troppe voci vecchie: ricostruisce gli heap con le sole ricette vive.
+            self._compatta()
+
+    def _sposta(self, ingrediente, delta):
+
+        """
+        Cambia di `delta` il conteggio di un ingrediente, spostandolo nel secchio della nuova frequenza.
+        """
+
+        vecchia = self._conteggi.get(ingrediente, 0)
+        nuova = vecchia + delta
+        if vecchia:
+            ordine = self._ordine[ingrediente]
+            secchio = self._per_frequenza[vecchia]
+            del secchio[bisect_left(secchio, ordine)]
+            if not secchio:                                                             # Secchio vuoto: toglie anche la sua frequenza dalla lista ordinata.
+                del self._per_frequenza[vecchia]
+                del self._frequenze[bisect_left(self._frequenze, vecchia)]
+        else:
+            ordine = self._ordine[ingrediente] = self._prossimo_ordine                  # Prima comparsa dell'ingrediente.
+            self._per_ordine[ordine] = ingrediente
+            self._prossimo_ordine += 1
+        if nuova:
+            self._conteggi[ingrediente] = nuova
+            if nuova not in self._per_frequenza:
+                self._per_frequenza[nuova] = []
+                insort(self._frequenze, nuova)
+            insort(self._per_frequenza[nuova], ordine)                                  # Di solito in fondo: gli ingredienti nuovi hanno il numero più alto.
+        else:
+            del self._conteggi[ingrediente]
+            del self._ordine[ingrediente]
+            del self._per_ordine[ordine]
+
+    def _compatta(self):
+
+        """
+        Ricostruisce gli heap scartando le voci delle ricette eliminate.
+        """
+
+        for heap in (self._heap_minutaggio_min, self._heap_minutaggio_max, self._heap_ingredienti_max):
+            heap[:] = [voce for voce in heap if voce[1] in self._vive]
+            heapify(heap)
+
+    def _cima(self, heap):
+
+        """
+        Restituisce la voce in cima a un heap, scartando prima quelle delle ricette eliminate.
+        """
+
+        while heap and heap[0][1] not in self._vive:
+            heappop(heap)
+        return heap[0] if heap else None
+
+    def __len__(self):
+        return self._numero
+
+    def frequenza(self, ingrediente):
+
+        """
+        Restituisce in O(1) quante volte un ingrediente compare nelle ricette
+        (senza distinguere maiuscole, accenti e sinonimi).
+
+        Args:
+            ingrediente (str): Ingrediente da cercare.
+
+        Returns:
+            int: Numero di occorrenze, 0 se l'ingrediente non compare.
+        """
+
+        return self._conteggi.get(self._dizionario.cerca(ingrediente), 0)
+
+    def piu_comuni(self, numero=5):
+
+        """
+        Restituisce gli ingredienti più comuni, come Counter.most_common().
+
+        Args:
+            numero (int, optional): Quanti ingredienti restituire.
+
+        Returns:
+            list: Tuple (ingrediente, occorrenze) dalla più frequente; a parità di
+                  frequenza viene prima l'ingrediente comparso per primo nel catalogo
+                  (conta la prima comparsa, anche se quella ricetta è stata eliminata).
+        """
+
+        nomi, per_ordine = self._dizionario, self._per_ordine
+        risultato = []
+        for frequenza in reversed(self._frequenze):                                     # Parte dalla frequenza più alta e si ferma appena ha `numero` ingredienti.
+            secchio = self._per_frequenza[frequenza]                                    # Già in ordine di prima comparsa: basta prenderne l'inizio.
+            risultato.extend((nomi[per_ordine[ordine]], frequenza) for ordine in secchio[:numero - len(risultato)])
+            if len(risultato) >= numero:
+                break
+        return risultato
+
+    def meno_comuni(self):
+
+        """
+        Restituisce gli ingredienti con la frequenza minima.
+
+        Returns:
+            tuple: (lista degli ingredienti, frequenza minima), oppure ([], 0) se non ci sono ricette.
+        """
+
+        if not self._frequenze:
+            return [], 0
+        frequenza_minima = self._frequenze[0]
+        nomi, per_ordine = self._dizionario, self._per_ordine
+        return [nomi[per_ordine[ordine]] for ordine in self._per_frequenza[frequenza_minima]], frequenza_minima
+
+    def ordine_di_comparsa(self):
+
+        """
+        Returns:
+            list: Gli id degli ingredienti presenti nell'ordine di prima comparsa, che decide gli ex aequo.
+        """
+
+        per_ordine = self._per_ordine
+        return [per_ordine[ordine] for ordine in sorted(per_ordine)]
+
+    def imposta_ordine_di_comparsa(self, id_ingredienti):
+
+        """
+        Sostituisce l'ordine di prima comparsa degli ingredienti, per esempio con quello
+        salvato in un'istantanea: ricaricando le ricette sopravvissute andrebbe perso.
+
+        Args:
+            id_ingredienti (iterable): Id degli ingredienti presenti, nel nuovo ordine.
+
+        Raises:
+            ValueError: Se gli id non sono tutti e soli gli ingredienti presenti.
+        """
+
+        ordine = {}
+        for id_ingrediente in id_ingredienti:
+            ordine.setdefault(id_ingrediente, len(ordine))
+        if ordine.keys() != self._conteggi.keys():
+            raise ValueError("L'ordine di comparsa deve contenere tutti e soli gli ingredienti presenti.")
+        per_frequenza = {}
+        for id_ingrediente, numero in ordine.items():                                   # Numeri crescenti: ogni secchio resta ordinato.
+            per_frequenza.setdefault(self._conteggi[id_ingrediente], []).append(numero)
+        self._ordine = ordine
+        self._per_ordine = {numero: id_ingrediente for id_ingrediente, numero in ordine.items()}
+        self._prossimo_ordine = len(ordine)
+        self._per_frequenza = per_frequenza                                             # Le frequenze presenti non cambiano.
+
+    def durata(self):
+
+        """
+        Restituisce minutaggio minimo, medio e massimo.
+
+        Returns:
+            tuple or None: (minimo, media, massimo), o None se non ci sono ricette.
+        """
+
+        if not self._numero:
+            return None
+        minimo = self._cima(self._heap_minutaggio_min)[0]
+        massimo = -self._cima(self._heap_minutaggio_max)[0]
+        return minimo, self._somma_minutaggi / self._numero, massimo
+
+    def id_con_piu_minutaggio(self):
+
+        """
+        Returns:
+            int or None: Id della prima ricetta inserita tra quelle con il minutaggio massimo.
+        """
+
+        cima = self._cima(self._heap_minutaggio_max)
+        return None if cima is None else cima[1]
+
+    def id_con_piu_ingredienti(self):
+
+        """
+        Returns:
+            int or None: Id della prima ricetta inserita tra quelle con più ingredienti.
+        """
+
+        cima = self._cima(self._heap_ingredienti_max)
+        return None if cima is None else cima[1]
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione di supporto che conta in quante ricette compare un ingrediente (l'operazione 'ingrediente_frequenza' delle metriche).
+@strumentata('ingrediente_frequenza')
+def _conta_ingrediente(lista, ingrediente_cercato, lavoratori=None):
+    if hasattr(lista, 'statistiche'):                                                                           # Se la lista mantiene le statistiche, legge direttamente il conteggio in O(1).
+        return lista.statistiche.frequenza(ingrediente_cercato)
+    if lavoratori:                                                                                              # Ricettario molto grande: conta a blocchi su più processi.
+        from .parallelo import statistiche_parallele
+        return statistiche_parallele(lista, lavoratori).frequenza(ingrediente_cercato)
+    frequenza_ingrediente = 0                                                                                   # Conta solo l'ingrediente cercato, senza costruire la lista di tutti gli ingredienti.
+    for ricetta in lista:                                                                                       # Itera attraverso ogni ricetta nella lista
+        frequenza_ingrediente += sum(1 for ingrediente in ricetta['ingredienti'] if ingrediente.lower() == ingrediente_cercato)  # Confronta gli ingredienti in minuscolo.
+    return frequenza_ingrediente
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione che permetta di visualizzare con quale frequenza si presenta un determinato ingrediente (Start2impact -> Statistiche sugli elementi)
+def ingrediente_frequenza(lista, lavoratori=None):
+    
+    """
+    Chiede all'utente di inserire un ingrediente e determina quante volte appare tra tutte le ricette.
+
+    Args:
+        lista (list): Lista che contiene tutte le ricette.
+        lavoratori (int, optional): Se indicato, su una lista semplice conta con più processi (vedi statistiche_parallele()).
+
+    Returns:
+        None: Stampa i risultati della ricerca o un messaggio se l'ingrediente non è stata trovato.
+    """
+    
+    if not lista:                                                                                               # Controlla se la lista è vuota
+        print("La lista delle ricette è vuota.")                                                                # Se sì, stampa un messaggio.
+        return None                                                                                             # La funzione termina se non ci sono ricette.
+    
+    ingrediente_cercato = input("Inserisci l'ingrediente di cui vuoi conoscere la frequenza: ").strip().lower() # Richiede all'utente di inserire l'ingrediente da cercare e lo converte in minuscolo
+    frequenza_ingrediente = _conta_ingrediente(lista, ingrediente_cercato, lavoratori)
+    
+    if frequenza_ingrediente > 0:
+        print(f"L'ingrediente '{ingrediente_cercato}' appare {frequenza_ingrediente} volte nelle ricette.")     # Stampa il risultato.
+    else:
+        print(f"L'ingrediente '{ingrediente_cercato}' non è presente in nessuna ricetta.")                      # Se l'input non è valido, stampa un messaggio.
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione che permetta di visualizzare la ricetta con più ingredienti (Start2impact -> Statistiche sugli elementi)
+@strumentata('ricetta_con_piu_ingredienti')
+def ricetta_con_piu_ingredienti(lista): 
+    
+    """
+    Determina e restituisce la ricetta con il maggior numero di ingredienti.
+
+    Args:
+        lista (list): Lista che contiene tutte le ricette.
+
+    Returns:
+        dict or None: Restituisce un dizionario contenente la ricetta con il maggior numero di ingredienti,
+                      o None se la lista è vuota.
+    """
+    
+    if not lista:                                                          # Controlla se la lista è vuota
+        print("La lista delle ricette è vuota.")                           # Se sì, stampa un messaggio.
+        return None                                                        # La funzione restituisce None se non ci sono ricette.
+
+    if hasattr(lista, 'statistiche'):                                      # Se la lista mantiene le statistiche, la risposta è già pronta.
+        return lista.ricetta(lista.statistiche.id_con_piu_ingredienti())
+    
+    ricetta_max_ingredienti = None                                         # Inizializza una variabile per tenere traccia della ricetta con il maggior numero di ingredienti.
+    max_ingredienti = 0                                                    # Inizializza una variabile per tenere traccia del numero massimo di ingredienti.
+    for ricetta in lista:                                                  # Scorre ogni ricetta nella lista fornita.
+        numero_ingredienti = len(ricetta['ingredienti'])                   # Calcola il numero di ingredienti della ricetta corrente.
+        if numero_ingredienti > max_ingredienti:                           # Se il numero di ingredienti della ricetta corrente è maggiore del massimo attuale                                                          # Se il numero di ingredienti è maggiore di quello attualmente massimo, aggiorna
+            max_ingredienti = numero_ingredienti                           # Aggiorna la variabile di massimo.
+            ricetta_max_ingredienti = ricetta                              # Aggiorna la ricetta corrispondente
+    
+    return ricetta_max_ingredienti                                         # Restituisce la ricetta con il maggior numero di ingredienti.
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione che permetta di visualizzare la ricetta che richiede maggior minutaggio per la preparazione (Start2impact -> Statistiche sugli elementi)
+@strumentata('ricetta_con_piu_minutaggio')
+def ricetta_con_piu_minutaggio(lista):
+    
+    """
+    Determina e visualizza la ricetta con il maggior minutaggio.
+
+    Args:
+        lista (list): Lista che contiene tutte le ricette, dove ogni ricetta è rappresentata come un dizionario 
+        con chiavi 'nome', 'ingredienti' e 'minutaggio'.
+
+    Returns:
+        dict or None: Restituisce un dizionario contenente la ricetta con il maggior minutaggio,
+                      o None se la lista è vuota.
+    """
+    
+    if not lista:                                                                                           # Controlla se la lista è vuota
+        print("La lista delle ricette è vuota.")                                                            # Se sì, stampa un messaggio.
+        return None                                                                                         # La funzione restituisce None se non ci sono ricette.
+
+    if hasattr(lista, 'statistiche'):                                                                       # Se la lista mantiene le statistiche, la risposta è già pronta.
+        return lista.ricetta(lista.statistiche.id_con_piu_minutaggio())
+    
+    ricetta_max_minutaggio = None                                                                           # Inizializza una variabile per tenere traccia della ricetta con il maggior minutaggio.
+    max_minutaggio = 0                                                                                      # Inizializza una variabile per tenere traccia del minutaggio massimo.
+    for ricetta in lista:                                                                                   # Scorre ogni ricetta nella lista fornita.
+        minutaggio = ricetta['minutaggio']                                                                  # Estrae il minutaggio della ricetta corrente.
+        if minutaggio > max_minutaggio:                                                                     # Se il minutaggio della ricetta corrente è maggiore di quello attualmente massimo
+            max_minutaggio = minutaggio                                                                     # Aggiorna la variabile massimo
+            ricetta_max_minutaggio = ricetta                                                                # Aggiorna la ricetta corrispondente.
+    
+    return ricetta_max_minutaggio                                                                           # Restituisce la ricetta con il maggior minutaggio.
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione che permetta di visualizzare gli ingredienti più e meno usati (Start2impact -> Statistiche sugli elementi)
+@strumentata('statistiche_ingredienti')
+def statistiche_ingredienti(lista, lavoratori=None):
+    
+    """
+    Analizza e stampa statistiche sugli ingredienti delle ricette.
+
+    Args:
+        lista (list): Lista che contiene tutte le ricette, 
+                      dove ogni ricetta è rappresentata come un dizionario 
+                      con chiavi 'nome', 'ingredienti' e 'minutaggio'.
+        lavoratori (int, optional): Se indicato, su una lista semplice conta con più processi (vedi statistiche_parallele()).
+
+    Returns:
+        None:Stampa i risultati della ricerca o un messaggio di errore se la lista è vuota.
+    """
+    
+    if not lista:                                                                                           # Controlla se la lista è vuota
+        print("La lista delle ricette è vuota.")                                                            # Se sì, stampa un messaggio.
+        return None                                                                                         # La funzione restituisce None se non ci sono ricette.
+
+ 
+    if hasattr(lista, 'statistiche'):                                                                       # Se la lista mantiene le statistiche, le legge senza ricontare gli ingredienti.
+        ingredienti_comuni = lista.statistiche.piu_comuni(5)
+        ingredienti_meno_comuni, frequenza_minima = lista.statistiche.meno_comuni()
+    elif lavoratori:                                                                                        # Ricettario molto grande: conta a blocchi su più processi e unisce i conteggi.
+        from .parallelo import statistiche_parallele
+        aggregate = statistiche_parallele(lista, lavoratori)
+        ingredienti_comuni = aggregate.piu_comuni(5)
+        ingredienti_meno_comuni, frequenza_minima = aggregate.meno_comuni()
+    else:
+        conteggi = Counter()                                                                                # Conta la frequenza di ogni ingrediente usando Counter.
+        for ricetta in lista:                                                                               # Scorre ogni ricetta nella lista fornita 
+            conteggi.update(ricetta['ingredienti'])                                                         # Aggiorna i conteggi ricetta per ricetta, senza costruire la lista di tutti gli ingredienti.
+
+        ingredienti_comuni = conteggi.most_common(5)                                                        # Estrae i 5 ingredienti più comuni dalla lista dei conteggi.
+        frequenza_minima = min(conteggi.values())                                                           # Trova la frequenza minima tra gli ingredienti.
+        ingredienti_meno_comuni = [ingrediente for ingrediente, frequenza in conteggi.items() if frequenza == frequenza_minima]  # Crea una lista di tutti gli ingredienti che hanno la frequenza minima.
+
+    print("Ingredienti più comuni:")  
+    for ingrediente, frequenza in ingredienti_comuni:
+        print(f"{ingrediente}: {frequenza} occorrenze")                                                     # Stampa gli ingredienti più comuni e il loro conteggio.
+        
+    print("-" * 40)                                                                                         # Stampa una linea di separazione per migliorare la leggibilità.
+     
+    print(f"Ingredienti meno comuni: {', '.join(ingredienti_meno_comuni)} (frequenza: {frequenza_minima})") # Stampa gli ingredienti meno comuni e la loro frequenza minima.
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione che calcola minimo, media e massimo dei minutaggi in un solo passaggio sulle ricette.
+def durata_in_flusso(ricette):
+
+    """
+    Calcola minutaggio minimo, medio e massimo scorrendo le ricette una sola volta,
+    senza costruire strutture intermedie (funziona anche con un generatore).
+
+    Args:
+        ricette (iterable): Ricette da analizzare.
+
+    Returns:
+        tuple or None: (minimo, media, massimo), o None se non ci sono ricette.
+    """
+
+    numero = 0                                                                                              # Numero di ricette viste finora.
+    somma = 0                                                                                               # Somma dei minutaggi, per la media.
+    minimo = massimo = None
+    for ricetta in ricette:
+        minutaggio = ricetta['minutaggio']
+        numero += 1
+        somma += minutaggio
+        if minimo is None or minutaggio < minimo:
+            minimo = minutaggio
+        if massimo is None or minutaggio > massimo:
+            massimo = minutaggio
+    if not numero:
+        return None
+    return minimo, somma / numero, massimo
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione che permetta di visualizzare il minutaggio minimo, massimo e la media sul totale (Start2impact -> Statistiche sugli elementi)
+@strumentata('statistiche_durata')
+def statistiche_durata(lista, lavoratori=None):
+    
+    """
+    Analizza e stampa statistiche sulla durata delle ricette.
+
+    Args:
+        lista (list): Lista che contiene tutte le ricette, 
+                      dove ogni ricetta è rappresentata come un dizionario 
+                      con chiavi 'nome', 'ingredienti' e 'minutaggio'.
+        lavoratori (int, optional): Se indicato, su una lista semplice aggrega con più processi (vedi statistiche_parallele()).
+
+    Returns:
+        None: Stampa i risultati della ricerca o un messaggio di errore se la lista è vuota.
+    """
+    
+    if not lista:                                                                                           # Controlla se la lista è vuota
+        print("La lista delle ricette è vuota.")                                                            # Se sì, stampa un messaggio.
+        return None                                                                                         # La funzione restituisce None se non ci sono ricette.
+
+    if hasattr(lista, 'statistiche'):                                                                       # Se la lista mantiene le statistiche, minimo, media e massimo sono già pronti.
+        min_durata, media_durata, max_durata = lista.statistiche.durata()
+    elif lavoratori:                                                                                        # Ricettario molto grande: aggrega i minutaggi a blocchi su più processi.
+        from .parallelo import statistiche_parallele
+        min_durata, media_durata, max_durata = statistiche_parallele(lista, lavoratori).durata()
+    else:
+        min_durata, media_durata, max_durata = durata_in_flusso(lista)                                      # Calcola minimo, media e massimo in un solo passaggio, senza pandas.
+
+    print(f"Durata minima: {min_durata} minuti")                                                            # Stampa i risultati delle statistiche sulla durata.
+    print(f"Durata media: {media_durata:.2f} minuti")                                                       # Stampa la media formattata a due decimali.
+    print(f"Durata massima: {max_durata} minuti")                                                           # Stampa i risultati delle statistiche sulla durata.
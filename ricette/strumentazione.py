@@ -0,0 +1,393 @@
+"""
+Strumentazione delle operazioni sulle ricette: per ogni operazione (ricerca, filtri,
+statistiche, aggiunte ed eliminazioni) conta chiamate ed errori e tiene un istogramma
+delle latenze e uno del numero di ricette restituite.
+
+Le funzioni strumentate sono decorate con @strumentata('nome'): finché la raccolta è
+disattivata, come di base, il decoratore costa un solo controllo per chiamata. Si attiva
+con metriche.abilita(); per le operazioni indicate si può chiedere anche il profilo con
+cProfile (dove va il tempo) e il picco di memoria allocata con tracemalloc. Sono molto
+più costosi (e gonfiano le latenze misurate), quindi vanno usati per un'indagine mirata.
+
+    from ricette import metriche
+    metriche.abilita(profilo=['cerca'], memoria=['filtra'])
+    ...
+    print(metriche.esporta_prometheus())
+    metriche.profilo('cerca').sort_stats('cumulative').print_stats(10)
+
+Le metriche si esportano in JSON (esporta()) o nel formato di testo di Prometheus
+(esporta_prometheus()), che il servizio HTTP espone su /metrics.
+"""
+
+import functools                                                                    # Importa functools, per conservare nome e docstring delle funzioni decorate.
+import os                                                                           # Importa os, usato per accorciare i percorsi nel profilo esportato.
+import time                                                                         # Importa time, per misurare le latenze con perf_counter().
+from _thread import allocate_lock                                                   # Importa allocate_lock: lo stesso lock di threading, senza il costo di importare threading.
+from bisect import bisect_left                                                      # Importa bisect_left, per trovare l'intervallo dell'istogramma.
+from collections.abc import Iterator                                                # Importa Iterator, per riconoscere i risultati generati uno alla volta.
+
+LIMITI_LATENZA = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)  # Secondi.
+LIMITI_RISULTATI = (0, 1, 10, 100, 1000, 10000, 100000, 1000000)                   # Numero di ricette restituite.
+RIGHE_PROFILO = 20                                                                  # Funzioni del profilo riportate nell'esportazione.
+PREFISSO = 'ricette_operazione'                                                     # Prefisso dei nomi delle metriche di Prometheus.
+
+
+# Definisce le misure raccolte per una singola operazione.
+class MisureOperazione:
+
+    """
+    Misure raccolte per un'operazione.
+
+    Attributes:
+        chiamate (int): Chiamate completate, con o senza errore.
+        errori (int): Chiamate terminate con un'eccezione.
+        secondi (float): Somma delle latenze.
+        latenze (list): Chiamate per intervallo di LIMITI_LATENZA (l'ultimo conta quelle oltre il limite più alto).
+        risultati (list): Chiamate per intervallo di LIMITI_RISULTATI, solo quelle che restituiscono delle ricette.
+        totale_risultati (int): Ricette restituite in tutto.
+        picco_memoria (int or None): Picco più alto di memoria allocata in una chiamata, se misurato con tracemalloc.
+        profilo (cProfile.Profile or None): Profilo cumulato delle chiamate, se richiesto.
+    """
+
+    __slots__ = ('chiamate', 'errori', 'secondi', 'latenze', 'risultati', 'totale_risultati', 'picco_memoria', 'profilo')
+
+    def __init__(self):
+        self.chiamate = 0
+        self.errori = 0
+        self.secondi = 0.0
+        self.latenze = [0] * (len(LIMITI_LATENZA) + 1)
+        self.risultati = [0] * (len(LIMITI_RISULTATI) + 1)
+        self.totale_risultati = 0
+        self.picco_memoria = None
+        self.profilo = None
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione di supporto che restituisce il numero di ricette di un risultato, o None se non è un elenco.
+def _dimensione(risultato):
+    if isinstance(risultato, (list, tuple, set, frozenset)):
+        return len(risultato)
+    return None
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione di supporto che scrive il valore di un'etichetta di Prometheus.
+def _etichetta(valore):
+    return str(valore).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce il blocco `with` restituito da Metriche.sospese(), che al termine riporta la raccolta com'era.
+class _Sospensione:
+
+    __slots__ = ('metriche', 'attive')
+
+    def __init__(self, metriche):
+        self.metriche = metriche
+        self.attive = False
+
+    def __enter__(self):
+        self.attive, self.metriche.attive = self.metriche.attive, False
+
+    def __exit__(self, *eccezione):
+        self.metriche.attive = self.attive
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce il registro delle metriche, condiviso da tutte le funzioni strumentate.
+class Metriche:
+
+    """
+    Registro delle misure per operazione. Di base è disattivato: usare l'istanza
+    `metriche` del modulo, che è quella letta dalle funzioni decorate con strumentata().
+
+    Attributes:
+        attive (bool): True se le chiamate vengono misurate.
+        operazioni (dict): Nome dell'operazione -> MisureOperazione.
+    """
+
+    def __init__(self):
+        self.attive = False
+        self.operazioni = {}
+        self._profilo = frozenset()                                                     # Operazioni da profilare con cProfile (True: tutte).
+        self._memoria = frozenset()                                                     # Operazioni di cui misurare la memoria con tracemalloc (True: tutte).
+        self._in_cattura = False                                                        # Una sola cattura alla volta: le operazioni annidate non la ripetono.
+        self._blocco = allocate_lock()
+
+    def abilita(self, profilo=(), memoria=()):
+
+        """
+        Attiva la raccolta delle metriche.
+
+        Args:
+            profilo (iterable or bool, optional): Operazioni da profilare con cProfile; True per tutte.
+            memoria (iterable or bool, optional): Operazioni di cui misurare il picco di memoria con tracemalloc; True per tutte.
+        """
+
+        self._profilo = profilo if profilo is True else frozenset(profilo)
+        self._memoria = memoria if memoria is True else frozenset(memoria)
+        self.attive = True
+
+    def disabilita(self):
+
+        """
+        Disattiva la raccolta; le misure già raccolte restano disponibili.
+        """
+
+        self.attive = False
+
+    def azzera(self):
+
+        """
+        Cancella tutte le misure raccolte, profili compresi.
+        """
+
+        with self._blocco:
+            self.operazioni = {}
+
+    def sospese(self):
+
+        """
+        Sospende la raccolta nel blocco `with`, per esempio per eseguire di nuovo
+        un'operazione già misurata senza contarla due volte.
+
+        Returns:
+            Il gestore di contesto da usare con `with`.
+        """
+
+        return _Sospensione(self)
+
+    def _misure(self, nome):
+        misure = self.operazioni.get(nome)
+        if misure is None:
+            with self._blocco:
+                misure = self.operazioni.setdefault(nome, MisureOperazione())
+        return misure
+
+    def registra(self, nome, secondi, dimensione=None, errore=False):
+
+        """
+        Registra una chiamata di un'operazione.
+
+        Args:
+            nome (str): Nome dell'operazione.
+            secondi (float): Latenza della chiamata.
+            dimensione (int, optional): Numero di ricette restituite, se l'operazione restituisce un elenco.
+            errore (bool, optional): True se la chiamata è terminata con un'eccezione.
+        """
+
+        misure = self._misure(nome)
+        with self._blocco:
+            misure.chiamate += 1
+            misure.errori += errore
+            misure.secondi += secondi
+            misure.latenze[bisect_left(LIMITI_LATENZA, secondi)] += 1                   # Intervalli chiusi a destra, come "le" di Prometheus.
+            if dimensione is not None:
+                misure.risultati[bisect_left(LIMITI_RISULTATI, dimensione)] += 1
+                misure.totale_risultati += dimensione
+
+    def esegui(self, nome, funzione, args, kwargs, elenco=True):
+
+        """
+        Esegue una funzione misurandola come operazione `nome` (usata da strumentata()).
+        Se la funzione restituisce un iteratore, si misura il tempo passato a produrre
+        ogni ricetta, fino all'ultima, e non quello di chi le consuma.
+
+        Args:
+            elenco (bool, optional): False se il risultato non è un elenco di ricette da contare.
+
+        Returns:
+            Il risultato della funzione, o un generatore che lo percorre misurandolo.
+        """
+
+        cattura = self._cattura(nome)
+        inizio = time.perf_counter()
+        try:
+            risultato = funzione(*args, **kwargs) if cattura is None else self._esegui_catturando(nome, cattura, funzione, args, kwargs)
+        except BaseException:
+            self.registra(nome, time.perf_counter() - inizio, errore=True)
+            raise
+        secondi = time.perf_counter() - inizio
+        if elenco and isinstance(risultato, Iterator):
+            return self._flusso(nome, risultato, secondi, cattura)
+        self.registra(nome, secondi, _dimensione(risultato) if elenco else None)
+        return risultato
+
+    def _flusso(self, nome, ricette, secondi, cattura):
+        numero, errore = 0, True
+        try:
+            while True:
+                inizio = time.perf_counter()
+                try:
+                    if cattura is None:
+                        ricetta = next(ricette)
+                    else:
+                        ricetta = self._esegui_catturando(nome, cattura, next, (ricette,), {})
+                except StopIteration:
+                    errore = False
+                    return
+                finally:
+                    secondi += time.perf_counter() - inizio
+                numero += 1
+                yield ricetta
+        except GeneratorExit:                                                           # Chi legge si è fermato prima della fine (per esempio con un limite).
+            errore = False
+            raise
+        finally:
+            self.registra(nome, secondi, numero, errore)
+
+    def _cattura(self, nome):
+        if self._in_cattura or not (self._profilo or self._memoria):
+            return None
+        profilo = self._profilo is True or nome in self._profilo
+        memoria = self._memoria is True or nome in self._memoria
+        return (profilo, memoria) if profilo or memoria else None
+
+    def _esegui_catturando(self, nome, cattura, funzione, args, kwargs):
+        profilo, memoria = cattura
+        misure = self._misure(nome)
+        self._in_cattura = True
+        avviato = False
+        try:
+            if memoria:
+                import tracemalloc                                                      # Importati solo quando servono: di base non vengono caricati.
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                    avviato = True
+                iniziale = tracemalloc.get_traced_memory()[0]
+                tracemalloc.reset_peak()
+            if profilo:
+                if misure.profilo is None:
+                    import cProfile
+                    misure.profilo = cProfile.Profile()
+                misure.profilo.enable()
+            try:
+                return funzione(*args, **kwargs)
+            finally:
+                if profilo:
+                    misure.profilo.disable()
+                if memoria:
+                    picco = tracemalloc.get_traced_memory()[1] - iniziale
+                    misure.picco_memoria = max(misure.picco_memoria or 0, picco)
+        finally:
+            if avviato:
+                tracemalloc.stop()
+            self._in_cattura = False
+
+    def profilo(self, nome):
+
+        """
+        Args:
+            nome (str): Nome dell'operazione.
+
+        Returns:
+            pstats.Stats or None: Il profilo cumulato dell'operazione, o None se non è stato richiesto
+                                  o l'operazione non è ancora stata chiamata.
+        """
+
+        misure = self.operazioni.get(nome)
+        if misure is None or misure.profilo is None:
+            return None
+        import pstats
+        try:
+            return pstats.Stats(misure.profilo)
+        except TypeError:                                                               # Profilo creato ma ancora vuoto.
+            return None
+
+    def esporta(self):
+
+        """
+        Returns:
+            dict: Per ogni operazione chiamate, errori, latenza totale e media, istogrammi
+                  (intervallo -> chiamate, non cumulati), ricette restituite e, se raccolti,
+                  picco di memoria e le funzioni più costose del profilo.
+        """
+
+        risultato = {}
+        for nome, misure in sorted(self.operazioni.items()):
+            with self._blocco:
+                latenze, risultati = list(misure.latenze), list(misure.risultati)
+                chiamate, errori, secondi, totale = misure.chiamate, misure.errori, misure.secondi, misure.totale_risultati
+            dati = {
+                'chiamate': chiamate,
+                'errori': errori,
+                'secondi': secondi,
+                'latenza_media': secondi / chiamate if chiamate else None,
+                'latenze': dict(zip([str(limite) for limite in LIMITI_LATENZA] + ['+Inf'], latenze)),
+                'risultati': dict(zip([str(limite) for limite in LIMITI_RISULTATI] + ['+Inf'], risultati)),
+                'totale_risultati': totale,
+            }
+            if misure.picco_memoria is not None:
+                dati['picco_memoria'] = misure.picco_memoria
+            profilo = self.profilo(nome)
+            if profilo is not None:
+                funzioni = sorted(profilo.stats.items(), key=lambda voce: voce[1][3], reverse=True)[:RIGHE_PROFILO]
+                dati['profilo'] = [{'funzione': f"{os.path.basename(file)}:{riga}({funzione})", 'chiamate': totali,
+                                    'secondi_propri': propri, 'secondi_cumulati': cumulati}
+                                   for (file, riga, funzione), (_, totali, propri, cumulati, _) in funzioni]
+            risultato[nome] = dati
+        return risultato
+
+    def esporta_prometheus(self):
+
+        """
+        Returns:
+            str: Le metriche nel formato di testo di Prometheus (versione 0.0.4).
+        """
+
+        righe = [f"# HELP {PREFISSO}_chiamate_total Chiamate per operazione.",
+                 f"# TYPE {PREFISSO}_chiamate_total counter"]
+        dati = self.esporta()
+        for nome, misure in dati.items():
+            righe.append(f'{PREFISSO}_chiamate_total{{operazione="{_etichetta(nome)}"}} {misure["chiamate"]}')
+        righe += [f"# HELP {PREFISSO}_errori_total Chiamate terminate con un errore.", f"# TYPE {PREFISSO}_errori_total counter"]
+        for nome, misure in dati.items():
+            righe.append(f'{PREFISSO}_errori_total{{operazione="{_etichetta(nome)}"}} {misure["errori"]}')
+
+        for metrica, chiave, somma, aiuto in (('durata_secondi', 'latenze', 'secondi', "Latenza delle chiamate in secondi."),
+                                              ('risultati', 'risultati', 'totale_risultati', "Ricette restituite per chiamata.")):
+            righe += [f"# HELP {PREFISSO}_{metrica} {aiuto}", f"# TYPE {PREFISSO}_{metrica} histogram"]
+            for nome, misure in dati.items():
+                etichetta = _etichetta(nome)
+                cumulato = 0
+                for limite, volte in misure[chiave].items():
+                    cumulato += volte
+                    righe.append(f'{PREFISSO}_{metrica}_bucket{{operazione="{etichetta}",le="{limite}"}} {cumulato}')
+                righe.append(f'{PREFISSO}_{metrica}_sum{{operazione="{etichetta}"}} {misure[somma]}')
+                righe.append(f'{PREFISSO}_{metrica}_count{{operazione="{etichetta}"}} {cumulato}')
+
+        memoria = [(nome, misure['picco_memoria']) for nome, misure in dati.items() if 'picco_memoria' in misure]
+        if memoria:
+            righe += [f"# HELP {PREFISSO}_picco_memoria_byte Picco più alto di memoria allocata in una chiamata.",
+                      f"# TYPE {PREFISSO}_picco_memoria_byte gauge"]
+            righe += [f'{PREFISSO}_picco_memoria_byte{{operazione="{_etichetta(nome)}"}} {picco}' for nome, picco in memoria]
+        return '\n'.join(righe) + '\n'
+
+
+metriche = Metriche()                                                               # Registro letto da tutte le funzioni strumentate.
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce il decoratore che misura una funzione come operazione, quando le metriche sono attive.
+def strumentata(nome, elenco=True):
+
+    """
+    Decoratore che registra le chiamate della funzione come operazione `nome` nel
+    registro `metriche`. A raccolta disattivata costa un solo controllo per chiamata.
+
+    Args:
+        nome (str): Nome dell'operazione nelle metriche, per esempio 'cerca'.
+        elenco (bool, optional): False se il risultato non è un elenco di ricette da contare.
+
+    Returns:
+        callable: Il decoratore.
+    """
+
+    def decora(funzione):
+        @functools.wraps(funzione)
+        def avvolta(*args, **kwargs):
+            if not metriche.attive:
+                return funzione(*args, **kwargs)
+            return metriche.esegui(nome, funzione, args, kwargs, elenco)
+        return avvolta
+    return decora
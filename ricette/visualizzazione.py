@@ -0,0 +1,138 @@
+"""
+Visualizzazione delle ricette: formattazione in blocchi di testo e scrittura bufferizzata,
+con paginazione e un formato compatto di una riga per ricetta.
+
+Invece di una print() per ogni riga, le ricette vengono formattate e scritte con una
+sola write() per blocco: su un terminale o una pipe il costo dominante è il numero di
+scritture, non la quantità di testo.
+"""
+
+import sys                                                                          # Importa sys, per scrivere su sys.stdout quando non viene indicato un file.
+from itertools import islice                                                        # Importa islice, usato per la paginazione e per dividere le ricette in blocchi.
+
+SEPARATORE = "-" * 40                                                               # Linea che separa le ricette nel formato esteso.
+DIMENSIONE_BLOCCO = 1000                                                            # Ricette formattate e scritte con una sola write().
+
+
+# Definisce una funzione che formatta una ricetta come la mostrava visualizza_ricette(), su più righe.
+def formatta_ricetta(ricetta):
+
+    """
+    Formatta una ricetta su quattro righe: nome, ingredienti, minutaggio e separatore.
+
+    Args:
+        ricetta (dict): Ricetta da formattare.
+
+    Returns:
+        str: Il testo della ricetta, terminato da un a capo.
+    """
+
+    return (f"Nome: {ricetta['nome']}\n"
+            f"Ingredienti: {', '.join(ricetta['ingredienti'])}\n"
+            f"Minutaggio: {ricetta['minutaggio']} minuti\n"
+            f"{SEPARATORE}\n")
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione che formatta una ricetta su una sola riga.
+def formatta_compatta(ricetta):
+
+    """
+    Formatta una ricetta su una sola riga: nome, minutaggio e ingredienti.
+
+    Args:
+        ricetta (dict): Ricetta da formattare.
+
+    Returns:
+        str: La riga della ricetta, terminata da un a capo.
+    """
+
+    return f"{ricetta['nome']} ({ricetta['minutaggio']} min): {', '.join(ricetta['ingredienti'])}\n"
+
+
+FORMATI = {                                                                         # Formati disponibili: nome -> funzione che formatta una ricetta.
+    'esteso': formatta_ricetta,
+    'compatto': formatta_compatta,
+}
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione di supporto che restituisce la funzione di formattazione di un formato.
+def _formattatore(formato):
+    try:
+        return FORMATI[formato]
+    except KeyError:
+        raise ValueError(f"Formato '{formato}' non supportato: usa uno tra {', '.join(FORMATI)}.") from None
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione di supporto che applica la paginazione a un flusso di ricette.
+def _pagina(ricette, pagina, per_pagina):
+    if per_pagina is None:
+        return iter(ricette)
+    inizio = (pagina - 1) * per_pagina
+    return islice(ricette, inizio, inizio + per_pagina)
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce la funzione che scrive le ricette su un file o sullo schermo, un blocco alla volta.
+def scrivi_ricette(ricette, file=None, formato='esteso', pagina=1, per_pagina=None, dimensione_blocco=DIMENSIONE_BLOCCO):
+
+    """
+    Scrive le ricette formattate, con una write() ogni `dimensione_blocco` ricette.
+
+    Le ricette vengono lette una alla volta (va bene anche un generatore), quindi in
+    memoria c'è al massimo il testo di un blocco, anche per milioni di ricette.
+
+    Args:
+        ricette (iterable): Ricette da scrivere.
+        file (file, optional): Dove scrivere; se manca, sys.stdout.
+        formato (str, optional): 'esteso' (come visualizza_ricette) o 'compatto' (una riga per ricetta).
+        pagina (int, optional): Pagina da scrivere (da 1), se è indicato `per_pagina`.
+        per_pagina (int, optional): Ricette per pagina; None per scriverle tutte.
+        dimensione_blocco (int, optional): Ricette per write(); None per un'unica write().
+
+    Returns:
+        int: Numero di ricette scritte.
+
+    Raises:
+        ValueError: Se il formato non è supportato.
+    """
+
+    formatta = _formattatore(formato)
+    file = sys.stdout if file is None else file                                         # Letto ad ogni chiamata, così funziona anche con redirect_stdout().
+    ricette = _pagina(ricette, pagina, per_pagina)
+    scritte = 0
+    while True:
+        blocco = [formatta(ricetta) for ricetta in islice(ricette, dimensione_blocco)]
+        if not blocco:
+            break
+        file.write(''.join(blocco))
+        scritte += len(blocco)
+        if dimensione_blocco is None:
+            break
+    return scritte
+
+#______________________________________________________________________________________________________________________________________
+
+# Definisce una funzione che restituisce il testo delle ricette invece di scriverlo.
+def rendi_ricette(ricette, formato='esteso', pagina=1, per_pagina=None):
+
+    """
+    Formatta le ricette in un'unica stringa.
+
+    Args:
+        ricette (iterable): Ricette da formattare.
+        formato (str, optional): 'esteso' o 'compatto'.
+        pagina (int, optional): Pagina da formattare (da 1), se è indicato `per_pagina`.
+        per_pagina (int, optional): Ricette per pagina; None per formattarle tutte.
+
+    Returns:
+        str: Il testo delle ricette.
+
+    Raises:
+        ValueError: Se il formato non è supportato.
+    """
+
+    formatta = _formattatore(formato)
+    return ''.join(map(formatta, _pagina(ricette, pagina, per_pagina)))